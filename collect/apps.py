@@ -1,6 +1,14 @@
 from django.apps import AppConfig
+from django.conf import settings
 
 
 class CollectConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'collect'
+
+    def ready(self):
+        from collect import signals  # noqa: F401 - registers the receivers
+
+        if getattr(settings, 'SENTIMENT_PRELOAD', False):
+            from utils.sentiment import preload
+            preload()
@@ -1,7 +1,14 @@
+import asyncio
 import json
+from channels.db import database_sync_to_async
 from channels.generic.websocket import AsyncWebsocketConsumer
+from django.utils import timezone
+
+from collect.scrapers.jobs import POLL_INTERVAL, job_updates
 
 class ThreatConsumer(AsyncWebsocketConsumer):
+    job_relay = None
+
     async def connect(self):
         # ✅ MUST join the group
         self.group_name = "print_messages"
@@ -16,8 +23,16 @@ class ThreatConsumer(AsyncWebsocketConsumer):
             'type': 'connection_established',
             'message': 'Connected to ThreatWatch WebSocket'
         }))
+
+        # Background jobs run in worker processes - relay their progress from the DB
+        user = self.scope.get('user')
+        if user is not None and user.is_authenticated:
+            self.job_relay = asyncio.create_task(self.relay_jobs(user))
     
     async def disconnect(self, close_code):
+        if self.job_relay is not None:
+            self.job_relay.cancel()
+
         # ✅ MUST leave the group
         await self.channel_layer.group_discard(
             self.group_name,
@@ -44,4 +59,29 @@ class ThreatConsumer(AsyncWebsocketConsumer):
         await self.send(text_data=json.dumps({
             'type': 'message',
             'content': event['text']
-        }))
\ No newline at end of file
+        }))
+
+    async def relay_jobs(self, user):
+        """Send progress messages and state changes of the user's scrape jobs"""
+        since = timezone.now()
+        seen = {}
+        while True:
+            await asyncio.sleep(POLL_INTERVAL)
+            try:
+                updates, since = await database_sync_to_async(job_updates)(user, since, seen)
+            except Exception as e:
+                print(f"⚠️ Job relay: {e}")
+                continue
+            for update in updates:
+                for message in update['messages']:
+                    await self.send(text_data=json.dumps({
+                        'type': 'message',
+                        'content': message
+                    }))
+                if update['state_changed']:
+                    await self.send(text_data=json.dumps({
+                        'type': 'job',
+                        'job_id': update['job_id'],
+                        'kind': update['kind'],
+                        'state': update['state']
+                    }))
@@ -0,0 +1,102 @@
+import contextlib
+import io
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from collect.models import AutoNewsArticle
+from collect.scrapers import health, page_cache
+from collect.scrapers.engine import SourceRequest, set_host_override, MAX_SOURCES
+from collect.scrapers.fixture_server import FixtureServer, bench_database, create_bench_user, delete_bench_user
+from collect.scrapers.sources import SCRAPER_FUNCTIONS, resolve_sources, scrape_sources
+from collect.scrapers.rate_limit import limiter_stats
+from utils.http_session import close_sessions, connection_stats
+
+
+BENCH_USERNAME = "engine-benchmark"
+
+
+class Command(BaseCommand):
+    help = "Replay all keyboard_* sources against a local fixture server: sequential loop vs shared engine"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sources', default='all', help="Comma separated source names or 'all'")
+        parser.add_argument('--latency', type=float, default=0.05, help="Fixture server latency per request (seconds)")
+        parser.add_argument('--error-rate', type=float, default=0.0, help="Fraction of fixture responses answered with 503")
+        parser.add_argument('--max-sources', type=int, default=MAX_SOURCES)
+        parser.add_argument('--skip-sequential', action='store_true')
+        parser.add_argument('--verbose', action='store_true', help="Show scraper output")
+
+    def handle(self, *args, **options):
+        names = []
+        for name in options['sources'].split(','):
+            resolved = resolve_sources(name.strip())
+            if resolved is None:
+                raise CommandError(f"Unknown source '{name}'. Available: {', '.join(SCRAPER_FUNCTIONS)}")
+            names.extend(n for n in resolved if n not in names)
+
+        server = FixtureServer(latency=options['latency'], error_rate=options['error_rate']).start()
+        set_host_override(server.base_url)
+        health.set_persistence(False)
+        page_cache.set_enabled(False)
+        try:
+            # Articles and keywords go to a throw-away database, not the real one
+            with bench_database():
+                self._bench(names, server, options)
+        finally:
+            set_host_override(None)
+            close_sessions()
+            server.stop()
+
+    def _bench(self, names, server, options):
+        user = create_bench_user(BENCH_USERNAME)
+        request = SourceRequest(user)
+        quiet = contextlib.nullcontext() if options['verbose'] else contextlib.redirect_stdout(io.StringIO())
+
+        try:
+            sequential_time = None
+            if not options['skip_sequential']:
+                self.stdout.write(f"⏳ Sequential loop over {len(names)} source(s)...")
+                start = time.time()
+                with quiet:
+                    for name in names:
+                        try:
+                            SCRAPER_FUNCTIONS[name](request)
+                        except Exception:
+                            pass
+                sequential_time = time.time() - start
+                AutoNewsArticle.objects.filter(created_by=user).delete()
+
+            self.stdout.write(f"⏳ Engine run over {len(names)} source(s) (max {options['max_sources']} at once)...")
+            start = time.time()
+            quiet = contextlib.nullcontext() if options['verbose'] else contextlib.redirect_stdout(io.StringIO())
+            with quiet:
+                results = scrape_sources(names, request, max_sources=options['max_sources'])
+            engine_time = time.time() - start
+
+            self.stdout.write("")
+            self.stdout.write(f"{'source':<16}{'seconds':>10}  status")
+            for name in names:
+                result = results[name]
+                status = result['error'] or (result['data'] or {}).get('metadata', {}).get('status', '?')
+                self.stdout.write(f"{name:<16}{result['elapsed']:>10.2f}  {status}")
+            self.stdout.write("")
+            if sequential_time is not None:
+                self.stdout.write(f"Sequential loop : {sequential_time:.2f}s")
+            self.stdout.write(f"Shared engine   : {engine_time:.2f}s")
+            if sequential_time:
+                self.stdout.write(self.style.SUCCESS(f"Speedup         : {sequential_time / engine_time:.1f}x"))
+            self.stdout.write(f"Fixture requests: {server.requests} ({server.bytes_sent / 1024:.0f} KB)")
+            stats = connection_stats()
+            self.stdout.write(
+                f"HTTP pool       : {stats['connections_opened']} connections opened, "
+                f"{stats['reused']} of {stats['requests']} requests reused a keep-alive connection"
+            )
+            limits = limiter_stats()
+            self.stdout.write(
+                f"Rate limiter    : {len(limits)} hosts, "
+                f"{sum(l['backoffs'] for l in limits.values())} backoffs, "
+                f"{sum(l['waited'] for l in limits.values()):.1f}s total wait"
+            )
+        finally:
+            delete_bench_user(user)
@@ -0,0 +1,73 @@
+import glob
+import os
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from collect.scrapers.fixture_server import render_article
+from collect.scrapers.html_parser import DEFAULT_BACKEND, parse_html
+
+
+def extract_signature(soup):
+    """What the article scrapers read from a page - used to check backends agree"""
+    date = soup.select_one("meta[property='article:published_time']")
+    image = soup.select_one("meta[property='og:image']")
+    content = soup.select_one("div.news-content") or soup.select_one("article")
+    paragraphs = content.find_all('p') if content else soup.find_all('p')
+    return (
+        date.get('content') if date else None,
+        image.get('content') if image else None,
+        tuple(p.get_text(strip=True) for p in paragraphs[:20]),
+    )
+
+
+class Command(BaseCommand):
+    help = "Parse saved article HTML with each backend and report pages/sec"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dir', help="Directory of saved article pages (*.html); fixture pages if omitted")
+        parser.add_argument('--pages', type=int, default=200, help="Number of fixture pages when --dir is not given")
+        parser.add_argument('--rounds', type=int, default=3)
+
+    def handle(self, *args, **options):
+        pages = self._load_pages(options)
+        backends = [('html.parser', False), ('html.parser', True)]
+        if DEFAULT_BACKEND == 'lxml':
+            backends += [('lxml', False), ('lxml', True)]
+        else:
+            self.stdout.write(self.style.WARNING("lxml is not installed - only html.parser is measured"))
+
+        baseline = [extract_signature(parse_html(page, backend='html.parser', strain=False)) for page in pages]
+        total_bytes = sum(len(page) for page in pages)
+        self.stdout.write(f"📄 {len(pages)} pages, {total_bytes / 1024:.0f} KB, {options['rounds']} rounds\n")
+        self.stdout.write(f"{'backend':<24}{'pages/sec':>12}{'MB/sec':>10}{'same output':>14}")
+
+        for backend, strain in backends:
+            best = None
+            for _ in range(options['rounds']):
+                start = time.perf_counter()
+                soups = [parse_html(page, backend=backend, strain=strain, charset='utf-8') for page in pages]
+                elapsed = time.perf_counter() - start
+                best = elapsed if best is None else min(best, elapsed)
+
+            same = sum(1 for soup, expected in zip(soups, baseline) if extract_signature(soup) == expected)
+            name = backend + (' + strainer' if strain else '')
+            self.stdout.write(
+                f"{name:<24}{len(pages) / best:>12.1f}{total_bytes / best / 1024 / 1024:>10.2f}"
+                f"{same:>9}/{len(pages)}"
+            )
+
+    def _load_pages(self, options):
+        if options['dir']:
+            paths = sorted(glob.glob(os.path.join(options['dir'], '*.htm*')))
+            if not paths:
+                raise CommandError(f"No .html files in {options['dir']}")
+            pages = []
+            for path in paths:
+                with open(path, 'rb') as f:
+                    pages.append(f.read())
+            return pages
+        return [
+            render_article('bench.local', f"/2026/01/01/story-{n}").encode('utf-8')
+            for n in range(options['pages'])
+        ]
@@ -0,0 +1,97 @@
+import random
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from collect.models import AutoNewsArticle, DangerousKeyword
+from collect.scrapers.fixture_server import FIXTURE_WORDS, render_article
+from collect.scrapers.html_parser import parse_html
+from utils.keyword_matcher import AUTOMATON_MIN_WORDS, KeywordMatcher
+from utils.text_normalize import normalize_keyword, normalize_text
+
+DEVANAGARI = [chr(code) for code in range(0x0915, 0x0939)] + ['ा', 'ि', 'ी', 'ु', 'ू', 'े', 'ै', 'ो', 'ौ', 'ं', '्']
+
+
+class Command(BaseCommand):
+    help = "Compare per-keyword substring checks with the Aho–Corasick matcher on a Nepali news corpus"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', default='10,100,400,1000,5000', help="Comma separated keyword counts")
+        parser.add_argument('--articles', type=int, default=500, help="Corpus size (stored articles, topped up with fixture pages)")
+        parser.add_argument('--rounds', type=int, default=3)
+        parser.add_argument('--seed', type=int, default=1)
+
+    def handle(self, *args, **options):
+        try:
+            sizes = [int(size) for size in options['sizes'].split(',')]
+        except ValueError:
+            raise CommandError("--sizes must be comma separated numbers")
+        rng = random.Random(options['seed'])
+        corpus = self._corpus(options['articles'])
+        vocabulary = self._vocabulary(corpus, rng)
+        total_chars = sum(len(text) for text in corpus)
+        self.stdout.write(f"📰 {len(corpus)} articles, {total_chars / len(corpus):.0f} chars on average, "
+                          f"{len(vocabulary)} candidate keywords (automaton from {AUTOMATON_MIN_WORDS} words)\n")
+        self.stdout.write(f"{'keywords':>9}{'compile ms':>12}{'in-loop art/s':>15}{'automaton art/s':>17}"
+                          f"{'matcher art/s':>15}{'speedup':>9}{'same':>7}")
+
+        for size in sizes:
+            keywords = [(word, f"category-{index % 7}") for index, word in enumerate(self._keywords(vocabulary, size, rng))]
+            start = time.perf_counter()
+            automaton = KeywordMatcher(keywords, automaton=True)
+            compile_ms = (time.perf_counter() - start) * 1000
+            matcher = KeywordMatcher(keywords)
+            normalized = [(normalize_keyword(word), word.lower().strip(), category) for word, category in keywords]
+
+            def substring_loop(text):
+                text = normalize_text(text)
+                return [(word, category) for key, word, category in normalized if key in text]
+
+            naive, expected = self._measure(substring_loop, corpus, options['rounds'])
+            scan, scanned = self._measure(automaton.matches, corpus, options['rounds'])
+            best, chosen = self._measure(matcher.matches, corpus, options['rounds'])
+            same = expected == scanned == chosen
+            self.stdout.write(
+                f"{size:>9}{compile_ms:>12.1f}{len(corpus) / naive:>15.0f}{len(corpus) / scan:>17.0f}"
+                f"{len(corpus) / best:>15.0f}{naive / best:>8.1f}x{'yes' if same else 'NO':>7}"
+            )
+            if not same:
+                self.stdout.write(self.style.ERROR("   ❌ matcher output differs from the substring checks"))
+
+    def _measure(self, function, corpus, rounds):
+        best, result = None, None
+        for _ in range(rounds):
+            start = time.perf_counter()
+            result = [function(text) for text in corpus]
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        return best, result
+
+    def _corpus(self, size):
+        corpus = [
+            f"{title} {summary}"
+            for title, summary in AutoNewsArticle.objects.order_by('-id').values_list('title', 'summary')[:size]
+        ]
+        # Top up with fixture article pages (same Nepali vocabulary, ~2.5 KB of text each)
+        for n in range(size - len(corpus)):
+            soup = parse_html(render_article("fixture.example", f"/2024/01/01/story-{n}"))
+            corpus.append(soup.get_text(" ", strip=True))
+        return corpus
+
+    def _vocabulary(self, corpus, rng):
+        words = set(normalize_keyword(word) for word in DangerousKeyword.objects.values_list('word', flat=True))
+        words.update(FIXTURE_WORDS)
+        for text in rng.sample(corpus, min(len(corpus), 200)):
+            tokens = text.split()
+            words.update(token for token in tokens if len(token) > 2)
+            words.update(f"{a} {b}" for a, b in zip(tokens, tokens[1:]))
+        words.discard('')
+        return sorted(words)
+
+    def _keywords(self, vocabulary, size, rng):
+        """Mostly corpus words (many hits), the rest random syllables (misses) as in a large keyword list"""
+        from_corpus = rng.sample(vocabulary, min(len(vocabulary), size * 3 // 4))
+        invented = ["".join(rng.choice(DEVANAGARI) for _ in range(rng.randint(3, 7))) for _ in range(size - len(from_corpus))]
+        keywords = from_corpus + invented
+        rng.shuffle(keywords)
+        return keywords
@@ -0,0 +1,219 @@
+import contextlib
+import io
+import json
+import subprocess
+import time
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from collect.models import AutoNewsArticle
+from collect.scrapers import health, page_cache
+from collect.scrapers.engine import SourceRequest, parse_result, set_host_override
+from collect.scrapers.fixture_server import (
+    ERROR_KINDS, FixtureServer, bench_database, create_bench_user, delete_bench_user, export_recordings,
+)
+from collect.scrapers.sources import SCRAPER_FUNCTIONS, resolve_sources
+from utils.http_session import close_sessions
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+BENCH_USERNAME = "scraper-benchmark"
+BENCH_DIR = Path(getattr(settings, 'BENCHMARK_DIR', Path(settings.BASE_DIR) / 'benchmarks'))
+RESULTS_DIR = BENCH_DIR / 'scrapers'
+RECORDINGS_DIR = BENCH_DIR / 'fixtures'
+
+
+def peak_rss_mb():
+    if resource is None:
+        return None
+    # ru_maxrss is in KB on Linux
+    return round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+
+
+def git_revision():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=settings.BASE_DIR,
+            capture_output=True, text=True, timeout=5,
+        ).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+class Command(BaseCommand):
+    help = "Run every keyboard_* scraper end-to-end against the local fixture server and store the metrics as JSON"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sources', default='all', help="Comma separated source names or 'all'")
+        parser.add_argument('--latency', type=float, default=0.02, help="Fixture server latency per request (seconds)")
+        parser.add_argument('--jitter', type=float, default=0.0, help="+/- random latency added per request (seconds)")
+        parser.add_argument('--error-rate', type=float, default=0.0, help="Fraction of requests answered with an injected error")
+        parser.add_argument('--errors', default='503', help=f"Comma separated injected error kinds ({', '.join(ERROR_KINDS)})")
+        parser.add_argument('--recordings', default=str(RECORDINGS_DIR),
+                            help="Directory of recorded pages (synthetic pages for everything not in it)")
+        parser.add_argument('--record', action='store_true',
+                            help="Export the page cache of a real crawl into --recordings and exit")
+        parser.add_argument('--output', help=f"Result file (default {RESULTS_DIR}/<timestamp>.json)")
+        parser.add_argument('--compare', help="Earlier result file to compare with (default: the latest one)")
+        parser.add_argument('--threshold', type=float, default=0.2, help="Slowdown flagged as a regression (0.2 = 20%%)")
+        parser.add_argument('--verbose', action='store_true', help="Show scraper output")
+
+    def handle(self, *args, **options):
+        if options['record']:
+            exported = export_recordings(options['recordings'])
+            self.stdout.write(f"📼 {exported} cached pages exported to {options['recordings']}")
+            return
+
+        names = []
+        for name in options['sources'].split(','):
+            resolved = resolve_sources(name.strip())
+            if resolved is None:
+                raise CommandError(f"Unknown source '{name}'. Available: {', '.join(SCRAPER_FUNCTIONS)}")
+            names.extend(n for n in resolved if n not in names)
+        errors = [kind.strip() for kind in options['errors'].split(',')]
+        unknown = [kind for kind in errors if kind not in ERROR_KINDS]
+        if unknown:
+            raise CommandError(f"Unknown error kind(s) {', '.join(unknown)}. Available: {', '.join(ERROR_KINDS)}")
+        previous = self._previous_result(options['compare'])
+
+        recordings = options['recordings'] if Path(options['recordings'], 'index.json').exists() else None
+        server = FixtureServer(
+            latency=options['latency'], jitter=options['jitter'], error_rate=options['error_rate'],
+            errors=errors, recordings=recordings,
+        ).start()
+        set_host_override(server.base_url)
+        # Fixture pages come back under the real URLs - keep them out of the real health state and cache
+        health.set_persistence(False)
+        page_cache.set_enabled(False)
+        if recordings:
+            self.stdout.write(f"📼 {len(server.recordings)} recorded pages, synthetic pages for the rest")
+
+        sources = {}
+        try:
+            # Articles and keywords go to a throw-away database, not the real one
+            with bench_database():
+                user = create_bench_user(BENCH_USERNAME)
+                request = SourceRequest(user)
+                total_start = time.perf_counter()
+                try:
+                    for name in names:
+                        self.stdout.write(f"⏳ {name}...")
+                        sources[name] = self._run_source(name, request, server, options['verbose'])
+                finally:
+                    total_time = time.perf_counter() - total_start
+                    delete_bench_user(user)
+        finally:
+            set_host_override(None)
+            close_sessions()
+            server.stop()
+            health.set_persistence(True)
+            page_cache.set_enabled(getattr(settings, 'PAGE_CACHE_ENABLED', True))
+
+        articles = sum(row['articles'] for row in sources.values())
+        result = {
+            "created_at": timezone.now().isoformat(),
+            "revision": git_revision(),
+            "config": {
+                "latency": options['latency'],
+                "jitter": options['jitter'],
+                "error_rate": options['error_rate'],
+                "errors": errors,
+                "recorded_pages": len(server.recordings) if server.recordings else 0,
+            },
+            "sources": sources,
+            "totals": {
+                "seconds": round(total_time, 3),
+                "articles": articles,
+                "articles_per_sec": round(articles / total_time, 2) if total_time else 0,
+                "requests": server.requests,
+                "bytes": server.bytes_sent,
+                "errors_injected": server.errors_injected,
+                "recorded_hits": server.recordings.hits if server.recordings else 0,
+                "peak_rss_mb": peak_rss_mb(),
+            },
+        }
+
+        self._print_table(result, previous, options['threshold'])
+        output = Path(options['output']) if options['output'] else RESULTS_DIR / f"{timezone.localtime():%Y%m%d-%H%M%S}.json"
+        output.parent.mkdir(parents=True, exist_ok=True)
+        output.write_text(json.dumps(result, indent=2, ensure_ascii=False), encoding='utf-8')
+        self.stdout.write(f"💾 Results written to {output}")
+
+    def _run_source(self, name, request, server, verbose):
+        requests_before, bytes_before = server.requests, server.bytes_sent
+        saved_before = AutoNewsArticle.objects.filter(created_by=request.user).count()
+        quiet = contextlib.nullcontext() if verbose else contextlib.redirect_stdout(io.StringIO())
+        status, error, data = 'error', '', {}
+        start = time.perf_counter()
+        with quiet:
+            try:
+                data = parse_result(SCRAPER_FUNCTIONS[name](request))
+                status = (data.get('metadata') or {}).get('status', 'success')
+            except Exception as e:
+                error = str(e)[:200]
+        seconds = time.perf_counter() - start
+        articles = len(data.get('articles') or []) if isinstance(data, dict) else 0
+        return {
+            "status": status,
+            "error": error,
+            "seconds": round(seconds, 3),
+            "articles": articles,
+            "articles_per_sec": round(articles / seconds, 2) if seconds else 0,
+            "requests": server.requests - requests_before,
+            "bytes": server.bytes_sent - bytes_before,
+            "saved": AutoNewsArticle.objects.filter(created_by=request.user).count() - saved_before,
+            "peak_rss_mb": peak_rss_mb(),
+        }
+
+    def _previous_result(self, path):
+        if path:
+            path = Path(path)
+        else:
+            earlier = sorted(RESULTS_DIR.glob('*.json')) if RESULTS_DIR.exists() else []
+            path = earlier[-1] if earlier else None
+        if path is None:
+            return None
+        try:
+            return json.loads(path.read_text(encoding='utf-8'))
+        except (OSError, ValueError) as e:
+            raise CommandError(f"Cannot read {path}: {e}")
+
+    def _print_table(self, result, previous, threshold):
+        before = (previous or {}).get('sources', {})
+        self.stdout.write("")
+        self.stdout.write(f"{'source':<16}{'seconds':>9}{'articles':>10}{'art/sec':>9}{'requests':>10}{'KB':>8}{'RSS MB':>8}  status")
+        for name, row in result['sources'].items():
+            change = ''
+            old = before.get(name)
+            if old and old.get('seconds'):
+                delta = row['seconds'] / old['seconds'] - 1
+                change = f"  {delta:+.0%}"
+                if delta > threshold:
+                    change = self.style.WARNING(change + " regression")
+            rss = row['peak_rss_mb'] if row['peak_rss_mb'] is not None else '-'
+            self.stdout.write(
+                f"{name:<16}{row['seconds']:>9.2f}{row['articles']:>10}{row['articles_per_sec']:>9.1f}"
+                f"{row['requests']:>10}{row['bytes'] / 1024:>8.0f}{rss:>8}  {row['error'] or row['status']}{change}"
+            )
+        totals = result['totals']
+        self.stdout.write("")
+        self.stdout.write(f"Total time      : {totals['seconds']:.2f}s")
+        self.stdout.write(f"Articles        : {totals['articles']} ({totals['articles_per_sec']:.1f}/sec)")
+        self.stdout.write(f"Fixture requests: {totals['requests']} ({totals['bytes'] / 1024:.0f} KB, "
+                          f"{totals['errors_injected']} injected errors, {totals['recorded_hits']} recorded pages)")
+        self.stdout.write(f"Peak RSS        : {totals['peak_rss_mb'] or '-'} MB")
+        if previous:
+            old = previous['totals']
+            self.stdout.write(
+                f"Previous run    : {old['seconds']:.2f}s, {old['articles_per_sec']:.1f} articles/sec "
+                f"({previous.get('revision') or '?'} at {previous['created_at'][:16]})"
+            )
+            if old['seconds'] and totals['seconds'] / old['seconds'] - 1 > threshold:
+                self.stdout.write(self.style.WARNING(f"⚠️ Total time regressed more than {threshold:.0%}"))
@@ -0,0 +1,76 @@
+import random
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from collect.models import AutoNewsArticle
+from utils.sentiment import fast_scorer, load_models
+
+EXTRA_WORDS = ["❤️", "👍", "🙏", "!!!", "नेपाल", "Nepal", "sir", "jai", "हो", "छ", "123", "—", "।"]
+
+
+class Command(BaseCommand):
+    help = "Check the fast linear sentiment path against model.predict and time both"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--samples', type=int, default=20000, help="Held-out texts to compare")
+        parser.add_argument('--single', type=int, default=2000, help="Texts timed one predict call each")
+        parser.add_argument('--seed', type=int, default=1)
+
+    def handle(self, *args, **options):
+        model, vectorizer = load_models()
+        scorer = fast_scorer()
+        if scorer is None:
+            raise CommandError(f"No fast path for {type(model).__name__} + {type(vectorizer).__name__} "
+                               f"(or SENTIMENT_FAST_PATH is off) - predictions use model.predict")
+
+        texts = self._sample(options['samples'], vectorizer, random.Random(options['seed']))
+        self.stdout.write(f"🧠 {type(model).__name__}: {scorer.weights.shape[0]} features x "
+                          f"{len(scorer.classes)} classes, {len(texts)} held-out texts")
+
+        expected = model.predict(vectorizer.transform(texts))
+        got = scorer.predict(texts)
+        mismatches = [i for i, (a, b) in enumerate(zip(expected, got)) if a != b]
+        single = texts[:options['single']]
+        mismatches += [i for i, text in enumerate(single) if scorer.predict([text])[0] != expected[i]]
+        if mismatches:
+            self.stdout.write(self.style.ERROR(f"   ❌ {len(mismatches)} prediction(s) differ"))
+            for i in mismatches[:5]:
+                self.stdout.write(f"      {texts[i][:60]!r}: model {expected[i]}, fast {got[i]}")
+        else:
+            self.stdout.write(self.style.SUCCESS("   ✅ identical predictions"))
+
+        sklearn_single = self._measure(lambda: [model.predict(vectorizer.transform([text])) for text in single])
+        fast_single = self._measure(lambda: [scorer.predict([text]) for text in single])
+        sklearn_batch = self._measure(lambda: model.predict(vectorizer.transform(texts)))
+        fast_batch = self._measure(lambda: scorer.predict(texts))
+        self.stdout.write(f"{'':>8}{'sklearn':>12}{'fast':>12}{'speedup':>9}")
+        self.stdout.write(f"{'single':>8}{sklearn_single / len(single) * 1e6:>10.0f}us{fast_single / len(single) * 1e6:>10.0f}us"
+                          f"{sklearn_single / fast_single:>8.1f}x")
+        self.stdout.write(f"{'batch':>8}{len(texts) / sklearn_batch:>9.0f}/s{len(texts) / fast_batch:>10.0f}/s"
+                          f"{sklearn_batch / fast_batch:>8.1f}x")
+
+    def _measure(self, function, rounds=3):
+        best = None
+        for _ in range(rounds):
+            start = time.perf_counter()
+            function()
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        return best
+
+    def _sample(self, size, vectorizer, rng):
+        # Stored headlines and summaries were never seen in training; top up with
+        # comment-like texts mixing model vocabulary, unknown words and emoji
+        texts = []
+        for title, summary in AutoNewsArticle.objects.order_by('-id').values_list('title', 'summary')[:size // 2]:
+            texts.append(title)
+            if summary:
+                texts.append(summary)
+        vocabulary = list(vectorizer.vocabulary_) + EXTRA_WORDS
+        while len(texts) < size:
+            words = [rng.choice(vocabulary) for _ in range(rng.randint(1, 25))]
+            if rng.random() < 0.3:
+                words = [word.upper() for word in words]
+            texts.append(rng.choice([" ", "  ", ", ", "\n"]).join(words))
+        return texts[:size]
@@ -0,0 +1,50 @@
+from collections import defaultdict
+
+from django.core.management.base import BaseCommand
+
+from collect.models import DangerousKeyword
+from utils.keyword_matcher import bump_keyword_version
+from utils.text_normalize import normalize_keyword
+
+
+class Command(BaseCommand):
+    help = "Recompute DangerousKeyword.normalized_word and list keywords that are spelling variants of each other"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--deactivate', action='store_true',
+                            help="Deactivate the variants, keeping the oldest keyword of each group active")
+
+    def handle(self, *args, **options):
+        # After a change to the folding tables in utils/text_normalize.py the stored forms are stale
+        keywords = list(DangerousKeyword.objects.order_by('created_at', 'pk'))
+        changed = []
+        for keyword in keywords:
+            normalized = normalize_keyword(keyword.word)
+            if keyword.normalized_word != normalized:
+                keyword.normalized_word = normalized
+                changed.append(keyword)
+        DangerousKeyword.objects.bulk_update(changed, ['normalized_word'], batch_size=500)
+        self.stdout.write(f"🔤 {len(keywords)} keyword(s), {len(changed)} normalized form(s) updated")
+
+        groups = defaultdict(list)
+        for keyword in keywords:
+            if keyword.is_active:
+                groups[(keyword.normalized_word, keyword.category, keyword.created_by_id)].append(keyword)
+        variants = {key: group for key, group in groups.items() if len(group) > 1}
+        if not variants:
+            self.stdout.write("✅ No duplicate spellings")
+            return
+
+        redundant = []
+        for (normalized, category, _), group in variants.items():
+            kept, *rest = group
+            redundant.extend(rest)
+            self.stdout.write(f"  [{category}] {normalized}: keeps '{kept.word}', "
+                              f"also {', '.join(repr(keyword.word) for keyword in rest)}")
+        if options['deactivate']:
+            DangerousKeyword.objects.filter(pk__in=[keyword.pk for keyword in redundant]).update(is_active=False)
+            bump_keyword_version()  # update() sends no post_save
+            self.stdout.write(f"🧹 {len(redundant)} variant keyword(s) deactivated")
+        else:
+            self.stdout.write(f"⚠️ {len(redundant)} variant keyword(s) match nothing their group's first keyword "
+                              f"does not - run with --deactivate to switch them off")
@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand
+
+from collect.scrapers import page_cache
+
+
+class Command(BaseCommand):
+    help = "Show, prune or clear the raw page cache used by the scrapers"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--prune', action='store_true', help="Evict expired and least recently used pages")
+        parser.add_argument('--clear', action='store_true', help="Remove every cached page")
+
+    def handle(self, *args, **options):
+        if options['clear']:
+            self.stdout.write(f"🗑️ Removed {page_cache.clear()} cached pages")
+        elif options['prune']:
+            self.stdout.write(f"🧹 Evicted {page_cache.prune()} cached pages")
+
+        stats = page_cache.cache_stats()
+        self.stdout.write(f"Directory       : {page_cache.CACHE_DIR}")
+        self.stdout.write(f"Pages           : {stats['pages']} ({stats['blobs']} distinct bodies)")
+        self.stdout.write(f"Compressed size : {stats['compressed_bytes'] / 1024 / 1024:.1f} MB of {page_cache.MAX_BYTES / 1024 / 1024:.0f} MB")
+        self.stdout.write(f"TTL             : {page_cache.TTL / 3600:.0f} h")
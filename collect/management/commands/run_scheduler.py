@@ -0,0 +1,69 @@
+import signal
+import threading
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from collect.models import SourceSchedule, User
+from collect.scrapers import scheduler
+from collect.scrapers.sources import SCRAPER_FUNCTIONS, resolve_sources
+
+
+class Command(BaseCommand):
+    help = "Queue due sources for the run_workers processes, each at its own yield-adapted interval"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--user', help="Create the missing schedules of this user (for --source)")
+        parser.add_argument('--source', default='all', help="Comma separated source names or 'all' (with --user)")
+        parser.add_argument('--tick', type=float, default=30, help="Seconds between two checks for due sources")
+        parser.add_argument('--max-active', type=int, default=scheduler.MAX_ACTIVE,
+                            help="Scheduled jobs allowed to be queued or running at once")
+        parser.add_argument('--once', action='store_true', help="Check once and exit (e.g. from cron)")
+        parser.add_argument('--list', action='store_true', help="Show the schedules and exit")
+
+    def handle(self, *args, **options):
+        if options['user']:
+            user = User.objects.filter(username=options['user']).first()
+            if user is None:
+                raise CommandError(f"Unknown user '{options['user']}'")
+            names = []
+            for name in options['source'].split(','):
+                resolved = resolve_sources(name.strip())
+                if resolved is None:
+                    raise CommandError(f"Unknown source '{name}'. Available: {', '.join(SCRAPER_FUNCTIONS)}")
+                names.extend(n for n in resolved if n not in names)
+            created = scheduler.ensure_schedules(user, names)
+            self.stdout.write(f"🗓️ {created} new schedule(s) for {user.username}")
+
+        if options['list']:
+            self.list_schedules()
+            return
+
+        if not SourceSchedule.objects.filter(enabled=True).exists():
+            raise CommandError("No enabled schedules - create them with --user USERNAME")
+
+        stop = threading.Event()
+        signal.signal(signal.SIGTERM, lambda signum, frame: stop.set())
+        self.stdout.write(f"🗓️ Scheduler running (max {options['max_active']} active jobs) - start `run_workers` to execute them")
+        try:
+            while not stop.is_set():
+                for schedule, job in scheduler.tick(max_active=options['max_active']):
+                    self.stdout.write(f"📥 {timezone.localtime():%H:%M:%S} {schedule.source} -> job #{job.pk}")
+                if options['once']:
+                    break
+                stop.wait(options['tick'])
+        except KeyboardInterrupt:
+            pass
+
+    def list_schedules(self):
+        now = timezone.now()
+        self.stdout.write(f"{'source':<16}{'user':<14}{'interval':>9}{'range':>14}{'new/h':>8}{'runs':>6}{'last':>7}  next run")
+        for schedule in SourceSchedule.objects.select_related('created_by').order_by('next_run_at'):
+            username = schedule.created_by.username if schedule.created_by else '-'
+            due_in = (schedule.next_run_at - now).total_seconds() / 60
+            self.stdout.write(
+                f"{schedule.source:<16}{username[:13]:<14}{schedule.interval // 60:>7}m"
+                f"{f'{schedule.min_interval // 60}-{schedule.max_interval // 60}m':>14}{schedule.yield_rate:>8.2f}"
+                f"{schedule.runs:>6}{schedule.last_new:>4}/{schedule.last_found:<2}"
+                f"  {'due' if due_in <= 0 else f'in {due_in:.0f}m'}{'' if schedule.enabled else ' (disabled)'}"
+            )
@@ -0,0 +1,78 @@
+import multiprocessing
+import signal
+import threading
+
+from django.core.management.base import BaseCommand
+from django.db import connections
+from django.db.models import Count
+
+from collect.models import ScrapeJob
+from collect.scrapers import jobs
+
+
+class Command(BaseCommand):
+    help = "Run background scrape jobs queued by the views (N worker processes, SQLite leases)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--processes', type=int, default=1, help="Worker processes to run")
+        parser.add_argument('--once', action='store_true', help="Exit once the queue is empty")
+        parser.add_argument('--poll', type=float, default=jobs.POLL_INTERVAL, help="Seconds between queue polls when idle")
+        parser.add_argument('--status', action='store_true', help="Show the queue and exit")
+
+    def handle(self, *args, **options):
+        if options['status']:
+            counts = dict(ScrapeJob.objects.values_list('state').annotate(n=Count('pk')))
+            for state, _ in ScrapeJob.STATE_CHOICES:
+                self.stdout.write(f"{state:<8}: {counts.get(state, 0)}")
+            for job in ScrapeJob.objects.filter(state__in=jobs.ACTIVE_STATES).order_by('created_at')[:20]:
+                self.stdout.write(f"  #{job.pk} {job.kind} {job.payload} {job.state} {job.worker}")
+            return
+
+        stop = threading.Event()
+        signal.signal(signal.SIGTERM, lambda signum, frame: stop.set())
+
+        if options['processes'] <= 1:
+            self.stdout.write(f"🛠️ Worker {jobs.worker_name()} waiting for jobs...")
+            try:
+                processed = jobs.work(once=options['once'], poll=options['poll'], stop=stop)
+            except KeyboardInterrupt:
+                return
+            self.stdout.write(f"✅ {processed} job(s) processed")
+            return
+
+        # Children open their own DB connections
+        connections.close_all()
+        children = {}
+
+        def spawn(index):
+            name = f"{jobs.worker_name()}-{index}"
+            process = multiprocessing.Process(
+                target=jobs.worker_process, args=(name, options['once'], options['poll']), name=name
+            )
+            process.start()
+            children[index] = process
+
+        for index in range(options['processes']):
+            spawn(index)
+        self.stdout.write(f"🛠️ Started {len(children)} worker processes")
+
+        try:
+            while children and not stop.is_set():
+                for index, process in list(children.items()):
+                    process.join(timeout=0.5)
+                    if process.is_alive():
+                        continue
+                    del children[index]
+                    if process.exitcode and not options['once']:
+                        self.stdout.write(f"⚠️ Worker {process.name} exited with {process.exitcode} - restarting")
+                        spawn(index)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            # SIGTERM lets every child finish its current job
+            for process in children.values():
+                if process.is_alive():
+                    process.terminate()
+            for process in children.values():
+                process.join()
+        self.stdout.write("✅ Workers stopped")
@@ -0,0 +1,64 @@
+import os
+import time
+
+from django.core.management.base import BaseCommand
+from django.db.models import Q
+
+from collect.models import AutoNewsArticle
+from collect.scrapers.feeds import source_keyword_scope
+from collect.scrapers.ingest import SCORE_FIELDS
+from utils.danger import article_text, danger_matcher, danger_score
+from utils.sentiment import flush_cache, predict_sentiments, shutdown_pool
+
+
+class Command(BaseCommand):
+    help = "Backfill AutoNewsArticle sentiment / danger_score in chunks, sentiment spread over worker processes"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk', type=int, default=2000, help="Rows read, scored and written per batch")
+        parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help="Sentiment worker processes")
+        parser.add_argument('--all', action='store_true', help="Rescore every article, not only the unscored ones")
+
+    def handle(self, *args, **options):
+        articles = AutoNewsArticle.objects.all()
+        if not options['all']:
+            articles = articles.filter(Q(sentiment__isnull=True) | Q(danger_score__isnull=True))
+        total = articles.count()
+        self.stdout.write(f"📰 {total} article(s) to score ({options['workers']} worker(s), chunks of {options['chunk']})")
+
+        start = time.time()
+        scored = 0
+        last_pk = 0
+        try:
+            while True:
+                # Keyset pages: SQLite doesn't isolate a running SELECT from the UPDATEs of the
+                # same connection, so the rows being rewritten are never read through one cursor
+                page = list(
+                    articles.filter(pk__gt=last_pk).order_by('pk')
+                    .only('pk', 'title', 'summary', 'source', 'created_by_id')[:options['chunk']]
+                    .iterator(chunk_size=options['chunk'])
+                )
+                if not page:
+                    break
+                last_pk = page[-1].pk
+                self._score(page, options['workers'])
+                AutoNewsArticle.objects.bulk_update(page, SCORE_FIELDS, batch_size=500)
+                scored += len(page)
+                elapsed = time.time() - start
+                self.stdout.write(f"   ✅ {scored}/{total} ({scored / max(elapsed, 1e-9):.0f} articles/s)")
+        finally:
+            flush_cache()
+            shutdown_pool()
+        self.stdout.write(f"🏁 Scored {scored} article(s) in {time.time() - start:.1f}s")
+
+    def _score(self, page, workers):
+        texts = [article_text(article.title, article.summary) for article in page]
+        # Danger scores use the keywords the article was matched with at ingest:
+        # its owner's, or everyone's for the feeds whose spec says "all"
+        matchers = {}
+        for article, text, sentiment in zip(page, texts, predict_sentiments(texts, workers)):
+            owner = article.created_by_id if source_keyword_scope(article.source) == "user" else None
+            if owner not in matchers:
+                matchers[owner] = danger_matcher(owner)
+            article.sentiment = sentiment
+            article.danger_score = danger_score(text, matchers[owner])
@@ -0,0 +1,96 @@
+import json
+import os
+import random
+import time
+from collections import Counter
+
+from django.core.management.base import BaseCommand, CommandError
+from django.test import override_settings
+
+from collect.views import read_comments, score_comments
+from utils.sentiment import POOL_MIN_TEXTS, load_models, predict_parallel, shutdown_pool
+
+SENTIMENT_NAMES = {0: 'negative', 1: 'positive', 2: 'neutral'}
+FILLER_WORDS = ["❤️", "👍", "🙏", "!!!", "jai", "sir", "हो", "छ", "ले", "को"]
+
+
+class Command(BaseCommand):
+    help = "Score a comment file offline (the commentAnalyze upload formats), sentiment spread over worker processes"
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help="JSON or copied-text comment file")
+        parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help="Sentiment worker processes")
+        parser.add_argument('--output', help="Write the scored comments here, one JSON object per line")
+        parser.add_argument('--bench', metavar='WORKERS', help="Time sentiment alone with these worker counts, e.g. 1,2,4,8")
+        parser.add_argument('--rounds', type=int, default=3)
+        parser.add_argument('--generate', type=int, metavar='N', help="Write N synthetic comments to path first")
+
+    def handle(self, *args, **options):
+        path = options['path']
+        if options['generate']:
+            self._generate(path, options['generate'])
+        try:
+            with open(path, encoding='utf-8') as f:
+                comments = read_comments(f.read())
+        except OSError as e:
+            raise CommandError(f"Cannot read {path}: {e}")
+        self.stdout.write(f"💬 {len(comments)} comments in {path}")
+
+        if options['bench']:
+            try:
+                worker_counts = [int(count) for count in options['bench'].split(',')]
+            except ValueError:
+                raise CommandError("--bench must be comma separated worker counts")
+            self._bench([comment['comment'] for comment in comments], worker_counts, options['rounds'])
+            return
+
+        start = time.perf_counter()
+        with override_settings(SENTIMENT_WORKERS=options['workers']):
+            scores = score_comments([comment['comment'] for comment in comments])
+        elapsed = time.perf_counter() - start
+        shutdown_pool()
+
+        sentiments = Counter(SENTIMENT_NAMES.get(score['sentiment'], 'neutral') for score in scores)
+        dangerous = sum(1 for score in scores if score['is_dangerous'])
+        self.stdout.write(f"✅ Scored in {elapsed:.2f}s ({len(scores) / max(elapsed, 1e-9):.0f} comments/s, "
+                          f"{options['workers']} worker(s))")
+        self.stdout.write(f"   😊 {sentiments['positive']} positive, 😐 {sentiments['neutral']} neutral, "
+                          f"😠 {sentiments['negative']} negative")
+        self.stdout.write(f"   🚨 {dangerous} dangerous")
+
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8') as f:
+                for comment, score in zip(comments, scores):
+                    f.write(json.dumps({**comment, **score}, ensure_ascii=False, default=str) + "\n")
+            self.stdout.write(f"📝 Written to {options['output']}")
+
+    def _bench(self, texts, worker_counts, rounds):
+        # The prediction cache is bypassed: every round scores every comment
+        self.stdout.write(f"🖥️ {os.cpu_count()} CPU(s)\n")
+        self.stdout.write(f"{'workers':>8}{'seconds':>10}{'comments/s':>12}{'speedup':>9}")
+        baseline = None
+        for workers in worker_counts:
+            shutdown_pool()
+            # Start the workers (and load the model in each) before timing
+            predict_parallel(texts[:max(POOL_MIN_TEXTS, 1000) * max(workers, 1)], workers)
+            best = None
+            for _ in range(rounds):
+                start = time.perf_counter()
+                predict_parallel(texts, workers)
+                elapsed = time.perf_counter() - start
+                best = elapsed if best is None else min(best, elapsed)
+            baseline = baseline or best
+            self.stdout.write(f"{workers:>8}{best:>10.2f}{len(texts) / best:>12.0f}{baseline / best:>8.1f}x")
+        shutdown_pool()
+
+    def _generate(self, path, size):
+        rng = random.Random(size)
+        vocabulary = list(load_models()[1].vocabulary_) + FILLER_WORDS
+        comments = [
+            {'commenter': f"user{rng.randint(1, size // 10 + 1)}",
+             'text': " ".join(rng.choice(vocabulary) for _ in range(rng.randint(3, 40)))}
+            for _ in range(size)
+        ]
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(comments, f, ensure_ascii=False)
+        self.stdout.write(f"🧪 Wrote {size} synthetic comments to {path}")
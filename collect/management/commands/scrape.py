@@ -0,0 +1,61 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from collect.models import User
+from collect.scrapers import page_cache
+from collect.scrapers.engine import SourceRequest, MAX_SOURCES
+from collect.scrapers.sources import SCRAPER_FUNCTIONS, resolve_sources, scrape_sources
+
+
+class Command(BaseCommand):
+    help = "Run keyboard_* sources for a user - live, or replayed from the page cache with --replay"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--user', required=True, help="Username the articles are saved for")
+        parser.add_argument('--source', default='all', help="Comma separated source names or 'all'")
+        parser.add_argument('--replay', action='store_true', help="Serve every page from the page cache (no network)")
+        parser.add_argument('--max-sources', type=int, default=MAX_SOURCES)
+
+    def handle(self, *args, **options):
+        try:
+            user = User.objects.get(username=options['user'])
+        except User.DoesNotExist:
+            raise CommandError(f"User '{options['user']}' does not exist")
+
+        names = []
+        for name in options['source'].split(','):
+            resolved = resolve_sources(name.strip())
+            if resolved is None:
+                raise CommandError(f"Unknown source '{name}'. Available: {', '.join(SCRAPER_FUNCTIONS)}")
+            names.extend(n for n in resolved if n not in names)
+
+        mode = "replay (page cache only)" if options['replay'] else "live"
+        self.stdout.write(f"⏳ Scraping {len(names)} source(s) for {user.username} - {mode}")
+        page_cache.set_replay(options['replay'])
+        start = time.time()
+        try:
+            results = scrape_sources(names, SourceRequest(user), max_sources=options['max_sources'])
+        finally:
+            page_cache.set_replay(False)
+        elapsed = time.time() - start
+
+        self.stdout.write("")
+        self.stdout.write(f"{'source':<16}{'seconds':>10}{'matched':>9}{'saved':>7}  status")
+        for name in names:
+            result = results[name]
+            metadata = (result['data'] or {}).get('metadata', {})
+            saved = metadata.get('database_save', {})
+            status = result['error'] or metadata.get('status', '?')
+            self.stdout.write(
+                f"{name:<16}{result['elapsed']:>10.2f}{metadata.get('articles_with_keywords', 0):>9}"
+                f"{saved.get('new_articles_saved', 0):>7}  {status}"
+            )
+
+        stats = page_cache.cache_stats()
+        self.stdout.write("")
+        self.stdout.write(f"Total           : {elapsed:.2f}s")
+        if options['replay']:
+            self.stdout.write(f"Page cache      : {stats['replayed']} replayed, {stats['replay_misses']} not cached")
+        else:
+            self.stdout.write(f"Page cache      : {stats['stored']} pages stored ({stats['pages']} cached, {stats['compressed_bytes'] / 1024 / 1024:.1f} MB)")
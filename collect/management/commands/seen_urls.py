@@ -0,0 +1,42 @@
+from collect.models import User
+from django.core.management.base import BaseCommand, CommandError
+
+from collect.scrapers import seen_urls
+
+
+class Command(BaseCommand):
+    help = "Show or rebuild the Bloom-filter seen-sets of saved article URLs"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--user', help="Username whose seen-set to use; every article if omitted")
+        parser.add_argument('--rebuild', action='store_true', help="Rebuild the filter from the database")
+        parser.add_argument('--check', nargs='*', default=[], metavar='URL', help="Look URLs up through the filter")
+
+    def handle(self, *args, **options):
+        user = None
+        if options['user']:
+            user = User.objects.filter(username=options['user']).first()
+            if user is None:
+                raise CommandError(f"Unknown user '{options['user']}'")
+
+        seen = seen_urls.get_filter(user)
+        if options['rebuild']:
+            seen.rebuild()
+        else:
+            added = seen.sync(force=True)
+            if added:
+                self.stdout.write(f"➕ Added {added} URLs saved since the last sync")
+
+        if options['check']:
+            existing = seen.existing(options['check'])
+            for url in options['check']:
+                self.stdout.write(f"{'✅ saved' if url in existing else '➖ new  '}  {url}")
+
+        stats = seen.stats()
+        self.stdout.write(f"Scope           : {stats['scope']} ({seen.path})")
+        self.stdout.write(f"URLs            : {stats['items']} of {stats['capacity']} capacity")
+        self.stdout.write(f"Size            : {stats['size_bytes'] / 1024:.0f} KB, {stats['hashes']} hashes, {stats['fill_ratio']:.1%} bits set")
+        self.stdout.write(f"False positives : {stats['expected_fp_rate']:.4%} expected"
+                          f" | {stats['false_positives']}/{stats['positives']} observed")
+        self.stdout.write(f"Lookups         : {stats['lookups']} ({stats['negatives']} answered without a query)")
+        self.stdout.write(f"Rebuilt at      : {stats['rebuilt_at']}")
@@ -0,0 +1,51 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from collect.models import SourceHealth
+from collect.scrapers import health
+
+
+class Command(BaseCommand):
+    help = "Show the circuit breakers and health scores of scraped hosts and sources"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--kind', choices=['host', 'source'], help="Only show hosts or sources")
+        parser.add_argument('--import-log', nargs='?', const=str(settings.BASE_DIR / 'down_sites.log'),
+                            help="Feed the site-monitor events of down_sites.log (or this file) into the breakers")
+        parser.add_argument('--probe', action='store_true', help="Probe the open hosts whose cooldown is over now")
+        parser.add_argument('--reset', metavar='NAME', help="Close the breaker(s) of this host or source")
+
+    def handle(self, *args, **options):
+        if options['reset']:
+            closed = SourceHealth.objects.filter(name=options['reset']).update(
+                state='closed', open_until=None, cooldown=0, consecutive_failures=0, updated_at=timezone.now()
+            )
+            if not closed:
+                raise CommandError(f"No breaker named '{options['reset']}'")
+            self.stdout.write(f"✅ {options['reset']}: closed")
+
+        health.load()
+        if options['import_log']:
+            try:
+                imported = health.import_monitor_log(options['import_log'])
+            except OSError as e:
+                raise CommandError(f"Cannot read {options['import_log']}: {e}")
+            self.stdout.write(f"📥 {imported} monitor event(s) imported")
+        if options['probe']:
+            self.stdout.write(f"🔍 {health.probe_due()} host(s) probed")
+
+        rows = health.health_stats(options['kind'])
+        if not rows:
+            self.stdout.write("No health data yet")
+            return
+        self.stdout.write(f"{'kind':<7}{'name':<32}{'state':<10}{'score':>6}{'errors':>8}{'latency':>9}{'reqs':>7}{'trips':>6}  last error")
+        for row in rows:
+            latency = f"{row['latency_ms']}ms" if row['latency_ms'] is not None else '-'
+            state = row['state']
+            if row['open_until'] and state == 'open':
+                state += f" {timezone.localtime(row['open_until']):%H:%M}"
+            self.stdout.write(
+                f"{row['kind']:<7}{row['name'][:31]:<32}{state:<10}{row['score']:>6}{row['error_rate']:>8.0%}"
+                f"{latency:>9}{row['requests']:>7}{row['trips']:>6}  {row['last_error'][:40]}"
+            )
@@ -0,0 +1,35 @@
+# Generated by Django 4.2.16 on 2026-10-18 12:47
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('collect', '0002_website'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FeedValidator',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('feed_url', models.URLField(max_length=500)),
+                ('etag', models.CharField(blank=True, max_length=255)),
+                ('last_modified', models.CharField(blank=True, max_length=100)),
+                ('body_hash', models.CharField(blank=True, max_length=64)),
+                ('keyword_fingerprint', models.CharField(blank=True, max_length=100)),
+                ('hits', models.PositiveIntegerField(default=0)),
+                ('misses', models.PositiveIntegerField(default=0)),
+                ('checked_at', models.DateTimeField(auto_now=True)),
+                ('created_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='feed_validators', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Feed Validator',
+                'verbose_name_plural': 'Feed Validators',
+                'unique_together': {('feed_url', 'created_by')},
+            },
+        ),
+    ]
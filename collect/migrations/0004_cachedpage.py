@@ -0,0 +1,30 @@
+# Generated by Django 4.2.16 on 2026-10-18 12:59
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('collect', '0003_feedvalidator'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CachedPage',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('url', models.URLField(help_text='Canonical URL', max_length=1000, unique=True)),
+                ('content_hash', models.CharField(db_index=True, max_length=64)),
+                ('status_code', models.PositiveSmallIntegerField(default=200)),
+                ('content_type', models.CharField(blank=True, max_length=255)),
+                ('size', models.PositiveIntegerField(default=0, help_text='Compressed size in bytes')),
+                ('fetched_at', models.DateTimeField(db_index=True)),
+                ('last_used', models.DateTimeField(db_index=True)),
+            ],
+            options={
+                'verbose_name': 'Cached Page',
+                'verbose_name_plural': 'Cached Pages',
+            },
+        ),
+    ]
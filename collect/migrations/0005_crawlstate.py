@@ -0,0 +1,37 @@
+# Generated by Django 4.2.16 on 2026-10-18 13:08
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('collect', '0004_cachedpage'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CrawlState',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('source', models.CharField(max_length=100)),
+                ('key', models.CharField(blank=True, help_text='Listing page or feed URL within the source', max_length=500)),
+                ('last_guid', models.CharField(blank=True, max_length=1000)),
+                ('last_published', models.DateTimeField(blank=True, null=True)),
+                ('listing_fingerprint', models.CharField(blank=True, max_length=64)),
+                ('seen_items', models.TextField(blank=True, default='[]')),
+                ('keyword_fingerprint', models.CharField(blank=True, max_length=100)),
+                ('runs', models.PositiveIntegerField(default=0)),
+                ('items_skipped', models.PositiveIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('created_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='crawl_states', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Crawl State',
+                'verbose_name_plural': 'Crawl States',
+                'unique_together': {('source', 'key', 'created_by')},
+            },
+        ),
+    ]
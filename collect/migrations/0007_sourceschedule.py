@@ -0,0 +1,47 @@
+# Generated by Django 4.2.16 on 2026-10-18 13:29
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('collect', '0006_scrapejob'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='scrapejob',
+            name='kind',
+            field=models.CharField(choices=[('keyboard_autofeed', 'Keyboard auto-feed'), ('news_autofeed', 'News auto-feed'), ('scheduled_scrape', 'Scheduled scrape')], max_length=50),
+        ),
+        migrations.CreateModel(
+            name='SourceSchedule',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('source', models.CharField(max_length=100)),
+                ('enabled', models.BooleanField(default=True)),
+                ('interval', models.PositiveIntegerField()),
+                ('min_interval', models.PositiveIntegerField()),
+                ('max_interval', models.PositiveIntegerField()),
+                ('next_run_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('yield_rate', models.FloatField(default=0.0)),
+                ('runs', models.PositiveIntegerField(default=0)),
+                ('last_run_at', models.DateTimeField(blank=True, null=True)),
+                ('last_status', models.CharField(blank=True, max_length=20)),
+                ('last_found', models.PositiveIntegerField(default=0)),
+                ('last_new', models.PositiveIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('created_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='source_schedules', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Source Schedule',
+                'verbose_name_plural': 'Source Schedules',
+                'ordering': ['next_run_at'],
+                'unique_together': {('source', 'created_by')},
+            },
+        ),
+    ]
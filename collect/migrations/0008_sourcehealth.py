@@ -0,0 +1,41 @@
+# Generated by Django 4.2.16 on 2026-10-18 13:31
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('collect', '0007_sourceschedule'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SourceHealth',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('host', 'Host'), ('source', 'Source')], max_length=10)),
+                ('name', models.CharField(help_text='Host name or source name', max_length=255)),
+                ('state', models.CharField(choices=[('closed', 'Closed'), ('open', 'Open'), ('half_open', 'Half-open')], default='closed', max_length=10)),
+                ('probe_url', models.CharField(blank=True, max_length=1000)),
+                ('error_rate', models.FloatField(default=0.0)),
+                ('latency_ms', models.FloatField(blank=True, null=True)),
+                ('consecutive_failures', models.PositiveIntegerField(default=0)),
+                ('requests', models.PositiveIntegerField(default=0)),
+                ('failures', models.PositiveIntegerField(default=0)),
+                ('trips', models.PositiveIntegerField(default=0)),
+                ('open_until', models.DateTimeField(blank=True, null=True)),
+                ('cooldown', models.PositiveIntegerField(default=0, help_text='Seconds of the current open period')),
+                ('last_error', models.CharField(blank=True, max_length=255)),
+                ('last_success_at', models.DateTimeField(blank=True, null=True)),
+                ('last_failure_at', models.DateTimeField(blank=True, null=True)),
+                ('updated_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+            options={
+                'verbose_name': 'Source Health',
+                'verbose_name_plural': 'Source Health',
+                'unique_together': {('kind', 'name')},
+            },
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 4.2.16 on 2026-10-18 13:51
+
+from django.db import migrations, models
+
+from utils.text_normalize import normalize_keyword
+
+
+def fill_normalized_word(apps, schema_editor):
+    DangerousKeyword = apps.get_model('collect', 'DangerousKeyword')
+    keywords = list(DangerousKeyword.objects.only('id', 'word'))
+    for keyword in keywords:
+        keyword.normalized_word = normalize_keyword(keyword.word)
+    DangerousKeyword.objects.bulk_update(keywords, ['normalized_word'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('collect', '0008_sourcehealth'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='dangerouskeyword',
+            name='normalized_word',
+            field=models.CharField(blank=True, db_index=True, editable=False, help_text='Word after utils.text_normalize folding - spelling variants share it', max_length=100),
+        ),
+        migrations.RunPython(fill_normalized_word, migrations.RunPython.noop),
+    ]
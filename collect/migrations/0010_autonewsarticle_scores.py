@@ -0,0 +1,23 @@
+# Generated by Django 4.2.16 on 2026-10-18 14:15
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('collect', '0009_dangerouskeyword_normalized_word'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='autonewsarticle',
+            name='danger_score',
+            field=models.PositiveSmallIntegerField(blank=True, db_index=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='autonewsarticle',
+            name='sentiment',
+            field=models.SmallIntegerField(blank=True, choices=[(0, 'Negative'), (1, 'Positive'), (2, 'Neutral')], db_index=True, null=True),
+        ),
+    ]
@@ -4,6 +4,7 @@ from django.contrib.auth.models import AbstractUser
 import datetime
 import os
 from uuid import uuid4
+from utils.text_normalize import normalize_keyword
 
 class User(AbstractUser):
     ROLE_CHOICES = [
@@ -360,6 +361,14 @@ class DangerousKeyword(models.Model):
         db_index=True,
         help_text="Category (e.g., Violence, Threats, Dehumanizing, etc.)"
     )
+
+    normalized_word = models.CharField(
+        max_length=100,
+        db_index=True,
+        blank=True,
+        editable=False,
+        help_text="Word after utils.text_normalize folding - spelling variants share it"
+    )
     
     # Provide default for existing rows
     created_at = models.DateTimeField(
@@ -398,6 +407,7 @@ class DangerousKeyword(models.Model):
     def save(self, *args, **kwargs):
         """Override save to normalize the word and category"""
         self.word = self.word.lower().strip()
+        self.normalized_word = normalize_keyword(self.word)
         self.category = self.category.strip()
         super().save(*args, **kwargs)    
 
@@ -417,6 +427,16 @@ class AutoNewsArticle(models.Model):
     threat_level = models.CharField(max_length=10, default='low')
     keywords = models.TextField(blank=True)
     categories = models.TextField(blank=True)
+
+    # Scored once at ingest (collect/scrapers/ingest.py) from title + summary;
+    # NULL until then - `manage.py score_articles` backfills older rows
+    SENTIMENT_CHOICES = [
+        (0, 'Negative'),
+        (1, 'Positive'),
+        (2, 'Neutral'),
+    ]
+    sentiment = models.SmallIntegerField(choices=SENTIMENT_CHOICES, null=True, blank=True, db_index=True)
+    danger_score = models.PositiveSmallIntegerField(null=True, blank=True, db_index=True)
     
     created_at = models.DateTimeField(auto_now_add=True)
     created_by = models.ForeignKey(
@@ -686,4 +706,211 @@ class Website(models.Model):
     is_active = models.BooleanField(default=True)
     
     def __str__(self):
-        return self.name
\ No newline at end of file
+        return self.name
+
+class FeedValidator(models.Model):
+    """HTTP validators of the last RSS feed fetch, used for conditional GETs"""
+    feed_url = models.URLField(max_length=500)
+    created_by = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name='feed_validators'
+    )
+    etag = models.CharField(max_length=255, blank=True)
+    last_modified = models.CharField(max_length=100, blank=True)
+    body_hash = models.CharField(max_length=64, blank=True)
+    # Keyword state the feed was last matched against - a keyword change forces a re-parse
+    keyword_fingerprint = models.CharField(max_length=100, blank=True)
+
+    hits = models.PositiveIntegerField(default=0)
+    misses = models.PositiveIntegerField(default=0)
+    checked_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = ['feed_url', 'created_by']
+        verbose_name = "Feed Validator"
+        verbose_name_plural = "Feed Validators"
+
+    def __str__(self):
+        return f"{self.feed_url} ({self.created_by}) hits={self.hits} misses={self.misses}"
+
+
+class CachedPage(models.Model):
+    """Index entry of the raw page cache - the body lives on disk under PAGE_CACHE_DIR/<content_hash>"""
+    url = models.URLField(max_length=1000, unique=True, help_text="Canonical URL")
+    content_hash = models.CharField(max_length=64, db_index=True)
+    status_code = models.PositiveSmallIntegerField(default=200)
+    content_type = models.CharField(max_length=255, blank=True)
+    size = models.PositiveIntegerField(default=0, help_text="Compressed size in bytes")
+    fetched_at = models.DateTimeField(db_index=True)
+    last_used = models.DateTimeField(db_index=True)
+
+    class Meta:
+        verbose_name = "Cached Page"
+        verbose_name_plural = "Cached Pages"
+
+    def __str__(self):
+        return f"{self.url} ({self.size} bytes, {self.fetched_at:%Y-%m-%d %H:%M})"
+
+
+class CrawlState(models.Model):
+    """High-water mark of a source (or one of its listing pages) so runs only touch new items"""
+    source = models.CharField(max_length=100)
+    key = models.CharField(max_length=500, blank=True, help_text="Listing page or feed URL within the source")
+    created_by = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name='crawl_states'
+    )
+    last_guid = models.CharField(max_length=1000, blank=True)
+    last_published = models.DateTimeField(null=True, blank=True)
+    listing_fingerprint = models.CharField(max_length=64, blank=True)
+    # JSON list of the most recent item URLs/GUIDs, newest first
+    seen_items = models.TextField(blank=True, default='[]')
+    keyword_fingerprint = models.CharField(max_length=100, blank=True)
+
+    runs = models.PositiveIntegerField(default=0)
+    items_skipped = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = ['source', 'key', 'created_by']
+        verbose_name = "Crawl State"
+        verbose_name_plural = "Crawl States"
+
+    def __str__(self):
+        return f"{self.source} {self.key} ({self.created_by}) runs={self.runs}"
+
+
+class ScrapeJob(models.Model):
+    """Scrape queued by a view and run by a `manage.py run_workers` process"""
+    KIND_CHOICES = [
+        ('keyboard_autofeed', 'Keyboard auto-feed'),
+        ('news_autofeed', 'News auto-feed'),
+        ('scheduled_scrape', 'Scheduled scrape'),
+    ]
+    STATE_CHOICES = [
+        ('queued', 'Queued'),
+        ('running', 'Running'),
+        ('done', 'Done'),
+        ('failed', 'Failed'),
+    ]
+
+    kind = models.CharField(max_length=50, choices=KIND_CHOICES)
+    # JSON arguments of the job handler
+    payload = models.TextField(blank=True, default='{}')
+    state = models.CharField(max_length=10, choices=STATE_CHOICES, default='queued')
+    created_by = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name='scrape_jobs'
+    )
+
+    attempts = models.PositiveIntegerField(default=0)
+    max_attempts = models.PositiveIntegerField(default=2)
+    worker = models.CharField(max_length=100, blank=True)
+    lease_until = models.DateTimeField(null=True, blank=True)
+
+    # JSON list of the latest progress messages and the number reported so far
+    progress = models.TextField(blank=True, default='[]')
+    events = models.PositiveIntegerField(default=0)
+    result = models.TextField(blank=True)
+    error = models.TextField(blank=True)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(default=timezone.now, db_index=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['-created_at']
+        indexes = [models.Index(fields=['state', 'created_at'])]
+        verbose_name = "Scrape Job"
+        verbose_name_plural = "Scrape Jobs"
+
+    def __str__(self):
+        return f"#{self.pk} {self.kind} ({self.state})"
+
+
+class SourceSchedule(models.Model):
+    """Polling schedule of one source for one user, adapted to its yield by `manage.py run_scheduler`"""
+    source = models.CharField(max_length=100)
+    created_by = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name='source_schedules'
+    )
+    enabled = models.BooleanField(default=True)
+
+    # Seconds between runs - interval moves between the bounds with the observed yield
+    interval = models.PositiveIntegerField()
+    min_interval = models.PositiveIntegerField()
+    max_interval = models.PositiveIntegerField()
+    next_run_at = models.DateTimeField(default=timezone.now)
+
+    # New keyword-matching articles per hour (moving average)
+    yield_rate = models.FloatField(default=0.0)
+    runs = models.PositiveIntegerField(default=0)
+    last_run_at = models.DateTimeField(null=True, blank=True)
+    last_status = models.CharField(max_length=20, blank=True)
+    last_found = models.PositiveIntegerField(default=0)
+    last_new = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = ['source', 'created_by']
+        ordering = ['next_run_at']
+        verbose_name = "Source Schedule"
+        verbose_name_plural = "Source Schedules"
+
+    def __str__(self):
+        return f"{self.source} ({self.created_by}) every {self.interval}s"
+
+
+class SourceHealth(models.Model):
+    """Circuit-breaker state and health of a scraped host or source (collect/scrapers/health.py)"""
+    KIND_CHOICES = [
+        ('host', 'Host'),
+        ('source', 'Source'),
+    ]
+    STATE_CHOICES = [
+        ('closed', 'Closed'),
+        ('open', 'Open'),
+        ('half_open', 'Half-open'),
+    ]
+
+    kind = models.CharField(max_length=10, choices=KIND_CHOICES)
+    name = models.CharField(max_length=255, help_text="Host name or source name")
+    state = models.CharField(max_length=10, choices=STATE_CHOICES, default='closed')
+    probe_url = models.CharField(max_length=1000, blank=True)
+
+    # Moving averages over recent outcomes
+    error_rate = models.FloatField(default=0.0)
+    latency_ms = models.FloatField(null=True, blank=True)
+    consecutive_failures = models.PositiveIntegerField(default=0)
+    requests = models.PositiveIntegerField(default=0)
+    failures = models.PositiveIntegerField(default=0)
+    trips = models.PositiveIntegerField(default=0)
+
+    open_until = models.DateTimeField(null=True, blank=True)
+    cooldown = models.PositiveIntegerField(default=0, help_text="Seconds of the current open period")
+    last_error = models.CharField(max_length=255, blank=True)
+    last_success_at = models.DateTimeField(null=True, blank=True)
+    last_failure_at = models.DateTimeField(null=True, blank=True)
+    updated_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        unique_together = ['kind', 'name']
+        verbose_name = "Source Health"
+        verbose_name_plural = "Source Health"
+
+    def __str__(self):
+        return f"{self.kind} {self.name} ({self.state})"
@@ -0,0 +1,320 @@
+"""
+Auto-feed pipelines run by the background job workers (see jobs.py).
+
+Both used to run inline in keyboard_AutoFeed / newsAutofeeding and hold the
+HTTP request for the whole scrape. They now take a report(message) callable
+for progress and return the JSON body the view used to send.
+"""
+import json
+from datetime import datetime
+
+from collect.scrapers.engine import SourceRequest
+from collect.scrapers.ingest import ingest_articles
+from collect.scrapers.kantipurdaily import kantipur_to_json
+from collect.scrapers.kathmandu_post import kathmandu_post_extractor
+from collect.scrapers.sources import SCRAPER_FUNCTIONS, resolve_sources, scrape_sources
+from collect.scrapers.techpana import techpana_to_json
+
+
+def scraper_saved(metadata):
+    """New articles a scraper saved on its own (kantipur/nagarik/kathmandupost, techpana and the feeds do)"""
+    if "saved_to_db" in metadata:
+        return metadata["saved_to_db"] or 0
+    return metadata.get("database_save", {}).get("new_articles_saved", 0)
+
+
+def keyboard_autofeed(user, source, report=print):
+    """Scrape one keyboard source (or 'all') for user and save the matches"""
+    report(f"Fetching started from { source}")
+
+    # Determine which sources to scrape
+    sources_to_scrape = resolve_sources(source)
+    if sources_to_scrape is None:
+        return {
+            "status": "error",
+            "message": f"Invalid source: {source}. Available: {', '.join(SCRAPER_FUNCTIONS.keys())}"
+        }
+
+    total_saved = 0
+    source_stats = {}
+
+    # Scrape all requested sources concurrently on the shared engine
+    report(f"📰 Fetching from {len(sources_to_scrape)} source(s)...")
+    results = scrape_sources(
+        sources_to_scrape,
+        SourceRequest(user),
+        on_done=lambda name, result: report(f"📥 {name} finished in {result['elapsed']}s"),
+    )
+
+    for source_name in sources_to_scrape:
+        try:
+            result = results[source_name]
+            if result['error']:
+                raise Exception(result['error'])
+            data = result['data']
+
+            # Check if scraping was successful
+            if data.get("metadata", {}).get("status") != "success":
+                report(f"❌ {source_name}: Scraping failed")
+                source_stats[source_name] = {"error": "Scraping failed"}
+                continue
+
+            articles = data.get("articles", [])
+
+            # Normalise every article, then write them in one batch (existing URLs are skipped)
+            records = []
+            for article in articles:
+                try:
+                    # Prepare keywords and categories
+                    keywords_list = article.get('keywords', [])
+                    if not keywords_list:
+                        # Try to get from threat_analysis for backward compatibility
+                        keywords_list = article.get('threat_analysis', {}).get('keywords_found', [])
+
+                    categories_list = article.get('categories', [])
+                    if not categories_list:
+                        # Try to get from threat_analysis for backward compatibility
+                        categories_list = article.get('threat_analysis', {}).get('categories', [])
+
+                    # Convert lists to comma-separated strings
+                    keywords_str = ','.join(keywords_list) if isinstance(keywords_list, list) else str(keywords_list)
+                    categories_str = ','.join(categories_list) if isinstance(categories_list, list) else str(categories_list)
+
+                    # Determine threat level and priority
+                    threat_level = article.get('threat_analysis', {}).get('level', 'low')
+                    priority = 'medium'
+                    if threat_level == 'high':
+                        priority = 'high'
+                    elif threat_level == 'low':
+                        priority = 'low'
+
+                    records.append({
+                        'title': article['title'][:200],
+                        'summary': article.get('summary', article.get('content', '')[:300])[:500],
+                        'url': article['url'],
+                        'image_url': (article.get('image_url') or '')[:500],
+                        'source': source_name,  # Use actual source name
+                        'date': article.get('date', datetime.now().strftime('%Y-%m-%d')),
+                        'keywords': keywords_str[:200],
+                        'categories': categories_str[:200],
+                        'threat_level': threat_level,
+                        'priority': priority,
+                        'content_length': len(article.get('content', '')),
+                    })
+                except Exception as e:
+                    # Skip article if error
+                    continue
+
+            result = ingest_articles(records, user, update_existing=False)
+            saved_from_source = result['saved']
+            total_saved += saved_from_source
+
+            source_stats[source_name] = {
+                "total_found": len(articles),
+                "saved": saved_from_source,
+                "duplicates": result['duplicates'],
+                # New articles whether the scraper saved them itself or they were saved above
+                "new": saved_from_source + scraper_saved(data.get("metadata", {})),
+                "status": "success"
+            }
+
+            report(f"✅ {source_name}: Saved {saved_from_source}/{len(articles)} articles")
+
+        except Exception as e:
+            report(f"❌ {source_name} error: {str(e)[:50]}")
+            source_stats[source_name] = {
+                "error": str(e)[:100],
+                "status": "failed"
+            }
+            continue
+
+    # Final summary
+    report(f"💾 Total saved: {total_saved} articles")
+
+    for source_name, stats in source_stats.items():
+        if stats.get('status') == 'success':
+            report(f"   📰 {source_name}: {stats.get('saved', 0)} saved")
+        else:
+            report(f"   ❌ {source_name}: Failed - {stats.get('error', 'Unknown error')}")
+
+    report("=" * 40)
+
+    return {
+        "status": "success",
+        "message": f"Auto-feed completed. Saved {total_saved} articles.",
+        "saved_count": total_saved,
+        "source_stats": source_stats,
+        "user": user.username
+    }
+
+
+def news_autofeed(report=print):
+    """Fetch the legacy Kantipur / Techpana / Kathmandu Post scrapers and save them without a user"""
+    all_articles = []
+
+    # Source 1: Kantipur News
+    try:
+        json_data = kantipur_to_json()
+        data = json.loads(json_data)
+        if data["metadata"]["status"] == "success":
+            for article in data["articles"]:
+                article["source"] = "kantipur"  # Ensure source is set
+                all_articles.append(article)
+            report(f"✅ Fetched {len(data['articles'])} articles from Kantipur")
+        else:
+            report(f"❌ Kantipur scraping failed: {data['metadata'].get('error', 'Unknown error')}")
+    except Exception as e:
+        report(f"❌ Error fetching Kantipur news: {e}")
+
+    # Source 2: Techpana News
+    try:
+        # Call the Techpana function directly - it returns JSON string
+        json_data = techpana_to_json()
+        data = json.loads(json_data)
+
+        if data["metadata"]["status"] == "success":
+            for article in data["articles"]:
+                article["source"] = "techpana"  # Ensure source is set
+                all_articles.append(article)
+            report(f"✅ Fetched {len(data['articles'])} articles from Techpana")
+
+            # Print some statistics if available - UPDATED FIELD NAMES
+            if "new_articles_added" in data["metadata"]:
+                report(f"📊 Techpana Stats: {data['metadata']['new_articles_added']} new articles")
+            if "total_articles_found" in data["metadata"]:
+                report(f"📊 Techpana Total Found: {data['metadata']['total_articles_found']} articles on homepage")
+            if "articles_skipped_no_keywords" in data["metadata"]:
+                report(f"📊 Techpana Skipped (no keywords): {data['metadata']['articles_skipped_no_keywords']} articles")
+            if "articles_skipped_old" in data["metadata"]:
+                report(f"📊 Techpana Skipped (old): {data['metadata']['articles_skipped_old']} articles")
+
+            # Content statistics
+            if "content_statistics" in data["metadata"]:
+                content_stats = data["metadata"]["content_statistics"]
+                report(f"📝 Techpana Content Stats:")
+                report(f"   - With full content: {content_stats.get('articles_with_full_content', 0)}")
+                report(f"   - Preview only: {content_stats.get('articles_with_preview_only', 0)}")
+                report(f"   - Avg summary length: {content_stats.get('average_summary_length', 0)} chars")
+                report(f"   - Adequate content: {content_stats.get('articles_with_adequate_content', 0)}")
+
+        else:
+            report(f"❌ Techpana scraping failed: {data['metadata'].get('error', 'Unknown error')}")
+    except Exception as e:
+        report(f"❌ Error fetching Techpana news: {e}")
+        import traceback
+        print(f"❌ Techpana error details: {traceback.format_exc()}")
+
+    # Source 3: Kathmandu Post News
+    try:
+        kathmandu_articles = kathmandu_post_extractor()
+        for article in kathmandu_articles:
+            # Convert Kathmandu Post format to match Kantipur format
+            converted_article = {
+                "id": len(all_articles) + 1,
+                "title": article["title"],
+                "summary": article["summary"],
+                "url": article["news_link"],
+                "image_url": article["image_link"] or "",
+                "date": article["raw_date"],
+                "source": "kathmandu_post",
+                "threat_analysis": article.get("threat_analysis", {
+                    "level": "low",
+                    "keywords_found": [],
+                    "categories": [],
+                    "total_keywords_matched": 0
+                }),
+                "content_length": len(article["title"] + " " + article["summary"]),
+                "priority": article.get("threat_analysis", {}).get("priority", "normal")
+            }
+            all_articles.append(converted_article)
+        report(f"✅ Fetched {len(kathmandu_articles)} articles from Kathmandu Post")
+    except Exception as e:
+        report(f"❌ Error fetching Kathmandu Post news: {e}")
+
+    if not all_articles:
+        error_msg = "❌ No articles fetched from any source"
+        report(error_msg)
+        return {
+            "status": "error",
+            "alert_type": "error",
+            "alert_message": "No articles could be fetched from any news source.",
+        }
+
+    # Normalise every article, then write them in one batched upsert
+    records = []
+    articles_skipped = 0
+    for article_data in all_articles:
+        try:
+            # Prepare data for saving
+            threat_analysis = article_data.get("threat_analysis", {})
+
+            # Convert lists to comma-separated strings
+            keywords_found = threat_analysis.get("keywords_found", [])
+            categories_list = threat_analysis.get("categories", [])
+
+            keywords_str = ", ".join(keywords_found) if isinstance(keywords_found, list) else str(keywords_found)
+            categories_str = ", ".join(categories_list) if isinstance(categories_list, list) else str(categories_list)
+
+            # Handle date field - ensure it's a string
+            article_date = article_data.get("date", "")
+            if not article_date or article_date == "Unknown":
+                article_date = datetime.now().strftime("%Y-%m-%d")
+
+            records.append({
+                'url': article_data["url"],
+                'title': article_data["title"][:500],  # Limit length for database
+                'summary': article_data.get("summary", "")[:1000],  # Limit length
+                'image_url': (article_data.get("image_url") or "")[:500],
+                'source': article_data.get("source", "unknown"),
+                'date': article_date,
+                'content_length': article_data.get("content_length", 0),
+                'priority': article_data.get("priority", "medium"),
+                'threat_level': threat_analysis.get("level", "low"),
+                'keywords': keywords_str[:500],  # Limit length
+                'categories': categories_str[:500],  # Limit length
+            })
+
+        except Exception as e:
+            articles_skipped += 1
+            source = article_data.get('source', 'unknown')
+            report(f"❌ Error preparing {source} article '{article_data.get('title', 'Unknown')[:30]}...': {e}")
+            continue
+
+    # Feeds saved without a user, like before; existing rows get every field refreshed
+    result = ingest_articles(records, None, update_fields=[
+        'title', 'summary', 'image_url', 'source', 'date', 'content_length',
+        'priority', 'threat_level', 'keywords', 'categories',
+    ])
+    articles_saved = result['saved']
+    articles_updated = result['updated']
+    articles_skipped += result['errors']
+    for message in result['error_messages'][:5]:
+        report(f"❌ Error saving article: {message}")
+    report(f"💾 Saved {articles_saved}, updated {articles_updated} in {result['db_seconds']:.2f}s")
+
+    # Create success message with all sources
+    sources_used = []
+    if any(article['source'] == 'kantipur' for article in all_articles):
+        sources_used.append("Kantipur")
+    if any(article['source'] == 'techpana' for article in all_articles):
+        sources_used.append("Techpana")
+    if any(article['source'] == 'kathmandu_post' for article in all_articles):
+        sources_used.append("Kathmandu Post")
+
+    sources_str = ", ".join(sources_used) if sources_used else "No sources"
+
+    success_message = f"News autofeeding completed! Sources: {sources_str}. Saved: {articles_saved}, Updated: {articles_updated}, Skipped: {articles_skipped}"
+    report(f"✅ {success_message}")
+
+    return {
+        "status": "success",
+        "alert_type": "success",
+        "alert_message": success_message,
+        "stats": {
+            "saved": articles_saved,
+            "updated": articles_updated,
+            "skipped": articles_skipped,
+            "total_processed": len(all_articles),
+            "sources": sources_used
+        }
+    }
@@ -0,0 +1,201 @@
+"""
+Incremental crawl state (high-water marks).
+
+For every source and user we keep one CrawlState row per listing page or feed:
+a fingerprint of the page's article links, the most recent item URLs/GUIDs and
+the newest GUID + publish time seen. Listing pages and feeds are newest-first,
+so a run can
+
+- skip a listing page whose links are exactly those of the last run,
+- drop links that are already known before asking the DB about them,
+- stop paginating once a page reaches known items, and
+- start a feed's date window at the last publish time instead of N days ago.
+
+Items are only marked as seen once the scraper has handled them, so an article
+whose fetch failed is retried on the next run. Feed marks are tied to the
+keyword fingerprint: after a keyword change the old items are matched again.
+"""
+import hashlib
+import json
+from datetime import timedelta, timezone as dt_timezone
+
+from django.db import IntegrityError
+from django.db.models import F
+
+from collect.models import CrawlState
+from collect.scrapers.page_cache import is_replay
+
+
+SEEN_LIMIT = 300                     # item ids remembered per listing page / feed
+FEED_SLACK = timedelta(hours=2)      # feeds are not strictly ordered by pubDate
+
+
+def links_fingerprint(links):
+    return hashlib.sha256("\n".join(links).encode('utf-8')).hexdigest()
+
+
+# Feed dates are naive in the feed's own clock (see feed_stream.item_pub_date);
+# they are stored as UTC so they come back unchanged.
+def _to_db(value):
+    return value.replace(tzinfo=dt_timezone.utc) if value.tzinfo is None else value
+
+
+def _from_db(value):
+    return value.astimezone(dt_timezone.utc).replace(tzinfo=None)
+
+
+class SourceCrawl:
+    """Crawl state of one source for one user (one query to load, one statement per page to save)"""
+
+    def __init__(self, source, user, keyword_fingerprint=None):
+        self.source = source
+        self.user = user
+        self.keyword_fingerprint = keyword_fingerprint
+        self.enabled = not is_replay()
+        self.states = {}
+        if self.enabled:
+            rows = CrawlState.objects.filter(source=source, created_by=user)
+            self.states = {row.key: row for row in rows if self._usable(row)}
+        self.seen = set()
+        for state in self.states.values():
+            self.seen.update(json.loads(state.seen_items or '[]'))
+
+        self._pages = {}          # key -> {"fingerprint", "links", "marked", "newest", "skipped"}
+        self.pages_scanned = 0
+        self.pages_unchanged = 0
+        self.items_skipped = 0
+        self.new_items = 0
+
+    def _usable(self, state):
+        return self.keyword_fingerprint is None or state.keyword_fingerprint == self.keyword_fingerprint
+
+    def _page(self, key):
+        return self._pages.setdefault(
+            key, {"fingerprint": None, "links": [], "marked": [], "newest": None, "skipped": 0}
+        )
+
+    # ============ LISTING PAGES ============
+    def new_links(self, key, links):
+        """
+        Links of a listing page that were not seen in earlier runs.
+        Returns (new_links, reached_known) - reached_known means pagination can stop here.
+        """
+        self.pages_scanned += 1
+        if not self.enabled:
+            self.new_items += len(links)
+            return list(links), False
+
+        page = self._page(key)
+        page["fingerprint"] = links_fingerprint(links)
+        page["links"] = list(links)
+        state = self.states.get(key)
+        if state is not None and state.listing_fingerprint == page["fingerprint"]:
+            self.pages_unchanged += 1
+            page["skipped"] += len(links)
+            self.items_skipped += len(links)
+            return [], True
+
+        new = [link for link in links if link not in self.seen]
+        page["skipped"] += len(links) - len(new)
+        self.items_skipped += len(links) - len(new)
+        self.new_items += len(new)
+        return new, len(new) < len(links)
+
+    def new_articles(self, key, articles):
+        """new_links() for link dicts ({'url': ...}); every kept dict is tagged with its listing page"""
+        new, reached_known = self.new_links(key, [a['url'] for a in articles])
+        new = set(new)
+        return [dict(a, listing=key) for a in articles if a['url'] in new], reached_known
+
+    # ============ FEEDS ============
+    def feed_cutoff(self, key, cutoff):
+        """Later of the date window and the feed's high-water mark (minus slack for unordered feeds)"""
+        state = self.states.get(key)
+        if not self.enabled or state is None or state.last_published is None:
+            return cutoff
+        return max(cutoff, _from_db(state.last_published) - FEED_SLACK)
+
+    def is_new(self, key, item_id):
+        """True for an item (GUID/URL) not handled in an earlier run"""
+        if not self.enabled:
+            return True
+        if item_id in self.seen:
+            self._page(key)["skipped"] += 1
+            self.items_skipped += 1
+            return False
+        self.new_items += 1
+        return True
+
+    # ============ RECORDING ============
+    def mark_seen(self, key, item_ids, published=None):
+        """Remember items the scraper has handled (newest first); published is the newest item's time"""
+        if not self.enabled:
+            return
+        page = self._page(key)
+        for item_id in item_ids:
+            if item_id and item_id not in self.seen:
+                self.seen.add(item_id)
+                page["marked"].append(item_id)
+        if published is not None:
+            published = _to_db(published)
+            if page["newest"] is None or published > page["newest"]:
+                page["newest"] = published
+
+    def hold_published(self, key):
+        """Keep key's stored publish time: items inside the window were left for the next run"""
+        if self.enabled:
+            self._page(key)["newest"] = None
+
+    def mark_articles(self, articles, handled_urls):
+        """mark_seen() for the handled ones of link dicts returned by new_articles()"""
+        by_listing = {}
+        for article in articles:
+            if article['url'] in handled_urls:
+                by_listing.setdefault(article['listing'], []).append(article['url'])
+        for key, urls in by_listing.items():
+            self.mark_seen(key, urls)
+
+    def save(self):
+        """Store the new marks with single-statement writes"""
+        if not self.enabled:
+            return
+        for key, page in self._pages.items():
+            state = self.states.get(key)
+            old_seen = json.loads(state.seen_items or '[]') if state is not None else []
+            seen_items = list(dict.fromkeys(page["marked"] + old_seen))[:SEEN_LIMIT]
+
+            fields = {
+                "seen_items": json.dumps(seen_items, ensure_ascii=False),
+                "keyword_fingerprint": self.keyword_fingerprint or '',
+            }
+            if page["fingerprint"]:
+                # Only trust the page fingerprint once every link on it has been handled
+                complete = all(link in self.seen for link in page["links"])
+                fields["listing_fingerprint"] = page["fingerprint"] if complete else ''
+            if page["marked"]:
+                fields["last_guid"] = page["marked"][0][:1000]
+            if page["newest"] is not None and (state is None or state.last_published is None
+                                               or page["newest"] > state.last_published):
+                fields["last_published"] = page["newest"]
+
+            updated = CrawlState.objects.filter(source=self.source, key=key, created_by=self.user).update(
+                runs=F('runs') + 1, items_skipped=F('items_skipped') + page["skipped"], **fields
+            )
+            if not updated:
+                try:
+                    CrawlState.objects.create(
+                        source=self.source, key=key, created_by=self.user,
+                        runs=1, items_skipped=page["skipped"], **fields
+                    )
+                except IntegrityError:
+                    # A concurrent run for the same user stored the page first
+                    CrawlState.objects.filter(source=self.source, key=key, created_by=self.user).update(**fields)
+
+    def stats(self):
+        return {
+            "enabled": self.enabled,
+            "pages_scanned": self.pages_scanned,
+            "pages_unchanged": self.pages_unchanged,
+            "items_skipped": self.items_skipped,
+            "new_items": self.new_items,
+        }
@@ -0,0 +1,234 @@
+"""
+Shared asyncio scraping engine.
+
+One background event loop is shared by every scraper in the process. Sources
+(the keyboard_* functions) are scheduled on it with a bounded concurrency, and
+every HTTP call a scraper makes through fetch() is routed onto the same loop,
+where a global request limit and the per-host rate limiter are applied.
+Hosts and sources whose circuit breaker is open (see health.py) are skipped.
+"""
+import asyncio
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from urllib.parse import urlsplit
+
+import requests
+from django.db import connection
+
+from collect.scrapers import health, page_cache
+from collect.scrapers.rate_limit import THROTTLE_STATUSES, get_limiter, parse_retry_after
+from utils.http_session import session_for
+
+
+# ============ LIMITS ============
+MAX_SOURCES = 6          # sources running at the same time
+MAX_REQUESTS = 16        # HTTP requests in flight across all sources
+MAX_PER_HOST = 4         # ceiling of the per-host window (see rate_limit.DEFAULT_POLICY)
+FETCH_RETRIES = 2        # retries of 429/5xx responses, paced by the host's limiter
+RETRY_METHODS = {'GET', 'HEAD'}  # only idempotent requests are ever sent twice
+
+_loop = None
+_loop_thread = None
+_loop_lock = threading.Lock()
+_request_pool = ThreadPoolExecutor(max_workers=MAX_REQUESTS, thread_name_prefix="scrape-http")
+_source_pool = ThreadPoolExecutor(max_workers=MAX_SOURCES * 2, thread_name_prefix="scrape-source")
+
+# Created lazily on the loop thread
+_global_semaphore = None
+
+# Rewrites every fetched URL to a local fixture server (benchmarks only)
+_host_override = None
+
+
+class SourceRequest:
+    """Minimal request object for running scrapers outside a view"""
+
+    def __init__(self, user):
+        self.user = user
+        self.method = 'POST'
+        self.headers = {}
+        self.POST = {}
+        self.GET = {}
+
+
+def get_loop():
+    """Return the shared event loop, starting its thread on first use"""
+    global _loop, _loop_thread
+    with _loop_lock:
+        if _loop is None or _loop.is_closed():
+            _loop = asyncio.new_event_loop()
+            _loop.set_default_executor(_source_pool)
+            _loop_thread = threading.Thread(target=_loop.run_forever, name="scrape-engine", daemon=True)
+            _loop_thread.start()
+    health.start_prober()
+    return _loop
+
+
+def set_host_override(base_url):
+    """Send every request to base_url/<original host>/<path> (None to disable)"""
+    global _host_override
+    _host_override = base_url.rstrip('/') if base_url else None
+
+
+def rewrite_url(url):
+    if not _host_override:
+        return url
+    parts = urlsplit(url)
+    rewritten = f"{_host_override}/{parts.netloc}{parts.path or '/'}"
+    if parts.query:
+        rewritten += f"?{parts.query}"
+    return rewritten
+
+
+async def _fetch_async(method, url, session, kwargs):
+    global _global_semaphore
+    if _global_semaphore is None:
+        _global_semaphore = asyncio.Semaphore(MAX_REQUESTS)
+
+    limiter = get_limiter(url)
+    caller = session.request if session is not None else session_for(url).request
+    target = rewrite_url(url)
+    retries = FETCH_RETRIES if method.upper() in RETRY_METHODS else 0
+
+    for attempt in range(retries + 1):
+        if attempt and not health.host_allowed(url):
+            raise health.CircuitOpenError(f"Circuit opened for {health.host_of(url)} while retrying")
+        # The host's token / slot first: a throttled or backed-off host must not sit on
+        # global slots while it waits, blocking requests to every other host
+        await limiter.acquire()
+        try:
+            await _global_semaphore.acquire()
+        except BaseException:
+            await limiter.release()
+            raise
+        try:
+            start = time.monotonic()
+            try:
+                response = await asyncio.get_running_loop().run_in_executor(
+                    _request_pool, partial(caller, method, target, **kwargs)
+                )
+            except (requests.Timeout, requests.ConnectionError) as e:
+                await limiter.release(failed=True)
+                health.record_host(url, False, error=type(e).__name__)
+                raise
+            except BaseException:
+                await limiter.release()
+                raise
+            latency = time.monotonic() - start
+            await limiter.release(
+                status=response.status_code,
+                latency=latency,
+                retry_after=parse_retry_after(response.headers.get('Retry-After')),
+            )
+        finally:
+            _global_semaphore.release()
+        # 429 says nothing about the host's health - the limiter handles it
+        if response.status_code != 429:
+            health.record_host(url, response.status_code < 500, round(latency * 1000), f"HTTP {response.status_code}")
+
+        # Throttled / server error: retry after the limiter's backoff instead of hammering
+        if response.status_code not in THROTTLE_STATUSES or attempt == retries:
+            return response
+
+
+def fetch(url, session=None, method='GET', **kwargs):
+    """
+    Blocking HTTP call for scrapers. Runs on the shared loop so the global and
+    per-host limits apply no matter which thread the scraper is using. Without
+    an explicit session the pooled session for the URL's host is used.
+    Successful GETs are kept in the page cache; in replay mode they are
+    served from it without touching the network. Raises health.CircuitOpenError
+    (a requests.ConnectionError) at once when the host's breaker is open.
+    """
+    if method == 'GET' and page_cache.is_replay():
+        return page_cache.replay_response(url)
+
+    loop = get_loop()
+    if threading.current_thread() is _loop_thread:
+        raise RuntimeError("fetch() must not be called from the engine loop thread")
+    health.check_host(url)
+    future = asyncio.run_coroutine_threadsafe(_fetch_async(method, url, session, kwargs), loop)
+    try:
+        response = future.result()
+    finally:
+        health.maybe_flush()
+    if method == 'GET':
+        page_cache.store(url, response)
+    return response
+
+
+def parse_result(json_result):
+    """Scrapers return a JSON string, a JsonResponse or a dict - normalise to dict"""
+    if isinstance(json_result, str):
+        return json.loads(json_result)
+    if hasattr(json_result, 'content'):
+        return json.loads(json_result.content.decode('utf-8'))
+    return json_result or {}
+
+
+def _run_source(name, scraper_function, request, track=True):
+    start = time.time()
+    try:
+        data = parse_result(scraper_function(request))
+        metadata = data.get('metadata') if isinstance(data, dict) else None
+        failed = isinstance(metadata, dict) and metadata.get('status') == 'error'
+        if track:
+            health.record_source(name, not failed, metadata.get('message', '') if failed else '')
+        return {"data": data, "error": None, "elapsed": round(time.time() - start, 2)}
+    except Exception as e:
+        if track:
+            health.record_source(name, False, str(e))
+        return {"data": None, "error": str(e), "elapsed": round(time.time() - start, 2)}
+    finally:
+        # Worker threads are reused - don't keep their DB connection open
+        connection.close()
+
+
+async def _run_sources_async(scrapers, request, max_sources, on_done, skipped, untracked):
+    semaphore = asyncio.Semaphore(max_sources)
+    loop = asyncio.get_running_loop()
+
+    async def run_one(name, scraper_function):
+        if name in skipped:
+            result = {"data": None, "error": skipped[name], "elapsed": 0.0, "skipped": True}
+        else:
+            async with semaphore:
+                result = await loop.run_in_executor(
+                    None, _run_source, name, scraper_function, request, name not in untracked
+                )
+        if on_done:
+            on_done(name, result)
+        return name, result
+
+    pairs = await asyncio.gather(*(run_one(name, func) for name, func in scrapers.items()))
+    return dict(pairs)
+
+
+def run_sources(scrapers, request, max_sources=MAX_SOURCES, on_done=None, untracked=()):
+    """
+    Run several scraper functions concurrently on the shared loop.
+
+    scrapers: {name: scraper_function}
+    on_done: optional callback(name, result) called as each source finishes
+    Returns {name: {"data": dict|None, "error": str|None, "elapsed": seconds}}
+    Sources with an open circuit breaker are not run ("skipped": True).
+    untracked: names that keep their own breakers (a batch of sources) - the
+    engine neither checks nor records them
+    """
+    loop = get_loop()
+    health.load()
+    skipped = {
+        name: health.source_skip_message(name)
+        for name in scrapers if name not in untracked and not health.allow_source(name)
+    }
+    future = asyncio.run_coroutine_threadsafe(
+        _run_sources_async(scrapers, request, max_sources, on_done, skipped, untracked), loop
+    )
+    try:
+        return future.result()
+    finally:
+        page_cache.flush()
+        health.flush()
@@ -0,0 +1,157 @@
+"""
+Conditional-GET cache for RSS feeds.
+
+For every (feed URL, user) we keep the ETag, Last-Modified value and a hash of
+the last body we processed. The next fetch sends If-None-Match /
+If-Modified-Since; on a 304, or a 200 whose body hash has not changed, the
+scraper skips parsing entirely. A change in the keyword table forces a full
+re-parse, since the same feed can then match different articles.
+"""
+import hashlib
+import json
+from datetime import datetime
+
+from django.db import IntegrityError
+from django.db.models import Count, F, Max, Q
+
+from collect.models import DangerousKeyword, FeedValidator
+from collect.scrapers.engine import fetch
+from collect.scrapers.page_cache import is_replay
+
+
+def keyword_fingerprint():
+    """Cheap summary of the keyword table - changes whenever keywords are added, removed, edited or toggled"""
+    stats = DangerousKeyword.objects.aggregate(
+        total=Count('id'),
+        active=Count('id', filter=Q(is_active=True)),
+        latest=Max('updated_at'),
+    )
+    latest = stats['latest'].isoformat() if stats['latest'] else ''
+    return f"{stats['total']}:{stats['active']}:{latest}"
+
+
+class FeedCacheResult:
+    """Outcome of a conditional feed fetch; save() stores the new validators once the feed is processed"""
+
+    def __init__(self, feed_url, user, validator, fingerprint):
+        self.feed_url = feed_url
+        self.user = user
+        self.validator = validator
+        self.fingerprint = fingerprint
+        self.hit = False
+        self.reason = None
+        self.pending = None
+
+    def as_dict(self):
+        return {
+            "hit": self.hit,
+            "reason": self.reason,
+            "hits": self.validator.hits if self.validator else 0,
+            "misses": self.validator.misses if self.validator else 0,
+        }
+
+    def record_hit(self, reason):
+        self.hit = True
+        self.reason = reason
+        FeedValidator.objects.filter(pk=self.validator.pk).update(hits=F('hits') + 1)
+        self.validator.hits += 1
+
+    def discard(self):
+        """Drop the new validators of a feed that was not fully processed - the next run parses it again"""
+        self.pending = None
+
+    def save(self):
+        """Remember the validators of a fully processed feed (no-op on a cache hit or a bad response)"""
+        if self.hit or self.pending is None:
+            return
+        fields = dict(self.pending, keyword_fingerprint=self.fingerprint)
+        # Single-statement writes: update_or_create's read-then-write transaction
+        # fails fast with "database is locked" on SQLite when sources run concurrently
+        if self.validator is not None:
+            FeedValidator.objects.filter(pk=self.validator.pk).update(misses=F('misses') + 1, **fields)
+            self.validator.misses += 1
+            return
+        try:
+            self.validator = FeedValidator.objects.create(
+                feed_url=self.feed_url, created_by=self.user, misses=1, **fields
+            )
+        except IntegrityError:
+            # Another run for the same user stored the feed first
+            FeedValidator.objects.filter(feed_url=self.feed_url, created_by=self.user).update(
+                misses=F('misses') + 1, **fields
+            )
+
+
+def fetch_feed(feed_url, user, headers=None, timeout=30):
+    """
+    Conditional GET of an RSS feed.
+
+    Returns (response, feed_cache). response is None when the feed has not
+    changed since the last processed fetch - the caller should return
+    not_modified_json() instead of parsing.
+    """
+    if is_replay():
+        # Replaying the page cache: always parse, never touch the stored validators
+        feed_cache = FeedCacheResult(feed_url, user, None, None)
+        feed_cache.reason = "replay"
+        return fetch(feed_url, headers=headers, timeout=timeout), feed_cache
+
+    validator = FeedValidator.objects.filter(feed_url=feed_url, created_by=user).first()
+    fingerprint = keyword_fingerprint()
+    feed_cache = FeedCacheResult(feed_url, user, validator, fingerprint)
+
+    # Validators are only trusted if the feed was matched against the current keywords
+    usable = validator is not None and validator.keyword_fingerprint == fingerprint
+    request_headers = dict(headers or {})
+    if usable and validator.etag:
+        request_headers['If-None-Match'] = validator.etag
+    if usable and validator.last_modified:
+        request_headers['If-Modified-Since'] = validator.last_modified
+
+    response = fetch(feed_url, headers=request_headers, timeout=timeout)
+
+    if response.status_code == 304 and usable:
+        feed_cache.record_hit("not_modified")
+        return None, feed_cache
+
+    if response.status_code != 200:
+        feed_cache.reason = f"http_{response.status_code}"
+        return response, feed_cache
+
+    body_hash = hashlib.sha256(response.content).hexdigest()
+    if usable and validator.body_hash == body_hash:
+        # Server ignores conditional headers but the body is byte-identical
+        feed_cache.record_hit("unchanged_body")
+        return None, feed_cache
+
+    feed_cache.reason = "changed" if validator else "first_fetch"
+    feed_cache.pending = {
+        "etag": response.headers.get('ETag', '')[:255],
+        "last_modified": response.headers.get('Last-Modified', '')[:100],
+        "body_hash": body_hash,
+    }
+    return response, feed_cache
+
+
+def not_modified_json(source_name, request, feed_cache):
+    """Scraper response for a feed that has not changed since the last run"""
+    print(f"♻️ {source_name}: feed not modified ({feed_cache.reason}) - skipping parse")
+    return json.dumps({
+        "metadata": {
+            "source": source_name,
+            "scraped_at": datetime.now().isoformat(),
+            "status": "success",
+            "user": request.user.username,
+            "total_articles_scraped": 0,
+            "articles_with_keywords": 0,
+            "database_save": {
+                "new_articles_saved": 0,
+                "existing_articles_updated": 0,
+                "errors": 0
+            },
+            "feed_cache": feed_cache.as_dict()
+        },
+        "articles": [],
+        "status": "success",
+        "alert_message": f"✅ {source_name}: feed unchanged since last run"
+    }, ensure_ascii=False)
@@ -0,0 +1,115 @@
+"""
+Streaming RSS item parser.
+
+FeedStream walks the feed with ElementTree.iterparse instead of building the
+whole document: each <item> is yielded as soon as its end tag is parsed and
+cleared right after the scraper is done with it, so memory stays flat however
+long the feed is. Feeds are newest-first, so once STALE_LIMIT items in a row
+fall before the cutoff the rest of the document is never parsed.
+
+The source is the body as bytes/str or a binary file object, which is parsed
+as it is read (e.g. a streamed response's raw stream). feeds.py passes the
+downloaded body: the unchanged-body check (feed_cache) hashes all of it before
+anything is parsed, the page cache stores it and repair_xml rewrites it - so
+the saving there is the element tree, never the download.
+"""
+import io
+import xml.etree.ElementTree as ET
+from email.utils import parsedate_to_datetime
+
+
+STALE_LIMIT = 3    # consecutive out-of-window items before we stop (tolerates slightly unordered feeds)
+
+
+def item_pub_date(item):
+    """pubDate of an <item> as a naive datetime in the feed's clock (None if missing/unparseable)"""
+    pub_date = item.findtext('pubDate')
+    if not pub_date:
+        return None
+    try:
+        return parsedate_to_datetime(pub_date.strip()).replace(tzinfo=None)
+    except (TypeError, ValueError, IndexError):
+        return None
+
+
+class FeedStream:
+    """
+    Iterate the <item> elements of an RSS document.
+
+    Items older than cutoff are skipped, and parsing stops after STALE_LIMIT
+    stale items in a row. The <channel> element (title, image, ... - everything
+    before the first item) is available as .channel straight away.
+    """
+
+    def __init__(self, content, cutoff=None, stale_limit=STALE_LIMIT):
+        if isinstance(content, str):
+            content = content.encode('utf-8')
+        source = io.BytesIO(content) if isinstance(content, (bytes, bytearray)) else content
+        self.cutoff = cutoff
+        self.stale_limit = stale_limit
+        self._events = ET.iterparse(source, events=('start', 'end'))
+        self.root = None
+        self.channel = None
+
+        self.items_parsed = 0
+        self.items_yielded = 0
+        self.items_stale = 0
+        self.stopped_early = False
+
+        self._prime()
+
+    def _prime(self):
+        """Parse up to the first <item> so the channel header is complete"""
+        for event, elem in self._events:
+            if self.root is None:
+                self.root = elem
+            if event == 'start' and elem.tag == 'channel':
+                self.channel = elem
+            elif event == 'start' and elem.tag == 'item':
+                break
+        if self.channel is None:
+            self.channel = self.root
+
+    def _completed_items(self):
+        # The item whose start tag _prime() stopped on finishes in the main event stream
+        for event, elem in self._events:
+            if event == 'end' and elem.tag == 'item':
+                yield elem
+
+    def __iter__(self):
+        stale_run = 0
+        parent = self.channel if self.channel is not None else self.root
+        for item in self._completed_items():
+            self.items_parsed += 1
+            pub_date = item_pub_date(item)
+
+            if self.cutoff is not None and pub_date is not None and pub_date < self.cutoff:
+                self.items_stale += 1
+                stale_run += 1
+                self._discard(parent, item)
+                if stale_run >= self.stale_limit:
+                    self.stopped_early = True
+                    print(f"⏹️ Feed window reached after {self.items_parsed} items - skipping the rest")
+                    return
+                continue
+
+            stale_run = 0
+            self.items_yielded += 1
+            yield item
+            self._discard(parent, item)
+
+    @staticmethod
+    def _discard(parent, item):
+        item.clear()
+        try:
+            parent.remove(item)
+        except ValueError:
+            pass
+
+    def stats(self):
+        return {
+            "items_parsed": self.items_parsed,
+            "items_in_window": self.items_yielded,
+            "items_stale": self.items_stale,
+            "stopped_early": self.stopped_early,
+        }
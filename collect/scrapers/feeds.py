@@ -0,0 +1,645 @@
+"""
+Declarative registry of the RSS/WordPress feed sources.
+
+Every feed we follow is one entry in FEEDS (merged over DEFAULT_FEED) and all
+of them run through the same code path: conditional GET (feed_cache), streamed
+items inside the date window (FeedStream) and past the feed's high-water mark
+(crawl_state), cleaning and image extraction with precompiled patterns,
+keyword matching and saving. Adding a source is a data
+entry here plus its name in sources.SCRAPER_FUNCTIONS.
+
+scrape_feeds() runs several feeds as one batch: the feeds are fetched and
+parsed concurrently, keywords are loaded once per scope and each feed's
+articles are written with one batched upsert (ingest.py).
+"""
+import html
+import json
+import re
+import time
+import xml.etree.ElementTree as ET
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from urllib.parse import urlsplit
+
+from django.db import connection
+
+from collect.scrapers import health
+from collect.scrapers.crawl_state import SourceCrawl
+from collect.scrapers.feed_cache import fetch_feed, not_modified_json
+from collect.scrapers.feed_stream import FeedStream, item_pub_date
+from collect.scrapers.ingest import ingest_articles
+from utils.keyword_matcher import keyword_matcher
+
+
+# ============ FEED SPECS ============
+FEED_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
+    'Accept': 'application/rss+xml, application/xml, text/xml, */*',
+}
+
+DEFAULT_FEED = {
+    "days": 4,                          # date window
+    "default_image": None,              # used when no image is found (or always, see "images")
+    "site": None,                       # base for relative image URLs - defaults to the feed's origin
+    "author": "",                       # when the item has no dc:creator
+    "category": ("news", "समाचार"),      # (category, category_display) when the item has none
+    "item_categories": True,            # False: every article gets "category"
+    "keywords": "user",                 # "user": the requesting user's keywords, "all": every active keyword
+    "images": ("description", "content", "media", "enclosure"),  # where to look, in order; () = always default_image
+    "clean": "standard",                # "aggressive" also strips editor/CSS artifacts and keeps Nepali words only
+    "post_id": r'/(\d+)/?$',            # post id from the URL when there is no wp:post-id
+    "date_format": None,                # strptime format for feeds whose pubDate is not RFC 822
+    "repair_xml": False,                # cut trailing junk after </rss> and unwrap CDATA
+    "save_all": False,                  # save every article in the window, not only keyword matches
+}
+
+FEEDS = {
+    'onlinekhabar': {
+        "title": "Online Khabar", "source": "onlinekhabar",
+        "feed_url": "https://www.onlinekhabar.com/feed",
+        "days": 10, "keywords": "all", "category": ("general", "सामान्य"),
+        "images": ("media", "image_tag", "description"),
+    },
+    'paschimnepal': {
+        "title": "Paschimnepal", "source": "paschimnepal",
+        "feed_url": "https://paschimnepal.com/feed/",
+        "default_image": "/static/project_images/paschimnepal.jpg",
+        "author": "पश्चिम नेपाल", "images": (), "save_all": True,
+    },
+    'onlinetvnepal': {
+        "title": "Online TV Nepal", "source": "onlinetvnepal",
+        "feed_url": "https://onlinetvnepal.com/feed/",
+        "default_image": "/static/project_images/onlinetv.png",
+        "days": 10, "keywords": "all", "category": ("general", "मनोरञ्जन"),
+        "images": ("content", "media", "enclosure", "description"),
+    },
+    'osnepal': {
+        "title": "OSNepal", "source": "osnepal",
+        "feed_url": "https://www.osnepal.com/feed",
+        "default_image": "/static/project_images/osnepal.png",
+        "days": 10, "keywords": "all", "item_categories": False,
+        "images": ("enclosure", "media", "description"), "post_id": r'/detail/(\d+)',
+    },
+    'eadarsha': {
+        "title": "eAdarsha", "source": "eadarsha",
+        "feed_url": "https://www.eadarsha.com/feed",
+        "default_image": "/static/project_images/eadarsha.png",
+        "days": 10, "keywords": "all",
+        "images": ("content", "media", "enclosure"), "repair_xml": True,
+    },
+    'arthasarokar': {
+        "title": "Artha Sarokar", "source": "arthasarokar",
+        "feed_url": "https://arthasarokar.com/feed",
+        "default_image": "/static/project_images/arthasarokar.png",
+        "days": 10, "keywords": "all", "category": ("business", "आर्थिक"),
+        "images": ("content", "media", "enclosure"),
+    },
+    'newsofnepal': {
+        "title": "News of Nepal", "source": "newsofnepal",
+        "feed_url": "https://newsofnepal.com/feed/",
+        "default_image": "/static/project_images/newsofnepal.png",
+        "days": 10, "keywords": "all", "images": ("description", "content"),
+    },
+    'rajdhanidaily': {
+        "title": "Rajdhani Daily", "source": "rajdhanidaily",
+        "feed_url": "https://rajdhanidaily.com/feed/",
+        "default_image": "/static/project_images/rajdhanidaily.png",
+        "days": 10, "keywords": "all", "images": ("description", "content"),
+    },
+    'dnews': {
+        "title": "DNews Nepal", "source": "dnewsnepal",
+        "feed_url": "https://dnewsnepal.com/feed",
+        "default_image": "/static/project_images/Dhadingnews.jpg",
+        "author": "डिन्यूज नेपाल", "images": ("description", "content", "media"),
+        "post_id": r'/archives/(\d+)',
+    },
+    'hetaudatoday': {
+        "title": "Hetauda Today", "source": "hetaudatoday",
+        "feed_url": "https://www.hetaudatoday.com/feed/",
+        "default_image": "/static/project_images/hetauda.jpg",
+        "author": "हेटौंडा टुडे",
+    },
+    'chitwan': {
+        "title": "Chitwan Samachar", "source": "chitwansamachar",
+        "feed_url": "https://chitwansamachar.com/feed",
+        "default_image": "/static/project_images/chitwan.png",
+        "author": "चितवन समाचार", "images": ("description", "content"),
+        "post_id": r'/archives/(\d+)',
+    },
+    'nuwakot': {
+        "title": "Online Nuwakot", "source": "onlinenuwakot",
+        "feed_url": "https://www.onlinenuwakot.com/feed/",
+        "default_image": "/static/project_images/chitwan.png",
+        "author": "अनलाइन नुवाकोट", "images": ("description", "content"),
+    },
+    'merokarnali': {
+        "title": "Merokarnali", "source": "merokarnali",
+        "feed_url": "https://merokarnali.com/feed/",
+        "default_image": "/static/project_images/merokarnali.png",
+        "author": "मेरो कर्णाली", "images": (),
+    },
+    'hamropahuch': {
+        "title": "Hamropahuch", "source": "hamropahuch",
+        "feed_url": "https://hamropahuch.com/feed/",
+        "default_image": "/static/project_images/pahuch.webp",
+        "author": "हाम्रो पहुँच", "images": (),
+    },
+    'raibar': {
+        "title": "Nepaliraibar", "source": "nepaliraibar",
+        "feed_url": "https://nepaliraibar.com/feed/",
+        "default_image": "/static/project_images/nepaliraibar.webp",
+        "author": "नेपालीरैबार", "images": (), "clean": "aggressive",
+    },
+    'shilapaper': {
+        "title": "Shilapaper", "source": "shilapaper",
+        "feed_url": "https://shilapaper.com/feed",
+        "default_image": "/static/project_images/shilapaper.png",
+        "days": 30, "author": "शिलापेपर", "images": (), "save_all": True,
+    },
+}
+
+FEED_WORKERS = 8          # feeds fetched/parsed at once inside a batch
+MAX_SAVED = 200           # articles written per feed and run
+MAX_RETURNED = 10         # articles included in the JSON response
+
+NAMESPACES = {
+    'content': 'http://purl.org/rss/1.0/modules/content/',
+    'dc': 'http://purl.org/dc/elements/1.1/',
+    'media': 'http://search.yahoo.com/mrss/',
+    'wp': 'com-wordpress:feed-additions:1',
+}
+
+
+def get_spec(name):
+    """Full spec of a feed: its FEEDS entry over DEFAULT_FEED"""
+    spec = dict(DEFAULT_FEED, name=name, **FEEDS[name])
+    if not spec["site"]:
+        parts = urlsplit(spec["feed_url"])
+        spec["site"] = f"{parts.scheme}://{parts.netloc}"
+    return spec
+
+
+# ============ PATTERNS ============
+TAG = re.compile(r'<[^>]+>')
+WHITESPACE = re.compile(r'\s+')
+CDATA = re.compile(r'<!\[CDATA\[(.*?)\]\]>', re.DOTALL)
+BOILERPLATE = re.compile(
+    r'The post.*?appeared first on.*?\.'
+    r'|\[(?:&hellip;|…)\]'
+    r'|Continue reading.*$'
+    r'|Source :-.*$'
+    r'|\[elementor-template[^\]]*\]'
+)
+# Leftovers of editor markup pasted into posts (Nepaliraibar)
+ARTIFACTS = re.compile(
+    r'(?:class|id|style|dir|tabindex|data-[\w-]*|on\w+)="[^"]*"'
+    r'|data-writing-block|pointer-events-auto|scroll-mt-[^"\s]+|\[--shadow-height:[^\]]+\]'
+    r'|has-data-writing-block|agent-turn|conversation-turn-\d+|message-\w+-\w+-\w+-\w+-\w+'
+    r'|--thread-content-margin:[^;]+;?|@[^:]+:[^;]+;?|calc\([^)]+\)|var\(--[^)]+\)'
+    r'|<!--.*?-->|\[\s*\]|\(\s*\)|\{\s*\}',
+    re.IGNORECASE | re.DOTALL,
+)
+LEADING_JUNK = re.compile(r'^[>*\]\[(){}]\s*')
+NEPALI_WORD = re.compile(r'[\u0900-\u097F]{4,}')
+
+FEATURED_IMG = re.compile(
+    r'<img[^>]+class="[^"]*(?:wp-post-image|webfeedsFeaturedVisual|wp-image-\d+)[^"]*"[^>]+src="([^">]+)"',
+    re.IGNORECASE,
+)
+ANY_IMG = re.compile(r'<img[^>]+src=["\']([^"\'>]+)["\']', re.IGNORECASE)
+SRCSET_IMG = re.compile(r'<img[^>]+srcset="([^">]+)"', re.IGNORECASE)
+
+
+# ============ CLEANING ============
+def clean_text(text, aggressive=False):
+    """Plain text from an HTML fragment, without WordPress boilerplate"""
+    if not text:
+        return ""
+    text = TAG.sub(' ', html.unescape(text))
+    if aggressive:
+        text = ARTIFACTS.sub('', text)
+    text = WHITESPACE.sub(' ', text)
+    text = BOILERPLATE.sub('', text).strip()
+    if aggressive:
+        text = LEADING_JUNK.sub('', text)
+    return text
+
+
+def summary_text(text, aggressive=False):
+    text = clean_text(text, aggressive)
+    if aggressive:
+        # Keep the Nepali words only - the rest is mostly editor debris
+        words = NEPALI_WORD.findall(text)
+        if words:
+            text = ' '.join(words)
+    return text[:1000]
+
+
+def image_from_html(content):
+    """Featured image, else the first <img>, else the first srcset entry"""
+    if not content:
+        return None
+    match = FEATURED_IMG.search(content) or ANY_IMG.search(content)
+    if match:
+        return match.group(1)
+    match = SRCSET_IMG.search(content)
+    if match:
+        return match.group(1).split(',')[0].strip().split(' ')[0] or None
+    return None
+
+
+def absolute_url(url, site):
+    if url.startswith('//'):
+        return 'https:' + url
+    if url.startswith('/'):
+        return site + url
+    if not url.startswith(('http://', 'https://', '/')):
+        return f"{site}/{url.lstrip('/')}"
+    return url
+
+
+# ============ ITEM PARSING ============
+def _text(item, path):
+    elem = item.find(path, NAMESPACES)
+    return elem.text.strip() if elem is not None and elem.text else ""
+
+
+def _find_image(item, spec, description, content):
+    for place in spec["images"]:
+        url = None
+        if place == "description":
+            url = image_from_html(description)
+        elif place == "content":
+            url = image_from_html(content)
+        elif place == "image_tag":
+            url = _text(item, 'image')
+        elif place in ("media", "enclosure"):
+            elem = item.find('media:content' if place == "media" else 'enclosure', NAMESPACES)
+            if elem is not None and ('image' in elem.get('type', '') or not elem.get('type')):
+                url = elem.get('url', '')
+        if url:
+            return absolute_url(url.strip(), spec["site"]), place
+    return spec["default_image"], "local_default"
+
+
+def _pub_date(item, spec, today):
+    if spec["date_format"]:
+        try:
+            return datetime.strptime(_text(item, 'pubDate'), spec["date_format"])
+        except ValueError:
+            return today
+    return item_pub_date(item) or today
+
+
+def parse_item(item, spec, today):
+    """Article dict for one <item>"""
+    aggressive = spec["clean"] == "aggressive"
+    title = clean_text(_text(item, 'title'), aggressive)
+    url = _text(item, 'link') or _text(item, 'guid')
+    pub_date = _pub_date(item, spec, today)
+    description = html.unescape(_text(item, 'description'))
+    content = html.unescape(_text(item, 'content:encoded'))
+
+    summary = title
+    for candidate in (description, content):
+        cleaned = summary_text(candidate, aggressive)
+        if len(cleaned) > len(summary):
+            summary = cleaned
+
+    image_url, image_source = _find_image(item, spec, description, content)
+
+    categories = []
+    if spec["item_categories"]:
+        for elem in item.findall('category'):
+            category = clean_text(CDATA.sub(r'\1', elem.text or ''), aggressive)
+            if category:
+                categories.append(category)
+    category, category_display = (categories[0], categories[0]) if categories else spec["category"]
+
+    post_id = _text(item, 'wp:post-id')
+    if not post_id:
+        match = re.search(spec["post_id"], url)
+        post_id = match.group(1) if match else ""
+
+    return {
+        'title': title[:500],
+        'url': url,
+        'post_id': post_id,
+        'author': clean_text(_text(item, 'dc:creator'), aggressive) or spec["author"],
+        'category': category,
+        'category_display': category_display,
+        'date_text': _text(item, 'pubDate'),
+        'image_url': image_url,
+        'summary': summary[:1000],
+        'page_found': 1,
+        'all_categories': categories or [category],
+        'pub_date': pub_date.isoformat(),
+        'date': pub_date.strftime('%Y-%m-%d'),
+        'has_image': image_source != "local_default",
+        'image_source': image_source,
+        'source': spec["source"],
+        'discovered_at': datetime.now().isoformat(),
+    }
+
+
+def repair_xml(text):
+    """eAdarsha appends junk after </rss> and nests broken CDATA"""
+    end = text.find('</rss>')
+    if end != -1:
+        text = text[:end + 6]
+    return CDATA.sub(r'\1', text)
+
+
+# ============ KEYWORDS ============
+def load_keywords(user, scope):
+    """Compiled matcher of the active keywords in scope ("user" or "all")"""
+    return keyword_matcher(user if scope == "user" else None)
+
+
+def source_keyword_scope(source):
+    """Keyword scope of the feed saving articles under source ("user" for every other scraper)"""
+    for entry in FEEDS.values():
+        if entry["source"] == source:
+            return entry.get("keywords", DEFAULT_FEED["keywords"])
+    return "user"
+
+
+def analyze_article(article, matcher):
+    """Keyword threat analysis over title + summary (one pass for all keywords)"""
+    matched = matcher.matches(f"{article['title']} {article.get('summary', '')}")
+    total_matches = len(matched)
+
+    if total_matches >= 5:
+        level = "high"
+    elif total_matches >= 2:
+        level = "medium"
+    elif total_matches >= 1:
+        level = "low"
+    else:
+        level = "none"
+
+    return {
+        "level": level,
+        "priority": level,
+        "keywords_found": list(dict.fromkeys(word for word, _ in matched))[:20],
+        "total_keywords_matched": total_matches,
+        "categories": list(dict.fromkeys(category for _, category in matched)),
+        "has_match": total_matches > 0,
+    }
+
+
+# ============ SAVING ============
+def save_articles(articles, spec, user):
+    """Create or refresh the articles for user in one batched upsert"""
+    records = []
+    for article in articles:
+        threat = article['threat_analysis']
+        records.append({
+            "url": article['url'],
+            "source": spec["source"],
+            "date": article['date'],
+            "title": article['title'],
+            "summary": article.get('summary', article['title'])[:1000],
+            "image_url": article.get('image_url') or None,
+            "content_length": len(article.get('summary', '')),
+            "priority": threat['priority'],
+            "threat_level": threat['level'],
+            "keywords": json.dumps(threat['keywords_found'], ensure_ascii=False),
+            "categories": json.dumps(article['all_categories'][:10], ensure_ascii=False),
+        })
+    result = ingest_articles(records, user, keyword_scope=spec["keywords"])
+    for message in result["error_messages"][:5]:
+        print(f"   ⚠️ Save error: {message}")
+    return {
+        "new_articles_saved": result["saved"],
+        "existing_articles_updated": result["updated"],
+        "errors": result["errors"],
+    }
+
+
+# ============ PIPELINE ============
+def error_result(message):
+    return {
+        "metadata": {
+            "status": "error",
+            "message": message,
+            "scraped_at": datetime.now().isoformat()
+        },
+        "articles": []
+    }
+
+
+def fetch_and_parse(spec, user):
+    """
+    Fetch one feed and parse the items inside its date window that were not handled before.
+    Returns (result, feed_cache, articles, feed, crawl) - result is set when there is nothing to analyse.
+    """
+    today = datetime.now()
+    cutoff = today - timedelta(days=spec["days"])
+    print(f"\n🚀 {spec['title'].upper()} - {today.strftime('%Y-%m-%d')} (last {spec['days']} days)")
+    try:
+        response, feed_cache = fetch_feed(spec["feed_url"], user, headers=FEED_HEADERS, timeout=30)
+        if response is None:
+            return "not_modified", feed_cache, [], None, None
+        if response.status_code != 200:
+            return error_result(f"Failed to fetch RSS feed: HTTP {response.status_code}"), feed_cache, [], None, None
+
+        # The mark is tied to the keywords the items were matched against, like the validators
+        crawl = SourceCrawl(spec["source"], user, keyword_fingerprint=feed_cache.fingerprint)
+        content = repair_xml(response.text) if spec["repair_xml"] else response.content
+        feed = FeedStream(content, cutoff=crawl.feed_cutoff(spec["feed_url"], cutoff))
+        articles = []
+        seen_urls = set()
+        newest = None
+        for item in feed:
+            try:
+                article = parse_item(item, spec, today)
+            except Exception as e:
+                print(f"   ⚠️ Error parsing item: {e}")
+                continue
+            if article['url'] and article['url'] not in seen_urls:
+                seen_urls.add(article['url'])
+                published = _pub_date(item, spec, None)
+                if published is not None and (newest is None or published > newest):
+                    newest = published
+                if crawl.is_new(spec["feed_url"], article['url']):
+                    articles.append(article)
+        # Recorded now, stored only once the items are saved (see analyze_and_save)
+        crawl.mark_seen(spec["feed_url"], [], published=newest)
+        print(f"📊 {spec['title']}: {len(articles)} new articles since {cutoff.strftime('%Y-%m-%d')} "
+              f"(⏭️ {crawl.items_skipped} seen in earlier runs)")
+        return None, feed_cache, articles, feed, crawl
+
+    except ET.ParseError as e:
+        print(f"❌ {spec['title']}: XML Parse Error: {e}")
+        return error_result(f"XML Parse Error: {str(e)}"), None, [], None, None
+    except Exception as e:
+        print(f"❌ {spec['title']}: Error fetching RSS feed: {e}")
+        return error_result(f"Error fetching RSS feed: {str(e)}"), None, [], None, None
+
+
+def analyze_and_save(spec, request, feed_cache, articles, feed, crawl, keywords):
+    """Match keywords, save and build the scraper response for one parsed feed"""
+    today = datetime.now()
+    matched_articles = []
+    category_stats = {}
+    for article in articles:
+        article['threat_analysis'] = analyze_article(article, keywords)
+        if article['threat_analysis']['has_match']:
+            matched_articles.append(article)
+            category_stats[article['category_display']] = category_stats.get(article['category_display'], 0) + 1
+
+    to_save = articles if spec["save_all"] else matched_articles
+    database_save = save_articles(to_save[:MAX_SAVED], spec, request.user)
+    unsaved = {a['url'] for a in to_save[MAX_SAVED:]}
+    if database_save['errors'] or unsaved:
+        # Articles are still unsaved: keep the old validators so the next run parses the feed again
+        feed_cache.discard()
+    else:
+        feed_cache.save()
+    if not database_save['errors']:
+        # Items past MAX_SAVED are picked up by the next run - the date window has to still reach them
+        if unsaved:
+            crawl.hold_published(spec["feed_url"])
+        crawl.mark_seen(spec["feed_url"], [a['url'] for a in articles if a['url'] not in unsaved])
+        crawl.save()
+
+    with_images = len([a for a in matched_articles if a['has_image']])
+    print(f"🔴 {spec['title']}: {len(matched_articles)} matched, "
+          f"💾 {database_save['new_articles_saved']} new, {database_save['existing_articles_updated']} updated")
+
+    if spec["save_all"]:
+        alert_message = f"✅ {spec['title']}: Processed {len(articles)} articles ({len(matched_articles)} with keyword matches)"
+    else:
+        alert_message = f"✅ {spec['title']}: Found {len(matched_articles)} matching articles"
+    if database_save['new_articles_saved'] or database_save['existing_articles_updated']:
+        alert_message += (f" (Saved: {database_save['new_articles_saved']} new, "
+                          f"Updated: {database_save['existing_articles_updated']})")
+
+    metadata = {
+        "source": spec["title"],
+        "scraped_at": datetime.now().isoformat(),
+        "status": "success",
+        "user": request.user.username,
+        "feed_cache": feed_cache.as_dict(),
+        "feed_stream": feed.stats(),
+        "crawl_state": crawl.stats(),
+        "total_articles_scraped": len(articles),
+        "articles_with_keywords": len(matched_articles),
+        "articles_with_rss_images": with_images,
+        "articles_with_local_images": len(matched_articles) - with_images,
+        "articles_by_category": category_stats,
+        "database_save": database_save,
+        "date_range": {
+            "start": (today - timedelta(days=spec["days"])).strftime('%Y-%m-%d'),
+            "end": today.strftime('%Y-%m-%d')
+        },
+        "default_image_path": spec["default_image"],
+    }
+    return {
+        "metadata": metadata,
+        "articles": to_save[:MAX_RETURNED],
+        "status": "success",
+        "alert_message": alert_message
+    }
+
+
+def _fetch_worker(spec, user):
+    try:
+        return fetch_and_parse(spec, user)
+    finally:
+        # Pool threads are reused - don't keep their DB connection open
+        connection.close()
+
+
+_executor = None
+
+
+def _get_executor():
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=FEED_WORKERS, thread_name_prefix="feeds")
+    return _executor
+
+
+def scrape_feeds(names, request, on_done=None):
+    """
+    Run several feeds as one batch.
+
+    Feeds are fetched and parsed concurrently; keyword matching and saving
+    then run feed by feed as each parse completes, with keywords loaded once
+    per scope for the whole batch. Every feed has its own source circuit
+    breaker (health.py): feeds whose breaker is open are not fetched.
+    Returns {name: {"data": dict|None, "error": str|None, "elapsed": seconds}}
+    """
+    if not request or not hasattr(request, 'user') or not request.user.is_authenticated:
+        data = error_result("User authentication required")
+        return {name: {"data": data, "error": None, "elapsed": 0} for name in names}
+
+    start = time.time()
+    results = {}
+    for name in names:
+        if not health.allow_source(name):
+            results[name] = {"data": None, "error": health.source_skip_message(name), "elapsed": 0.0, "skipped": True}
+            if on_done:
+                on_done(name, results[name])
+    specs = {name: get_spec(name) for name in names if name not in results}
+    futures = {name: _get_executor().submit(_fetch_worker, spec, request.user) for name, spec in specs.items()}
+    keywords = {}
+
+    for name, future in futures.items():
+        spec = specs[name]
+        try:
+            result, feed_cache, articles, feed, crawl = future.result()
+            if result == "not_modified":
+                data = json.loads(not_modified_json(spec["title"], request, feed_cache))
+            elif result is not None:
+                data = result
+            else:
+                if spec["keywords"] not in keywords:
+                    keywords[spec["keywords"]] = load_keywords(request.user, spec["keywords"])
+                data = analyze_and_save(spec, request, feed_cache, articles, feed, crawl, keywords[spec["keywords"]])
+            results[name] = {"data": data, "error": None, "elapsed": round(time.time() - start, 2)}
+            metadata = data.get('metadata') or {}
+            failed = metadata.get('status') == 'error'
+            health.record_source(name, not failed, metadata.get('message', '') if failed else '')
+        except Exception as e:
+            results[name] = {"data": None, "error": str(e), "elapsed": round(time.time() - start, 2)}
+            health.record_source(name, False, str(e))
+        if on_done:
+            on_done(name, results[name])
+
+    health.maybe_flush()
+    return {name: results[name] for name in names}
+
+
+def scrape_feed(name, request):
+    """Single feed scraper - JSON string like the other keyboard_* scrapers"""
+    result = scrape_feeds([name], request)[name]
+    if result["error"]:
+        return json.dumps(error_result(result["error"]), ensure_ascii=False)
+    return json.dumps(result["data"], ensure_ascii=False)
+
+
+def fetch_feed_news(name, request):
+    """Summary dict of a single feed run for the keyboard views"""
+    title = FEEDS[name]["title"]
+    try:
+        result_data = json.loads(scrape_feed(name, request))
+        return {
+            "status": result_data["metadata"]["status"],
+            "message": result_data.get("alert_message", f"{title} fetch completed"),
+            "stats": {
+                "saved": result_data["metadata"]["database_save"]["new_articles_saved"],
+                "updated": result_data["metadata"]["database_save"]["existing_articles_updated"],
+                "errors": result_data["metadata"]["database_save"]["errors"],
+                "security_articles": result_data["metadata"]["articles_with_keywords"],
+                "total_processed": result_data["metadata"]["total_articles_scraped"]
+            },
+            "data": result_data
+        }
+    except Exception as e:
+        return {
+            "status": "error",
+            "message": f"Error fetching {title}: {str(e)}"
+        }
@@ -0,0 +1,284 @@
+"""
+Local fixture HTTP server for offline scraper benchmarks.
+
+Every request arrives as /<original host>/<original path> (see
+engine.set_host_override). Pages recorded from a real crawl (exported from the
+page cache with export_recordings) are served as they were; anything else
+gets a synthetic RSS feed, listing page or article page shaped like the real
+Nepali news sites.
+"""
+import contextlib
+import hashlib
+import json
+import random
+import re
+import shutil
+import threading
+import time
+import zlib
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+
+ARTICLE_PATH = re.compile(r'/\d{4}/\d{2}/\d{2}/story-\d+')
+
+FIXTURE_WORDS = ["सुरक्षा", "प्रहरी", "सेना", "आन्दोलन", "निर्वाचन", "सरकार", "नेपाल", "काठमाडौं"]
+KEYWORDS = [("सुरक्षा", "benchmark"), ("आन्दोलन", "benchmark"), ("सेना", "benchmark")]
+
+# Injected failures: the status answered, or 'reset' (connection closed without a response)
+ERROR_KINDS = {
+    '503': 503,
+    '500': 500,
+    '429': 429,
+    'reset': None,
+}
+
+
+def _sentence(seed):
+    rng = random.Random(seed)
+    return " ".join(rng.choice(FIXTURE_WORDS) for _ in range(12)) + "।"
+
+
+def _article_url(host, n):
+    day = datetime.now().strftime('%Y/%m/%d')
+    return f"https://{host}/{day}/story-{n}"
+
+
+def render_feed(host, items=20):
+    # Stable within the hour so repeated polls see an identical feed (ETag / 304)
+    pub_date = datetime.now().strftime('%a, %d %b %Y %H:00:00') + " +0000"
+    entries = []
+    for n in range(items):
+        entries.append(f"""
+    <item>
+      <title>{_sentence(n)} समाचार {n}</title>
+      <link>{_article_url(host, n)}</link>
+      <guid>{_article_url(host, n)}</guid>
+      <pubDate>{pub_date}</pubDate>
+      <dc:creator>fixture</dc:creator>
+      <category>समाचार</category>
+      <description><![CDATA[<img class="wp-post-image" src="https://{host}/img/{n}.jpg" /> {_sentence(n + 1)} {_sentence(n + 2)}]]></description>
+      <content:encoded><![CDATA[<p>{_sentence(n + 3)}</p><p>{_sentence(n + 4)}</p>]]></content:encoded>
+    </item>""")
+    return f"""<?xml version="1.0" encoding="UTF-8"?>
+<rss version="2.0" xmlns:content="http://purl.org/rss/1.0/modules/content/" xmlns:dc="http://purl.org/dc/elements/1.1/">
+  <channel>
+    <title>{host}</title>
+    <link>https://{host}/</link>{''.join(entries)}
+  </channel>
+</rss>"""
+
+
+def render_listing(host, path, items=12):
+    offset = sum(map(ord, path)) % 1000 * 100
+    blocks = []
+    for n in range(offset, offset + items):
+        blocks.append(f"""
+<div class="category-description">
+  <article class="card">
+    <h2><a href="{_article_url(host, n)}">{_sentence(n)} समाचार {n}</a></h2>
+    <time>{datetime.now().strftime('%Y-%m-%d')}</time>
+    <img src="https://{host}/img/{n}.jpg" />
+    <p class="excerpt">{_sentence(n + 1)}</p>
+  </article>
+</div>""")
+    return f"""<html><head><title>{host}</title></head><body>{''.join(blocks)}
+</body></html>"""
+
+
+def render_article(host, path):
+    seed = sum(map(ord, path))
+    paragraphs = "".join(f"<p>{_sentence(seed + i)} {_sentence(seed + i + 7)}</p>" for i in range(12))
+    return f"""<html><head>
+<meta charset="utf-8">
+<meta property="article:published_time" content="{datetime.now().strftime('%Y-%m-%dT%H:%M:%S')}">
+<meta property="og:image" content="https://{host}/img/{seed}.jpg">
+<title>{_sentence(seed)}</title>
+</head><body>
+<header><nav><a href="/">Home</a></nav></header>
+<article><div class="news-content">{paragraphs}</div></article>
+<footer><p>Copyright fixture</p></footer>
+</body></html>"""
+
+
+@contextlib.contextmanager
+def bench_database():
+    """Run the block against a throw-away test database migrated from scratch, never the real one"""
+    from django.test.utils import setup_databases, teardown_databases
+    from utils.keyword_matcher import clear_cache
+
+    old_config = setup_databases(verbosity=0, interactive=False, serialized_aliases=())
+    clear_cache()
+    try:
+        yield
+    finally:
+        teardown_databases(old_config, verbosity=0)
+        clear_cache()
+
+
+def create_bench_user(username):
+    """Throw-away user owning the benchmark keywords and articles"""
+    from collect.models import DangerousKeyword, User
+
+    user, _ = User.objects.get_or_create(username=username, defaults={'email': f"{username}@localhost"})
+    for word, category in KEYWORDS:
+        DangerousKeyword.objects.get_or_create(word=word, category=category, defaults={'created_by': user})
+    return user
+
+
+def delete_bench_user(user):
+    from collect.models import AutoNewsArticle, DangerousKeyword
+
+    AutoNewsArticle.objects.filter(created_by=user).delete()
+    DangerousKeyword.objects.filter(created_by=user).delete()
+    user.delete()
+
+
+# ============ RECORDINGS ============
+def export_recordings(directory, hosts=None):
+    """
+    Copy the page cache (pages of a real crawl) into directory for FixtureServer:
+    index.json maps each canonical URL to its zlib blob under pages/.
+    Returns the number of pages exported.
+    """
+    from collect.models import CachedPage
+    from collect.scrapers import page_cache
+
+    page_cache.flush()
+    directory = Path(directory)
+    (directory / 'pages').mkdir(parents=True, exist_ok=True)
+    index_path = directory / 'index.json'
+    index = json.loads(index_path.read_text(encoding='utf-8')) if index_path.exists() else {}
+
+    exported = 0
+    for url, content_hash, content_type in CachedPage.objects.values_list('url', 'content_hash', 'content_type').iterator():
+        host = url.split('/')[2]
+        if hosts and host.removeprefix('www.') not in hosts:
+            continue
+        blob = page_cache._blob_path(content_hash)
+        target = directory / 'pages' / blob.name
+        if not target.exists():
+            try:
+                shutil.copyfile(blob, target)
+            except OSError:
+                continue
+        index[url] = [blob.name, content_type]
+        exported += 1
+    index_path.write_text(json.dumps(index, indent=1, sort_keys=True), encoding='utf-8')
+    return exported
+
+
+class Recordings:
+    """Recorded pages exported by export_recordings(), looked up by host + path"""
+
+    def __init__(self, directory):
+        self.directory = Path(directory)
+        self.index = {}
+        index_path = self.directory / 'index.json'
+        if index_path.exists():
+            for url, entry in json.loads(index_path.read_text(encoding='utf-8')).items():
+                # Scheme-less key: the fixture server only sees /<host>/<path>
+                self.index[url.split('://', 1)[-1]] = entry
+        self.hits = 0
+
+    def __len__(self):
+        return len(self.index)
+
+    def get(self, host, path):
+        """(content_type, body bytes) or None"""
+        from collect.scrapers.page_cache import canonical_url
+
+        key = canonical_url(f"https://{host}{path}").split('://', 1)[-1]
+        entry = self.index.get(key)
+        if entry is None:
+            return None
+        try:
+            body = zlib.decompress((self.directory / 'pages' / entry[0]).read_bytes())
+        except (OSError, zlib.error):
+            return None
+        self.hits += 1
+        return entry[1] or 'text/html; charset=utf-8', body
+
+
+class FixtureServer:
+    """ThreadingHTTPServer on 127.0.0.1 with configurable latency, jitter and injected errors"""
+
+    def __init__(self, latency=0.05, error_rate=0.0, errors=('503',), jitter=0.0, recordings=None):
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.errors = [kind for kind in errors if kind in ERROR_KINDS] or ['503']
+        self.recordings = Recordings(recordings) if recordings else None
+        self.requests = 0
+        self.bytes_sent = 0
+        self.errors_injected = 0
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(('127.0.0.1', 0), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def base_url(self):
+        host, port = self._server.server_address
+        return f"http://{host}:{port}"
+
+    def _handler_class(self):
+        fixture = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                time.sleep(max(0.0, fixture.latency + random.uniform(-fixture.jitter, fixture.jitter)))
+                parts = self.path.lstrip('/').split('/', 1)
+                host = parts[0]
+                path = '/' + (parts[1] if len(parts) > 1 else '')
+                recorded = fixture.recordings.get(host, path) if fixture.recordings else None
+
+                if fixture.error_rate and random.random() < fixture.error_rate:
+                    with fixture._lock:
+                        fixture.errors_injected += 1
+                    status = ERROR_KINDS[random.choice(fixture.errors)]
+                    if status is None:
+                        self.close_connection = True
+                        return
+                    content_type, payload = 'text/plain', b'fixture error'
+                elif recorded is not None:
+                    status, (content_type, payload) = 200, recorded
+                elif 'feed' in path or 'rss' in path or path.endswith('.xml'):
+                    status, content_type, payload = 200, 'application/rss+xml; charset=utf-8', render_feed(host).encode('utf-8')
+                elif ARTICLE_PATH.search(path):
+                    status, content_type, payload = 200, 'text/html; charset=utf-8', render_article(host, path).encode('utf-8')
+                else:
+                    status, content_type, payload = 200, 'text/html; charset=utf-8', render_listing(host, path).encode('utf-8')
+
+                headers = {'Content-Type': content_type}
+                if status == 200 and 'xml' in content_type:
+                    etag = '"%s"' % hashlib.md5(payload).hexdigest()
+                    headers['ETag'] = etag
+                    if self.headers.get('If-None-Match') == etag:
+                        status, payload = 304, b''
+
+                self.send_response(status)
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.send_header('Content-Length', str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+                with fixture._lock:
+                    fixture.requests += 1
+                    fixture.bytes_sent += len(payload)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
@@ -0,0 +1,410 @@
+"""
+Circuit breakers and health scores for scraped hosts and sources.
+
+Every host the engine fetches from, and every source it runs, has a breaker:
+
+- closed: requests go through; outcomes feed a moving error rate and latency.
+  FAILURE_THRESHOLD consecutive failures (or a sustained error rate) open it.
+- open: engine.fetch() raises CircuitOpenError at once instead of burning
+  timeouts and retries, and run_sources() skips the source. After the cooldown
+  (doubled on every failed probe, up to max_cooldown) the breaker half-opens.
+- half-open: a host is probed in the background (one GET of a page it served
+  before) and closes again on success; a source lets one run through as the
+  trial.
+
+Site-monitor checks (monitor_sites and the events in down_sites.log) feed the
+same host breakers. State is kept in memory, read from SourceHealth once per
+run and written back in one upsert - never from the engine's loop thread,
+which must stay free of DB calls.
+"""
+import re
+import threading
+import time
+from datetime import datetime, timedelta
+from urllib.parse import urlsplit
+
+import requests
+from django.db import DatabaseError
+from django.utils import timezone
+
+from collect.models import SourceHealth
+
+
+# ============ POLICIES ============
+BREAKER_POLICIES = {
+    # Hosts: one failure already includes the session's own connection retries
+    'host': {"failure_threshold": 3, "base_cooldown": 60, "max_cooldown": 30 * 60},
+    # Whole scraper runs are expensive - trip sooner relative to their cost, stay open longer
+    'source': {"failure_threshold": 3, "base_cooldown": 10 * 60, "max_cooldown": 6 * 3600},
+}
+
+ALPHA = 0.2                   # weight of the latest outcome in error_rate / latency
+ERROR_RATE_THRESHOLD = 0.6    # moving error rate that opens a breaker ...
+MIN_REQUESTS = 10             # ... once this many outcomes were seen
+SLOW_MS = 1000                # latency that starts lowering the health score
+PROBE_INTERVAL = 15           # seconds between two background probe passes
+PROBE_TIMEOUT = 10
+PERSIST_EVERY = 10            # seconds between two upserts while a run is going
+
+_breakers = {}
+_lock = threading.Lock()
+_loaded = False
+_persist = True
+_last_flush = 0.0
+_prober = None
+
+
+class CircuitOpenError(requests.ConnectionError):
+    """Raised by engine.fetch() instead of contacting a host whose breaker is open"""
+
+
+def host_of(url):
+    host = (urlsplit(url).hostname or url).lower()
+    return host[4:] if host.startswith('www.') else host
+
+
+class Breaker:
+    """closed / open / half-open state of one host or source"""
+
+    FIELDS = [
+        'state', 'probe_url', 'error_rate', 'latency_ms', 'consecutive_failures', 'requests', 'failures',
+        'trips', 'open_until', 'cooldown', 'last_error', 'last_success_at', 'last_failure_at',
+    ]
+
+    def __init__(self, kind, name):
+        self.kind = kind
+        self.name = name
+        self.policy = BREAKER_POLICIES[kind]
+        self.state = 'closed'
+        self.probe_url = ''
+        self.error_rate = 0.0
+        self.latency_ms = None
+        self.consecutive_failures = 0
+        self.requests = 0
+        self.failures = 0
+        self.trips = 0
+        self.open_until = None
+        self.cooldown = 0
+        self.last_error = ''
+        self.last_success_at = None
+        self.last_failure_at = None
+        self.trial_running = False
+        self.dirty = False
+
+    def load(self, row):
+        for field in self.FIELDS:
+            setattr(self, field, getattr(row, field))
+
+    def allow(self, now):
+        if self.state == 'closed':
+            return True
+        if self.state == 'open' and now >= self.open_until:
+            self.state = 'half_open'
+            self.dirty = True
+        if self.state == 'half_open' and self.kind == 'source' and not self.trial_running:
+            # One trial run; hosts wait for the background probe instead
+            self.trial_running = True
+            return True
+        return False
+
+    def record(self, ok, now, latency_ms=None, error=''):
+        self.requests += 1
+        self.error_rate = (1 - ALPHA) * self.error_rate + ALPHA * (0.0 if ok else 1.0)
+        self.trial_running = False
+        self.dirty = True
+        if ok:
+            if latency_ms is not None:
+                self.latency_ms = latency_ms if self.latency_ms is None else (1 - ALPHA) * self.latency_ms + ALPHA * latency_ms
+            self.consecutive_failures = 0
+            self.last_success_at = now
+            if self.state != 'closed':
+                self.state, self.open_until, self.cooldown = 'closed', None, 0
+            return
+
+        self.failures += 1
+        self.consecutive_failures += 1
+        self.last_error = str(error)[:255]
+        self.last_failure_at = now
+        if self.state == 'half_open':
+            self.trip(now)
+        elif self.state == 'closed' and (
+            self.consecutive_failures >= self.policy["failure_threshold"]
+            or (self.requests >= MIN_REQUESTS and self.error_rate >= ERROR_RATE_THRESHOLD)
+        ):
+            self.trip(now)
+
+    def trip(self, now):
+        self.cooldown = min(self.cooldown * 2, self.policy["max_cooldown"]) if self.cooldown else self.policy["base_cooldown"]
+        self.state = 'open'
+        self.open_until = now + timedelta(seconds=self.cooldown)
+        self.trips += 1
+
+    def score(self):
+        """0-100: share of recent successes, lowered for slow responses and an open breaker"""
+        score = 100 * (1 - self.error_rate)
+        if self.latency_ms and self.latency_ms > SLOW_MS:
+            score *= max(0.5, SLOW_MS / self.latency_ms)
+        if self.state != 'closed':
+            score *= 0.5
+        return round(score)
+
+    def as_row(self):
+        row = SourceHealth(kind=self.kind, name=self.name, updated_at=timezone.now())
+        for field in self.FIELDS:
+            setattr(row, field, getattr(self, field))
+        return row
+
+
+# ============ REGISTRY ============
+def set_persistence(enabled):
+    """
+    Off: start from empty in-memory breakers and never read or write SourceHealth
+    (benchmarks against the fixture server must not touch the real hosts' state)
+    """
+    global _persist, _loaded
+    with _lock:
+        _persist = bool(enabled)
+        _breakers.clear()
+        _loaded = not _persist
+
+
+def _get(kind, name):
+    key = (kind, name)
+    breaker = _breakers.get(key)
+    if breaker is None:
+        breaker = _breakers[key] = Breaker(kind, name)
+    return breaker
+
+
+def load():
+    """Take the persisted state of every breaker without unsaved local changes (one query)"""
+    global _loaded
+    if not _persist:
+        return
+    try:
+        rows = list(SourceHealth.objects.all())
+    except DatabaseError as e:
+        print(f"⚠️ Health: could not load breaker state: {e}")
+        return
+    with _lock:
+        for row in rows:
+            breaker = _get(row.kind, row.name)
+            if not breaker.dirty and not breaker.trial_running:
+                breaker.load(row)
+        _loaded = True
+
+
+def _ensure_loaded():
+    if not _loaded:
+        load()
+
+
+def flush():
+    """Write changed breakers in a single upsert"""
+    global _last_flush
+    if not _persist:
+        return 0
+    with _lock:
+        changed = [breaker for breaker in _breakers.values() if breaker.dirty]
+        rows = [breaker.as_row() for breaker in changed]
+        for breaker in changed:
+            breaker.dirty = False
+        _last_flush = time.monotonic()
+    if not rows:
+        return 0
+    try:
+        SourceHealth.objects.bulk_create(
+            rows,
+            update_conflicts=True,
+            unique_fields=['kind', 'name'],
+            update_fields=Breaker.FIELDS + ['updated_at'],
+        )
+    except DatabaseError as e:
+        with _lock:
+            for breaker in changed:
+                breaker.dirty = True
+        print(f"⚠️ Health: could not store breaker state: {e}")
+        return 0
+    return len(rows)
+
+
+def maybe_flush():
+    if time.monotonic() - _last_flush >= PERSIST_EVERY:
+        flush()
+
+
+# ============ HOSTS ============
+def check_host(url):
+    """Raise CircuitOpenError when the host of url is open (caller threads only - may load state)"""
+    _ensure_loaded()
+    host = host_of(url)
+    with _lock:
+        breaker = _get('host', host)
+        if not breaker.probe_url:
+            parts = urlsplit(url)
+            breaker.probe_url = f"{parts.scheme}://{parts.netloc}/"
+            breaker.dirty = True
+        allowed = breaker.allow(timezone.now())
+        open_until = breaker.open_until
+    if not allowed:
+        until = timezone.localtime(open_until).strftime('%H:%M:%S') if open_until else 'probe'
+        raise CircuitOpenError(f"Circuit open for {host} (until {until})")
+
+
+def host_allowed(url):
+    """In-memory check for the engine loop (retries)"""
+    with _lock:
+        return _get('host', host_of(url)).allow(timezone.now())
+
+
+def record_host(url, ok, latency_ms=None, error=''):
+    """Outcome of one request (in memory only - safe on the engine loop thread)"""
+    host = host_of(url)
+    with _lock:
+        breaker = _get('host', host)
+        was_closed = breaker.state == 'closed'
+        breaker.record(ok, timezone.now(), latency_ms, error)
+        tripped = was_closed and breaker.state == 'open'
+        cooldown = breaker.cooldown
+    if tripped:
+        print(f"🔌 Circuit opened for {host} ({error}) - skipping it for {cooldown}s")
+
+
+def record_monitor(url, up, response_time=None, error=''):
+    """Site-monitor check result (monitor_sites / down_sites.log)"""
+    if not url.startswith(('http://', 'https://')):
+        url = 'https://' + url
+    with _lock:
+        breaker = _get('host', host_of(url))
+        if not breaker.probe_url:
+            breaker.probe_url = url
+    record_host(url, up, response_time, error)
+
+
+# ============ SOURCES ============
+def allow_source(name):
+    _ensure_loaded()
+    with _lock:
+        return _get('source', name).allow(timezone.now())
+
+
+def record_source(name, ok, error=''):
+    with _lock:
+        breaker = _get('source', name)
+        was_closed = breaker.state == 'closed'
+        breaker.record(ok, timezone.now(), error=error)
+        tripped = was_closed and breaker.state == 'open'
+        cooldown = breaker.cooldown
+    if tripped:
+        print(f"🔌 Circuit opened for source {name} - skipped for {cooldown // 60} min")
+
+
+def source_skip_message(name):
+    with _lock:
+        breaker = _get('source', name)
+        until = timezone.localtime(breaker.open_until).strftime('%H:%M') if breaker.open_until else '?'
+        return f"Skipped: circuit open after {breaker.consecutive_failures} failed runs (retry after {until})"
+
+
+# ============ BACKGROUND PROBES ============
+def probe_due():
+    """GET the probe page of every host whose cooldown is over; the outcome closes or re-opens it"""
+    from collect.scrapers.engine import rewrite_url
+    from utils.http_session import session_for
+
+    now = timezone.now()
+    with _lock:
+        due = [
+            breaker for breaker in _breakers.values()
+            if breaker.kind == 'host' and breaker.probe_url and (
+                breaker.state == 'half_open' or (breaker.state == 'open' and now >= breaker.open_until)
+            )
+        ]
+        for breaker in due:
+            breaker.state = 'half_open'
+    for breaker in due:
+        start = time.monotonic()
+        try:
+            response = session_for(breaker.probe_url, policy='monitor').get(
+                rewrite_url(breaker.probe_url), timeout=PROBE_TIMEOUT
+            )
+            ok, error = response.status_code < 500, f"HTTP {response.status_code}"
+        except requests.RequestException as e:
+            ok, error = False, type(e).__name__
+        record_host(breaker.probe_url, ok, round((time.monotonic() - start) * 1000), error)
+        print(f"{'✅' if ok else '🔌'} Probe {breaker.name}: {'closed' if ok else f'still down ({error})'}")
+    if due:
+        flush()
+    return len(due)
+
+
+def _probe_forever():
+    while True:
+        time.sleep(PROBE_INTERVAL)
+        try:
+            probe_due()
+        except Exception as e:
+            print(f"⚠️ Health probe failed: {e}")
+
+
+def start_prober():
+    """Start the background probe thread of this process (idempotent)"""
+    global _prober
+    with _lock:
+        if _prober is None:
+            _prober = threading.Thread(target=_probe_forever, name="health-prober", daemon=True)
+            _prober.start()
+
+
+# ============ SITE-MONITOR LOG ============
+LOG_EVENT = re.compile(
+    r"(?P<time>\d{4}-\d\d-\d\d \d\d:\d\d:\d\d).*?(?P<event>DOWN|RECOVERED) - .*?\| URL: (?P<url>\S+)"
+    r"(?:.*?Error: (?P<error>[^|]+))?(?:.*?Response Time: (?P<ms>\d+)ms)?"
+)
+
+
+def import_monitor_log(path):
+    """Fold down_sites.log events newer than each host's last recorded outcome into the breakers"""
+    _ensure_loaded()
+    imported = 0
+    tz = timezone.get_current_timezone()
+    with open(path, encoding='utf-8', errors='replace') as f:
+        for line in f:
+            match = LOG_EVENT.search(line)
+            if not match:
+                continue
+            at = timezone.make_aware(datetime.strptime(match['time'], '%Y-%m-%d %H:%M:%S'), tz)
+            url = match['url']
+            ok = match['event'] == 'RECOVERED'
+            with _lock:
+                breaker = _get('host', host_of(url))
+                latest = max(filter(None, [breaker.last_success_at, breaker.last_failure_at]), default=None)
+                if latest is not None and at <= latest:
+                    continue
+                if not breaker.probe_url:
+                    breaker.probe_url = url
+                breaker.record(ok, at, int(match['ms']) if match['ms'] else None, (match['error'] or '').strip())
+            imported += 1
+    flush()
+    return imported
+
+
+def health_stats(kind=None):
+    with _lock:
+        breakers = sorted(_breakers.values(), key=lambda b: (b.kind, b.name))
+        return [
+            {
+                "kind": breaker.kind,
+                "name": breaker.name,
+                "state": breaker.state,
+                "score": breaker.score(),
+                "error_rate": round(breaker.error_rate, 3),
+                "latency_ms": round(breaker.latency_ms) if breaker.latency_ms is not None else None,
+                "requests": breaker.requests,
+                "failures": breaker.failures,
+                "trips": breaker.trips,
+                "open_until": breaker.open_until,
+                "last_error": breaker.last_error,
+            }
+            for breaker in breakers if kind is None or breaker.kind == kind
+        ]
@@ -0,0 +1,66 @@
+"""
+HTML parsing backends for article pages.
+
+parse_article() is a drop-in for BeautifulSoup(response.content, 'html.parser')
+in the fetch_article_content helpers:
+
+- lxml is used when it is installed (it is optional - see requirements.txt),
+  otherwise the stdlib html.parser.
+- A SoupStrainer keeps only what the article extractors look at: meta/time/
+  article/figure/img/p tags and every element carrying a class or id
+  attribute (their whole subtree is kept), so scripts, styles and bare layout
+  wrappers are never turned into Tag objects.
+- The charset from the Content-Type header is passed as from_encoding, which
+  skips BeautifulSoup's encoding detection.
+"""
+import re
+
+from bs4 import BeautifulSoup, SoupStrainer
+
+try:
+    import lxml  # noqa: F401
+    DEFAULT_BACKEND = 'lxml'
+except ImportError:
+    DEFAULT_BACKEND = 'html.parser'
+
+
+# Tags the date/content/image selectors of the article scrapers match on
+ARTICLE_TAGS = {'meta', 'time', 'article', 'figure', 'img', 'p'}
+
+CHARSET_PATTERN = re.compile(r'charset=["\']?([\w.:-]+)', re.I)
+
+
+def _keep_tag(name, attrs):
+    return name in ARTICLE_TAGS or bool(attrs and (attrs.get('class') or attrs.get('id')))
+
+
+if hasattr(SoupStrainer, 'allow_tag_creation'):
+    # beautifulsoup4 >= 4.13
+    class ArticleStrainer(SoupStrainer):
+        def allow_tag_creation(self, nsprefix, name, attrs):
+            return _keep_tag(name, attrs)
+
+    ARTICLE_STRAINER = ArticleStrainer()
+else:
+    ARTICLE_STRAINER = SoupStrainer(_keep_tag)
+
+
+def header_charset(headers):
+    """Charset declared in the Content-Type header, or None"""
+    match = CHARSET_PATTERN.search((headers or {}).get('Content-Type', ''))
+    return match.group(1) if match else None
+
+
+def parse_html(content, backend=None, strain=True, charset=None):
+    """BeautifulSoup of raw HTML with the chosen backend (None -> best available)"""
+    kwargs = {}
+    if strain:
+        kwargs['parse_only'] = ARTICLE_STRAINER
+    if charset and isinstance(content, bytes):
+        kwargs['from_encoding'] = charset
+    return BeautifulSoup(content, backend or DEFAULT_BACKEND, **kwargs)
+
+
+def parse_article(response, backend=None):
+    """Parsed article page from a requests response"""
+    return parse_html(response.content, backend=backend, charset=header_charset(response.headers))
@@ -0,0 +1,182 @@
+"""
+Batched ingestion of scraped articles into AutoNewsArticle.
+
+Scrapers hand over plain dicts keyed by model field name and
+ingest_articles() writes the whole batch in one transaction:
+
+- values are clipped to the model's max_lengths and records are
+  de-duplicated by URL (the last one wins, the others count as duplicates);
+- the seen-set tells new URLs from existing ones (one query for its positives);
+  rows without a user have no unique-constraint backstop, so for them every
+  URL is looked up in the DB - another process's recent rows may not be in
+  this process's seen-set yet;
+- the rows to write get sentiment and danger_score in one batched scoring
+  stage (utils/danger.py: one model predict, one keyword matcher); existing
+  rows whose title and summary are unchanged keep their stored scores;
+- rows go out in bulk_create() batches that upsert on the (url, created_by)
+  unique constraint - update_conflicts refreshes existing rows,
+  ignore_conflicts leaves them alone.
+
+SQLite never treats NULLs as equal in a unique constraint, so articles without
+a user cannot conflict; their existing rows are refreshed with bulk_update().
+"""
+import logging
+import time
+
+from django.db import DatabaseError, transaction
+
+from collect.models import AutoNewsArticle
+from collect.scrapers.seen_urls import get_filter, record_saved
+from utils.danger import score_articles
+
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = 500
+
+# Refreshed on existing rows unless the caller passes its own list
+UPDATE_FIELDS = [
+    'title', 'summary', 'image_url', 'content_length',
+    'priority', 'threat_level', 'keywords', 'categories',
+]
+
+# Computed from title + summary: carried over from the stored row while those are unchanged
+SCORE_FIELDS = ['sentiment', 'danger_score']
+
+MAX_LENGTHS = {
+    field.name: field.max_length
+    for field in AutoNewsArticle._meta.concrete_fields
+    if getattr(field, 'max_length', None)
+}
+
+
+def _clip(record):
+    values = {}
+    for name, value in record.items():
+        if isinstance(value, str) and name in MAX_LENGTHS:
+            value = value[:MAX_LENGTHS[name]]
+        values[name] = value
+    return values
+
+
+def _carry_scores(row, stored):
+    """Reuse the stored row's scores when the text they were computed from is unchanged"""
+    if stored and stored['title'] == row.title and stored['summary'] == row.summary:
+        row.sentiment, row.danger_score = stored['sentiment'], stored['danger_score']
+
+
+def _score(rows, user):
+    """Sentiment and danger score of the rows that don't carry them yet, as one batch"""
+    pending = [row for row in rows if row.sentiment is None or row.danger_score is None]
+    if not pending:
+        return
+    try:
+        scores = score_articles([(row.title, row.summary) for row in pending], user)
+    except Exception:
+        # Scoring never costs the articles - they are saved unscored and score_articles backfills them
+        logger.exception("Scoring %d article(s) failed, saving them without scores", len(pending))
+        print(f"⚠️ {len(pending)} article(s) saved without scores")
+        return
+    for row, (sentiment, danger_score) in zip(pending, scores):
+        row.sentiment, row.danger_score = sentiment, danger_score
+
+
+def _write(rows, user, update_existing, update_fields, existing_pks):
+    if user is None and update_existing:
+        updates = [row for row in rows if row.url in existing_pks]
+        for row in updates:
+            row.pk = existing_pks[row.url]
+        AutoNewsArticle.objects.bulk_update(updates, update_fields, batch_size=BATCH_SIZE)
+        AutoNewsArticle.objects.bulk_create(
+            [row for row in rows if row.url not in existing_pks], batch_size=BATCH_SIZE
+        )
+    elif update_existing:
+        AutoNewsArticle.objects.bulk_create(
+            rows, batch_size=BATCH_SIZE, update_conflicts=True,
+            unique_fields=['url', 'created_by'], update_fields=update_fields,
+        )
+    else:
+        AutoNewsArticle.objects.bulk_create(rows, batch_size=BATCH_SIZE, ignore_conflicts=True)
+
+
+def ingest_articles(records, user, update_existing=True, update_fields=None, keyword_scope="user"):
+    """
+    Save records (dicts of AutoNewsArticle fields, url required) for user in one transaction.
+
+    Existing (url, user) rows get update_fields refreshed, or are left alone
+    and counted as duplicates when update_existing is False.
+    Danger scores use user's keywords, or everyone's with keyword_scope "all"
+    (the scope the records were matched with, see feeds.DEFAULT_FEED).
+    Returns {"saved", "updated", "duplicates", "errors", "error_messages", "score_seconds", "db_seconds"}
+    """
+    start = time.time()
+    update_fields = list(update_fields or UPDATE_FIELDS)
+    update_fields += [field for field in SCORE_FIELDS if field not in update_fields]
+    result = {"saved": 0, "updated": 0, "duplicates": 0, "errors": 0, "error_messages": [],
+              "score_seconds": 0.0, "db_seconds": 0.0}
+
+    by_url = {}
+    for record in records:
+        values = _clip(record)
+        if not values.get('url'):
+            result["errors"] += 1
+            result["error_messages"].append("Article without URL")
+            continue
+        if values['url'] in by_url:
+            result["duplicates"] += 1
+        by_url[values['url']] = values
+    if not by_url:
+        return result
+
+    # The existing rows come back with what their scores were computed from
+    stored_fields = ['pk', 'title', 'summary'] + SCORE_FIELDS
+    if user is None:
+        # A NULL created_by never conflicts, so a duplicate would be inserted silently:
+        # ask the DB about every URL instead of trusting (possibly stale) seen-set negatives
+        urls = list(by_url)
+        existing = [
+            row for start in range(0, len(urls), BATCH_SIZE)
+            for row in AutoNewsArticle.objects.filter(
+                created_by__isnull=True, url__in=urls[start:start + BATCH_SIZE]
+            ).values('url', *stored_fields)
+        ]
+    else:
+        # The (url, user) unique constraint catches what a stale seen-set misses
+        existing = get_filter(user).existing_rows(list(by_url), *stored_fields)
+    stored = {row['url']: row for row in existing}
+    existing_pks = {url: row['pk'] for url, row in stored.items()}
+
+    rows = []
+    for url, values in by_url.items():
+        if url in existing_pks and not update_existing:
+            result["duplicates"] += 1
+            continue
+        row = AutoNewsArticle(created_by=user, **values)
+        _carry_scores(row, stored.get(url))
+        rows.append(row)
+
+    score_start = time.time()
+    _score(rows, user if keyword_scope == "user" else None)
+    result["score_seconds"] = round(time.time() - score_start, 3)
+
+    written = rows
+    try:
+        with transaction.atomic():
+            _write(rows, user, update_existing, update_fields, existing_pks)
+    except DatabaseError:
+        # Isolate the offending rows - everything else is still written
+        written = []
+        for row in rows:
+            try:
+                with transaction.atomic():
+                    _write([row], user, update_existing, update_fields, existing_pks)
+                written.append(row)
+            except DatabaseError as e:
+                result["errors"] += 1
+                result["error_messages"].append(f"{row.url[:80]}: {str(e)[:100]}")
+
+    for row in written:
+        result["updated" if row.url in existing_pks else "saved"] += 1
+    record_saved(user, [row.url for row in written if row.url not in existing_pks])
+    result["db_seconds"] = round(time.time() - start, 3)
+    return result
@@ -0,0 +1,305 @@
+"""
+Durable background queue for long-running scrapes - a SQLite table, no broker.
+
+Views enqueue() a ScrapeJob and return straight away; `manage.py run_workers`
+processes claim() the oldest runnable job with a single conditional UPDATE
+(a compare-and-swap on its state and lease), so two workers never run the
+same job. While a job runs, its worker renews the lease every HEARTBEAT
+seconds and writes the buffered progress messages in the same statement. A job
+whose worker died is claimed again once its lease has expired, until
+max_attempts is used up.
+
+The channel layer is in-memory (per process), so workers cannot group_send to
+the browser: ThreatConsumer polls job_updates() and relays the new messages.
+"""
+import json
+import os
+import signal
+import socket
+import threading
+import time
+import traceback
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import DatabaseError, close_old_connections, connection
+from django.db.models import F, Q
+from django.utils import timezone
+
+from collect.models import ScrapeJob
+from utils.websocket_helper import add_listener, remove_listener
+
+
+LEASE = getattr(settings, 'SCRAPE_JOB_LEASE', 300)             # seconds a claim stays valid without a heartbeat
+HEARTBEAT = 2                                                  # seconds between progress / lease writes
+POLL_INTERVAL = getattr(settings, 'SCRAPE_JOB_POLL_INTERVAL', 2)
+PROGRESS_LIMIT = 200                                           # messages kept on the job row
+CATCH_UP = 20                                                  # messages relayed for a job already under way
+ACTIVE_STATES = ('queued', 'running')
+
+
+# ============ HANDLERS ============
+def _keyboard_autofeed(job, payload, report):
+    from collect.scrapers.autofeed import keyboard_autofeed
+    return keyboard_autofeed(job.created_by, payload.get('source'), report)
+
+
+def _news_autofeed(job, payload, report):
+    from collect.scrapers.autofeed import news_autofeed
+    return news_autofeed(report)
+
+
+def _scheduled_scrape(job, payload, report):
+    from collect.scrapers.scheduler import run_scheduled
+    return run_scheduled(payload['schedule_id'], report)
+
+
+# ScrapeJob.kind -> handler(job, payload, report) returning the JSON result
+JOB_HANDLERS = {
+    'keyboard_autofeed': _keyboard_autofeed,
+    'news_autofeed': _news_autofeed,
+    'scheduled_scrape': _scheduled_scrape,
+}
+
+
+# ============ QUEUE ============
+def enqueue(kind, user=None, payload=None):
+    """
+    Queue a job, or return the identical one that is still queued/running.
+    Returns (job, created)
+    """
+    if kind not in JOB_HANDLERS:
+        raise ValueError(f"Unknown job kind '{kind}'")
+    payload = json.dumps(payload or {}, sort_keys=True)
+    existing = ScrapeJob.objects.filter(
+        kind=kind, created_by=user, payload=payload, state__in=ACTIVE_STATES
+    ).order_by('created_at').first()
+    if existing is not None:
+        return existing, False
+    return ScrapeJob.objects.create(kind=kind, created_by=user, payload=payload), True
+
+
+def _claimable(now):
+    return ScrapeJob.objects.filter(Q(state='queued') | Q(state='running', lease_until__lt=now))
+
+
+def claim(worker):
+    """Take the oldest queued (or abandoned) job for worker, or None"""
+    while True:
+        now = timezone.now()
+        pk = _claimable(now).order_by('created_at', 'pk').values_list('pk', flat=True).first()
+        if pk is None:
+            return None
+        claimed = _claimable(now).filter(pk=pk).update(
+            state='running',
+            worker=worker,
+            attempts=F('attempts') + 1,
+            lease_until=now + timedelta(seconds=LEASE),
+            started_at=now,
+            updated_at=now,
+        )
+        if not claimed:
+            continue  # another worker was faster
+        job = ScrapeJob.objects.get(pk=pk)
+        if job.attempts > job.max_attempts:
+            _finish(job, 'failed', None, f"Abandoned by its worker {job.attempts - 1} times", [], job.events)
+            continue
+        return job
+
+
+def _finish(job, state, result, error, messages, events):
+    return ScrapeJob.objects.filter(pk=job.pk, worker=job.worker).update(
+        state=state,
+        result=json.dumps(result, ensure_ascii=False, default=str) if result is not None else '',
+        error=error or '',
+        progress=json.dumps(messages, ensure_ascii=False),
+        events=events,
+        lease_until=None,
+        finished_at=timezone.now(),
+        updated_at=timezone.now(),
+    )
+
+
+def release(job):
+    """Put a claimed job back in the queue (worker shutting down) without using up an attempt"""
+    ScrapeJob.objects.filter(pk=job.pk, worker=job.worker, state='running').update(
+        state='queued', worker='', lease_until=None, attempts=F('attempts') - 1, updated_at=timezone.now()
+    )
+
+
+# ============ RUNNING ============
+class JobReporter:
+    """report(message) for a running job - buffers messages, a heartbeat thread writes them with the lease"""
+
+    def __init__(self, job):
+        self.job = job
+        self.messages = json.loads(job.progress or '[]')
+        self.events = job.events
+        self._dirty = False
+        self._renewed = time.monotonic()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._beat, name=f"job-{job.pk}-heartbeat", daemon=True)
+
+    def __call__(self, message):
+        print(f"[job {self.job.pk}] {message}")
+        with self._lock:
+            self.messages.append(str(message)[:500])
+            del self.messages[:-PROGRESS_LIMIT]
+            self.events += 1
+            self._dirty = True
+
+    def snapshot(self):
+        with self._lock:
+            return list(self.messages), self.events
+
+    def flush(self):
+        with self._lock:
+            if not self._dirty and time.monotonic() - self._renewed < LEASE / 3:
+                return
+            messages, events = list(self.messages), self.events
+            self._dirty = False
+        now = timezone.now()
+        try:
+            ScrapeJob.objects.filter(pk=self.job.pk, worker=self.job.worker, state='running').update(
+                progress=json.dumps(messages, ensure_ascii=False),
+                events=events,
+                lease_until=now + timedelta(seconds=LEASE),
+                updated_at=now,
+            )
+            self._renewed = time.monotonic()
+        except DatabaseError as e:
+            # SQLite busy - the messages are written with the next beat
+            self._dirty = True
+            print(f"⚠️ Job {self.job.pk}: heartbeat failed: {e}")
+
+    def _beat(self):
+        try:
+            while not self._stop.wait(HEARTBEAT):
+                self.flush()
+        finally:
+            connection.close()
+
+    def start(self):
+        add_listener(self)
+        self._thread.start()
+
+    def stop(self):
+        remove_listener(self)
+        self._stop.set()
+        self._thread.join()
+
+
+def run_job(job):
+    """Run a claimed job to completion and store its result"""
+    handler = JOB_HANDLERS.get(job.kind)
+    reporter = JobReporter(job)
+    reporter.start()
+    state, result, error = 'done', None, ''
+    try:
+        if handler is None:
+            raise ValueError(f"No handler for job kind '{job.kind}'")
+        result = handler(job, json.loads(job.payload or '{}'), reporter)
+        if isinstance(result, dict) and result.get('status') == 'error':
+            state = 'failed'
+            error = result.get('message') or result.get('alert_message') or 'Job failed'
+    except (KeyboardInterrupt, SystemExit):
+        reporter.stop()
+        release(job)
+        raise
+    except Exception as e:
+        state, error = 'failed', str(e)
+        reporter(f"❌ Job failed: {str(e)[:200]}")
+        print(traceback.format_exc())
+    reporter.stop()
+    messages, events = reporter.snapshot()
+    if not _finish(job, state, result, error, messages, events):
+        print(f"⚠️ Job {job.pk}: lease was lost before it finished - result discarded")
+    return state
+
+
+def worker_name():
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def work(name=None, once=False, poll=POLL_INTERVAL, stop=None):
+    """Claim and run jobs until stop is set (or the queue is empty with once=True)"""
+    name = name or worker_name()
+    stop = stop or threading.Event()
+    processed = 0
+    while not stop.is_set():
+        close_old_connections()
+        try:
+            job = claim(name)
+        except DatabaseError as e:
+            print(f"⚠️ Worker {name}: could not claim a job: {e}")
+            job = None
+        if job is None:
+            if once:
+                break
+            stop.wait(poll)
+            continue
+        print(f"🛠️ Worker {name}: job #{job.pk} {job.kind} (attempt {job.attempts})")
+        state = run_job(job)
+        print(f"{'✅' if state == 'done' else '❌'} Worker {name}: job #{job.pk} {state}")
+        processed += 1
+    return processed
+
+
+def worker_process(name, once, poll):
+    """Entry point of a run_workers child process; SIGTERM stops it after the current job"""
+    import django
+    django.setup()
+    stop = threading.Event()
+    signal.signal(signal.SIGTERM, lambda signum, frame: stop.set())
+    try:
+        work(name, once=once, poll=poll, stop=stop)
+    except KeyboardInterrupt:
+        pass
+
+
+# ============ STATUS ============
+def job_as_dict(job, messages=20):
+    return {
+        "job_id": job.pk,
+        "kind": job.kind,
+        "state": job.state,
+        "attempts": job.attempts,
+        "progress": json.loads(job.progress or '[]')[-messages:] if messages else [],
+        "events": job.events,
+        "result": json.loads(job.result) if job.result else None,
+        "error": job.error,
+        "created_at": job.created_at.isoformat() if job.created_at else None,
+        "started_at": job.started_at.isoformat() if job.started_at else None,
+        "finished_at": job.finished_at.isoformat() if job.finished_at else None,
+    }
+
+
+def job_updates(user, since, seen):
+    """
+    Progress of user's jobs written after since - one indexed query.
+    seen maps job id -> (events, state) already relayed and is updated in place.
+    A job seen for the first time only brings its last CATCH_UP messages.
+    Returns (updates, since) with updates = [{"job_id", "kind", "state", "state_changed", "messages"}]
+    """
+    updates = []
+    rows = ScrapeJob.objects.filter(created_by=user, updated_at__gte=since).order_by('updated_at').values(
+        'pk', 'kind', 'state', 'events', 'progress', 'updated_at'
+    )
+    for row in rows:
+        since = max(since, row['updated_at'])
+        events, state = seen.get(row['pk'], (0, None))
+        new = row['events'] - events
+        if new <= 0 and row['state'] == state:
+            continue
+        if row['pk'] not in seen:
+            new = min(new, CATCH_UP)
+        seen[row['pk']] = (row['events'], row['state'])
+        updates.append({
+            "job_id": row['pk'],
+            "kind": row['kind'],
+            "state": row['state'],
+            "state_changed": row['state'] != state,
+            "messages": json.loads(row['progress'] or '[]')[-new:] if new > 0 else [],
+        })
+    return updates, since
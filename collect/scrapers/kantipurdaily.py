@@ -2,6 +2,8 @@ import requests
 from bs4 import BeautifulSoup
 import json
 from datetime import datetime
+from collect.scrapers.engine import fetch
+from utils.keyword_matcher import compile_keywords
 
 def kantipur_to_json():
     url = "https://www.kantipurdaily.com/news"
@@ -111,9 +113,10 @@ def kantipur_to_json():
         "नजर", "निगरानी", "खुफिया", "गुप्त", "जासुस", "जासुसी", "सीसीटिभी",
         "क्यामेरा", "मोनिटर", "अवलोकन"
     }
+    matcher = compile_keywords((keyword, keyword) for keyword in important_keywords)
     
     try:
-        response = requests.get(url, headers=headers, timeout=10)
+        response = fetch(url, headers=headers, timeout=10)
         response.raise_for_status()
         
         soup = BeautifulSoup(response.content, "lxml")
@@ -156,9 +159,8 @@ def kantipur_to_json():
                 found_keywords = []
                 threat_level = "low"
                 
-                for keyword in important_keywords:
-                    if keyword in content_for_analysis:
-                        found_keywords.append(keyword)
+                for _, keyword in matcher.matches(content_for_analysis):
+                    found_keywords.append(keyword)
                 
                 # Determine threat level based on keywords found
                 if found_keywords:
@@ -7,6 +7,9 @@ from datetime import datetime
 from bs4 import BeautifulSoup as BS
 import requests
 import json
+from collect.scrapers.engine import fetch
+from utils.keyword_matcher import compile_keywords
+from utils.text_normalize import normalize_text
 
 parser = "lxml"
 URL = "https://kathmandupost.com"  # Updated URL
@@ -17,7 +20,7 @@ def setup():
     }
 
     try:
-        PAGE = requests.get(URL, headers=HEADERS, timeout=10)
+        PAGE = fetch(URL, headers=HEADERS, timeout=10)
         PAGE.raise_for_status()
         return BS(PAGE.content, parser)
     except Exception as e:
@@ -82,13 +85,9 @@ def is_security_related(content):
         "scam", "corruption", "fraud", "financial crime"
     }
     
-    content_lower = content.lower()
-    
-    for keyword in security_keywords:
-        if keyword.lower() in content_lower:
-            return True
-    
-    return False
+    # One pass over the content for all keywords (compiled once per process)
+    matcher = compile_keywords((keyword, keyword) for keyword in security_keywords)
+    return bool(matcher.found_word_ids(content))
 
 def analyze_security_threat(content):
     """Analyze content for security threat levels"""
@@ -103,14 +102,24 @@ def analyze_security_threat(content):
         "security force", "intelligence", "surveillance", "espionage"
     }
     
-    found_keywords = []
     threat_level = "low"
     
-    content_lower = content.lower()
+    category_mapping = {
+        "Terrorism": {"terrorism", "terrorist", "bomb", "explosion"},
+        "Violent_Crime": {"murder", "shooting", "armed attack", "hostage", "kidnapping"},
+        "Public_Disorder": {"protest", "demonstration", "riot", "strike", "clash"},
+        "Cyber_Security": {"cyber attack", "hack", "data breach"},
+        "Law_Enforcement": {"police", "arrest", "investigation", "raid", "crime"},
+        "Military": {"army", "military", "defense"},
+    }
     
-    for keyword in security_keywords:
-        if keyword.lower() in content_lower:
-            found_keywords.append(keyword)
+    # Keywords and category terms found in a single pass over the content
+    entries = [(keyword, ('keyword', keyword)) for keyword in security_keywords]
+    entries += [(term, ('category', cat)) for cat, terms in category_mapping.items() for term in terms]
+    found_keywords = []
+    found_categories = []
+    for _, (kind, value) in compile_keywords(entries).matches(content):
+        (found_keywords if kind == 'keyword' else found_categories).append(value)
     
     # Determine threat level
     if found_keywords:
@@ -129,20 +138,8 @@ def analyze_security_threat(content):
         else:
             threat_level = "low"
     
-    # Determine categories
-    categories = []
-    category_mapping = {
-        "Terrorism": {"terrorism", "terrorist", "bomb", "explosion"},
-        "Violent_Crime": {"murder", "shooting", "armed attack", "hostage", "kidnapping"},
-        "Public_Disorder": {"protest", "demonstration", "riot", "strike", "clash"},
-        "Cyber_Security": {"cyber attack", "hack", "data breach"},
-        "Law_Enforcement": {"police", "arrest", "investigation", "raid", "crime"},
-        "Military": {"army", "military", "defense"},
-    }
-    
-    for cat, terms in category_mapping.items():
-        if any(term in content_lower for term in terms):
-            categories.append(cat)
+    # Determine categories (in category_mapping order)
+    categories = list(dict.fromkeys(found_categories))
     
     if not categories and found_keywords:
         categories = ["General_Security"]
@@ -206,8 +203,8 @@ def kathmandu_post_security_extractor():
                 # Get date
                 date = format_date_from_url(relative_link)
                 
-                # Combine content for analysis
-                content_for_analysis = title + " " + summary
+                # Combine content for analysis (normalized once for both keyword scans)
+                content_for_analysis = normalize_text(title + " " + summary)
                 
                 # Filter for security-related news
                 if not is_security_related(content_for_analysis):
@@ -6,9 +6,14 @@ import re
 import time
 import random
 from concurrent.futures import ThreadPoolExecutor, as_completed
-from requests.adapters import HTTPAdapter
-from urllib3.util.retry import Retry
 from utils.websocket_helper import send_to_websocket
+from collect.scrapers.engine import fetch
+from collect.scrapers.crawl_state import SourceCrawl
+from collect.scrapers.ingest import ingest_articles
+from collect.scrapers.seen_urls import get_filter
+from collect.scrapers.html_parser import parse_article
+from utils.http_session import get_session
+from utils.keyword_matcher import compile_keywords, keyword_entries
 
 
 def keyboard_kantipur_to_json(request):
@@ -22,7 +27,6 @@ def keyboard_kantipur_to_json(request):
     TODAY = datetime.now()
     TWO_DAYS_AGO = TODAY - timedelta(days=4)
     
-    DELAY = 2
     MAX_WORKERS = 4
     TOTAL_STEPS = 7
     
@@ -43,29 +47,24 @@ def keyboard_kantipur_to_json(request):
     
     def get_user_keywords(request):
         try:
-            from collect.models import DangerousKeyword
             if not request.user.is_authenticated:
                 return [], {}
-            keywords = DangerousKeyword.objects.filter(is_active=True, created_by=request.user)
-            keyword_dict = {kw.word.lower().strip(): kw.category.strip() for kw in keywords}
+            # Versioned registry - no query unless the keywords changed since the last run
+            keyword_dict = {word.lower().strip(): category for word, category in keyword_entries(request.user)}
             return list(keyword_dict.keys()), keyword_dict
         except Exception as e:
             print(f"⚠️ Keyword error: {e}")
             return [], {}
     
     def create_session():
-        session = requests.Session()
-        retry = Retry(total=3, backoff_factor=1)
-        adapter = HTTPAdapter(max_retries=retry, pool_connections=10)
-        session.mount('https://', adapter)
-        session.headers.update({
+        """Shared pooled session (keep-alive across runs)"""
+        return get_session("ekantipur.com", headers={
             "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36",
             "Accept": "text/html,application/xhtml+xml",
         })
-        return session
     
-    def find_article_links(session):
-        """Find article links using the actual HTML structure"""
+    def find_article_links(session, crawl):
+        """Find article links using the actual HTML structure (only links new since the last run)"""
         nonlocal current_step, base_url
         update_progress("Finding articles", 0, 1, "🔍 Searching for articles...")
         
@@ -73,7 +72,7 @@ def keyboard_kantipur_to_json(request):
         working_base = None
         for url in base_urls:
             try:
-                test_response = session.get(url, timeout=10)
+                test_response = fetch(url, session=session, timeout=10)
                 if test_response.status_code == 200:
                     working_base = url
                     base_url = url
@@ -104,8 +103,7 @@ def keyboard_kantipur_to_json(request):
                 url = working_base + category
                 print(f"\n   📄 Fetching {url}")
                 
-                time.sleep(DELAY)
-                response = session.get(url, timeout=15)
+                response = fetch(url, session=session, timeout=15)
                 
                 if response.status_code != 200:
                     print(f"   ⚠️ HTTP {response.status_code} - Skipping")
@@ -113,6 +111,7 @@ def keyboard_kantipur_to_json(request):
                 
                 working_categories += 1
                 soup = BeautifulSoup(response.content, 'html.parser')
+                page_start = len(articles)
                 
                 # 🔍 FIND ARTICLES USING ACTUAL HTML STRUCTURE
                 found_on_page = 0
@@ -175,6 +174,9 @@ def keyboard_kantipur_to_json(request):
                 
                 print(f"      ✅ Found {found_on_page} articles")
                 
+                # Drop links handled in earlier runs (whole page when unchanged)
+                articles[page_start:], _ = crawl.new_articles(url, articles[page_start:])
+                
                 if len(articles) >= 100:
                     break
                     
@@ -194,23 +196,18 @@ def keyboard_kantipur_to_json(request):
         """Check for existing articles"""
         nonlocal current_step
         try:
-            from collect.models import AutoNewsArticle
             urls_to_check = [a['url'] for a in articles]
             duplicate_urls = []
             existing_articles = {}
             
             user = request.user if request.user.is_authenticated else None
             
-            for i in range(0, len(urls_to_check), 20):
-                batch = urls_to_check[i:i+20]
-                existing = AutoNewsArticle.objects.filter(
-                    url__in=batch,
-                    created_by=user
-                ).values('url', 'id')
-                
-                for item in existing:
-                    duplicate_urls.append(item['url'])
-                    existing_articles[item['url']] = item['id']
+            # Seen-set first - only its positives reach the DB
+            existing = get_filter(user).existing_rows(urls_to_check, 'id')
+            
+            for item in existing:
+                duplicate_urls.append(item['url'])
+                existing_articles[item['url']] = item['id']
             
             if duplicate_urls:
                 update_progress("Checking duplicates", 1, 1, f"⏭️ Found {len(duplicate_urls)} duplicates")
@@ -227,13 +224,12 @@ def keyboard_kantipur_to_json(request):
     def fetch_article_content(article, session):
         """Fetch full article content"""
         try:
-            time.sleep(DELAY * 0.5)
-            response = session.get(article['url'], timeout=15)
+            response = fetch(article['url'], session=session, timeout=15)
             
             if response.status_code != 200:
                 return None
             
-            soup = BeautifulSoup(response.content, 'html.parser')
+            soup = parse_article(response)
             
             # Get date
             pub_date = TODAY
@@ -363,19 +359,17 @@ def keyboard_kantipur_to_json(request):
         current_step += 1
         return results
     
-    def analyze_keywords_in_article(article, keyword_dict):
-        """Find which keywords match in the article"""
-        if not keyword_dict:
+    def analyze_keywords_in_article(article, matcher):
+        """Find which keywords match in the article (one pass for all keywords)"""
+        if not matcher:
             return [], []
         
-        text = (article['title'] + ' ' + article['content']).lower()
         found_keywords = []
         found_categories = set()
         
-        for keyword, category in keyword_dict.items():
-            if keyword.lower() in text:
-                found_keywords.append(keyword)
-                found_categories.add(category)
+        for keyword, category in matcher.matches(article['title'] + ' ' + article['content']):
+            found_keywords.append(keyword)
+            found_categories.add(category)
         
         return found_keywords[:10], list(found_categories)[:5]
     
@@ -388,8 +382,9 @@ def keyboard_kantipur_to_json(request):
         start_time = time.time()
         keyword_match_count = 0
         
+        matcher = compile_keywords(keyword_dict.items())
         for idx, article in enumerate(articles):
-            found_keywords, categories = analyze_keywords_in_article(article, keyword_dict)
+            found_keywords, categories = analyze_keywords_in_article(article, matcher)
             
             # Set threat level based on keywords found
             if found_keywords:
@@ -416,100 +411,39 @@ def keyboard_kantipur_to_json(request):
         current_step += 1
         return processed_articles
     
-    def save_to_database(articles, request, existing_articles=None):
-        """Save articles to database - CORRECTED FOR YOUR MODEL"""
+    def save_to_database(articles, request):
+        """Save articles to database in one batched upsert (existing rows are refreshed)"""
         nonlocal current_step
-        if existing_articles is None:
-            existing_articles = {}
-            
         try:
-            from collect.models import AutoNewsArticle
-            
             update_progress("Saving to DB", 0, len(articles), 
                            f"💾 Saving {len(articles)} articles to database...")
             
-            saved_count = 0
-            updated_count = 0
-            duplicate_count = 0
-            error_count = 0
-            errors = []
-            start_time = time.time()
-            
-            for idx, article in enumerate(articles):
-                try:
-                    user = request.user if request.user.is_authenticated else None
-                    
-                    # ✅ USE ONLY FIELDS THAT EXIST IN YOUR MODEL
-                    title = article['title'][:500]
-                    summary = article['content'][:1000] if article.get('content') else ""
-                    url = article['url'][:1000]
-                    image_url = article.get('image_url', '')[:1000] if article.get('image_url') else None
-                    source = "kantipur"[:100]
-                    date = article.get('date', TODAY.strftime('%Y-%m-%d'))[:20]
-                    
-                    content_length = len(article['content']) if article.get('content') else 0
-                    priority = article.get('priority', 'medium')[:10]
-                    threat_level = article.get('threat_level', 'low')[:10]
-                    
+            records = []
+            for article in articles:
+                records.append({
+                    'title': article['title'],
+                    'summary': article['content'][:1000] if article.get('content') else "",
+                    'url': article['url'],
+                    'image_url': article.get('image_url') or None,
+                    'source': "kantipur",
+                    'date': article.get('date', TODAY.strftime('%Y-%m-%d')),
+                    'content_length': len(article['content']) if article.get('content') else 0,
+                    'priority': article.get('priority', 'medium'),
+                    'threat_level': article.get('threat_level', 'low'),
                     # Store as JSON strings
-                    keywords = json.dumps(article.get('found_keywords', []), ensure_ascii=False)
-                    categories = json.dumps(article.get('categories', []), ensure_ascii=False)
-                    
-                    # Check if exists by URL
-                    if url in existing_articles:
-                        # Update existing
-                        article_id = existing_articles[url]
-                        existing = AutoNewsArticle.objects.get(id=article_id)
-                        
-                        existing.title = title
-                        existing.summary = summary
-                        existing.image_url = image_url
-                        existing.content_length = content_length
-                        existing.priority = priority
-                        existing.threat_level = threat_level
-                        existing.keywords = keywords
-                        existing.categories = categories
-                        
-                        existing.save()
-                        updated_count += 1
-                            
-                    elif AutoNewsArticle.objects.filter(url=url, created_by=user).exists():
-                        # Duplicate found via direct check
-                        duplicate_count += 1
-                        
-                    else:
-                        # Create new
-                        AutoNewsArticle.objects.create(
-                            title=title,
-                            summary=summary,
-                            url=url,
-                            image_url=image_url,
-                            source=source,
-                            date=date,
-                            content_length=content_length,
-                            priority=priority,
-                            threat_level=threat_level,
-                            keywords=keywords,
-                            categories=categories,
-                            created_by=user
-                        )
-                        saved_count += 1
-                    
-                except Exception as e:
-                    error_count += 1
-                    errors.append(str(e)[:100])
-                
-                # Update progress every 3 articles
-                if (idx + 1) % 3 == 0 or (idx + 1) == len(articles):
-                    progress_percent = ((idx + 1) / len(articles)) * 100
-                    update_progress("Saving to DB", idx + 1, len(articles),
-                                   f"💾 New: {saved_count} | Updated: {updated_count} | Duplicates: {duplicate_count} | Errors: {error_count}")
+                    'keywords': json.dumps(article.get('found_keywords', []), ensure_ascii=False),
+                    'categories': json.dumps(article.get('categories', []), ensure_ascii=False),
+                })
+            
+            user = request.user if request.user.is_authenticated else None
+            result = ingest_articles(records, user)
+            saved_count, updated_count = result['saved'], result['updated']
+            duplicate_count, error_count = result['duplicates'], result['errors']
             
-            time_taken = time.time() - start_time
             update_progress("Saving to DB", len(articles), len(articles),
-                           f"✅ New: {saved_count} | Updated: {updated_count} | Duplicates: {duplicate_count} | Errors: {error_count} | Total: {saved_count + updated_count}/{len(articles)} in {time_taken:.1f}s")
+                           f"✅ New: {saved_count} | Updated: {updated_count} | Duplicates: {duplicate_count} | Errors: {error_count} | Total: {saved_count + updated_count}/{len(articles)} in {result['db_seconds']:.2f}s")
             current_step += 1
-            return saved_count, updated_count, duplicate_count, error_count, errors
+            return saved_count, updated_count, duplicate_count, error_count, result['error_messages']
             
         except Exception as e:
             update_progress("Saving to DB", 1, 1, f"❌ Database error: {str(e)[:50]}")
@@ -536,11 +470,14 @@ def keyboard_kantipur_to_json(request):
         current_step += 1
         
         # 3. Find articles
-        article_links = find_article_links(session)
+        crawl = SourceCrawl("kantipur", request.user if request.user.is_authenticated else None)
+        article_links = find_article_links(session, crawl)
         if not article_links:
-            send_to_websocket("❌ No articles found")
+            crawl.save()
+            message = "No new articles since last run" if crawl.items_skipped else "No articles found"
+            send_to_websocket(f"{'✅' if crawl.items_skipped else '❌'} {message}")
             return json.dumps({
-                "metadata": {"status": "success", "message": "No articles found"},
+                "metadata": {"status": "success", "message": message, "crawl_state": crawl.stats()},
                 "articles": []
             })
         
@@ -571,11 +508,18 @@ def keyboard_kantipur_to_json(request):
         
         if processed_articles:
             saved_count, updated_count, duplicate_count, error_count, errors = save_to_database(
-                processed_articles, request, existing_articles
+                processed_articles, request
             )
         else:
             send_to_websocket("⚠️ No articles to save")
         
+        # Remember what was handled so the next run skips it (failed fetches are retried)
+        handled_urls = set(duplicate_urls)
+        if not error_count:
+            handled_urls.update(a['url'] for a in processed_articles)
+        crawl.mark_articles(article_links, handled_urls)
+        crawl.save()
+        
         # Prepare final response
         final_articles = []
         for idx, article in enumerate(processed_articles):
@@ -604,7 +548,7 @@ def keyboard_kantipur_to_json(request):
         send_to_websocket("=" * 60)
         send_to_websocket("🎯 KANTIPUR SCRAPING COMPLETE - FINAL SUMMARY")
         send_to_websocket(f"⏱️ Total time: {total_time}s")
-        send_to_websocket(f"📊 Articles found: {len(article_links)}")
+        send_to_websocket(f"📊 Articles found: {len(article_links)} (⏭️ {crawl.items_skipped} seen in earlier runs)")
         send_to_websocket(f"📊 Existing in DB: {len(duplicate_urls)}")
         send_to_websocket(f"📊 New articles fetched: {len(articles_with_content)}")
         send_to_websocket(f"📊 Total processed: {len(processed_articles)}")
@@ -649,6 +593,7 @@ def keyboard_kantipur_to_json(request):
                 "errors": error_count,
                 "time_taken": total_time,
                 "user_keywords_count": len(keyword_dict),
+                "crawl_state": crawl.stats(),
                 "user": request.user.username if request.user.is_authenticated else "unknown",
                 "scraped_at": datetime.now().isoformat()
             },
@@ -6,10 +6,29 @@ import re
 import time
 import random
 from concurrent.futures import ThreadPoolExecutor, as_completed
-from requests.adapters import HTTPAdapter
-from urllib3.util.retry import Retry
 import hashlib
 from utils.websocket_helper import send_to_websocket
+from collect.scrapers.engine import fetch
+from collect.scrapers.crawl_state import SourceCrawl
+from collect.scrapers.ingest import ingest_articles
+from collect.scrapers.seen_urls import get_filter
+from collect.scrapers.feed_cache import keyword_fingerprint
+from collect.scrapers.html_parser import parse_article
+from utils.http_session import get_session
+from utils.keyword_matcher import compile_keywords, keyword_entries
+
+
+# Security keywords matched next to the user's own keywords
+SECURITY_KEYWORDS = {
+    'terrorism': 'Terrorism', 'terrorist': 'Terrorism', 'bomb': 'Terrorism', 'explosion': 'Terrorism',
+    'murder': 'Violence', 'killing': 'Violence', 'shooting': 'Violence', 'attack': 'Violence',
+    'police': 'Police', 'arrest': 'Police', 'investigation': 'Police',
+    'army': 'Military', 'military': 'Military', 'soldier': 'Military',
+    'protest': 'Protest', 'strike': 'Protest', 'riot': 'Protest',
+    'cyber': 'Cyber_Security', 'hack': 'Cyber_Security', 'breach': 'Cyber_Security'
+}
+CRITICAL_TERMS = ['terrorism', 'bomb', 'explosion', 'mass shooting', 'assassination']
+HIGH_TERMS = ['murder', 'killing', 'shooting', 'attack', 'kidnapping', 'hostage', 'riot']
 
 
 def keyboard_kathmandu_post_to_json(request):
@@ -27,7 +46,6 @@ def keyboard_kathmandu_post_to_json(request):
     send_to_websocket(f"📅 Looking for articles after: {FOUR_DAYS_AGO.strftime('%Y-%m-%d')}")
     
     # Settings
-    DELAY = 3
     MAX_WORKERS = 4
     TOTAL_STEPS = 7
     
@@ -57,19 +75,13 @@ def keyboard_kathmandu_post_to_json(request):
         try:
             update_progress("Loading keywords", 1, 1, "🔑 Fetching saved keywords from database...")
             
-            from collect.models import DangerousKeyword
-            
             if not request.user.is_authenticated:
                 return [], {}
             
-            keywords = DangerousKeyword.objects.filter(
-                is_active=True, 
-                created_by=request.user
-            )
-            
+            # Versioned registry - no query unless the keywords changed since the last run
             keyword_dict = {}
-            for kw in keywords:
-                keyword_dict[kw.word.lower().strip()] = kw.category.strip()
+            for word, category in keyword_entries(request.user):
+                keyword_dict[word.lower().strip()] = category
             
             keyword_list = list(keyword_dict.keys())
             update_progress("Keywords loaded", 1, 1, f"✅ Loaded {len(keyword_list)} keywords")
@@ -85,17 +97,12 @@ def keyboard_kathmandu_post_to_json(request):
             return list(fallback.keys()), fallback
     
     def create_session():
-        """Create HTTP session"""
-        session = requests.Session()
-        retry = Retry(total=3, backoff_factor=1)
-        adapter = HTTPAdapter(max_retries=retry, pool_connections=10)
-        session.mount('https://', adapter)
-        session.headers.update({
+        """Shared pooled HTTP session (keep-alive across runs)"""
+        return get_session("kathmandupost.com", headers={
             "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
             "Accept": "text/html,application/xhtml+xml",
             "Accept-Language": "en-US,en;q=0.9",
         })
-        return session
     
     def extract_articles_from_page(soup, category_name):
         """Extract articles from a category page based on Kathmandu Post structure"""
@@ -160,8 +167,8 @@ def keyboard_kathmandu_post_to_json(request):
         
         return articles
     
-    def find_article_links(session):
-        """Find article links from Kathmandu Post"""
+    def find_article_links(session, crawl):
+        """Find article links from Kathmandu Post (only links new since the last run)"""
         nonlocal current_step
         update_progress("Finding articles", 0, 1, "🔍 Searching for articles...")
         
@@ -180,12 +187,13 @@ def keyboard_kathmandu_post_to_json(request):
                 update_progress(f"Checking {category.strip('/')}", idx + 1, len(categories))
                 
                 url = base_url + category
-                time.sleep(DELAY)
-                response = session.get(url, timeout=15)
+                response = fetch(url, session=session, timeout=15)
                 
                 if response.status_code == 200:
                     soup = BeautifulSoup(response.content, 'html.parser')
                     page_articles = extract_articles_from_page(soup, category.strip('/'))
+                    page_articles = [a for a in page_articles if a['url'] not in seen_urls]
+                    page_articles, _ = crawl.new_articles(url, page_articles)
                     
                     new_articles = 0
                     for article in page_articles:
@@ -215,23 +223,16 @@ def keyboard_kathmandu_post_to_json(request):
         update_progress("Checking duplicates", 0, 1, "🔍 Checking for duplicates...")
         
         try:
-            from collect.models import AutoNewsArticle
-            
             urls_to_check = [a['url'] for a in articles]
             duplicate_urls = []
             existing_articles = {}
             
-            # Check in batches
-            for i in range(0, len(urls_to_check), 20):
-                batch = urls_to_check[i:i+20]
-                existing = AutoNewsArticle.objects.filter(
-                    url__in=batch,
-                    created_by=request.user
-                ).values('url', 'id')
-                
-                for item in existing:
-                    duplicate_urls.append(item['url'])
-                    existing_articles[item['url']] = item['id']
+            # Seen-set first - only its positives reach the DB
+            existing = get_filter(request.user).existing_rows(urls_to_check, 'id')
+            
+            for item in existing:
+                duplicate_urls.append(item['url'])
+                existing_articles[item['url']] = item['id']
             
             if duplicate_urls:
                 update_progress("Checking duplicates", 1, 1, f"⏭️ Found {len(duplicate_urls)} duplicates")
@@ -286,13 +287,12 @@ def keyboard_kathmandu_post_to_json(request):
     def fetch_article_content(article, session):
         """Fetch content for a single Kathmandu Post article"""
         try:
-            time.sleep(DELAY * 0.5)
-            response = session.get(article['url'], timeout=12)
+            response = fetch(article['url'], session=session, timeout=12)
             
             if response.status_code != 200:
                 return None
             
-            soup = BeautifulSoup(response.content, 'html.parser')
+            soup = parse_article(response)
             
             # Get date from URL first (most reliable)
             pub_date = format_date_from_url(article['url'])
@@ -439,47 +439,35 @@ def keyboard_kathmandu_post_to_json(request):
         current_step += 1
         return results
     
-    def analyze_security_threat(content, keyword_dict):
-        """Analyze security threat level based on content and user keywords"""
-        content_lower = content.lower()
-        
-        # Security keywords
-        security_keywords = {
-            'terrorism': 'Terrorism', 'terrorist': 'Terrorism', 'bomb': 'Terrorism', 'explosion': 'Terrorism',
-            'murder': 'Violence', 'killing': 'Violence', 'shooting': 'Violence', 'attack': 'Violence',
-            'police': 'Police', 'arrest': 'Police', 'investigation': 'Police',
-            'army': 'Military', 'military': 'Military', 'soldier': 'Military',
-            'protest': 'Protest', 'strike': 'Protest', 'riot': 'Protest',
-            'cyber': 'Cyber_Security', 'hack': 'Cyber_Security', 'breach': 'Cyber_Security'
-        }
-        
+    def security_matcher(keyword_dict):
+        """Security keywords, user keywords and threat-level terms in one automaton"""
+        entries = [(keyword, ('keyword', category)) for keyword, category in SECURITY_KEYWORDS.items()]
+        entries += [(keyword, ('keyword', category)) for keyword, category in (keyword_dict or {}).items()]
+        entries += [(term, ('level', 'critical')) for term in CRITICAL_TERMS]
+        entries += [(term, ('level', 'high')) for term in HIGH_TERMS]
+        return compile_keywords(entries)
+    
+    def analyze_security_threat(content, matcher):
+        """Analyze security threat level based on content and user keywords (one pass)"""
         found_keywords = []
         found_categories = set()
+        levels = set()
         
-        # Check security keywords
-        for keyword, category in security_keywords.items():
-            if keyword in content_lower:
+        for keyword, (kind, value) in matcher.matches(content):
+            if kind == 'level':
+                levels.add(value)
+            else:
                 found_keywords.append(keyword)
-                found_categories.add(category)
-        
-        # Check user keywords
-        if keyword_dict:
-            for keyword, category in keyword_dict.items():
-                if keyword.lower() in content_lower:
-                    found_keywords.append(keyword)
-                    found_categories.add(category)
+                found_categories.add(value)
         
         # Determine threat level
         threat_level = "low"
         priority = "low"
         
-        critical_terms = {'terrorism', 'bomb', 'explosion', 'mass shooting', 'assassination'}
-        high_terms = {'murder', 'killing', 'shooting', 'attack', 'kidnapping', 'hostage', 'riot'}
-        
-        if any(term in content_lower for term in critical_terms):
+        if 'critical' in levels:
             threat_level = "critical"
             priority = "high"
-        elif any(term in content_lower for term in high_terms):
+        elif 'high' in levels:
             threat_level = "high"
             priority = "high"
         elif found_keywords:
@@ -499,10 +487,11 @@ def keyboard_kathmandu_post_to_json(request):
         update_progress("Keyword analysis", 0, len(articles))
         
         filtered = []
+        matcher = security_matcher(keyword_dict)
         
         for idx, article in enumerate(articles):
             full_text = article['title'] + ' ' + article['content']
-            analysis = analyze_security_threat(full_text, keyword_dict)
+            analysis = analyze_security_threat(full_text, matcher)
             
             if analysis['found_keywords']:
                 article['found_keywords'] = analysis['found_keywords']
@@ -519,88 +508,38 @@ def keyboard_kathmandu_post_to_json(request):
         current_step += 1
         return filtered
     
-    def save_to_database(articles, request, existing_articles=None):
-        """Save articles to database with duplicate prevention"""
+    def save_to_database(articles, request):
+        """Save articles to database with duplicate prevention (one batched upsert, existing rows are refreshed)"""
         nonlocal current_step
-        if existing_articles is None:
-            existing_articles = {}
-            
         try:
-            from collect.models import AutoNewsArticle
-            
-            update_progress("Saving to DB", 0, len(articles))
-            
-            saved_count = 0
-            updated_count = 0
-            error_count = 0
-            errors = []
-            
-            for idx, article in enumerate(articles):
-                try:
-                    user = request.user if request.user.is_authenticated else None
-                    
-                    # Prepare data according to your model
-                    title = article['title'][:500]
-                    summary = article['content'][:1000]  # Use content as summary
-                    url = article['url'][:1000]
-                    image_url = article.get('image_url', '')[:1000] if article.get('image_url') else None
-                    source = "kathmandu_post"[:100]
-                    date = article.get('date', TODAY.strftime('%Y-%m-%d'))[:20]
-                    
-                    content_length = len(article['content'])
-                    priority = article.get('priority', 'medium')[:10]
-                    threat_level = article.get('threat_level', 'low')[:10]
-                    
+            update_progress("Saving to DB", 0, len(articles), 
+                           f"💾 Saving {len(articles)} articles to database...")
+            
+            records = []
+            for article in articles:
+                records.append({
+                    'title': article['title'],
+                    'summary': article['content'][:1000],  # Use content as summary
+                    'url': article['url'],
+                    'image_url': article.get('image_url') or None,
+                    'source': "kathmandu_post",
+                    'date': article.get('date', TODAY.strftime('%Y-%m-%d')),
+                    'content_length': len(article['content']),
+                    'priority': article.get('priority', 'medium'),
+                    'threat_level': article.get('threat_level', 'low'),
                     # Store as JSON strings
-                    keywords = json.dumps(article.get('found_keywords', []), ensure_ascii=False)
-                    categories = json.dumps(article.get('categories', []), ensure_ascii=False)
-                    
-                    # Check if exists
-                    if article['url'] in existing_articles:
-                        # Update existing
-                        article_id = existing_articles[article['url']]
-                        existing = AutoNewsArticle.objects.get(id=article_id)
-                        
-                        existing.title = title
-                        existing.summary = summary
-                        existing.image_url = image_url
-                        existing.content_length = content_length
-                        existing.priority = priority
-                        existing.threat_level = threat_level
-                        existing.keywords = keywords
-                        existing.categories = categories
-                        
-                        existing.save()
-                        updated_count += 1
-                    else:
-                        # Create new
-                        AutoNewsArticle.objects.create(
-                            title=title,
-                            summary=summary,
-                            url=url,
-                            image_url=image_url,
-                            source=source,
-                            date=date,
-                            content_length=content_length,
-                            priority=priority,
-                            threat_level=threat_level,
-                            keywords=keywords,
-                            categories=categories,
-                            created_by=user
-                        )
-                        saved_count += 1
-                    
-                except Exception as e:
-                    error_count += 1
-                    errors.append(str(e)[:100])
-                
-                if (idx + 1) % 3 == 0:
-                    update_progress("Saving to DB", idx + 1, len(articles))
+                    'keywords': json.dumps(article.get('found_keywords', []), ensure_ascii=False),
+                    'categories': json.dumps(article.get('categories', []), ensure_ascii=False),
+                })
+            
+            user = request.user if request.user.is_authenticated else None
+            result = ingest_articles(records, user)
+            saved_count, updated_count, error_count = result['saved'], result['updated'], result['errors']
             
-            update_progress("Saving to DB", len(articles), len(articles), 
-                           f"✅ New: {saved_count} | Updated: {updated_count} | Errors: {error_count}")
+            update_progress("Saving to DB", len(articles), len(articles),
+                           f"✅ New: {saved_count} | Updated: {updated_count} | Errors: {error_count} | Total: {saved_count + updated_count}/{len(articles)} in {result['db_seconds']:.2f}s")
             current_step += 1
-            return saved_count, updated_count, error_count, errors
+            return saved_count, updated_count, error_count, result['error_messages']
             
         except Exception as e:
             update_progress("Saving to DB", 1, 1, f"❌ Database error: {str(e)[:50]}")
@@ -625,12 +564,16 @@ def keyboard_kathmandu_post_to_json(request):
         session = create_session()
         current_step += 1
         
-        # 3. Find articles
-        article_links = find_article_links(session)
+        # 3. Find articles (non-matching articles are dropped, so the marks follow the keyword table)
+        crawl = SourceCrawl("kathmandu_post", request.user if request.user.is_authenticated else None,
+                            keyword_fingerprint=keyword_fingerprint())
+        article_links = find_article_links(session, crawl)
         if not article_links:
-            send_to_websocket("❌ No articles found")
+            crawl.save()
+            message = "No new articles since last run" if crawl.items_skipped else "No articles found"
+            send_to_websocket(f"{'✅' if crawl.items_skipped else '❌'} {message}")
             return json.dumps({
-                "metadata": {"status": "success", "message": "No articles found"},
+                "metadata": {"status": "success", "message": message, "crawl_state": crawl.stats()},
                 "articles": []
             })
         
@@ -646,9 +589,16 @@ def keyboard_kathmandu_post_to_json(request):
         
         # 7. Save to database
         saved_count, updated_count, error_count, errors = save_to_database(
-            filtered_articles, request, existing_articles
+            filtered_articles, request
         ) if filtered_articles else (0, 0, 0, [])
         
+        # Remember what was handled so the next run skips it (failed fetches are retried)
+        handled_urls = set(duplicate_urls)
+        if not error_count:
+            handled_urls.update(a['url'] for a in articles_with_content)
+        crawl.mark_articles(article_links, handled_urls)
+        crawl.save()
+        
         # Prepare final response
         final_articles = []
         for idx, article in enumerate(filtered_articles):
@@ -674,7 +624,7 @@ def keyboard_kathmandu_post_to_json(request):
         send_to_websocket("=" * 60)
         send_to_websocket("🎯 KATHMANDU POST SCRAPING COMPLETE")
         send_to_websocket(f"⏱️ Total time: {total_time}s")
-        send_to_websocket(f"📊 Articles found: {len(article_links)}")
+        send_to_websocket(f"📊 Articles found: {len(article_links)} (⏭️ {crawl.items_skipped} seen in earlier runs)")
         send_to_websocket(f"📊 Existing in DB: {len(duplicate_urls)}")
         send_to_websocket(f"📊 New articles fetched (after date filter): {len(articles_with_content)}")
         send_to_websocket(f"🔒 Security articles: {len(filtered_articles)}")
@@ -697,6 +647,7 @@ def keyboard_kathmandu_post_to_json(request):
                 "errors": error_count,
                 "time_taken": total_time,
                 "user_keywords_count": len(keyword_dict),
+                "crawl_state": crawl.stats(),
                 "user": request.user.username if request.user.is_authenticated else "unknown",
                 "scraped_at": datetime.now().isoformat(),
                 "date_range": {
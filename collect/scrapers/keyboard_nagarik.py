@@ -6,10 +6,16 @@ import re
 import time
 import random
 from concurrent.futures import ThreadPoolExecutor, as_completed
-from requests.adapters import HTTPAdapter
-from urllib3.util.retry import Retry
 import hashlib
 from utils.websocket_helper import send_to_websocket
+from collect.scrapers.engine import fetch
+from collect.scrapers.crawl_state import SourceCrawl
+from collect.scrapers.ingest import UPDATE_FIELDS, ingest_articles
+from collect.scrapers.seen_urls import get_filter
+from collect.scrapers.feed_cache import keyword_fingerprint
+from collect.scrapers.html_parser import parse_article
+from utils.http_session import get_session
+from utils.keyword_matcher import compile_keywords, keyword_entries
 
 
 def keyboard_nagariknews_to_json(request):
@@ -21,7 +27,6 @@ def keyboard_nagariknews_to_json(request):
     TWO_DAYS_AGO = TODAY - timedelta(days=2)
     
     # Settings
-    DELAY = 4
     MAX_WORKERS = 3
     TOTAL_STEPS = 7  # Total steps in the scraping process
     
@@ -54,19 +59,13 @@ def keyboard_nagariknews_to_json(request):
         try:
             update_progress("Loading keywords", 1, 1, "🔑 Fetching saved keywords from database...")
             
-            from collect.models import DangerousKeyword
-            
             if not request.user.is_authenticated:
                 return [], {}
             
-            keywords = DangerousKeyword.objects.filter(
-                is_active=True, 
-                created_by=request.user
-            )
-            
+            # Versioned registry - no query unless the keywords changed since the last run
             keyword_dict = {}
-            for kw in keywords:
-                keyword_dict[kw.word.lower().strip()] = kw.category.strip()
+            for word, category in keyword_entries(request.user):
+                keyword_dict[word.lower().strip()] = category
             
             keyword_list = list(keyword_dict.keys())
             update_progress("Keywords loaded", 1, 1, f"✅ Loaded {len(keyword_list)} keywords for user")
@@ -82,19 +81,14 @@ def keyboard_nagariknews_to_json(request):
             return list(fallback.keys()), fallback
     
     def create_session():
-        """Create HTTP session"""
-        session = requests.Session()
-        retry = Retry(total=2, backoff_factor=1)
-        adapter = HTTPAdapter(max_retries=retry, pool_connections=10)
-        session.mount('https://', adapter)
-        session.headers.update({
+        """Shared pooled HTTP session (keep-alive across runs)"""
+        return get_session("nagariknews.nagariknetwork.com", headers={
             "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) Chrome/120.0.0.0",
             "Accept": "text/html,application/xhtml+xml",
         })
-        return session
     
-    def find_article_links(session):
-        """Find article links from political sections"""
+    def find_article_links(session, crawl):
+        """Find article links from political sections (only links new since the last run)"""
         nonlocal current_step
         update_progress("Finding articles", 0, 1, "🔍 Searching for articles in political sections...")
         # --------------------------------------------------------------------------Change fetching category-------------------------------------------------------------
@@ -119,11 +113,11 @@ def keyboard_nagariknews_to_json(request):
                 )
                 
                 url = base_url + category
-                time.sleep(DELAY)
-                response = session.get(url, timeout=10)
+                response = fetch(url, session=session, timeout=10)
                 
                 if response.status_code == 200:
                     soup = BeautifulSoup(response.content, 'html.parser')
+                    page_articles = []
                     
                     for link in soup.find_all('a', href=True):
                         href = link.get('href', '').strip()
@@ -150,14 +144,18 @@ def keyboard_nagariknews_to_json(request):
                                 title = parent.get_text(strip=True)
                         
                         if len(title) >= 10:
-                            articles.append({'url': href, 'title': title[:200]})
+                            page_articles.append({'url': href, 'title': title[:200]})
                             seen_urls.add(href)
-                            
-                            if len(articles) >= 50:  # Limit
-                                time_taken = time.time() - start_time
-                                update_progress("Finding articles", len(categories), len(categories), 
-                                              f"✅ Found {len(articles)} articles in {time_taken:.1f}s")
-                                return articles
+                    
+                    # Drop links handled in earlier runs (whole page when unchanged)
+                    page_articles, _ = crawl.new_articles(url, page_articles)
+                    articles.extend(page_articles[:50 - len(articles)])
+                    
+                    if len(articles) >= 50:  # Limit
+                        time_taken = time.time() - start_time
+                        update_progress("Finding articles", len(categories), len(categories), 
+                                      f"✅ Found {len(articles)} articles in {time_taken:.1f}s")
+                        return articles
                 
             except Exception:
                 continue
@@ -174,36 +172,22 @@ def keyboard_nagariknews_to_json(request):
         update_progress("Checking duplicates", 0, 1, "🔍 Checking for duplicate articles in database...")
         
         try:
-            from collect.models import AutoNewsArticle
-            
             urls_to_check = [a['url'] for a in articles]
             duplicate_urls = []
             existing_articles = {}
             
-            # Check in batches
-            total_batches = (len(urls_to_check) + 9) // 10
-            for i in range(0, len(urls_to_check), 10):
-                batch_num = i // 10 + 1
-                batch = urls_to_check[i:i+10]
-                
-                batch_progress = (batch_num / total_batches) * 100
-                update_progress("Checking duplicates", batch_num, total_batches,
-                               f"📋 Checking batch {batch_num}/{total_batches} ({batch_progress:.1f}%)")
-                
-                existing = AutoNewsArticle.objects.filter(
-                    url__in=batch,
-                    created_by=request.user
-                ).values('url', 'id')
-                
-                for item in existing:
-                    duplicate_urls.append(item['url'])
-                    existing_articles[item['url']] = item['id']
+            # Seen-set first - only its positives reach the DB
+            existing = get_filter(request.user).existing_rows(urls_to_check, 'id')
+            
+            for item in existing:
+                duplicate_urls.append(item['url'])
+                existing_articles[item['url']] = item['id']
             
             if duplicate_urls:
-                update_progress("Checking duplicates", total_batches, total_batches,
+                update_progress("Checking duplicates", 1, 1,
                                f"⏭️ Found {len(duplicate_urls)} duplicates in database")
             else:
-                update_progress("Checking duplicates", total_batches, total_batches,
+                update_progress("Checking duplicates", 1, 1,
                                "✅ No duplicates found")
             
             current_step += 1
@@ -217,13 +201,12 @@ def keyboard_nagariknews_to_json(request):
     def fetch_article_content(article, session, article_num, total_articles):
         """Fetch content for a single article"""
         try:
-            time.sleep(DELAY * 0.7)
-            response = session.get(article['url'], timeout=10)
+            response = fetch(article['url'], session=session, timeout=10)
             
             if response.status_code != 200:
                 return None
             
-            soup = BeautifulSoup(response.content, 'html.parser')
+            soup = parse_article(response)
             
             # Get date
             pub_date = None
@@ -341,18 +324,16 @@ def keyboard_nagariknews_to_json(request):
         current_step += 1
         return results
     
-    def analyze_keywords_in_article(article, keyword_dict):
-        """Find which keywords match in the article"""
-        text = (article['title'] + ' ' + article['content']).lower()
+    def analyze_keywords_in_article(article, matcher):
+        """Find which keywords match in the article (one pass for all keywords)"""
         found_keywords = []
         found_categories = set()
         
-        for keyword, category in keyword_dict.items():
-            if keyword in text:
-                found_keywords.append(keyword)
-                found_categories.add(category)
-                if len(found_keywords) >= 10:  # Limit
-                    break
+        for keyword, category in matcher.matches(article['title'] + ' ' + article['content']):
+            found_keywords.append(keyword)
+            found_categories.add(category)
+            if len(found_keywords) >= 10:  # Limit
+                break
         
         return found_keywords, list(found_categories)
     
@@ -376,8 +357,9 @@ def keyboard_nagariknews_to_json(request):
         filtered = []
         start_time = time.time()
         
+        matcher = compile_keywords(keyword_dict.items())
         for idx, article in enumerate(articles):
-            found_keywords, categories = analyze_keywords_in_article(article, keyword_dict)
+            found_keywords, categories = analyze_keywords_in_article(article, matcher)
             
             if found_keywords:  # Only include if keywords matched
                 # Determine threat level
@@ -408,112 +390,38 @@ def keyboard_nagariknews_to_json(request):
         current_step += 1
         return filtered
     
-    def save_to_database(articles, request, existing_articles=None):
-        """Save articles to database with duplicate prevention - CORRECTED FOR YOUR MODEL"""
+    def save_to_database(articles, request):
+        """Save articles to database with duplicate prevention - CORRECTED FOR YOUR MODEL (one batched upsert, existing rows are refreshed)"""
         nonlocal current_step
-        if existing_articles is None:
-            existing_articles = {}
-            
         try:
-            from collect.models import AutoNewsArticle
-            
             update_progress("Saving to DB", 0, len(articles), 
                            f"💾 Saving {len(articles)} articles to database...")
             
-            saved_count = 0
-            updated_count = 0
-            error_count = 0
-            errors = []
-            start_time = time.time()
+            records = []
+            for article in articles:
+                records.append({
+                    'title': article['title'],
+                    'summary': article['content'][:1000],  # Use content as summary
+                    'url': article['url'],
+                    'image_url': article.get('image_url') or None,
+                    'source': "nagariknews",
+                    'date': article.get('date', TODAY.strftime('%Y-%m-%d')),
+                    'content_length': len(article['content']),
+                    'priority': article.get('priority', 'medium'),
+                    'threat_level': article.get('threat_level', 'low'),
+                    # Store as JSON strings
+                    'keywords': json.dumps(article.get('found_keywords', []), ensure_ascii=False),
+                    'categories': json.dumps(article.get('categories', []), ensure_ascii=False),
+                })
             
-            for idx, article in enumerate(articles):
-                try:
-                    # Get user for created_by field
-                    user = request.user if request.user.is_authenticated else None
-                    
-                    # Prepare data according to your model
-                    title = article['title'][:500]  # max_length=500
-                    summary = article['content'][:1000]  # TextField
-                    url = article['url'][:1000]  # max_length=1000
-                    image_url = article.get('image_url', '')[:1000] if article.get('image_url') else None
-                    source = "nagariknews"[:100]  # max_length=100
-                    date = article.get('date', TODAY.strftime('%Y-%m-%d'))[:20]  # max_length=20
-                    
-                    # Store analysis data
-                    content_length = len(article['content'])
-                    priority = article.get('priority', 'medium')[:10]  # max_length=10
-                    threat_level = article.get('threat_level', 'low')[:10]  # max_length=10
-                    
-                    # Store keywords and categories as JSON strings
-                    keywords = json.dumps(article.get('found_keywords', []), ensure_ascii=False)
-                    categories = json.dumps(article.get('categories', []), ensure_ascii=False)
-                    
-                    # Check if article exists
-                    if article['url'] in existing_articles:
-                        # Update existing article
-                        article_id = existing_articles[article['url']]
-                        existing = AutoNewsArticle.objects.get(id=article_id)
-                        
-                        existing.title = title
-                        existing.summary = summary
-                        existing.url = url
-                        existing.image_url = image_url
-                        existing.source = source
-                        existing.date = date
-                        existing.content_length = content_length
-                        existing.priority = priority
-                        existing.threat_level = threat_level
-                        existing.keywords = keywords
-                        existing.categories = categories
-                        
-                        existing.save()
-                        updated_count += 1
-                        
-                        if updated_count <= 5 or len(articles) <= 20:
-                            print(f"      🔄 Updated: {article['title'][:50]}...")
-                    else:
-                        # Check by content hash (optional, not required for your model)
-                        # You can add this if you want, but not necessary
-                        
-                        # Create new article
-                        AutoNewsArticle.objects.create(
-                            title=title,
-                            summary=summary,
-                            url=url,
-                            image_url=image_url,
-                            source=source,
-                            date=date,
-                            content_length=content_length,
-                            priority=priority,
-                            threat_level=threat_level,
-                            keywords=keywords,
-                            categories=categories,
-                            created_by=user
-                        )
-                        saved_count += 1
-                        
-                        if saved_count <= 5 or len(articles) <= 20:
-                            print(f"      ✅ Saved: {article['title'][:50]}...")
-                    
-                except Exception as e:
-                    error_count += 1
-                    error_msg = f"Error saving {article['url'][:50]}: {str(e)[:100]}"
-                    errors.append(error_msg)
-                    print(f"      ❌ {error_msg}")
-                    import traceback
-                    traceback.print_exc()
-                
-                # Update progress every 3 articles
-                if (idx + 1) % 3 == 0 or (idx + 1) == len(articles):
-                    progress_percent = ((idx + 1) / len(articles)) * 100
-                    update_progress("Saving to DB", idx + 1, len(articles),
-                                   f"💾 New: {saved_count} | Updated: {updated_count} | Total: {idx + 1}/{len(articles)} ({progress_percent:.1f}%)")
+            user = request.user if request.user.is_authenticated else None
+            result = ingest_articles(records, user, update_fields=UPDATE_FIELDS + ['source', 'date'])
+            saved_count, updated_count, error_count = result['saved'], result['updated'], result['errors']
             
-            time_taken = time.time() - start_time
             update_progress("Saving to DB", len(articles), len(articles),
-                           f"✅ New: {saved_count} | Updated: {updated_count} | Errors: {error_count} | Total: {saved_count + updated_count}/{len(articles)} in {time_taken:.1f}s")
+                           f"✅ New: {saved_count} | Updated: {updated_count} | Errors: {error_count} | Total: {saved_count + updated_count}/{len(articles)} in {result['db_seconds']:.2f}s")
             current_step += 1
-            return saved_count, updated_count, error_count, errors
+            return saved_count, updated_count, error_count, result['error_messages']
             
         except Exception as e:
             update_progress("Saving to DB", 1, 1, f"❌ Database error: {str(e)[:50]}")
@@ -541,12 +449,16 @@ def keyboard_nagariknews_to_json(request):
         session = create_session()
         current_step += 1
         
-        # 3. Find article links
-        article_links = find_article_links(session)
+        # 3. Find article links (non-matching articles are dropped, so the marks follow the keyword table)
+        crawl = SourceCrawl("nagariknews", request.user if request.user.is_authenticated else None,
+                            keyword_fingerprint=keyword_fingerprint())
+        article_links = find_article_links(session, crawl)
         if not article_links:
-            send_to_websocket("❌ No articles found")
+            crawl.save()
+            message = "No new articles since last run" if crawl.items_skipped else "No articles found"
+            send_to_websocket(f"{'✅' if crawl.items_skipped else '❌'} {message}")
             return json.dumps({
-                "metadata": {"status": "success", "message": "No articles found"},
+                "metadata": {"status": "success", "message": message, "crawl_state": crawl.stats()},
                 "articles": []
             })
         
@@ -562,6 +474,7 @@ def keyboard_nagariknews_to_json(request):
         articles_with_content = fetch_all_articles(articles_to_fetch, session)
         
         if not articles_with_content and not duplicate_urls:
+            crawl.save()
             send_to_websocket("❌ No articles with content found")
             return json.dumps({
                 "metadata": {"status": "success", "message": "No valid articles found"},
@@ -580,10 +493,17 @@ def keyboard_nagariknews_to_json(request):
         errors = []
         
         if filtered_articles:
-            saved_count, updated_count, error_count, errors = save_to_database(filtered_articles, request, existing_articles)
+            saved_count, updated_count, error_count, errors = save_to_database(filtered_articles, request)
         else:
             send_to_websocket("⚠️ No articles with keyword matches found")
         
+        # Remember what was handled so the next run skips it (failed fetches are retried)
+        handled_urls = set(duplicate_urls)
+        if not error_count:
+            handled_urls.update(a['url'] for a in articles_with_content)
+        crawl.mark_articles(article_links, handled_urls)
+        crawl.save()
+        
         # Prepare final response
         final_articles = []
         for idx, article in enumerate(filtered_articles):
@@ -611,7 +531,7 @@ def keyboard_nagariknews_to_json(request):
         send_to_websocket("=" * 50)
         send_to_websocket("🎯 SCRAPING COMPLETE - FINAL SUMMARY")
         send_to_websocket(f"⏱️ Total time: {total_time}s")
-        send_to_websocket(f"📊 Articles found: {len(article_links)}")
+        send_to_websocket(f"📊 Articles found: {len(article_links)} (⏭️ {crawl.items_skipped} seen in earlier runs)")
         send_to_websocket(f"📊 Existing in DB: {len(duplicate_urls)}")
         send_to_websocket(f"📊 New articles fetched: {len(articles_with_content)}")
         send_to_websocket(f"📊 After filtering: {len(filtered_articles)}")
@@ -641,6 +561,7 @@ def keyboard_nagariknews_to_json(request):
                 "errors": error_count,
                 "time_taken": total_time,
                 "user_keywords_count": len(keyword_dict),
+                "crawl_state": crawl.stats(),
                 "user": request.user.username if request.user.is_authenticated else "unknown",
                 "scraped_at": datetime.now().isoformat()
             },
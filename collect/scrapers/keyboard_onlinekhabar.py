@@ -1,360 +1,11 @@
 """
-Online Khabar RSS Feed Scraper - Following Paschim Nepal pattern
+Online Khabar RSS Feed Scraper
+
+The feed itself is declared in collect/scrapers/feeds.py (FEEDS['onlinekhabar']).
 """
-import requests
-import xml.etree.ElementTree as ET
-import json
-from datetime import datetime, timedelta
-import re
-import time
-import html
-from django.db import transaction
+from collect.scrapers.feeds import scrape_feed
 
-from collect.models import DangerousKeyword, AutoNewsArticle
 
 def keyboard_onlinekhabar_to_json(request):
-    """Online Khabar RSS scraper - following Paschim Nepal pattern"""
-    
-    if not request or not hasattr(request, 'user') or not request.user.is_authenticated:
-        return json.dumps({
-            "metadata": {
-                "status": "error",
-                "message": "User authentication required",
-                "scraped_at": datetime.now().isoformat()
-            },
-            "articles": []
-        })
-    
-    feed_url = "https://www.onlinekhabar.com/feed"
-    TODAY = datetime.now()
-    FOUR_DAYS_AGO = TODAY - timedelta(days=10)
-    
-    # Only print header
-    print(f"\n🚀 ONLINE KHABAR SCRAPER - {TODAY.strftime('%Y-%m-%d')} (last {10} days)")
-    
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-    }
-    
-    all_articles = []
-    
-    # Get keywords (silent)
-    try:
-        keywords = DangerousKeyword.objects.filter(is_active=True).values('word', 'category')
-        all_keywords_list = []
-        keywords_by_category = {}
-        
-        for kw in keywords:
-            word = kw['word'].lower().strip()
-            category = kw['category'].strip()
-            all_keywords_list.append({'word': word, 'category': category})
-            
-            if category not in keywords_by_category:
-                keywords_by_category[category] = []
-            keywords_by_category[category].append(word)
-    except Exception:
-        all_keywords_list = []
-        keywords_by_category = {}
-    
-    def is_article_within_date_range(pub_date):
-        """Check if article is from last 10 days"""
-        if pub_date:
-            return pub_date >= FOUR_DAYS_AGO
-        return True  # Keep if no date
-    
-    # Fetch RSS feed
-    try:
-        print(f"\n📡 Fetching RSS feed...")
-        response = requests.get(feed_url, headers=headers, timeout=30)
-        
-        if response.status_code != 200:
-            print(f"❌ Failed to fetch RSS feed: HTTP {response.status_code}")
-            return json.dumps({
-                "metadata": {
-                    "status": "error",
-                    "message": f"Failed to fetch RSS feed: HTTP {response.status_code}",
-                    "scraped_at": datetime.now().isoformat()
-                },
-                "articles": []
-            })
-        
-        # Parse XML
-        root = ET.fromstring(response.content)
-        
-        # Namespace handling
-        namespaces = {
-            'content': 'http://purl.org/rss/1.0/modules/content/',
-            'dc': 'http://purl.org/dc/elements/1.1/',
-            'media': 'http://search.yahoo.com/mrss/'
-        }
-        
-        # Find all items
-        items = root.findall('.//item')
-        print(f"📄 Found {len(items)} articles in RSS feed")
-        
-        for item in items:
-            try:
-                # Extract basic info
-                title_elem = item.find('title')
-                link_elem = item.find('link')
-                pubDate_elem = item.find('pubDate')
-                description_elem = item.find('description')
-                
-                # Get title
-                title = ""
-                if title_elem is not None and title_elem.text:
-                    title = html.unescape(title_elem.text).strip()
-                
-                # Get URL
-                url = ""
-                if link_elem is not None and link_elem.text:
-                    url = link_elem.text.strip()
-                
-                # Get publication date
-                pub_date = None
-                date_text = ""
-                if pubDate_elem is not None and pubDate_elem.text:
-                    date_text = pubDate_elem.text
-                    try:
-                        # RSS date format: Mon, 23 Feb 2026 10:40:34 +0000
-                        pub_date = datetime.strptime(date_text, '%a, %d %b %Y %H:%M:%S %z')
-                        pub_date = pub_date.replace(tzinfo=None)  # Remove timezone
-                    except:
-                        try:
-                            pub_date = datetime.strptime(date_text, '%a, %d %b %Y %H:%M:%S %Z')
-                        except:
-                            pub_date = TODAY
-                
-                # Get description/summary
-                summary = title
-                if description_elem is not None and description_elem.text:
-                    summary = html.unescape(description_elem.text)
-                    # Remove CDATA and HTML tags
-                    summary = re.sub(r'<!\[CDATA\[|\]\]>', '', summary)
-                    summary = re.sub(r'<.*?>', '', summary)
-                    summary = summary.strip()
-                
-                # Get image URL (try multiple sources)
-                image_url = ""
-                
-                # Try media:content
-                media_content = item.find('media:content', namespaces)
-                if media_content is not None:
-                    image_url = media_content.get('url', '')
-                
-                # Try custom <image> tag (Online Khabar specific)
-                if not image_url:
-                    image_elem = item.find('image')
-                    if image_elem is not None and image_elem.text:
-                        image_url = image_elem.text.strip()
-                
-                # Try extracting from description
-                if not image_url and description_elem is not None and description_elem.text:
-                    img_match = re.search(r'<img[^>]+src="([^">]+)"', description_elem.text)
-                    if img_match:
-                        image_url = img_match.group(1)
-                
-                # Get categories
-                categories = []
-                for cat in item.findall('category'):
-                    if cat.text:
-                        categories.append(html.unescape(cat.text).strip())
-                
-                # Create article data
-                article_data = {
-                    'title': title[:500],
-                    'url': url,
-                    'category': categories[0] if categories else 'general',
-                    'category_display': categories[0] if categories else 'सामान्य',
-                    'date_text': date_text,
-                    'image_url': image_url,
-                    'summary': summary[:1000],
-                    'page_found': 1,
-                    'source_category': 'RSS Feed',
-                    'all_categories': categories,
-                    'pub_date': pub_date
-                }
-                
-                # Check date range
-                if is_article_within_date_range(pub_date):
-                    article_data['discovered_at'] = datetime.now().isoformat()
-                    all_articles.append(article_data)
-                
-            except Exception as e:
-                print(f"   ⚠️ Error parsing item: {e}")
-                continue
-        
-        print(f"📊 After date filter: {len(all_articles)} articles")
-        
-    except Exception as e:
-        print(f"❌ Error fetching RSS feed: {e}")
-        return json.dumps({
-            "metadata": {
-                "status": "error",
-                "message": f"Error fetching RSS feed: {str(e)}",
-                "scraped_at": datetime.now().isoformat()
-            },
-            "articles": []
-        })
-    
-    # Remove duplicates by URL
-    unique_articles = []
-    seen_urls = set()
-    for article in all_articles:
-        if article['url'] not in seen_urls:
-            seen_urls.add(article['url'])
-            unique_articles.append(article)
-    
-    print(f"📊 Unique articles: {len(unique_articles)}")
-    
-    # Analyze articles for keywords
-    def analyze_article_content(article, keywords_by_category, all_keywords_list):
-        matched_keywords = []
-        matched_categories = set()
-        keywords_found = []
-        
-        content = f"{article['title']} {article.get('summary', '')}".lower()
-        
-        for keyword_info in all_keywords_list:
-            keyword = keyword_info['word']
-            category = keyword_info['category']
-            
-            if keyword in content:
-                matched_keywords.append({'word': keyword, 'category': category})
-                matched_categories.add(category)
-                keywords_found.append(keyword)
-        
-        unique_keywords = list(set(keywords_found))
-        total_matches = len(matched_keywords)
-        
-        if total_matches >= 5:
-            threat_level = "high"
-            priority = "high"
-        elif total_matches >= 2:
-            threat_level = "medium"
-            priority = "medium"
-        elif total_matches >= 1:
-            threat_level = "low"
-            priority = "low"
-        else:
-            threat_level = "none"
-            priority = "none"
-        
-        return {
-            "level": threat_level,
-            "priority": priority,
-            "keywords_found": unique_keywords[:20],
-            "total_keywords_matched": total_matches,
-            "categories": list(matched_categories),
-            "has_match": total_matches > 0
-        }
-    
-    # Match keywords
-    matched_articles = []
-    category_stats = {}
-    
-    for article in unique_articles:
-        threat = analyze_article_content(article, keywords_by_category, all_keywords_list)
-        if threat['has_match']:
-            article['threat_analysis'] = threat
-            matched_articles.append(article)
-            
-            # Use first category for stats
-            cat = article['category_display']
-            category_stats[cat] = category_stats.get(cat, 0) + 1
-    
-    print(f"🔴 Matched articles: {len(matched_articles)}")
-    
-    # Save to database
-    saved_count = 0
-    updated_count = 0
-    error_count = 0
-    
-    for article in matched_articles[:200]:
-        try:
-            existing = AutoNewsArticle.objects.filter(
-                url=article['url'],
-                created_by=request.user
-            ).first()
-            
-            title = article['title'][:500]
-            summary = article.get('summary', article['title'])[:1000]
-            url = article['url'][:1000]
-            image_url = article.get('image_url', '')[:1000] if article.get('image_url') else None
-            source = 'onlinekhabar'
-            date = article.get('pub_date', datetime.now()).strftime('%Y-%m-%d')[:20]
-            content_length = len(article.get('summary', ''))
-            priority = article['threat_analysis']['priority']
-            threat_level = article['threat_analysis']['level']
-            keywords = json.dumps(article['threat_analysis']['keywords_found'], ensure_ascii=False)
-            
-            # Store all categories as JSON
-            all_cats = article.get('all_categories', [article['category_display']])
-            categories_json = json.dumps(all_cats[:10], ensure_ascii=False)
-            
-            if existing:
-                existing.title = title
-                existing.summary = summary
-                existing.image_url = image_url
-                existing.content_length = content_length
-                existing.priority = priority
-                existing.threat_level = threat_level
-                existing.keywords = keywords
-                existing.categories = categories_json
-                existing.save()
-                updated_count += 1
-            else:
-                AutoNewsArticle.objects.create(
-                    title=title,
-                    summary=summary,
-                    url=url,
-                    image_url=image_url,
-                    source=source,
-                    date=date,
-                    content_length=content_length,
-                    priority=priority,
-                    threat_level=threat_level,
-                    keywords=keywords,
-                    categories=categories_json,
-                    created_by=request.user
-                )
-                saved_count += 1
-                
-        except Exception:
-            error_count += 1
-    
-    # Prepare response with MINIMAL summary prints
-    print(f"\n📊 Total RSS articles: {len(unique_articles)}")
-    print(f"🔴 Matched articles: {len(matched_articles)}")
-    print(f"💾 Saved: {saved_count} new, {updated_count} updated")
-    print(f"{'='*60}")
-    
-    alert_message = f"✅ Online Khabar: Found {len(matched_articles)} matching articles"
-    if saved_count > 0 or updated_count > 0:
-        alert_message += f" (Saved: {saved_count} new, Updated: {updated_count})"
-    
-    metadata = {
-        "source": "Online Khabar",
-        "scraped_at": datetime.now().isoformat(),
-        "status": "success",
-        "user": request.user.username,
-        "total_articles_scraped": len(unique_articles),
-        "articles_with_keywords": len(matched_articles),
-        "articles_by_category": category_stats,
-        "database_save": {
-            "new_articles_saved": saved_count,
-            "existing_articles_updated": updated_count,
-            "errors": error_count
-        },
-        "date_range": {
-            "start": FOUR_DAYS_AGO.strftime('%Y-%m-%d'),
-            "end": TODAY.strftime('%Y-%m-%d')
-        }
-    }
-    
-    return json.dumps({
-        "metadata": metadata,
-        "articles": matched_articles[:10],
-        "status": "success",
-        "alert_message": alert_message
-    }, ensure_ascii=False)
\ No newline at end of file
+    """Online Khabar RSS scraper"""
+    return scrape_feed('onlinekhabar', request)
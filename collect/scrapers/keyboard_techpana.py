@@ -6,18 +6,22 @@ import re
 import time
 import random
 from concurrent.futures import ThreadPoolExecutor, as_completed
-from requests.adapters import HTTPAdapter
-from urllib3.util.retry import Retry
 import urllib.parse
 import os
 from utils.websocket_helper import send_to_websocket
-from django.contrib.auth.models import User
-from django.db import models, transaction
+from django.contrib.auth.models import AnonymousUser
+from django.db import models
 from django.core.exceptions import ObjectDoesNotExist
 from django.utils import timezone
 
 # Import your models from collect app
-from collect.models import DangerousKeyword, AutoNewsArticle
+from collect.scrapers.engine import SourceRequest, fetch
+from collect.scrapers.crawl_state import SourceCrawl
+from collect.scrapers.feed_cache import keyword_fingerprint
+from collect.scrapers.ingest import UPDATE_FIELDS, ingest_articles
+from utils.http_session import get_session
+from utils.keyword_matcher import compile_keywords, keyword_entries
+from utils.text_normalize import normalize_text
 
 
 def keyboard_techpana_to_json(request):
@@ -34,11 +38,6 @@ def keyboard_techpana_to_json(request):
     
     base_url = "https://techpana.com"
     
-    # ============ ADJUSTED DELAYS ============
-    DISCOVERY_DELAY = 2
-    ARTICLE_DELAY = 2
-    CATEGORY_DELAY = 3
-    
     # ============ PAGINATION LIMIT ============
     MAX_PAGES_PER_CATEGORY = 4  # Only scrape first 4 pages
     
@@ -84,15 +83,15 @@ def keyboard_techpana_to_json(request):
     def fetch_dangerous_keywords():
         """Fetch all active dangerous keywords from collect app database"""
         try:
-            keywords = DangerousKeyword.objects.filter(is_active=True).values('word', 'category')
+            # Versioned registry - no query unless the keywords changed since the last run
+            keywords = keyword_entries()
             
             # Organize keywords by category
             keywords_by_category = {}
             all_keywords_list = []
             
-            for kw in keywords:
-                word = kw['word'].lower().strip()
-                category = kw['category'].strip()
+            for word, category in keywords:
+                word = word.lower().strip()
                 
                 # Add to category-specific list
                 if category not in keywords_by_category:
@@ -117,35 +116,28 @@ def keyboard_techpana_to_json(request):
             return {}, []
     
     # ============ KEYWORD MATCHING FUNCTION ============
-    def analyze_article_content(article, keywords_by_category, all_keywords_list):
+    def analyze_article_content(article, matcher):
         """
-        Analyze article title and summary against dangerous keywords
+        Analyze article title and summary against dangerous keywords (one pass, see compile_keywords)
         Returns matched keywords by category and threat analysis
         """
         matched_keywords = []
         matched_categories = set()
         keywords_found = []
         
-        # Combine title and summary for analysis
-        content_to_analyze = f"{article['title']} {article.get('summary', '')}".lower()
-        
-        # Remove special characters for better matching
-        content_to_analyze = re.sub(r'[^\w\s]', ' ', content_to_analyze)
-        words_in_content = set(content_to_analyze.split())
+        # Combine title and summary for analysis. normalize_text folds punctuation
+        # and spelling variants; the old [^\w\s] cleanup also removed Devanagari
+        # matras and virama, so most Nepali keywords could never match
+        content_to_analyze = normalize_text(f"{article['title']} {article.get('summary', '')}")
         
-        # Check each keyword against the content
-        for keyword_info in all_keywords_list:
-            keyword = keyword_info['word']
-            category = keyword_info['category']
-            
-            # Check for exact match or as part of words
-            if keyword in words_in_content or keyword in content_to_analyze:
-                matched_keywords.append({
-                    'word': keyword,
-                    'category': category
-                })
-                matched_categories.add(category)
-                keywords_found.append(keyword)
+        # Every keyword found anywhere in the content (whole words included)
+        for keyword, category in matcher.matches(content_to_analyze):
+            matched_keywords.append({
+                'word': keyword,
+                'category': category
+            })
+            matched_categories.add(category)
+            keywords_found.append(keyword)
         
         # Remove duplicates while preserving order
         unique_keywords_found = []
@@ -239,37 +231,19 @@ def keyboard_techpana_to_json(request):
     
     # ============ SESSION SETUP ============
     def create_protected_session():
-        session = requests.Session()
-        
-        retry_strategy = Retry(
-            total=3,
-            backoff_factor=1,
-            status_forcelist=[429, 500, 502, 503, 504],
-            allowed_methods=["GET"],
-            raise_on_status=False
-        )
-        
-        adapter = HTTPAdapter(
-            max_retries=retry_strategy,
-            pool_connections=10,
-            pool_maxsize=10
-        )
-        
-        session.mount("https://", adapter)
-        session.mount("http://", adapter)
-        
-        session.headers.update({
+        """Shared pooled session - keep-alive connections survive between runs"""
+        return get_session("techpana.com")
+
+    def request_headers():
+        """Sent with every request - the shared session keeps the headers of whoever created it"""
+        return {
             "User-Agent": random.choice(user_agents),
             "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
             "Accept-Language": "en-US,en;q=0.5",
-            "Accept-Encoding": "gzip, deflate",
-            "Connection": "keep-alive",
             "Upgrade-Insecure-Requests": "1",
             "Cache-Control": "no-cache",
             "Pragma": "no-cache"
-        })
-        
-        return session
+        }
     
     def safe_decode_html(content):
         if isinstance(content, bytes):
@@ -442,8 +416,11 @@ def keyboard_techpana_to_json(request):
         return unique_articles
     
     # ============ MAIN EXTRACTION WITH PAGINATION LIMIT ============
-    def extract_all_articles():
-        """Extract articles from all relevant categories with max 4 pages per category"""
+    def extract_all_articles(crawl):
+        """
+        Extract articles from all relevant categories with max 4 pages per category.
+        Pagination stops at the first page that reaches articles handled in an earlier run.
+        """
         all_articles = []
         processed_urls = set()
         
@@ -470,7 +447,7 @@ def keyboard_techpana_to_json(request):
             
             # Test if category exists
             try:
-                test_response = session.get(category_url, timeout=15)
+                test_response = fetch(category_url, session=session, headers=request_headers(), timeout=15)
                 if test_response.status_code == 200:
                     working_categories.append(category_path)
                     print(f"\n   ✅ Category exists: {category_name}")
@@ -498,9 +475,8 @@ def keyboard_techpana_to_json(request):
                 print(f"      📄 Page {page_num}/{MAX_PAGES_PER_CATEGORY}: {current_url}")
                 
                 try:
-                    time.sleep(CATEGORY_DELAY + random.uniform(1, 3))
-                    
-                    response = session.get(current_url, timeout=30)
+                    # Page 1 is the category URL fetched by the existence check above
+                    response = test_response if page_num == 1 else fetch(current_url, session=session, headers=request_headers(), timeout=30)
                     
                     if response.status_code != 200:
                         print(f"      ⚠️ HTTP {response.status_code} - stopping pagination for this category")
@@ -513,8 +489,12 @@ def keyboard_techpana_to_json(request):
                         print(f"      📭 No articles found on page {page_num}")
                         break
                     
+                    found_count = len(articles)
+                    articles, reached_known = crawl.new_articles(current_url, articles)
+                    
                     new_articles = []
                     date_filtered_count = 0
+                    date_filtered_urls = []
                     
                     for article in articles:
                         # Check if article is within date range
@@ -528,12 +508,20 @@ def keyboard_techpana_to_json(request):
                                 new_articles.append(article)
                         else:
                             date_filtered_count += 1
+                            date_filtered_urls.append(article['url'])
+                    
+                    # Too old now means too old on every later run as well
+                    crawl.mark_seen(current_url, date_filtered_urls)
                     
                     if date_filtered_count > 0:
                         print(f"      ⏰ Filtered out {date_filtered_count} articles older than 4 days")
                     
                     print(f"      ✅ Page {page_num}: +{len(new_articles)} new articles within date range")
                     
+                    if reached_known:
+                        print(f"      ⏭️ {found_count - len(articles)} articles seen in earlier runs - stopping pagination for {category_name}")
+                        break
+                    
                     # Check if we've reached max pages
                     if page_num >= MAX_PAGES_PER_CATEGORY:
                         print(f"      🏁 Reached max pages limit ({MAX_PAGES_PER_CATEGORY}) for {category_name}")
@@ -569,10 +557,11 @@ def keyboard_techpana_to_json(request):
         processed_articles = []
         matched_articles_count = 0
         keyword_match_stats = {}
+        matcher = compile_keywords((kw['word'], kw['category']) for kw in all_keywords_list)
         
         for i, article in enumerate(articles):
             # Analyze article content against keywords
-            threat_analysis = analyze_article_content(article, keywords_by_category, all_keywords_list)
+            threat_analysis = analyze_article_content(article, matcher)
             
             # ONLY KEEP ARTICLES THAT HAVE KEYWORD MATCHES
             if threat_analysis['has_match']:
@@ -634,98 +623,43 @@ def keyboard_techpana_to_json(request):
         }
     
     # ============ SAVE TO DATABASE FUNCTION - CORRECTED FOR YOUR MODEL ============
-    @transaction.atomic
     def save_articles_to_database(articles, request):
         """
         Save scraped articles to AutoNewsArticle model in collect app
-        Only saves articles with keyword matches
+        Only saves articles with keyword matches - one batched upsert on (url, created_by)
         """
-        saved_count = 0
-        updated_count = 0
-        error_count = 0
-        errors = []
-        
         print(f"\n💾 SAVING {len(articles)} MATCHED ARTICLES TO DATABASE...")
         
         # Get user for created_by field
         user = request.user if request.user.is_authenticated else None
         
+        records = []
         for article in articles:
-            try:
-                # Check if article already exists for this user (unique_together = ['url', 'created_by'])
-                existing_article = AutoNewsArticle.objects.filter(
-                    url=article['url'],
-                    created_by=user
-                ).first()
-                
-                # Prepare data according to your model
-                title = article['title'][:500]  # max_length=500
-                summary = article.get('summary', article['title'])[:1000]  # TextField
-                url = article['url'][:1000]  # max_length=1000
-                image_url = article.get('image_url', '')[:1000] if article.get('image_url') else None
-                source = article.get('source', 'techpana')[:100]  # max_length=100
-                date = article.get('date_text', '')[:20] or datetime.now().strftime('%Y-%m-%d')[:20]  # max_length=20
-                
+            threat_analysis = article.get('threat_analysis', {})
+            records.append({
+                'title': article['title'],
+                'summary': article.get('summary', article['title'])[:1000],
+                'url': article['url'],
+                'image_url': article.get('image_url') or None,
+                'source': article.get('source', 'techpana'),
+                'date': article.get('date_text', '')[:20] or datetime.now().strftime('%Y-%m-%d'),
                 # Store threat analysis data in appropriate fields
-                content_length = len(article.get('summary', ''))
-                priority = article.get('threat_analysis', {}).get('priority', 'medium')[:10]  # max_length=10
-                threat_level = article.get('threat_analysis', {}).get('level', 'low')[:10]  # max_length=10
-                
+                'content_length': len(article.get('summary', '')),
+                'priority': threat_analysis.get('priority', 'medium'),
+                'threat_level': threat_analysis.get('level', 'low'),
                 # Store keywords and categories as JSON strings in TextFields
-                keywords = json.dumps(article.get('threat_analysis', {}).get('keywords_found', []), ensure_ascii=False)
-                categories = json.dumps(article.get('threat_analysis', {}).get('categories', []), ensure_ascii=False)
-                
-                if existing_article:
-                    # Update existing article
-                    existing_article.title = title
-                    existing_article.summary = summary
-                    existing_article.url = url
-                    existing_article.image_url = image_url
-                    existing_article.source = source
-                    existing_article.date = date
-                    existing_article.content_length = content_length
-                    existing_article.priority = priority
-                    existing_article.threat_level = threat_level
-                    existing_article.keywords = keywords
-                    existing_article.categories = categories
-                    
-                    existing_article.save()
-                    updated_count += 1
-                    if updated_count <= 5 or len(articles) <= 20:
-                        print(f"      🔄 Updated: {article['title'][:50]}...")
-                else:
-                    # Create new article
-                    AutoNewsArticle.objects.create(
-                        title=title,
-                        summary=summary,
-                        url=url,
-                        image_url=image_url,
-                        source=source,
-                        date=date,
-                        content_length=content_length,
-                        priority=priority,
-                        threat_level=threat_level,
-                        keywords=keywords,
-                        categories=categories,
-                        created_by=user
-                    )
-                    saved_count += 1
-                    if saved_count <= 5 or len(articles) <= 20:
-                        print(f"      ✅ Saved: {article['title'][:50]}...")
-                
-            except Exception as e:
-                error_count += 1
-                error_msg = f"Error saving {article['url'][:50]}: {str(e)[:100]}"
-                errors.append(error_msg)
-                print(f"      ❌ {error_msg}")
-                
-                # Print more details for debugging
-                import traceback
-                traceback.print_exc()
+                'keywords': json.dumps(threat_analysis.get('keywords_found', []), ensure_ascii=False),
+                'categories': json.dumps(threat_analysis.get('categories', []), ensure_ascii=False),
+            })
+        
+        result = ingest_articles(records, user, update_fields=UPDATE_FIELDS + ['source', 'date'])
+        saved_count, updated_count = result['saved'], result['updated']
+        error_count, errors = result['errors'], result['error_messages']
         
         print(f"\n   ✅ New articles saved: {saved_count}")
         print(f"   🔄 Existing articles updated: {updated_count}")
         print(f"   ❌ Errors: {error_count}")
+        print(f"   ⏱️ DB time: {result['db_seconds']:.2f}s")
         print(f"   📊 TOTAL MATCHED ARTICLES IN DATABASE: {saved_count + updated_count}")
         
         if errors and error_count <= 5:
@@ -765,7 +699,7 @@ def keyboard_techpana_to_json(request):
         print("\n🌐 Testing connection to Techpana...")
         test_session = create_protected_session()
         try:
-            test_response = test_session.get("https://techpana.com", timeout=30)
+            test_response = fetch("https://techpana.com", session=test_session, headers=request_headers(), timeout=30)
             print(f"   ✅ Techpana homepage: {test_response.status_code}")
         except Exception as e:
             print(f"   ❌ Cannot access Techpana: {str(e)}")
@@ -779,15 +713,20 @@ def keyboard_techpana_to_json(request):
             }, ensure_ascii=False)
         
         # Step 3: Extract articles from all relevant categories
-        all_articles, working_categories = extract_all_articles()
+        # (non-matching articles are dropped, so the marks follow the keyword table)
+        crawl = SourceCrawl("techpana", request.user if request.user.is_authenticated else None,
+                            keyword_fingerprint=keyword_fingerprint())
+        all_articles, working_categories = extract_all_articles(crawl)
         
         if not all_articles:
-            print("\n❌ No articles found within date range!")
+            crawl.save()
+            print("\n❌ No new articles found within date range!")
             return json.dumps({
                 "metadata": {
                     "status": "success",
-                    "message": "No articles found in last 4 days",
+                    "message": "No new articles found in last 4 days",
                     "total_articles_found": 0,
+                    "crawl_state": crawl.stats(),
                     "scraped_at": datetime.now().isoformat(),
                     "source": "Techpana"
                 },
@@ -803,6 +742,8 @@ def keyboard_techpana_to_json(request):
         )
         
         if not matched_articles:
+            crawl.mark_articles(all_articles, {a['url'] for a in all_articles})
+            crawl.save()
             print("\n📭 No articles with dangerous keyword matches found in last 4 days!")
             
             metadata = {
@@ -815,6 +756,7 @@ def keyboard_techpana_to_json(request):
                 "total_articles_scraped": len(all_articles),
                 "articles_with_keywords": 0,
                 "articles_filtered_out": len(all_articles),
+                "crawl_state": crawl.stats(),
                 "date_range": {
                     "start": FOUR_DAYS_AGO.strftime('%Y-%m-%d'),
                     "end": TODAY.strftime('%Y-%m-%d')
@@ -831,6 +773,11 @@ def keyboard_techpana_to_json(request):
         # Step 5: Save only matched articles to database
         saved, updated, errors_count, errors_list = save_articles_to_database(matched_articles, request)
         
+        # Remember what was handled so the next run skips it (retried if saving failed)
+        if not errors_count:
+            crawl.mark_articles(all_articles, {a['url'] for a in all_articles})
+        crawl.save()
+        
         # Step 6: Prepare metadata
         exec_time = round(time.time() - start_time, 2)
         
@@ -843,6 +790,7 @@ def keyboard_techpana_to_json(request):
             "working_categories_found": len(working_categories),
             "max_pages_per_category": MAX_PAGES_PER_CATEGORY,
             "total_articles_scraped": len(all_articles),
+            "crawl_state": crawl.stats(),
             "articles_with_keywords": len(matched_articles),
             "articles_filtered_out_by_date": len([a for a in all_articles if not is_article_within_date_range(a)]),
             "articles_filtered_out_by_keywords": len(all_articles) - len(matched_articles),
@@ -967,17 +915,8 @@ def test_techpana_scraper():
     print("🔴 ONLY articles with dangerous keyword matches from last 4 days will be saved")
     print("=" * 80)
     
-    class MockUser:
-        def __init__(self):
-            self.username = "debug_user"
-            self.is_authenticated = True
-    
-    class MockRequest:
-        def __init__(self):
-            self.user = MockUser()
-    
-    # Run the scraper
-    result = keyboard_techpana_to_json(MockRequest())
+    # Run the scraper (articles are saved without a user)
+    result = keyboard_techpana_to_json(SourceRequest(AnonymousUser()))
     
     # Parse and display results
     try:
@@ -1015,22 +954,13 @@ def test_techpana_scraper():
 
 
 # ============ SCHEDULED TASK FUNCTION ============
-def run_techpana_scraper_scheduled():
-    """Function to be called by Celery or cron jobs"""
+def run_techpana_scraper_scheduled(user=None):
+    """Run Techpana once for user outside a view - periodic runs: `manage.py run_scheduler`"""
     print(f"🕐 Starting scheduled Techpana scraper at {datetime.now()}")
     print(f"🔴 Mode: Keyword matches only, Last 4 days")
     
-    class SystemUser:
-        def __init__(self):
-            self.username = "system"
-            self.is_authenticated = True
-    
-    class ScheduledRequest:
-        def __init__(self):
-            self.user = SystemUser()
-    
     try:
-        result = keyboard_techpana_to_json(ScheduledRequest())
+        result = keyboard_techpana_to_json(SourceRequest(user or AnonymousUser()))
         parsed = json.loads(result)
         
         if parsed['metadata']['status'] == 'success':
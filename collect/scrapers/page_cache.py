@@ -0,0 +1,255 @@
+"""
+Content-addressed on-disk cache of raw fetched pages.
+
+Every successful GET made through engine.fetch() is stored here: the body is
+zlib-compressed and written once under its SHA-256 (identical pages fetched
+from different URLs share a blob), and a CachedPage row maps the canonical
+URL to the blob. Entries past PAGE_CACHE_TTL are evicted first, then the least
+recently used ones until the store fits in PAGE_CACHE_MAX_BYTES.
+
+Rows are buffered and written FLUSH_EVERY at a time in one upsert (and at the
+end of every engine.run_sources() batch) so a crawl does not hold SQLite's
+write lock once per page while the scrapers are saving articles.
+
+In replay mode engine.fetch() answers from this cache only - no network - so
+extraction and keyword analysis can be re-run against yesterday's crawl.
+"""
+import hashlib
+import os
+import threading
+import zlib
+from datetime import timedelta
+from pathlib import Path
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import requests
+from django.conf import settings
+from django.db import DatabaseError
+from django.db.models import Sum
+from django.utils import timezone
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+from collect.models import CachedPage
+
+
+CACHE_DIR = Path(getattr(settings, 'PAGE_CACHE_DIR', Path(settings.BASE_DIR) / 'cache' / 'pages'))
+TTL = getattr(settings, 'PAGE_CACHE_TTL', 7 * 24 * 3600)
+MAX_BYTES = getattr(settings, 'PAGE_CACHE_MAX_BYTES', 512 * 1024 * 1024)
+ENABLED = getattr(settings, 'PAGE_CACHE_ENABLED', True)
+
+PRUNE_EVERY = 200        # stores between two eviction passes
+FLUSH_EVERY = 50         # buffered rows written per upsert
+MAX_PAGE_BYTES = 5 * 1024 * 1024
+TRACKING_PARAMS = ('utm_', 'fbclid', 'gclid')
+
+_replay = False
+_stores = 0
+_pending = {}
+_lock = threading.Lock()
+_stats = {"stored": 0, "replayed": 0, "replay_misses": 0}
+
+
+# ============ KEYS ============
+def canonical_url(url):
+    """Lower-case scheme/host, drop default ports, fragments and tracking params, sort the query"""
+    try:
+        parts = urlsplit(url.strip())
+        port = parts.port
+    except ValueError:
+        # Malformed port or IPv6 host: keep the URL as it is rather than fail the fetch
+        return url.strip()
+    scheme = parts.scheme.lower() or 'https'
+    host = parts.hostname.lower() if parts.hostname else ''
+    if port and not ((scheme == 'http' and port == 80) or (scheme == 'https' and port == 443)):
+        host = f"{host}:{port}"
+    query = sorted(
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not key.lower().startswith(TRACKING_PARAMS)
+    )
+    return urlunsplit((scheme, host, parts.path or '/', urlencode(query), ''))
+
+
+def _blob_path(content_hash):
+    return CACHE_DIR / content_hash[:2] / f"{content_hash}.z"
+
+
+# ============ REPLAY MODE ============
+def set_replay(enabled):
+    """Serve engine.fetch() from the cache only (no network)"""
+    global _replay
+    _replay = bool(enabled)
+
+
+def is_replay():
+    return _replay
+
+
+def set_enabled(enabled):
+    """Turn storing fetched pages on or off (benchmarks serve synthetic pages under real URLs)"""
+    global ENABLED
+    ENABLED = bool(enabled)
+
+
+# ============ STORE / LOAD ============
+def store(url, response):
+    """Keep the raw body of a successful response (no-op when disabled or too large)"""
+    global _stores
+    if not ENABLED or _replay or response.status_code != 200:
+        return
+    body = response.content
+    if not body or len(body) > MAX_PAGE_BYTES:
+        return
+
+    content_hash = hashlib.sha256(body).hexdigest()
+    path = _blob_path(content_hash)
+    if not path.exists():
+        path.parent.mkdir(parents=True, exist_ok=True)
+        compressed = zlib.compress(body, 6)
+        tmp_path = path.with_suffix(f".{threading.get_ident()}.tmp")
+        with open(tmp_path, 'wb') as f:
+            f.write(compressed)
+        os.replace(tmp_path, path)
+        size = len(compressed)
+    else:
+        size = path.stat().st_size
+
+    key = canonical_url(url)
+    now = timezone.now()
+    row = CachedPage(
+        url=key,
+        content_hash=content_hash,
+        status_code=response.status_code,
+        content_type=response.headers.get('Content-Type', '')[:255],
+        size=size,
+        fetched_at=now,
+        last_used=now,
+    )
+
+    with _lock:
+        _pending[key] = row
+        _stats["stored"] += 1
+        _stores += 1
+        flush_due = len(_pending) >= FLUSH_EVERY
+        prune_due = _stores % PRUNE_EVERY == 0
+    if prune_due:
+        prune()
+    elif flush_due:
+        flush()
+
+
+def flush():
+    """Write buffered rows in a single upsert statement"""
+    with _lock:
+        rows = list(_pending.values())
+        _pending.clear()
+    if not rows:
+        return 0
+    try:
+        CachedPage.objects.bulk_create(
+            rows,
+            update_conflicts=True,
+            unique_fields=['url'],
+            update_fields=['content_hash', 'status_code', 'content_type', 'size', 'fetched_at', 'last_used'],
+        )
+    except DatabaseError as e:
+        # The blobs are on disk already - the pages are simply fetched again next time
+        print(f"⚠️ Page cache: could not record {len(rows)} pages: {e}")
+        return 0
+    return len(rows)
+
+
+def load(url):
+    """Rebuild a requests.Response for url from the cache, or None"""
+    flush()
+    key = canonical_url(url)
+    entry = CachedPage.objects.filter(url=key).first()
+    if entry is None:
+        return None
+    try:
+        with open(_blob_path(entry.content_hash), 'rb') as f:
+            body = zlib.decompress(f.read())
+    except (OSError, zlib.error):
+        CachedPage.objects.filter(pk=entry.pk).delete()
+        return None
+
+    CachedPage.objects.filter(pk=entry.pk).update(last_used=timezone.now())
+
+    response = requests.Response()
+    response.status_code = entry.status_code
+    response._content = body
+    response.headers = CaseInsensitiveDict({'Content-Type': entry.content_type, 'X-Page-Cache': 'replay'})
+    response.encoding = get_encoding_from_headers(response.headers)
+    response.url = url
+    response.reason = 'OK'
+    return response
+
+
+def replay_response(url):
+    """Cached response in replay mode; a 404 stands in for pages that were never fetched"""
+    response = load(url)
+    with _lock:
+        _stats["replayed" if response is not None else "replay_misses"] += 1
+    if response is not None:
+        return response
+    missing = requests.Response()
+    missing.status_code = 404
+    missing._content = b''
+    missing.reason = 'Not in page cache'
+    missing.url = url
+    return missing
+
+
+# ============ EVICTION ============
+def _delete_entries(entries):
+    hashes = {content_hash for _, content_hash in entries}
+    CachedPage.objects.filter(pk__in=[pk for pk, _ in entries]).delete()
+    still_used = set(
+        CachedPage.objects.filter(content_hash__in=hashes).values_list('content_hash', flat=True)
+    )
+    for content_hash in hashes - still_used:
+        try:
+            os.remove(_blob_path(content_hash))
+        except OSError:
+            pass
+    return len(entries)
+
+
+def prune(ttl=TTL, max_bytes=MAX_BYTES):
+    """Evict expired pages, then least recently used ones until under max_bytes"""
+    flush()
+    expired = list(
+        CachedPage.objects.filter(fetched_at__lt=timezone.now() - timedelta(seconds=ttl))
+        .values_list('pk', 'content_hash')
+    )
+    removed = _delete_entries(expired) if expired else 0
+
+    total = CachedPage.objects.aggregate(total=Sum('size'))['total'] or 0
+    if total > max_bytes:
+        victims = []
+        for pk, content_hash, size in CachedPage.objects.order_by('last_used').values_list('pk', 'content_hash', 'size').iterator():
+            if total <= max_bytes:
+                break
+            victims.append((pk, content_hash))
+            total -= size
+        removed += _delete_entries(victims)
+    return removed
+
+
+def clear():
+    flush()
+    return _delete_entries(list(CachedPage.objects.values_list('pk', 'content_hash')))
+
+
+def cache_stats():
+    flush()
+    totals = CachedPage.objects.aggregate(total=Sum('size'))
+    with _lock:
+        stats = dict(_stats)
+    stats.update({
+        "pages": CachedPage.objects.count(),
+        "blobs": CachedPage.objects.values('content_hash').distinct().count(),
+        "compressed_bytes": totals['total'] or 0,
+        "replay": _replay,
+    })
+    return stats
@@ -0,0 +1,171 @@
+"""
+Per-host politeness for the scraping engine.
+
+Every host gets a token bucket (requests per second, with a small burst) and
+an AIMD concurrency window. 429/5xx responses and timeouts halve both the
+window and the rate (and honour Retry-After); healthy, fast responses grow
+them back additively up to the host's ceiling. Callers wait exactly until
+the next token is due instead of sleeping a fixed delay.
+
+All limiter state lives on the engine's event loop thread - acquire() and
+release() must only be awaited from there (engine._fetch_async does).
+"""
+import asyncio
+import time
+from urllib.parse import urlsplit
+
+
+# ============ HOST POLICIES ============
+DEFAULT_POLICY = {
+    "rate": 2.0,             # starting requests/second
+    "min_rate": 0.2,         # floor after repeated backoffs
+    "max_rate": 5.0,         # politeness ceiling - never exceeded
+    "burst": 4,              # bucket size
+    "max_concurrency": 4,    # in-flight ceiling (engine.MAX_PER_HOST)
+}
+
+# Hosts known to block aggressive clients
+HOST_POLICIES = {
+    "techpana.com": {"rate": 0.25, "min_rate": 0.05, "max_rate": 0.5, "burst": 2, "max_concurrency": 2},
+    "nagariknews.nagariknetwork.com": {"rate": 1.0, "max_rate": 2.0, "burst": 2},
+}
+
+THROTTLE_STATUSES = {429, 500, 502, 503, 504}
+LATENCY_HEALTHY_FACTOR = 2.0   # latency under 2x the best observed counts as healthy
+RATE_STEP = 0.1                # additive increase, as a fraction of the starting rate
+MAX_RETRY_AFTER = 120
+
+
+class HostLimiter:
+    """Token bucket + AIMD concurrency window for a single host"""
+
+    def __init__(self, host, rate, min_rate, max_rate, burst, max_concurrency):
+        self.host = host
+        self.base_rate = rate
+        self.rate = rate
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.max_concurrency = max_concurrency
+        self.window = float(max(1, max_concurrency // 2))
+        self.in_flight = 0
+        self.blocked_until = 0.0
+        self.srtt = None
+        self.best_rtt = None
+        self.last_backoff = 0.0
+        self._updated = time.monotonic()
+        self._cond = None
+
+        # Stats
+        self.requests = 0
+        self.backoffs = 0
+        self.waited = 0.0
+
+    def _refill(self, now):
+        self.tokens = min(self.burst, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self):
+        """Wait for a concurrency slot and a token - no longer than needed"""
+        if self._cond is None:
+            self._cond = asyncio.Condition()
+        start = time.monotonic()
+        async with self._cond:
+            while True:
+                if self.in_flight >= max(1, int(self.window)):
+                    await self._cond.wait()
+                    continue
+
+                now = time.monotonic()
+                self._refill(now)
+                delay = self.blocked_until - now
+                if self.tokens < 1:
+                    delay = max(delay, (1 - self.tokens) / self.rate)
+                if delay <= 0:
+                    self.tokens -= 1
+                    self.in_flight += 1
+                    self.requests += 1
+                    self.waited += now - start
+                    return
+
+                # Sleep until the next token is due, but wake early if a slot frees up
+                try:
+                    await asyncio.wait_for(self._cond.wait(), timeout=delay)
+                except asyncio.TimeoutError:
+                    pass
+
+    async def release(self, status=None, latency=None, failed=False, retry_after=None):
+        """Feed the outcome of a request back into the window and the rate"""
+        now = time.monotonic()
+        async with self._cond:
+            self.in_flight -= 1
+            if failed or status in THROTTLE_STATUSES:
+                self._backoff(now, retry_after)
+            elif latency is not None:
+                self._observe(latency)
+            self._cond.notify_all()
+
+    def _backoff(self, now, retry_after):
+        # Multiplicative decrease, at most once per round trip so a burst of
+        # errors from the same window doesn't collapse the rate to the floor
+        if now - self.last_backoff >= (self.srtt or 1.0):
+            self.window = max(1.0, self.window / 2)
+            self._refill(now)
+            self.rate = max(self.min_rate, self.rate / 2)
+            self.last_backoff = now
+            self.backoffs += 1
+        if retry_after:
+            self.blocked_until = max(self.blocked_until, now + min(retry_after, MAX_RETRY_AFTER))
+
+    def _observe(self, latency):
+        self.srtt = latency if self.srtt is None else 0.8 * self.srtt + 0.2 * latency
+        self.best_rtt = latency if self.best_rtt is None else min(self.best_rtt, latency)
+        if self.srtt <= self.best_rtt * LATENCY_HEALTHY_FACTOR:
+            # Additive increase: about one extra slot per window of healthy responses
+            self.window = min(self.max_concurrency, self.window + 1 / max(self.window, 1.0))
+            self._refill(time.monotonic())
+            self.rate = min(self.max_rate, self.rate + self.base_rate * RATE_STEP)
+
+    def stats(self):
+        return {
+            "rate": round(self.rate, 2),
+            "window": round(self.window, 2),
+            "in_flight": self.in_flight,
+            "requests": self.requests,
+            "backoffs": self.backoffs,
+            "waited": round(self.waited, 2),
+            "srtt": round(self.srtt, 3) if self.srtt is not None else None,
+        }
+
+
+_limiters = {}
+
+
+def _normalise_host(host):
+    host = host.lower().split(':')[0]
+    return host[4:] if host.startswith('www.') else host
+
+
+def get_limiter(url_or_host):
+    """Limiter for a host (engine loop thread only)"""
+    host = urlsplit(url_or_host).netloc if '://' in url_or_host else url_or_host
+    host = _normalise_host(host)
+    limiter = _limiters.get(host)
+    if limiter is None:
+        policy = dict(DEFAULT_POLICY, **HOST_POLICIES.get(host, {}))
+        limiter = HostLimiter(host, **policy)
+        _limiters[host] = limiter
+    return limiter
+
+
+def parse_retry_after(value):
+    """Retry-After in seconds (the HTTP-date form is treated as absent)"""
+    try:
+        return max(0.0, float(value))
+    except (TypeError, ValueError):
+        return None
+
+
+def limiter_stats():
+    return {host: limiter.stats() for host, limiter in list(_limiters.items())}
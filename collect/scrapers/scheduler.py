@@ -0,0 +1,158 @@
+"""
+Periodic scraping with a per-source, yield-adaptive interval.
+
+Every (source, user) pair has a SourceSchedule row. `manage.py run_scheduler`
+ticks every few seconds and queues a `scheduled_scrape` job (see jobs.py) for
+each source that is due, never keeping more than MAX_ACTIVE of them queued or
+running at once. The workers run the source through autofeed.keyboard_autofeed
+and then adapt its interval with adapt():
+
+- the yield is the number of new keyword-matching articles per hour, kept as
+  a moving average (ALPHA);
+- the interval moves towards the one that would bring TARGET_NEW articles per
+  run, by at most FASTEST_STEP / QUIET_GROWTH per run, between the source's
+  min_interval and max_interval;
+- sources that yield nothing drift out to max_interval; failed runs back off.
+
+Every next run gets +/- JITTER so sources do not stay in lock-step.
+"""
+import random
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import F
+from django.utils import timezone
+
+from collect.models import ScrapeJob, SourceSchedule
+from collect.scrapers.engine import MAX_SOURCES
+from collect.scrapers.jobs import ACTIVE_STATES, enqueue
+
+
+# ============ POLICY ============
+DEFAULT_INTERVAL = 30 * 60
+MIN_INTERVAL = 5 * 60
+MAX_INTERVAL = 12 * 3600
+
+# Starting interval (seconds) - national dailies publish all day, regional sites a few times
+SOURCE_INTERVALS = {
+    'kantipur': 15 * 60,
+    'onlinekhabar': 15 * 60,
+    'nagariknews': 15 * 60,
+    'kathmandupost': 20 * 60,
+    'techpana': 30 * 60,          # slow host rate limit (rate_limit.HOST_POLICIES)
+    'hetaudatoday': 60 * 60,
+    'chitwan': 60 * 60,
+    'nuwakot': 60 * 60,
+    'merokarnali': 60 * 60,
+    'hamropahuch': 60 * 60,
+    'paschimnepal': 60 * 60,
+    'raibar': 60 * 60,
+}
+
+MAX_ACTIVE = getattr(settings, 'SCHEDULER_MAX_ACTIVE', MAX_SOURCES)   # scheduled jobs queued or running
+JITTER = 0.1              # +/- fraction of the interval
+ALPHA = 0.3               # weight of the latest run in yield_rate
+TARGET_NEW = 1.0          # new articles per run the interval aims for
+FASTEST_STEP = 0.5        # interval shrinks at most by half per run
+QUIET_GROWTH = 1.5        # ... and grows at most by half
+FAILURE_BACKOFF = 2.0
+
+
+def base_interval(source):
+    return SOURCE_INTERVALS.get(source, DEFAULT_INTERVAL)
+
+
+def jittered(seconds):
+    return timedelta(seconds=seconds * random.uniform(1 - JITTER, 1 + JITTER))
+
+
+# ============ SCHEDULES ============
+def ensure_schedules(user, names):
+    """Create the missing schedules of user for names, first runs spread over a fraction of the interval"""
+    now = timezone.now()
+    rows = []
+    for name in names:
+        interval = base_interval(name)
+        rows.append(SourceSchedule(
+            source=name,
+            created_by=user,
+            interval=interval,
+            min_interval=max(MIN_INTERVAL, interval // 3),
+            max_interval=min(MAX_INTERVAL, interval * 12),
+            next_run_at=now + timedelta(seconds=random.uniform(0, interval * JITTER)),
+        ))
+    before = SourceSchedule.objects.filter(created_by=user).count()
+    SourceSchedule.objects.bulk_create(rows, ignore_conflicts=True)
+    return SourceSchedule.objects.filter(created_by=user).count() - before
+
+
+def adapt(schedule, status, new, now):
+    """Fold one run into yield_rate and return the next interval (seconds)"""
+    if schedule.last_run_at is not None:
+        hours = max((now - schedule.last_run_at).total_seconds(), schedule.min_interval) / 3600
+    else:
+        hours = schedule.interval / 3600
+    rate = new / hours
+    schedule.yield_rate = rate if schedule.runs == 0 else ALPHA * rate + (1 - ALPHA) * schedule.yield_rate
+
+    if status != 'success':
+        interval = schedule.interval * FAILURE_BACKOFF
+    elif schedule.yield_rate <= 0:
+        interval = schedule.interval * QUIET_GROWTH
+    else:
+        target = TARGET_NEW / schedule.yield_rate * 3600
+        interval = min(max(target, schedule.interval * FASTEST_STEP), schedule.interval * QUIET_GROWTH)
+    return int(min(max(interval, schedule.min_interval), schedule.max_interval))
+
+
+def run_scheduled(schedule_id, report=print):
+    """Run one scheduled source now (job handler) and reschedule it from its yield"""
+    from collect.scrapers.autofeed import keyboard_autofeed
+
+    schedule = SourceSchedule.objects.select_related('created_by').get(pk=schedule_id)
+    try:
+        result = keyboard_autofeed(schedule.created_by, schedule.source, report)
+    except Exception as e:
+        result = {"status": "error", "message": str(e)}
+    stats = result.get('source_stats', {}).get(schedule.source, {})
+    status = stats.get('status', 'failed') if result.get('status') == 'success' else 'failed'
+    found, new = stats.get('total_found', 0), stats.get('new', 0)
+
+    now = timezone.now()
+    interval = adapt(schedule, status, new, now)
+    SourceSchedule.objects.filter(pk=schedule.pk).update(
+        interval=interval,
+        yield_rate=schedule.yield_rate,
+        next_run_at=now + jittered(interval),
+        last_run_at=now,
+        last_status=status,
+        last_found=found,
+        last_new=new,
+        runs=F('runs') + 1,
+        updated_at=now,
+    )
+    report(f"🗓️ {schedule.source}: {new} new of {found} matched - next run in {interval // 60} min "
+           f"({schedule.yield_rate:.2f} new/h)")
+    result["schedule"] = {"source": schedule.source, "interval": interval, "yield_rate": round(schedule.yield_rate, 3)}
+    return result
+
+
+def tick(now=None, max_active=MAX_ACTIVE):
+    """Queue a job for every due source while fewer than max_active scheduled jobs are active"""
+    now = now or timezone.now()
+    active = ScrapeJob.objects.filter(kind='scheduled_scrape', state__in=ACTIVE_STATES).count()
+    slots = max_active - active
+    if slots <= 0:
+        return []
+
+    queued = []
+    due = SourceSchedule.objects.filter(enabled=True, next_run_at__lte=now).select_related('created_by')
+    for schedule in due.order_by('next_run_at')[:slots]:
+        job, created = enqueue('scheduled_scrape', schedule.created_by, {"schedule_id": schedule.pk})
+        # Not due again while the job is pending - run_scheduled() sets the real next run
+        SourceSchedule.objects.filter(pk=schedule.pk).update(
+            next_run_at=now + timedelta(seconds=schedule.interval), updated_at=now
+        )
+        if created:
+            queued.append((schedule, job))
+    return queued
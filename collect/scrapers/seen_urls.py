@@ -0,0 +1,240 @@
+"""
+Compact seen-set of saved article URLs (Bloom filter + exact DB fallback).
+
+One filter per scope - a user's articles, or every article for the scrapers
+that dedupe globally - over canonical URLs (page_cache.canonical_url):
+
+- A negative answer costs no query: the URL was not saved as of the last
+  sync (plus whatever this process add()ed since). Rows other processes
+  saved in between are missed for up to SYNC_INTERVAL, so a negative is only
+  safe to act on where a unique constraint catches the duplicate; anything
+  else must sync(force=True) first or ask the DB (see ingest.py).
+- A positive answer may be a false positive, so the positives of a batch are
+  confirmed with a single url__in query.
+
+The bit array is kept on disk under SEEN_FILTER_DIR and rebuilt lazily from
+the DB when it is missing, over capacity or older than REBUILD_AFTER (a Bloom
+filter cannot forget deleted rows). In between it catches up incrementally
+with the rows added since the last sync (pk > synced_id), at most once every
+SYNC_INTERVAL seconds, and savers add() what they create straight away.
+"""
+import hashlib
+import json
+import math
+import os
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+
+from django.conf import settings
+
+from collect.models import AutoNewsArticle
+from collect.scrapers.page_cache import canonical_url
+
+
+FILTER_DIR = Path(getattr(settings, 'SEEN_FILTER_DIR', Path(settings.BASE_DIR) / 'cache' / 'seen'))
+FP_RATE = getattr(settings, 'SEEN_FILTER_FP_RATE', 0.001)
+MIN_CAPACITY = 50_000
+GROWTH = 2                       # capacity = GROWTH x rows at rebuild time
+SYNC_INTERVAL = 60               # seconds between two catch-up queries
+REBUILD_AFTER = 7 * 24 * 3600    # seconds - sheds URLs of deleted rows
+
+_filters = {}
+_lock = threading.Lock()
+
+
+def _scope(user):
+    return f"user-{user.pk}" if user is not None else "all"
+
+
+def _positions(url, bits, hashes):
+    # Kirsch-Mitzenmacher double hashing over one digest
+    digest = hashlib.blake2b(canonical_url(url).encode('utf-8'), digest_size=16).digest()
+    h1 = int.from_bytes(digest[:8], 'little')
+    h2 = int.from_bytes(digest[8:], 'little') | 1
+    return [(h1 + i * h2) % bits for i in range(hashes)]
+
+
+class SeenUrls:
+    """Bloom filter over the saved article URLs of one scope"""
+
+    def __init__(self, user=None):
+        self.user = user
+        self.scope = _scope(user)
+        self.path = FILTER_DIR / f"{self.scope}.bloom"
+        self._lock = threading.Lock()
+        self.capacity = 0
+        self.bits = 0
+        self.hashes = 0
+        self.items = 0
+        self.synced_id = 0
+        self.rebuilt_at = None
+        self._array = bytearray()
+        self._synced = 0.0
+        self._stats = {"lookups": 0, "negatives": 0, "positives": 0, "false_positives": 0, "queries": 0}
+        if not self._load():
+            self.rebuild()
+
+    def _rows(self):
+        rows = AutoNewsArticle.objects.all()
+        if self.user is not None:
+            rows = rows.filter(created_by=self.user)
+        return rows
+
+    # ============ BUILD / PERSIST ============
+    def _size_for(self, rows):
+        self.capacity = max(MIN_CAPACITY, rows * GROWTH)
+        self.bits = int(-self.capacity * math.log(FP_RATE) / (math.log(2) ** 2))
+        self.hashes = max(1, round(self.bits / self.capacity * math.log(2)))
+        self._array = bytearray((self.bits + 7) // 8)
+        self.items = 0
+
+    def rebuild(self):
+        """Size the filter for the current table and re-add every URL of the scope"""
+        with self._lock:
+            rows = self._rows()
+            self._size_for(rows.count())
+            synced_id = 0
+            for pk, url in rows.order_by('pk').values_list('pk', 'url').iterator(chunk_size=5000):
+                self._add(url)
+                synced_id = pk
+            self.synced_id = synced_id
+            self.rebuilt_at = time.time()
+            self._synced = time.monotonic()
+            self._save()
+        print(f"🧮 Seen-set {self.scope}: rebuilt with {self.items} URLs ({len(self._array) / 1024:.0f} KB)")
+
+    def _load(self):
+        try:
+            with open(self.path, 'rb') as f:
+                header = json.loads(f.readline())
+                array = bytearray(f.read())
+        except (OSError, ValueError):
+            return False
+        if len(array) != (header.get("bits", 0) + 7) // 8:
+            return False
+        if header["items"] > header["capacity"] or time.time() - header["rebuilt_at"] > REBUILD_AFTER:
+            return False
+        self.capacity = header["capacity"]
+        self.bits = header["bits"]
+        self.hashes = header["hashes"]
+        self.items = header["items"]
+        self.synced_id = header["synced_id"]
+        self.rebuilt_at = header["rebuilt_at"]
+        self._array = array
+        return True
+
+    def _save(self):
+        header = {
+            "capacity": self.capacity, "bits": self.bits, "hashes": self.hashes,
+            "items": self.items, "synced_id": self.synced_id, "rebuilt_at": self.rebuilt_at,
+        }
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        with open(tmp_path, 'wb') as f:
+            f.write(json.dumps(header).encode('utf-8') + b"\n")
+            f.write(self._array)
+        os.replace(tmp_path, self.path)
+
+    def sync(self, force=False):
+        """Add rows saved since the last sync (by any process); rebuild once over capacity"""
+        if not force and time.monotonic() - self._synced < SYNC_INTERVAL:
+            return 0
+        added = 0
+        with self._lock:
+            self._synced = time.monotonic()
+            self._stats["queries"] += 1
+            for pk, url in self._rows().filter(pk__gt=self.synced_id).order_by('pk').values_list('pk', 'url').iterator(chunk_size=5000):
+                self._add(url)
+                self.synced_id = pk
+                added += 1
+            over_capacity = self.items > self.capacity
+            if added and not over_capacity:
+                self._save()
+        if over_capacity:
+            self.rebuild()
+        return added
+
+    # ============ MEMBERSHIP ============
+    def _add(self, url, count=True):
+        for position in _positions(url, self.bits, self.hashes):
+            self._array[position >> 3] |= 1 << (position & 7)
+        if count:
+            self.items += 1
+
+    def add(self, urls):
+        """Record URLs that were just saved - counted and persisted when sync() reads their rows"""
+        with self._lock:
+            for url in urls:
+                self._add(url, count=False)
+
+    def might_contain(self, url):
+        """False means the URL is certainly not saved in this scope"""
+        return all(self._array[p >> 3] & (1 << (p & 7)) for p in _positions(url, self.bits, self.hashes))
+
+    def existing_rows(self, urls, *fields):
+        """
+        Saved rows of this scope for urls - model instances, or values() dicts of url + fields.
+        Bloom negatives cost nothing; the positives are confirmed with one query.
+        Rows saved by other processes since the last sync may be missing (see the module docstring).
+        """
+        self.sync()
+        urls = [url for url in dict.fromkeys(urls) if url]
+        candidates = [url for url in urls if self.might_contain(url)]
+        rows = []
+        if candidates:
+            rows = self._rows().filter(url__in=candidates)
+            rows = list(rows.values('url', *fields) if fields else rows)
+        found = {row['url'] if fields else row.url for row in rows}
+        with self._lock:
+            self._stats["lookups"] += len(urls)
+            self._stats["negatives"] += len(urls) - len(candidates)
+            self._stats["positives"] += len(candidates)
+            self._stats["false_positives"] += len(candidates) - len(found)
+            self._stats["queries"] += 1 if candidates else 0
+        return rows
+
+    def existing(self, urls):
+        """The subset of urls already saved in this scope"""
+        return {row['url'] for row in self.existing_rows(urls, 'pk')}
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+            fill = sum(bin(byte).count('1') for byte in self._array) / self.bits if self.bits else 0.0
+        stats.update({
+            "scope": self.scope,
+            "items": self.items,
+            "capacity": self.capacity,
+            "bits": self.bits,
+            "hashes": self.hashes,
+            "size_bytes": len(self._array),
+            "fill_ratio": round(fill, 4),
+            "expected_fp_rate": round(fill ** self.hashes, 6),
+            "observed_fp_rate": round(stats["false_positives"] / stats["positives"], 4) if stats["positives"] else 0.0,
+            "synced_id": self.synced_id,
+            "rebuilt_at": datetime.fromtimestamp(self.rebuilt_at).isoformat() if self.rebuilt_at else None,
+        })
+        return stats
+
+
+def get_filter(user=None):
+    """Shared filter for user's articles (None -> every article)"""
+    scope = _scope(user)
+    with _lock:
+        seen = _filters.get(scope)
+        if seen is None:
+            seen = _filters[scope] = SeenUrls(user)
+    return seen
+
+
+def record_saved(user, urls):
+    """Add newly saved URLs to the loaded filters they belong to"""
+    urls = list(urls)
+    if not urls:
+        return
+    for scope in (_scope(user), _scope(None)):
+        seen = _filters.get(scope)
+        if seen is not None:
+            seen.add(urls)
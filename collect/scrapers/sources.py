@@ -0,0 +1,88 @@
+"""
+Registry of keyboard_* sources run by the scraping engine
+"""
+from collect.scrapers.engine import run_sources, MAX_SOURCES
+from collect.scrapers.feeds import FEEDS, scrape_feeds
+from collect.scrapers.keyboard_techpana import keyboard_techpana_to_json
+from collect.scrapers.keyboard_nagarik import keyboard_nagariknews_to_json
+from collect.scrapers.keyboard_kantipur import keyboard_kantipur_to_json
+from collect.scrapers.keyboard_kathmandupost import keyboard_kathmandu_post_to_json
+from collect.scrapers.keyboard_onlinekhabar import keyboard_onlinekhabar_to_json
+from collect.scrapers.keyboard_paschim import keyboard_paschimnepal_to_json
+from collect.scrapers.tvnepal import keyboard_onlinetvnepal_to_json
+from collect.scrapers.osnepal import keyboard_osnepal_to_json
+from collect.scrapers.eAdarsha import keyboard_eadarsha_to_json
+from collect.scrapers.keyboard_arthasarokar import keyboard_arthasarokar_to_json
+from collect.scrapers.keyboard_newsofnepal import keyboard_newsofnepal_to_json
+from collect.scrapers.keyboard_rajdhanidaily import keyboard_rajdhanidaily_to_json
+from collect.scrapers.keyboard_dnews import keyboard_dnewsnepal_to_json
+from collect.scrapers.keyboard_hetauda import keyboard_hetaudatoday_to_json
+from collect.scrapers.keyboard_chitwan import keyboard_chitwansamachar_to_json
+from collect.scrapers.keyboard_nuwakot import keyboard_onlinenuwakot_to_json
+from collect.scrapers.keyboard_karnali import keyboard_merokarnali_to_json
+from collect.scrapers.keyboard_pahuch import keyboard_hamropahuch_to_json
+from collect.scrapers.keyboard_raibar import keyboard_nepaliraibar_to_json
+from collect.scrapers.keyboard_shilapaper import keyboard_shilapaper_to_json
+
+
+# Source name (as sent by newsportal_list.html) -> scraper function
+SCRAPER_FUNCTIONS = {
+    'nagariknews': keyboard_nagariknews_to_json,
+    'techpana': keyboard_techpana_to_json,
+    'kantipur': keyboard_kantipur_to_json,
+    'kathmandupost': keyboard_kathmandu_post_to_json,
+    'onlinekhabar': keyboard_onlinekhabar_to_json,
+    'paschimnepal': keyboard_paschimnepal_to_json,
+    'onlinetvnepal': keyboard_onlinetvnepal_to_json,
+    'osnepal': keyboard_osnepal_to_json,
+    'eadarsha': keyboard_eadarsha_to_json,
+    'arthasarokar': keyboard_arthasarokar_to_json,
+    'newsofnepal': keyboard_newsofnepal_to_json,
+    'rajdhanidaily': keyboard_rajdhanidaily_to_json,
+    'dnews': keyboard_dnewsnepal_to_json,
+    'hetaudatoday': keyboard_hetaudatoday_to_json,
+    'chitwan': keyboard_chitwansamachar_to_json,
+    'nuwakot': keyboard_onlinenuwakot_to_json,
+    'merokarnali': keyboard_merokarnali_to_json,
+    'hamropahuch': keyboard_hamropahuch_to_json,
+    'raibar': keyboard_nepaliraibar_to_json,
+    'shilapaper': keyboard_shilapaper_to_json,
+}
+
+
+def resolve_sources(source):
+    """Turn 'all' / None / a single name into a list of source names (None if unknown)"""
+    if source in SCRAPER_FUNCTIONS:
+        return [source]
+    if source == 'all' or source is None:
+        return list(SCRAPER_FUNCTIONS.keys())
+    return None
+
+
+FEED_BATCH = "rss-feeds"
+
+
+def scrape_sources(names, request, max_sources=MAX_SOURCES, on_done=None):
+    """
+    Run the named sources concurrently on the shared engine.
+    RSS feeds (see feeds.FEEDS) run together as one batch next to the HTML scrapers;
+    the batch checks and records each feed's circuit breaker itself.
+    """
+    feed_names = [name for name in names if name in FEEDS]
+    scrapers = {name: SCRAPER_FUNCTIONS[name] for name in names if name not in FEEDS}
+    if feed_names:
+        scrapers[FEED_BATCH] = lambda req: scrape_feeds(feed_names, req, on_done=on_done)
+
+    def source_done(name, result):
+        # Feeds in the batch report through scrape_feeds' own on_done
+        if on_done and name != FEED_BATCH:
+            on_done(name, result)
+
+    results = run_sources(scrapers, request, max_sources=max_sources, on_done=source_done, untracked={FEED_BATCH})
+    batch = results.pop(FEED_BATCH, None)
+    if batch is not None:
+        for name in feed_names:
+            results[name] = (batch['data'] or {}).get(name) or {
+                "data": None, "error": batch['error'] or "Feed batch failed", "elapsed": batch['elapsed']
+            }
+    return results
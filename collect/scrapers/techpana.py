@@ -7,8 +7,10 @@ import time
 import os
 import random
 from concurrent.futures import ThreadPoolExecutor, as_completed
-from requests.adapters import HTTPAdapter
-from urllib3.util.retry import Retry
+from collect.scrapers.engine import fetch
+from utils.keyword_matcher import compile_keywords
+from collect.scrapers.seen_urls import get_filter
+from utils.http_session import get_session
 
 def techpana_to_json():
     base_url = "https://techpana.com/"
@@ -133,34 +135,9 @@ def techpana_to_json():
         "जेनजेड", "युवा", "दुर्गा पार्साई", "सेना", "प्रहरी"
     }
     
-    # Create keyword set for faster lookup
+    # All keywords in one automaton - a single pass per article
     keyword_set = set(important_keywords)
-    
-    # Rate limiting class
-    class RateLimiter:
-        def __init__(self, calls_per_minute=20):
-            self.calls_per_minute = calls_per_minute
-            self.last_calls = []
-            
-        def wait_if_needed(self):
-            now = datetime.now()
-            # Remove calls older than 1 minute
-            self.last_calls = [call for call in self.last_calls 
-                              if (now - call).seconds < 60]
-            
-            if len(self.last_calls) >= self.calls_per_minute:
-                oldest_call = self.last_calls[0]
-                sleep_time = 60 - (now - oldest_call).seconds
-                if sleep_time > 0:
-                    print(f"⏳ Rate limiting: Sleeping for {sleep_time} seconds...")
-                    time.sleep(sleep_time + random.uniform(1, 3))
-                
-                # Clean up again after sleep
-                now = datetime.now()
-                self.last_calls = [call for call in self.last_calls 
-                                  if (now - call).seconds < 60]
-            
-            self.last_calls.append(now)
+    matcher = compile_keywords((kw, kw) for kw in keyword_set)
     
     def save_to_debug_file(data, filename="techpana_debug_output.json"):
         """Save the scraped data to a JSON file for debugging"""
@@ -171,13 +148,11 @@ def techpana_to_json():
         except Exception as e:
             print(f"❌ Error saving debug file: {e}")
     
-    def get_existing_urls_from_database():
-        """Get existing article URLs from database to avoid duplicates"""
+    def get_existing_urls_from_database(urls):
+        """Which of urls are already saved - seen-set first, one query for its positives"""
         try:
-            # Import your model here
-            from collect.models import AutoNewsArticle
-            existing_urls = set(AutoNewsArticle.objects.values_list('url', flat=True))
-            print(f"📁 Found {len(existing_urls)} existing articles in database")
+            existing_urls = get_filter().existing(urls)
+            print(f"📁 Found {len(existing_urls)} of {len(urls)} homepage articles in database")
             return existing_urls
         except Exception as e:
             print(f"⚠️ Error loading existing articles from database: {e}")
@@ -235,56 +210,29 @@ def techpana_to_json():
         return None, None
 
     def create_session():
-        """Create a session with retry strategy and rate limiting"""
-        session = requests.Session()
-        
-        # Configure retry strategy
-        retry_strategy = Retry(
-            total=3,
-            backoff_factor=1,
-            status_forcelist=[429, 500, 502, 503, 504],
-            allowed_methods=["GET", "POST"]
-        )
-        
-        adapter = HTTPAdapter(
-            max_retries=retry_strategy,
-            pool_connections=10,
-            pool_maxsize=10
-        )
-        
-        session.mount("https://", adapter)
-        session.mount("http://", adapter)
-        
-        # Update headers with random User-Agent
-        session.headers.update({
+        """Shared pooled session for techpana (keep-alive across batches and runs)"""
+        return get_session("techpana.com")
+
+    def request_headers():
+        """Sent with every request - the shared session keeps the headers of whoever created it"""
+        return {
             "User-Agent": random.choice(user_agents),
             "Accept": headers["Accept"],
             "Accept-Language": headers["Accept-Language"],
-            "Accept-Encoding": headers["Accept-Encoding"],
             "DNT": headers["DNT"],
-            "Connection": headers["Connection"],
             "Upgrade-Insecure-Requests": headers["Upgrade-Insecure-Requests"],
-        })
-        
-        return session
+        }
 
-    def fetch_single_article_content(url, session, rate_limiter):
-        """Fetch content for a single article with rate limiting"""
+    def fetch_single_article_content(url, session):
+        """Fetch content for a single article (paced by the shared per-host limiter)"""
         try:
-            # Apply rate limiting
-            rate_limiter.wait_if_needed()
+            response = fetch(url, session=session, headers=request_headers(), timeout=15)
             
-            # Add random delay between 3-7 seconds
-            time.sleep(random.uniform(3, 7))
-            
-            response = session.get(url, timeout=15)
-            response.raise_for_status()
-            
-            # Check if we got blocked
+            # Got blocked - the limiter has already backed off for this host
             if response.status_code == 429:
-                print(f"⏸️ Got 429 for {url}, waiting 30 seconds...")
-                time.sleep(30)
+                print(f"⏸️ Got 429 for {url}, skipping")
                 return url, ""
+            response.raise_for_status()
             
             soup = BeautifulSoup(response.content, "lxml")
             full_content = ""
@@ -317,46 +265,25 @@ def techpana_to_json():
             return url, ""
 
     def get_article_content_batch(urls_to_fetch):
-        """Fetch multiple article contents in parallel with better rate limiting"""
+        """Fetch multiple article contents in parallel; techpana's host policy keeps the pace polite"""
         content_map = {}
-        rate_limiter = RateLimiter(calls_per_minute=15)  # Be conservative
-        
-        # Process in small batches with delays between batches
-        batch_size = 3  # Very small batch size to avoid detection
-        delay_between_batches = 20  # seconds
+        session = create_session()
+        print(f"📄 Fetching {len(urls_to_fetch)} articles")
         
-        for i in range(0, len(urls_to_fetch), batch_size):
-            batch = urls_to_fetch[i:i+batch_size]
-            print(f"📄 Processing batch {i//batch_size + 1}/{(len(urls_to_fetch)-1)//batch_size + 1} ({len(batch)} articles)")
-            
-            # Create a new session for each batch to rotate User-Agent
-            session = create_session()
-            
-            # Process batch
-            with ThreadPoolExecutor(max_workers=2) as executor:  # Only 2 workers!
-                future_to_url = {}
-                for url in batch:
-                    future = executor.submit(fetch_single_article_content, url, session, rate_limiter)
-                    future_to_url[future] = url
-                
-                for future in as_completed(future_to_url):
-                    url, content = future.result()
-                    content_map[url] = content
-            
-            # Close session
-            session.close()
-            
-            # Delay between batches
-            if i + batch_size < len(urls_to_fetch):
-                print(f"⏸️ Waiting {delay_between_batches} seconds before next batch...")
-                time.sleep(delay_between_batches)
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            future_to_url = {
+                executor.submit(fetch_single_article_content, url, session): url
+                for url in urls_to_fetch
+            }
+            for future in as_completed(future_to_url):
+                url, content = future.result()
+                content_map[url] = content
         
         return content_map
 
     def analyze_keywords(content):
         """Analyze content for keywords and return matches"""
-        # Use list comprehension for faster matching
-        found_keywords = [kw for kw in keyword_set if kw in content]
+        found_keywords = [kw for _, kw in matcher.matches(content)]
         return found_keywords
 
     def determine_threat_level(keywords):
@@ -409,28 +336,20 @@ def techpana_to_json():
     try:
         print(f"🚀 Starting Techpana scraping at {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
         
-        # Load existing articles from database
-        existing_urls = get_existing_urls_from_database()
-        
         # Create session for homepage
         session = create_session()
         
-        # Fetch main page with delay
-        time.sleep(random.uniform(2, 5))
+        # Fetch main page
         print(f"🌐 Fetching homepage: {base_url}")
-        response = session.get(base_url, timeout=15)
-        response.raise_for_status()
+        response = fetch(base_url, session=session, headers=request_headers(), timeout=15)
         
-        # Check for blocking
+        # Check for blocking - the retry waits for the limiter's backoff / Retry-After
         if response.status_code == 429:
-            print("❌ Homepage blocked with 429. Waiting 60 seconds...")
-            time.sleep(60)
-            # Try once more
-            response = session.get(base_url, timeout=15)
-            response.raise_for_status()
+            print("❌ Homepage blocked with 429. Retrying once...")
+            response = fetch(base_url, session=session, headers=request_headers(), timeout=15)
+        response.raise_for_status()
         
         soup = BeautifulSoup(response.content, "lxml")
-        session.close()
         
         # Find all article containers
         article_containers = []
@@ -448,11 +367,14 @@ def techpana_to_json():
         candidate_articles = []
         candidate_urls = []
         
+        extracted = []
         for container in article_containers:
             title, link = extract_article_info(container)
-            if not title or not link:
-                continue
-            
+            if title and link:
+                extracted.append((container, title, link))
+        existing_urls = get_existing_urls_from_database([link for _, _, link in extracted])
+        
+        for container, title, link in extracted:
             # Skip existing articles
             if link in existing_urls:
                 continue
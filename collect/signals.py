@@ -0,0 +1,12 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from collect.models import DangerousKeyword
+from utils.keyword_matcher import bump_keyword_version
+
+
+@receiver(post_save, sender=DangerousKeyword)
+@receiver(post_delete, sender=DangerousKeyword)
+def dangerous_keywords_changed(sender, **kwargs):
+    """Compiled keyword matchers of every process are rebuilt on their next use"""
+    bump_keyword_version()
@@ -1,3 +1,1076 @@
-from django.test import TestCase
+import asyncio
+import contextlib
+import io
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from datetime import timedelta
+from pathlib import Path
+from unittest import mock
 
-# Create your tests here.
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.utils import timezone
+
+from collect.models import AutoNewsArticle, CrawlState, DangerousKeyword, FeedValidator, ScrapeJob, SourceSchedule
+from collect.scrapers import engine, feed_cache, feeds, health, ingest, jobs, page_cache, scheduler, seen_urls
+from collect.scrapers.crawl_state import FEED_SLACK, SourceCrawl
+from collect.scrapers.engine import SourceRequest, set_host_override
+from collect.scrapers.feed_stream import FeedStream
+from collect.scrapers.fixture_server import FixtureServer, render_article
+from collect.scrapers.html_parser import parse_html
+from collect.scrapers.page_cache import canonical_url
+from collect.scrapers.rate_limit import MAX_RETRY_AFTER, HostLimiter, parse_retry_after
+from collect.views import comment_spans, is_dangerous_comment
+from utils import http_session, sentiment
+from utils.keyword_matcher import (
+    AUTOMATON_MIN_WORDS, KeywordMatcher, bump_keyword_version, clear_cache, highlight_html, keyword_entries,
+    keyword_matcher,
+)
+from utils.text_normalize import normalize_keyword, normalize_text, normalize_with_offsets
+
+
+def isolate_seen_urls(test):
+    """Seen-sets of the test database must not land next to the real ones"""
+    seen_dir = tempfile.TemporaryDirectory()
+    test.addCleanup(seen_dir.cleanup)
+    for patcher in (mock.patch.object(seen_urls, 'FILTER_DIR', Path(seen_dir.name)),
+                    mock.patch.dict(seen_urls._filters, clear=True)):
+        patcher.start()
+        test.addCleanup(patcher.stop)
+
+
+def use_fixture_server(test, **options):
+    """Route engine.fetch() to a local FixtureServer, away from the real health state and page cache"""
+    server = FixtureServer(latency=0, **options).start()
+    set_host_override(server.base_url)
+    health.set_persistence(False)
+    page_cache.set_enabled(False)
+
+    def restore():
+        set_host_override(None)
+        server.stop()
+        health.set_persistence(True)
+        page_cache.set_enabled(getattr(settings, 'PAGE_CACHE_ENABLED', True))
+
+    test.addCleanup(restore)
+    return server
+
+
+# ============ SENTIMENT ============
+@unittest.skipUnless(
+    os.path.exists(sentiment.MODEL_PATH) and os.path.exists(sentiment.VECTORIZER_PATH), "sentiment model files missing"
+)
+class LinearScorerParityTests(SimpleTestCase):
+    """The fast linear path predicts exactly what model.predict() does"""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.model, cls.vectorizer = sentiment.load_models()
+        cls.scorer = sentiment.LinearScorer.export(cls.model, cls.vectorizer)
+        if cls.scorer is None:
+            raise unittest.SkipTest(f"no fast path for {type(cls.model).__name__}")
+
+        # Held out: random mixes of model vocabulary, words it never saw, emoji and case changes
+        rng = random.Random(7)
+        vocabulary = list(cls.vectorizer.vocabulary_) + ["नेपाल", "Nepal", "❤️", "👍", "!!!", "xyzzy", "१२३", "—"]
+        cls.texts = ["", "   ", "🙏", "जय नेपाल", "Good GOOD good", "खराब सरकार"]
+        for _ in range(3000):
+            words = [rng.choice(vocabulary) for _ in range(rng.randint(1, 30))]
+            if rng.random() < 0.3:
+                words = [word.upper() for word in words]
+            cls.texts.append(rng.choice([" ", "  ", ", ", "\n"]).join(words))
+
+    def test_batch_matches_model_predict(self):
+        expected = self.model.predict(self.vectorizer.transform(self.texts))
+        self.assertEqual(list(self.scorer.predict(self.texts)), list(expected))
+
+    def test_single_text_matches_model_predict(self):
+        expected = self.model.predict(self.vectorizer.transform(self.texts[:300]))
+        self.assertEqual([self.scorer.predict([text])[0] for text in self.texts[:300]], list(expected))
+
+
+class SentimentLoadingTests(SimpleTestCase):
+    """The model is loaded on first use - not at import, and at app ready only with SENTIMENT_PRELOAD"""
+
+    CHECK = (
+        "import sys, django; django.setup(); "
+        "from utils import sentiment; "
+        "print(sentiment._models is not None, 'sklearn' in sys.modules)"
+    )
+
+    def run_django(self, preload):
+        env = dict(os.environ, DJANGO_SETTINGS_MODULE='threatwatch.settings')
+        env.pop('SENTIMENT_PRELOAD', None)
+        if preload:
+            env['SENTIMENT_PRELOAD'] = '1'
+        result = subprocess.run([sys.executable, "-c", self.CHECK], cwd=settings.BASE_DIR, env=env,
+                                capture_output=True, text=True, timeout=120)
+        self.assertEqual(result.returncode, 0, result.stderr)
+        return result.stdout.split()[-2:]
+
+    def test_not_loaded_without_preload(self):
+        self.assertEqual(self.run_django(preload=False), ['False', 'False'])
+
+    @unittest.skipUnless(os.path.exists(sentiment.MODEL_PATH), "sentiment model files missing")
+    def test_loaded_at_ready_with_preload(self):
+        self.assertEqual(self.run_django(preload=True), ['True', 'True'])
+
+
+@unittest.skipUnless(
+    os.path.exists(sentiment.MODEL_PATH) and os.path.exists(sentiment.VECTORIZER_PATH), "sentiment model files missing"
+)
+class SentimentPoolTests(SimpleTestCase):
+    """Labels from the worker pool are those of in-process scoring, in the same order"""
+
+    def setUp(self):
+        for patcher in (mock.patch.object(sentiment, 'POOL_MIN_TEXTS', 0),
+                        mock.patch.object(sentiment, 'POOL_MIN_CHUNK', 8)):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.addCleanup(sentiment.shutdown_pool)
+
+    def test_pool_matches_in_process_predict(self):
+        rng = random.Random(11)
+        vocabulary = list(sentiment.load_models()[1].vocabulary_)[:2000] + ["राम्रो", "नराम्रो", "👍", "xyzzy"]
+        texts = [" ".join(rng.choice(vocabulary) for _ in range(rng.randint(1, 12))) for _ in range(60)] + [""]
+        expected = sentiment.predict_uncached(texts)
+        self.assertEqual(sentiment.predict_parallel(texts, workers=2), expected)
+        self.assertIsNotNone(sentiment._pool)
+
+
+class SentimentCacheFileTests(SimpleTestCase):
+
+    def test_labels_survive_a_save_and_load(self):
+        labels = {bytes([n]) * 16: label for n, label in enumerate([0, 1, 2, -1, 255, 256, -40000, 2 ** 40])}
+        with tempfile.TemporaryDirectory() as directory, \
+                mock.patch.object(sentiment, 'model_version', return_value="0123456789abcdef"):
+            path = os.path.join(directory, 'sentiment.cache')
+            cache = sentiment.SentimentCache(path=path)
+            cache.put_many(labels)
+            cache.save()
+            self.assertEqual(sentiment.SentimentCache(path=path).get_many(list(labels)), labels)
+
+
+# ============ INGEST ============
+class IngestScoreTests(TestCase):
+    """Scores are computed once per text: re-seen unchanged articles keep them, failures save unscored"""
+
+    def setUp(self):
+        self.user = get_user_model().objects.create(username="ingest-test")
+        isolate_seen_urls(self)
+        scorer = mock.patch.object(ingest, 'score_articles', side_effect=lambda articles, user: [(1, 3)] * len(articles))
+        self.score_articles = scorer.start()
+        self.addCleanup(scorer.stop)
+
+    def record(self, n, title="सुरक्षा समाचार"):
+        return {"url": f"https://example.com/story-{n}", "source": "test", "title": title, "summary": f"summary {n}"}
+
+    def scored(self):
+        return dict(AutoNewsArticle.objects.filter(created_by=self.user).values_list('url', 'danger_score'))
+
+    def test_reseen_unchanged_articles_keep_their_scores(self):
+        ingest.ingest_articles([self.record(1), self.record(2)], self.user)
+        self.assertEqual(self.score_articles.call_count, 1)
+
+        self.score_articles.side_effect = lambda articles, user: [(0, 9)] * len(articles)
+        result = ingest.ingest_articles([self.record(1), self.record(2, title="बदलिएको शीर्षक"), self.record(3)], self.user)
+        self.assertEqual((result["saved"], result["updated"]), (1, 2))
+        # Only the changed and the new article were scored again
+        self.assertEqual(len(self.score_articles.call_args[0][0]), 2)
+        self.assertEqual(self.scored(), {
+            "https://example.com/story-1": 3,
+            "https://example.com/story-2": 9,
+            "https://example.com/story-3": 9,
+        })
+
+    def test_scoring_failure_saves_articles_unscored(self):
+        self.score_articles.side_effect = RuntimeError("model exploded")
+        with self.assertLogs(ingest.logger, 'ERROR'):
+            result = ingest.ingest_articles([self.record(1), self.record(2)], self.user)
+        self.assertEqual(result["saved"], 2)
+        self.assertEqual(set(self.scored().values()), {None})
+
+    def test_feed_keyword_scope_all_scores_with_everyones_keywords(self):
+        ingest.ingest_articles([self.record(1)], self.user, keyword_scope="all")
+        self.assertIsNone(self.score_articles.call_args[0][1])
+        ingest.ingest_articles([self.record(2)], self.user)
+        self.assertEqual(self.score_articles.call_args[0][1], self.user)
+
+    def test_rows_without_user_are_never_duplicated(self):
+        url = "https://example.com/story-1"
+        seen = seen_urls.get_filter(None)
+        # Another process saved the URL after this one's seen-set was synced
+        AutoNewsArticle.objects.create(url=url, source="test", title="old")
+        self.assertFalse(seen.might_contain(url))
+
+        result = ingest.ingest_articles([self.record(1)], None)
+        self.assertEqual((result["saved"], result["updated"]), (0, 1))
+        self.assertEqual(AutoNewsArticle.objects.filter(url=url, created_by=None).count(), 1)
+
+
+# ============ SEEN-SET ============
+class SeenUrlsTests(TestCase):
+
+    def setUp(self):
+        self.user = get_user_model().objects.create(username="seen-test")
+        isolate_seen_urls(self)
+        quiet = mock.patch('sys.stdout', new_callable=io.StringIO)
+        quiet.start()
+        self.addCleanup(quiet.stop)
+
+    def save(self, urls):
+        AutoNewsArticle.objects.bulk_create(
+            [AutoNewsArticle(url=url, source="test", title="t", created_by=self.user) for url in urls]
+        )
+
+    def test_no_false_negatives_after_add_or_sync(self):
+        self.save([f"https://example.com/old-{n}" for n in range(300)])
+        seen = seen_urls.SeenUrls(self.user)
+        self.assertTrue(all(seen.might_contain(f"https://example.com/old-{n}") for n in range(300)))
+
+        added = [f"https://example.com/added-{n}" for n in range(300)]
+        seen.add(added)
+        self.assertTrue(all(seen.might_contain(url) for url in added))
+
+        # Saved by another process: a forced sync picks them up, however recent the last one was
+        other = [f"https://example.com/other-{n}" for n in range(300)]
+        self.save(other)
+        self.assertEqual(seen.sync(force=True), 300)
+        self.assertTrue(all(seen.might_contain(url) for url in other))
+        self.assertEqual(seen.existing(other + ["https://example.com/never"]), set(other))
+
+    def test_false_positives_are_confirmed_and_counted(self):
+        seen = seen_urls.SeenUrls(self.user)
+        seen.add(["https://example.com/not-saved"])
+        self.assertEqual(seen.existing(["https://example.com/not-saved", "https://example.com/other"]), set())
+        stats = seen.stats()
+        self.assertEqual((stats["lookups"], stats["positives"], stats["false_positives"]), (2, 1, 1))
+        self.assertEqual(stats["observed_fp_rate"], 1.0)
+
+    def test_stale_filter_is_rebuilt_without_deleted_rows(self):
+        urls = [f"https://example.com/story-{n}" for n in range(50)]
+        self.save(urls)
+        seen_urls.SeenUrls(self.user)
+        AutoNewsArticle.objects.filter(url__in=urls[:25]).delete()
+
+        # Loaded from its file, the filter still holds the deleted URLs
+        loaded = seen_urls.SeenUrls(self.user)
+        self.assertTrue(all(loaded.might_contain(url) for url in urls))
+
+        later = time.time() + seen_urls.REBUILD_AFTER + 1
+        with mock.patch.object(seen_urls.time, 'time', return_value=later):
+            rebuilt = seen_urls.SeenUrls(self.user)
+        self.assertEqual(rebuilt.rebuilt_at, later)
+        self.assertEqual(rebuilt.items, 25)
+        self.assertTrue(all(rebuilt.might_contain(url) for url in urls[25:]))
+        self.assertLessEqual(sum(rebuilt.might_contain(url) for url in urls[:25]), 1)
+
+
+# ============ COMMENT ANALYSIS ============
+class DangerousCommentTests(TestCase):
+
+    def setUp(self):
+        user = get_user_model().objects.create(username="keywords-test")
+        DangerousKeyword.objects.create(word="मार", category="violence", created_by=user)
+        DangerousKeyword.objects.create(word="सेना", category="military", created_by=user, is_active=False)
+        clear_cache()
+        self.addCleanup(clear_cache)
+
+    def test_inactive_keywords_still_count_for_comments(self):
+        info = is_dangerous_comment("सेना आयो, मार!")
+        self.assertEqual(info['matches'], [('violence', 'मार'), ('military', 'सेना'), ('contextual_threat', 'सेना + मार')])
+        self.assertEqual(info['danger_score'], 4)
+        # The scrapers still match active keywords only
+        self.assertEqual(keyword_matcher().matches("सेना आयो, मार!"), [('मार', 'violence')])
+
+
+# ============ KEYWORD MATCHING ============
+class KeywordMatcherTests(SimpleTestCase):
+    """The Aho–Corasick automaton finds exactly what the per-keyword `in` fallback finds"""
+
+    SYLLABLES = ["स", "से", "ना", "मा", "र", "ह", "त्या", "आ", "ह्वा", "न", "ज़", "ई", "क्ष", "ं", "ँ", "a", "he", "r", "s"]
+
+    def keywords(self, rng, count):
+        words = {"he", "she", "hers", "his", "सेना", "मार", "मारा", "हत्या", "आह्वान", "ईश"}
+        while len(words) < count:
+            words.add("".join(rng.choice(self.SYLLABLES) for _ in range(rng.randint(1, 4))))
+        # Same normalized word twice, with a different payload each
+        return [(word, f"category-{n % 5}") for n, word in enumerate(sorted(words))] + [("सेना", "military")]
+
+    def texts(self, rng, count=300):
+        pieces = self.SYLLABLES + [" ", "  ", "\u200d", "\u200c", "।", "HE", "SHE"]
+        return ["", " ", "ushers", "सेनाको मारामार"] + [
+            "".join(rng.choice(pieces) for _ in range(rng.randint(1, 60))) for _ in range(count)
+        ]
+
+    def assertSameResults(self, entries):
+        rng = random.Random(len(entries))
+        automaton = KeywordMatcher(entries, automaton=True)
+        fallback = KeywordMatcher(entries, automaton=False)
+        for text in self.texts(rng):
+            normalized = normalize_text(text)
+            # Both find what the baseline `keyword in text` check found, in keyword order
+            expected = [(word.lower().strip(), payload) for word, payload in entries
+                        if normalize_keyword(word) and normalize_keyword(word) in normalized]
+            self.assertEqual(automaton.matches(text), expected, text)
+            self.assertEqual(fallback.matches(text), expected, text)
+            self.assertEqual(sorted(automaton.spans(text)), sorted(fallback.spans(text)), text)
+            self.assertEqual(automaton.matches_in(automaton.spans(text)), expected, text)
+
+    def test_small_keyword_set(self):
+        entries = self.keywords(random.Random(1), 30)
+        self.assertFalse(KeywordMatcher(entries).automaton)
+        self.assertSameResults(entries)
+
+    def test_large_keyword_set(self):
+        entries = self.keywords(random.Random(2), AUTOMATON_MIN_WORDS + 50)
+        self.assertTrue(KeywordMatcher(entries).automaton)
+        self.assertSameResults(entries)
+
+    def test_overlapping_spans(self):
+        matcher = KeywordMatcher([("he", 1), ("she", 2), ("hers", 3)], automaton=True)
+        self.assertEqual(sorted(matcher.spans("ushers")), [(1, 4, "she"), (2, 4, "he"), (2, 6, "hers")])
+
+
+@override_settings(CACHES={
+    'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'},
+    'keywords': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'keyword-registry-tests'},
+})
+class KeywordRegistryTests(TestCase):
+    """keyword_entries() follows every change to the table and costs no query while nothing changed"""
+
+    def setUp(self):
+        clear_cache()
+        self.addCleanup(clear_cache)
+        self.user = get_user_model().objects.create(username="registry-test")
+        self.keyword = DangerousKeyword.objects.create(word="मार", category="violence", created_by=self.user)
+        self.assertEqual(keyword_entries(self.user), [("मार", "violence")])
+
+    def test_unchanged_table_costs_no_query(self):
+        with self.assertNumQueries(0):
+            self.assertEqual(keyword_entries(self.user), [("मार", "violence")])
+            self.assertEqual(keyword_matcher(self.user).matches("उसलाई मार"), [("मार", "violence")])
+
+    def test_edits_are_reflected(self):
+        self.keyword.category = "threat"
+        self.keyword.save()
+        self.assertEqual(keyword_entries(self.user), [("मार", "threat")])
+
+        self.keyword.is_active = False
+        self.keyword.save()
+        self.assertEqual(keyword_entries(self.user), [])
+        self.assertEqual(keyword_entries(self.user, active_only=False), [("मार", "threat")])
+
+    def test_delete_is_reflected(self):
+        DangerousKeyword.objects.filter(pk=self.keyword.pk).delete()
+        self.assertEqual(keyword_entries(self.user), [])
+        self.assertEqual(keyword_entries(), [])
+
+    def test_version_bump_from_another_process(self):
+        # update() sends no signal: the row changes, but the registry only notices once the version moves
+        DangerousKeyword.objects.filter(pk=self.keyword.pk).update(word="काट")
+        self.assertEqual(keyword_entries(self.user), [("मार", "violence")])
+        bump_keyword_version()
+        self.assertEqual(keyword_entries(self.user), [("काट", "violence")])
+
+
+# ============ TEXT NORMALIZATION ============
+class NormalizeWithOffsetsTests(SimpleTestCase):
+    """normalized[i] came from text[starts[i]:ends[i]], whatever the folding deleted, split or composed"""
+
+    TEXTS = [
+        "जय  नेपाल\u200d ई",
+        "\u092b\u093c\u094c\u091c र सेना\u200cको आह्वान।",    # combining nukta, ZWNJ, danda
+        "\u095bमीन \u091c\u093cमीन",                          # precomposed and decomposed ज़
+        "क\u094d\u200dष क\u094d\u200cष",                     # ZWJ / ZWNJ after a virama
+        "\u0929ेपाल \u0928\u093cेपाल",                        # precomposed nukta letter, NFD na + nukta
+        "सेना\u0901  ",
+        "  Straße — “उद्धरण” ०१२ …",
+        "\u200b\ufeff सेना\u00ad ",
+        "",
+    ]
+
+    def test_offsets_cover_the_original_characters(self):
+        for text in self.TEXTS:
+            normalized, starts, ends = normalize_with_offsets(text)
+            self.assertEqual(normalized, normalize_text(text))
+            self.assertEqual(len(starts), len(normalized))
+            self.assertEqual(len(ends), len(normalized))
+            self.assertEqual(starts, sorted(starts))
+            self.assertTrue(all(0 <= start < end <= len(text) for start, end in zip(starts, ends)), text)
+            # Every word maps back to the original slice it was folded from
+            position = 0
+            for word in normalized.split(' ') if normalized else []:
+                start, end = position, position + len(word)
+                self.assertEqual(normalize_text(text[starts[start]:ends[end - 1]]), word, text)
+                position = end + 1
+
+    def test_match_maps_to_original_slice(self):
+        cases = [
+            ("\u092b\u093c\u094c\u091c र सेना\u200cको", "फौज", "\u092b\u093c\u094c\u091c"),
+            ("\u092b\u093c\u094c\u091c र सेना\u200cको", "सेनाको", "सेना\u200cको"),
+            ("मेरो \u095bमीन", "जमिन", "\u095bमीन"),
+            ("यो \u0928\u093cेपाल हो", "नेपाल", "\u0928\u093cेपाल"),
+            ("क\u094d\u200dष  सेना\u0901", "सेनां", "सेना\u0901"),
+        ]
+        for text, keyword, original in cases:
+            matcher = KeywordMatcher([(keyword, "test")])
+            _, starts, ends = normalize_with_offsets(text)
+            (start, end, _), = matcher.spans(text)
+            self.assertEqual(text[starts[start]:ends[end - 1]], original)
+            self.assertIn(f'<mark class="highlight-danger">{original}</mark>', highlight_html(text, matcher.spans(text)))
+
+
+# ============ BATCHED COMMENT SCAN ============
+class CommentSpansTests(SimpleTestCase):
+    """One scan over the NUL-joined comments gives every comment its own spans"""
+
+    ENTRIES = [("मार", "violence"), ("सेना", "military"), ("he", "test"), ("she", "test"), ("a b", "test")]
+    TEXTS = [
+        "मार", "  मार ", "", "   ", "सेना\u200dले मार्‍यो", "मा", "र", "a", " b",
+        "\u093cसेना", "she\x00he", "usher\x00", "\x00मार", "SHE   HE", "\u200b", "a b", "सेना", "मारमार",
+    ]
+
+    def assertSpansMatchOneByOne(self, matcher, texts):
+        spans = comment_spans(texts, matcher)
+        self.assertEqual(len(spans), len(texts))
+        for text, text_spans in zip(texts, spans):
+            self.assertEqual(sorted(text_spans), sorted(matcher.spans(normalize_text(text))), repr(text))
+
+    def test_spans_match_scanning_each_comment(self):
+        for automaton in (False, True):
+            self.assertSpansMatchOneByOne(KeywordMatcher(self.ENTRIES, automaton=automaton), self.TEXTS)
+
+    def test_no_match_across_comments(self):
+        matcher = KeywordMatcher(self.ENTRIES)
+        self.assertEqual(comment_spans(["मा", "र", "a", "b", "s", "he"], matcher), [[], [], [], [], [], [(0, 2, "he")]])
+
+    def test_random_batches(self):
+        rng = random.Random(3)
+        pieces = ["मार", "सेना", "she", "he", " ", "  ", "\u200d", "\x00", "a b", "x", "मा", "र"]
+        texts = ["".join(rng.choice(pieces) for _ in range(rng.randint(0, 8))) for _ in range(500)]
+        for automaton in (False, True):
+            self.assertSpansMatchOneByOne(KeywordMatcher(self.ENTRIES, automaton=automaton), texts)
+
+
+# ============ JOB QUEUE ============
+class JobLeaseTests(TestCase):
+    """A claimed job is nobody else's until its lease expires; abandoned jobs run at most max_attempts times"""
+
+    def setUp(self):
+        self.now = timezone.now()
+        clock = mock.patch.object(jobs.timezone, 'now', side_effect=lambda: self.now)
+        clock.start()
+        self.addCleanup(clock.stop)
+        self.job, _ = jobs.enqueue('news_autofeed')
+
+    def advance(self, seconds):
+        self.now += timedelta(seconds=seconds)
+
+    def test_enqueue_returns_the_active_job(self):
+        self.assertEqual(jobs.enqueue('news_autofeed'), (self.job, False))
+        with self.assertRaises(ValueError):
+            jobs.enqueue('unknown')
+
+    def test_lease_blocks_other_workers_until_it_expires(self):
+        job = jobs.claim('worker-a')
+        self.assertEqual((job.pk, job.state, job.worker, job.attempts), (self.job.pk, 'running', 'worker-a', 1))
+        self.assertEqual(job.lease_until, self.now + timedelta(seconds=jobs.LEASE))
+
+        self.advance(jobs.LEASE - 1)
+        self.assertIsNone(jobs.claim('worker-b'))
+
+        # worker-a died: once the lease has run out the job is claimed again
+        self.advance(2)
+        job = jobs.claim('worker-b')
+        self.assertEqual((job.pk, job.worker, job.attempts), (self.job.pk, 'worker-b', 2))
+        # The old worker can no longer finish it
+        self.assertEqual(jobs._finish(ScrapeJob(pk=job.pk, worker='worker-a'), 'done', {}, '', [], job.events), 0)
+
+    def test_abandoned_job_fails_after_max_attempts(self):
+        for attempt in range(1, self.job.max_attempts + 1):
+            self.assertEqual(jobs.claim(f'worker-{attempt}').attempts, attempt)
+            self.advance(jobs.LEASE + 1)
+        self.assertIsNone(jobs.claim('worker-last'))
+        job = ScrapeJob.objects.get(pk=self.job.pk)
+        self.assertEqual(job.state, 'failed')
+        self.assertIn("Abandoned", job.error)
+
+    def test_release_requeues_without_using_an_attempt(self):
+        job = jobs.claim('worker-a')
+        jobs.release(job)
+        job.refresh_from_db()
+        self.assertEqual((job.state, job.worker, job.attempts, job.lease_until), ('queued', '', 0, None))
+        self.assertEqual(jobs.claim('worker-b').attempts, 1)
+
+
+# ============ FEED PARSING ============
+class FeedStreamTests(SimpleTestCase):
+
+    def feed(self, dates):
+        items = "".join(
+            f"<item><title>item {n}</title><pubDate>{date:%a, %d %b %Y %H:%M:%S} +0000</pubDate></item>"
+            for n, date in enumerate(dates)
+        )
+        return f'<?xml version="1.0"?><rss><channel><title>test</title>{items}</channel></rss>'.encode('utf-8')
+
+    def test_file_source_is_read_only_up_to_the_window(self):
+        now = timezone.now().replace(tzinfo=None, microsecond=0)
+        content = self.feed([now] * 5 + [now - timedelta(days=30)] * 5000)
+        source = io.BytesIO(content)
+        feed = FeedStream(source, cutoff=now - timedelta(days=1))
+        titles = [item.findtext('title') for item in feed]
+
+        self.assertEqual(titles, [f"item {n}" for n in range(5)])
+        self.assertEqual(feed.channel.findtext('title'), "test")
+        self.assertTrue(feed.stopped_early)
+        self.assertLess(source.tell(), len(content) // 2)
+        self.assertEqual([item.findtext('title') for item in FeedStream(content, cutoff=now - timedelta(days=1))], titles)
+
+
+
+class CanonicalUrlTests(SimpleTestCase):
+
+    def test_canonical_form(self):
+        self.assertEqual(
+            canonical_url(" HTTPS://Example.COM:443/a?utm_source=x&b=2&a=1#top "), "https://example.com/a?a=1&b=2"
+        )
+        self.assertEqual(canonical_url("http://example.com:8080"), "http://example.com:8080/")
+
+    def test_malformed_url_falls_back_to_the_raw_url(self):
+        for url in ["https://example.com:80a/story", "https://example.com:99999/", "http://[::1/feed"]:
+            self.assertEqual(canonical_url(f" {url}"), url)
+
+
+
+# ============ CRAWL STATE ============
+class SourceCrawlTests(TestCase):
+    """Listing fingerprints and feed marks only cover items the scraper actually handled"""
+
+    page = "https://listing.test/news"
+    links = ["https://listing.test/news/3", "https://listing.test/news/2", "https://listing.test/news/1"]
+
+    def setUp(self):
+        self.user = get_user_model().objects.create(username="crawl-test")
+
+    def crawl(self):
+        return SourceCrawl("listing", self.user)
+
+    def test_unchanged_listing_page_is_skipped(self):
+        crawl = self.crawl()
+        self.assertEqual(crawl.new_links(self.page, self.links), (self.links, False))
+        crawl.mark_seen(self.page, self.links)
+        crawl.save()
+
+        crawl = self.crawl()
+        self.assertEqual(crawl.new_links(self.page, self.links), ([], True))
+        self.assertEqual(crawl.stats()["pages_unchanged"], 1)
+
+        # A new article on top: only that one is fetched, and pagination stops at the known ones
+        crawl = self.crawl()
+        fresh = "https://listing.test/news/4"
+        self.assertEqual(crawl.new_links(self.page, [fresh] + self.links), ([fresh], True))
+
+    def test_failed_fetch_is_retried_on_an_unchanged_page(self):
+        crawl = self.crawl()
+        articles, _ = crawl.new_articles(self.page, [{'url': link} for link in self.links])
+        # The fetch of news/2 failed
+        crawl.mark_articles(articles, {self.links[0], self.links[2]})
+        crawl.save()
+        self.assertEqual(CrawlState.objects.get(created_by=self.user).listing_fingerprint, '')
+
+        crawl = self.crawl()
+        self.assertEqual(crawl.new_links(self.page, self.links), ([self.links[1]], True))
+        crawl.mark_seen(self.page, [self.links[1]])
+        crawl.save()
+
+        self.assertEqual(self.crawl().new_links(self.page, self.links), ([], True))
+
+    def test_feed_cutoff_follows_the_newest_saved_item(self):
+        feed = "https://listing.test/feed"
+        window = timezone.now().replace(tzinfo=None) - timedelta(days=10)
+        newest = window + timedelta(days=5)
+        crawl = self.crawl()
+        self.assertEqual(crawl.feed_cutoff(feed, window), window)
+        crawl.mark_seen(feed, ["guid-1"], published=newest)
+        crawl.save()
+        self.assertEqual(self.crawl().feed_cutoff(feed, window), newest - FEED_SLACK)
+
+        # Items inside the window were left for the next run: the mark must not move
+        crawl = self.crawl()
+        crawl.mark_seen(feed, ["guid-2"], published=newest + timedelta(days=1))
+        crawl.hold_published(feed)
+        crawl.save()
+        self.assertEqual(self.crawl().feed_cutoff(feed, window), newest - FEED_SLACK)
+
+
+# ============ FEED CACHE ============
+class FeedCacheTests(TestCase):
+    """Conditional GET of a feed: validators round trip, body-hash short-circuit and single-statement saves"""
+
+    feed_url = "https://fixture.test/feed"
+
+    def setUp(self):
+        self.user = get_user_model().objects.create(username="feed-cache-test")
+        self.responses = []
+        fetch = mock.patch.object(feed_cache, 'fetch', side_effect=lambda url, headers, timeout: self.responses.pop(0))
+        self.fetch = fetch.start()
+        self.addCleanup(fetch.stop)
+
+    def respond(self, status=200, body=b"<rss/>", **headers):
+        self.responses.append(mock.Mock(status_code=status, content=body, headers=headers))
+
+    def sent_headers(self):
+        return self.fetch.call_args.kwargs['headers']
+
+    def test_etag_and_last_modified_round_trip(self):
+        self.respond(ETag='"v1"', **{'Last-Modified': "Mon, 01 Jan 2024 00:00:00 GMT"})
+        response, cache = feed_cache.fetch_feed(self.feed_url, self.user)
+        self.assertIsNotNone(response)
+        self.assertEqual(cache.reason, "first_fetch")
+        cache.save()
+
+        self.respond(status=304, body=b"")
+        response, cache = feed_cache.fetch_feed(self.feed_url, self.user)
+        self.assertEqual(self.sent_headers(), {
+            'If-None-Match': '"v1"', 'If-Modified-Since': "Mon, 01 Jan 2024 00:00:00 GMT",
+        })
+        self.assertIsNone(response)
+        self.assertEqual(cache.reason, "not_modified")
+        self.assertEqual(FeedValidator.objects.get(created_by=self.user).hits, 1)
+
+    def test_identical_body_without_validators_is_skipped(self):
+        self.respond()
+        feed_cache.fetch_feed(self.feed_url, self.user)[1].save()
+
+        self.respond()
+        response, cache = feed_cache.fetch_feed(self.feed_url, self.user)
+        self.assertEqual(self.sent_headers(), {})
+        self.assertIsNone(response)
+        self.assertEqual(cache.reason, "unchanged_body")
+
+        self.respond(body=b"<rss>new</rss>")
+        response, cache = feed_cache.fetch_feed(self.feed_url, self.user)
+        self.assertIsNotNone(response)
+        self.assertEqual(cache.reason, "changed")
+
+    def test_keyword_change_invalidates_the_validators(self):
+        self.respond(ETag='"v1"')
+        feed_cache.fetch_feed(self.feed_url, self.user)[1].save()
+        DangerousKeyword.objects.create(word="नयाँ", category="other", created_by=self.user)
+
+        self.respond(ETag='"v1"')
+        response, cache = feed_cache.fetch_feed(self.feed_url, self.user)
+        self.assertNotIn('If-None-Match', self.sent_headers())
+        self.assertIsNotNone(response)
+
+    def test_save_is_a_single_statement(self):
+        self.respond(ETag='"v1"')
+        cache = feed_cache.fetch_feed(self.feed_url, self.user)[1]
+        with self.assertNumQueries(1):
+            cache.save()
+
+        self.respond(body=b"<rss>v2</rss>", ETag='"v2"')
+        cache = feed_cache.fetch_feed(self.feed_url, self.user)[1]
+        with self.assertNumQueries(1):
+            cache.save()
+        validator = FeedValidator.objects.get(created_by=self.user)
+        self.assertEqual((validator.etag, validator.misses), ('"v2"', 2))
+
+    def test_discarded_validators_are_not_saved(self):
+        self.respond(ETag='"v1"')
+        cache = feed_cache.fetch_feed(self.feed_url, self.user)[1]
+        cache.discard()
+        with self.assertNumQueries(0):
+            cache.save()
+        self.assertFalse(FeedValidator.objects.filter(created_by=self.user).exists())
+
+        # The next run sends no validators and parses the feed again
+        self.respond(status=304, body=b"")
+        response, cache = feed_cache.fetch_feed(self.feed_url, self.user)
+        self.assertEqual(self.sent_headers(), {})
+        self.assertEqual(cache.reason, "http_304")
+
+
+# ============ FEED PIPELINE ============
+class FeedPipelineTests(TestCase):
+    """A feed is only marked as handled (validators, crawl marks) once every article in it was saved"""
+
+    def setUp(self):
+        self.user = get_user_model().objects.create(username="feeds-test")
+        self.request = SourceRequest(self.user)
+        isolate_seen_urls(self)
+        self.server = use_fixture_server(self)
+        for patcher in (
+            mock.patch.dict(feeds.FEEDS, {'fixture': {
+                "title": "Fixture", "source": "fixture", "feed_url": "https://fixture.test/feed",
+                "days": 10, "keywords": "all", "save_all": True,
+            }}),
+            mock.patch.object(feeds, 'MAX_SAVED', 12),
+            mock.patch.object(ingest, 'score_articles', side_effect=lambda articles, user: [(2, 0)] * len(articles)),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.spec = feeds.get_spec('fixture')
+
+    def run_feed(self):
+        with contextlib.redirect_stdout(io.StringIO()):
+            result, feed_cache, articles, feed, crawl = feeds.fetch_and_parse(self.spec, self.user)
+            if result is not None:
+                return result
+            return feeds.analyze_and_save(
+                self.spec, self.request, feed_cache, articles, feed, crawl, feeds.load_keywords(self.user, "all")
+            )
+
+    def saved(self):
+        return AutoNewsArticle.objects.filter(created_by=self.user, source="fixture").count()
+
+    def test_articles_past_max_saved_are_saved_by_the_next_run(self):
+        first = self.run_feed()
+        self.assertEqual(first['metadata']['database_save']['new_articles_saved'], 12)
+        self.assertFalse(FeedValidator.objects.filter(created_by=self.user).exists())
+
+        # The feed is parsed again and the 8 articles left over are saved
+        second = self.run_feed()
+        self.assertEqual(second['metadata']['total_articles_scraped'], 8)
+        self.assertEqual(second['metadata']['database_save']['new_articles_saved'], 8)
+        self.assertEqual(self.saved(), 20)
+
+        # Everything is saved: now the feed is skipped until it changes
+        self.assertEqual(self.run_feed(), "not_modified")
+
+    def test_failed_save_leaves_the_feed_to_the_next_run(self):
+        with mock.patch.object(feeds, 'save_articles',
+                               return_value={"new_articles_saved": 0, "existing_articles_updated": 0, "errors": 3}):
+            self.run_feed()
+        self.assertFalse(FeedValidator.objects.filter(created_by=self.user).exists())
+        self.assertFalse(CrawlState.objects.filter(created_by=self.user).exists())
+
+        with mock.patch.object(feeds, 'MAX_SAVED', 200):
+            result = self.run_feed()
+        self.assertEqual(result['metadata']['database_save']['new_articles_saved'], 20)
+        self.assertEqual(self.run_feed(), "not_modified")
+
+
+# ============ RATE LIMITING ============
+class HostLimiterTests(SimpleTestCase):
+
+    def limiter(self, **policy):
+        return HostLimiter("limiter.test", **dict(
+            {"rate": 2.0, "min_rate": 0.2, "max_rate": 5.0, "burst": 4, "max_concurrency": 4}, **policy
+        ))
+
+    def test_tokens_refill_at_the_rate_up_to_the_burst(self):
+        limiter = self.limiter()
+        limiter.tokens, limiter._updated = 0.0, 100.0
+        limiter._refill(100.5)
+        self.assertAlmostEqual(limiter.tokens, 1.0)
+        limiter._refill(110.0)
+        self.assertEqual(limiter.tokens, 4)
+
+    def test_acquire_waits_for_the_next_token(self):
+        limiter = self.limiter(rate=20.0, burst=1)
+
+        async def two_requests():
+            await limiter.acquire()
+            await limiter.release()
+            start = time.monotonic()
+            await limiter.acquire()
+            await limiter.release()
+            return time.monotonic() - start
+
+        self.assertGreaterEqual(asyncio.run(two_requests()), 0.04)
+
+    def test_throttle_response_halves_rate_and_window_once_per_round_trip(self):
+        limiter = self.limiter(rate=1.0, min_rate=0.3)
+        window = limiter.window
+
+        async def throttled(status):
+            await limiter.acquire()
+            await limiter.release(status=status)
+
+        asyncio.run(throttled(503))
+        self.assertEqual((limiter.rate, limiter.window, limiter.backoffs), (0.5, window / 2, 1))
+        # Same round trip: the window that was already in flight doesn't count twice
+        asyncio.run(throttled(429))
+        self.assertEqual((limiter.rate, limiter.backoffs), (0.5, 1))
+
+        limiter.last_backoff -= 1.0
+        asyncio.run(throttled(500))
+        self.assertEqual(limiter.rate, 0.3)
+
+    def test_retry_after_blocks_the_host(self):
+        limiter = self.limiter()
+
+        async def throttled_then_retry(retry_after):
+            await limiter.acquire()
+            await limiter.release(status=429, retry_after=retry_after)
+            blocked_for = limiter.blocked_until - time.monotonic()
+            start = time.monotonic()
+            await limiter.acquire()
+            await limiter.release()
+            return blocked_for, time.monotonic() - start
+
+        blocked_for, waited = asyncio.run(throttled_then_retry(0.1))
+        self.assertAlmostEqual(blocked_for, 0.1, delta=0.02)
+        self.assertGreaterEqual(waited, 0.09)
+
+        limiter = self.limiter()
+        limiter._backoff(time.monotonic(), 3600)
+        self.assertLessEqual(limiter.blocked_until - time.monotonic(), MAX_RETRY_AFTER)
+
+    def test_parse_retry_after(self):
+        self.assertEqual(parse_retry_after("5"), 5.0)
+        self.assertEqual(parse_retry_after("-3"), 0.0)
+        self.assertIsNone(parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT"))
+        self.assertIsNone(parse_retry_after(None))
+
+
+class FetchRetryTests(SimpleTestCase):
+    """Only idempotent requests are sent again after a 429/5xx"""
+
+    def setUp(self):
+        health.set_persistence(False)
+        page_cache.set_enabled(False)
+        self.addCleanup(health.set_persistence, True)
+        self.addCleanup(page_cache.set_enabled, getattr(settings, 'PAGE_CACHE_ENABLED', True))
+        stdout = mock.patch('sys.stdout', new_callable=io.StringIO)
+        stdout.start()
+        self.addCleanup(stdout.stop)
+        self.session = mock.Mock()
+        self.session.request.return_value = mock.Mock(status_code=503, headers={})
+
+    def test_get_is_retried(self):
+        response = engine.fetch("https://retry-get.test/", session=self.session)
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(self.session.request.call_count, engine.FETCH_RETRIES + 1)
+
+    def test_post_is_sent_once(self):
+        response = engine.fetch("https://retry-post.test/", session=self.session, method='POST', data={"q": 1})
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(self.session.request.call_count, 1)
+
+
+# ============ ENGINE ============
+class EngineTests(SimpleTestCase):
+    """fetch() and run_sources() on the shared loop, against the fixture server"""
+
+    def setUp(self):
+        self.server = use_fixture_server(self)
+        stdout = mock.patch('sys.stdout', new_callable=io.StringIO)
+        stdout.start()
+        self.addCleanup(stdout.stop)
+        self.request = SourceRequest(None)
+
+    def test_fetch_goes_through_the_engine(self):
+        response = engine.fetch("https://engine.test/feed", timeout=5)
+        self.assertEqual(response.status_code, 200)
+        # Served by the fixture server: its feeds are titled with the original host
+        self.assertIn('<title>engine.test</title>', response.text)
+
+    def test_run_sources_collects_results_and_errors(self):
+        def failing(request):
+            raise ValueError("parser broke")
+
+        done = []
+        results = engine.run_sources({
+            'json': lambda request: json.dumps({"metadata": {"status": "success"}, "articles": [1, 2]}),
+            'error': lambda request: {"metadata": {"status": "error", "message": "blocked"}},
+            'failing': failing,
+        }, self.request, on_done=lambda name, result: done.append(name))
+
+        self.assertEqual(sorted(done), ['error', 'failing', 'json'])
+        self.assertEqual(results['json']['data']['articles'], [1, 2])
+        self.assertIsNone(results['json']['error'])
+        self.assertEqual(results['error']['data']['metadata']['message'], "blocked")
+        self.assertEqual((results['failing']['data'], results['failing']['error']), (None, "parser broke"))
+        self.assertEqual(health._get('source', 'error').consecutive_failures, 1)
+        self.assertEqual(health._get('source', 'json').consecutive_failures, 0)
+
+    def test_run_sources_is_bounded_by_max_sources(self):
+        lock, running, peak = threading.Lock(), [0], [0]
+
+        def scraper(request):
+            with lock:
+                running[0] += 1
+                peak[0] = max(peak[0], running[0])
+            time.sleep(0.05)
+            with lock:
+                running[0] -= 1
+            return {}
+
+        engine.run_sources({f"source-{n}": scraper for n in range(6)}, self.request, max_sources=2)
+        self.assertEqual(peak[0], 2)
+
+    def test_open_source_breaker_skips_the_source(self):
+        for _ in range(health.BREAKER_POLICIES['source']["failure_threshold"]):
+            health.record_source('flaky', False, "boom")
+        scraper = mock.Mock(return_value={})
+        results = engine.run_sources({'flaky': scraper}, self.request)
+        self.assertTrue(results['flaky']['skipped'])
+        scraper.assert_not_called()
+
+        # untracked sources keep their own breakers - the engine runs them regardless
+        engine.run_sources({'flaky': scraper}, self.request, untracked=('flaky',))
+        scraper.assert_called_once()
+
+
+# ============ CIRCUIT BREAKERS ============
+class BreakerTests(SimpleTestCase):
+
+    def setUp(self):
+        self.now = timezone.now()
+
+    def record_failures(self, breaker, times=1):
+        for _ in range(times):
+            breaker.record(False, self.now, error="HTTP 503")
+
+    def test_host_breaker_cycle(self):
+        breaker = health.Breaker('host', "breaker.test")
+        self.record_failures(breaker, 2)
+        self.assertEqual(breaker.state, 'closed')
+        self.record_failures(breaker)
+        self.assertEqual(breaker.state, 'open')
+        self.assertFalse(breaker.allow(self.now))
+
+        # After the cooldown a host half-opens but waits for the background probe
+        self.now += timedelta(seconds=breaker.cooldown)
+        self.assertFalse(breaker.allow(self.now))
+        self.assertEqual(breaker.state, 'half_open')
+        breaker.record(True, self.now, latency_ms=120)
+        self.assertEqual((breaker.state, breaker.cooldown), ('closed', 0))
+        self.assertTrue(breaker.allow(self.now))
+
+    def test_source_breaker_lets_one_trial_run_through(self):
+        breaker = health.Breaker('source', "breaker-source")
+        self.record_failures(breaker, 3)
+        self.now = breaker.open_until
+        self.assertTrue(breaker.allow(self.now))
+        self.assertFalse(breaker.allow(self.now))
+
+    def test_failed_probe_doubles_the_cooldown_up_to_the_maximum(self):
+        breaker = health.Breaker('host', "breaker.test")
+        policy = health.BREAKER_POLICIES['host']
+        self.record_failures(breaker, 3)
+        cooldowns = [breaker.cooldown]
+        while breaker.cooldown < policy["max_cooldown"]:
+            self.now = breaker.open_until
+            breaker.allow(self.now)
+            self.record_failures(breaker)
+            self.assertEqual(breaker.state, 'open')
+            cooldowns.append(breaker.cooldown)
+        self.assertEqual(cooldowns[:3], [policy["base_cooldown"], policy["base_cooldown"] * 2, policy["base_cooldown"] * 4])
+        self.assertEqual(cooldowns[-1], policy["max_cooldown"])
+
+    def test_sustained_error_rate_opens_the_breaker(self):
+        breaker = health.Breaker('host', "breaker.test")
+        for _ in range(health.MIN_REQUESTS * 2):
+            if breaker.state != 'closed':
+                break
+            breaker.record(True, self.now)
+            self.record_failures(breaker, 2)
+        self.assertEqual(breaker.state, 'open')
+
+
+# ============ SCHEDULER ============
+class AdaptiveIntervalTests(SimpleTestCase):
+    """The interval follows the source's yield of new articles, within its bounds"""
+
+    def setUp(self):
+        self.now = timezone.now()
+        self.schedule = SourceSchedule(source="fixture", interval=3600, min_interval=600, max_interval=12 * 3600)
+
+    def run_once(self, new, status='success'):
+        interval = scheduler.adapt(self.schedule, status, new, self.now)
+        self.schedule.last_run_at, self.schedule.interval = self.now, interval
+        self.schedule.runs += 1
+        self.now += timedelta(seconds=interval)
+        return interval
+
+    def test_productive_source_is_polled_sooner(self):
+        # 8 new articles an hour want a run every 7.5 minutes: halve per run, stop at min_interval
+        self.assertEqual([self.run_once(8 * self.schedule.interval // 3600) for _ in range(3)], [1800, 900, 600])
+
+    def test_steady_yield_converges_on_the_target(self):
+        # 2 new articles per hour -> one new article (TARGET_NEW) every 30 minutes
+        for _ in range(10):
+            interval = self.run_once(2 * self.schedule.interval / 3600)
+        self.assertEqual(interval, 1800)
+
+    def test_quiet_source_drifts_out_to_max_interval(self):
+        intervals = [self.run_once(0) for _ in range(10)]
+        self.assertEqual(intervals[:2], [5400, 8100])
+        self.assertEqual(intervals[-1], 12 * 3600)
+
+    def test_failed_run_backs_off(self):
+        self.assertEqual(self.run_once(0, status='failed'), 7200)
+
+
+# ============ ARTICLE PARSING ============
+class ArticleStrainerTests(SimpleTestCase):
+    """The strained parse answers the article selectors exactly like a full html.parser parse"""
+
+    # Date / content / image selectors of the article scrapers, plus id-only and class-less ones
+    SELECTORS = [
+        "meta[property='article:published_time']", "meta[property='og:image']", "time[datetime]", "span.date",
+        "div.news-content", "article", "div[class*='content']", "article div.text", ".featured-image img",
+        "figure img", "p", "#story", "#story p", "div#gallery img", "#byline",
+    ]
+
+    def setUp(self):
+        self.page = render_article("fixture.test", "/news/1").replace("</body>", """
+<div><div id="story"><p>Id-only container with a paragraph long enough for the extractors.</p></div></div>
+<section id="gallery-wrap"><div id="gallery"><img src="https://fixture.test/img/g.jpg"></div></section>
+<article><div class="text"><p>Second article body.</p></div></article>
+<script>trackPageView();</script>
+<p>Byline: <span id="byline">फिक्स्चर</span></p>
+<div class="featured-image"><div><img src="https://fixture.test/img/f.jpg"></div></div>
+<div><figure><div><img src="https://fixture.test/img/fig.jpg"></div></figure></div>
+<div><span class="date">2024-01-01</span> <time datetime="2024-01-01">1 Jan</time></div>
+</body>""").encode('utf-8')
+
+    def extract(self, soup):
+        return {selector: [(tag.name, tag.attrs, tag.get_text(" ", strip=True)) for tag in soup.select(selector)]
+                for selector in self.SELECTORS}
+
+    def test_strained_parse_matches_html_parser(self):
+        expected = self.extract(parse_html(self.page, backend='html.parser', strain=False))
+        self.assertTrue(all(expected.values()))
+        for backend in (None, 'html.parser'):
+            with self.subTest(backend=backend or 'default'):
+                self.assertEqual(self.extract(parse_html(self.page, backend=backend, charset='utf-8')), expected)
+
+    def test_scripts_and_bare_wrappers_are_dropped(self):
+        soup = parse_html(self.page)
+        self.assertIsNone(soup.find('script'))
+        self.assertIsNone(soup.find('nav'))
+
+
+# ============ HTTP SESSIONS ============
+class SessionRegistryTests(SimpleTestCase):
+
+    def setUp(self):
+        patcher = mock.patch.dict(http_session._sessions, clear=True)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_one_session_per_host_and_policy(self):
+        session = http_session.get_session("sessions.test")
+        self.assertIs(http_session.session_for("https://sessions.test/a/b"), session)
+        self.assertIsNot(http_session.get_session("other.test"), session)
+        self.assertIsNot(http_session.get_session("sessions.test", policy='monitor'), session)
+        self.assertEqual(session.headers['Accept-Encoding'], http_session.ACCEPT_ENCODING)
+
+    def test_headers_only_apply_when_the_session_is_created(self):
+        session = http_session.get_session("sessions.test", headers={"User-Agent": "first"})
+        self.assertIs(http_session.get_session("sessions.test", headers={"User-Agent": "second"}), session)
+        self.assertEqual(session.headers["User-Agent"], "first")
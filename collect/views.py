@@ -23,7 +23,7 @@ from django.utils.html import escapejs
 from django.core.paginator import Paginator, EmptyPage, PageNotAnInteger
 import io
 
-from .models import ThreatAlert, CurrentInformation, NewsSource, DangerousKeyword, User, AutoNewsArticle, MapMarker, SocialMediaURL, SharedFile, Website
+from .models import ThreatAlert, CurrentInformation, NewsSource, DangerousKeyword, User, AutoNewsArticle, MapMarker, SocialMediaURL, SharedFile, Website, ScrapeJob
 from collections import Counter
 from django.utils import timezone
 from datetime import datetime, timedelta
@@ -40,37 +40,22 @@ from django.core.cache import cache
 from html import escape
 from django.utils.safestring import mark_safe
 from collections import defaultdict
+from bisect import bisect_right
 from django.contrib.auth.hashers import check_password
 from django.contrib.auth.hashers import make_password
 from collect.decorators import session_auth_required
 from django.http import JsonResponse
-from collect.scrapers.kantipurdaily import kantipur_to_json
-from collect.scrapers.kathmandu_post import kathmandu_post_extractor
-from collect.scrapers.techpana import techpana_to_json 
-from collect.scrapers.keyboard_techpana import keyboard_techpana_to_json 
-from collect.scrapers.keyboard_kantipur import keyboard_kantipur_to_json 
-from collect.scrapers.keyboard_kathmandupost import keyboard_kathmandu_post_to_json 
-from collect.scrapers.keyboard_onlinekhabar import keyboard_onlinekhabar_to_json
-from collect.scrapers.keyboard_paschim import keyboard_paschimnepal_to_json
-from collect.scrapers.tvnepal import keyboard_onlinetvnepal_to_json
-from collect.scrapers.osnepal import keyboard_osnepal_to_json
-from collect.scrapers.eAdarsha import keyboard_eadarsha_to_json
-from collect.scrapers.keyboard_arthasarokar import keyboard_arthasarokar_to_json
-from collect.scrapers.keyboard_newsofnepal import keyboard_newsofnepal_to_json
-from collect.scrapers.keyboard_rajdhanidaily import keyboard_rajdhanidaily_to_json
-from collect.scrapers.keyboard_dnews import keyboard_dnewsnepal_to_json
-from collect.scrapers.keyboard_hetauda import keyboard_hetaudatoday_to_json
-from collect.scrapers.keyboard_chitwan import keyboard_chitwansamachar_to_json
-from collect.scrapers.keyboard_nuwakot import keyboard_onlinenuwakot_to_json
-from collect.scrapers.keyboard_karnali import keyboard_merokarnali_to_json
-from collect.scrapers.keyboard_pahuch import keyboard_hamropahuch_to_json
-from collect.scrapers.keyboard_raibar import keyboard_nepaliraibar_to_json
-from collect.scrapers.keyboard_shilapaper import keyboard_shilapaper_to_json
+from collect.scrapers.sources import SCRAPER_FUNCTIONS, resolve_sources
+from collect.scrapers.jobs import enqueue, job_as_dict
+from collect.scrapers import health
+from utils.danger import danger_matcher, score_matches
+from utils.keyword_matcher import highlight_html, keyword_matcher
+from utils.text_normalize import normalize_keyword, normalize_text
 
 from django.urls import reverse  # Add this import
 from django.db.models import Q
 from datetime import datetime, timedelta
-from utils.sentiment import predict_sentiment
+from utils.sentiment import cache_stats as sentiment_cache_stats, flush_cache as flush_sentiment_cache, predict_sentiments
 from django.utils.dateparse import parse_date
 from utils.permission import check_access
 import requests
@@ -1930,9 +1915,9 @@ def keywordsAdd(request):
         
         for word in word_list:
             try:
-                # Check if keyword already exists in this category
+                # Check if keyword (or a spelling variant of it) already exists in this category
                 exists = DangerousKeyword.objects.filter(
-                    word=word.lower(),
+                    normalized_word=normalize_keyword(word),
                     category=category
                 ).exists()
                 
@@ -2027,94 +2012,40 @@ def CategoryAdd(request):
     return render(request, 'category_add.html', context)
 
 
-# This function loads dangerous keywords by category from the database once, caches them for 5 minutes, and reuses the cache to speed up comment scanning.
-def get_keyword_map():
-    keyword_map = cache.get('dangerous_keyword_map')
-    if keyword_map is None:
-        keyword_map = defaultdict(list)
-        for kw in DangerousKeyword.objects.all():
-            keyword_map[kw.category].append(kw.word)
-        cache.set('dangerous_keyword_map', dict(keyword_map), timeout=300)
-    return keyword_map
+# Comments scored together by score_comments (one sentiment predict and one keyword scan each)
+COMMENT_BATCH_SIZE = 5000
 
-def is_dangerous_comment(text):
-    if not text:
-        return {
-            'is_dangerous': False,
-            'matches': [],
-            'danger_score': 0,
-            'highlighted_comment': mark_safe(escape('').replace('\n', '<br>'))
-        }
 
-    text_lower = text.lower()
-    matches = []
-    danger_score = 0
-    keyword_map = get_keyword_map()
-    matched_words = set()
-
-    # Check core categories (violence, threats, dehumanizing)
-    for category in ['violence', 'threats', 'dehumanizing']:
-        for word in keyword_map.get(category, []):
-            if word in text_lower:
-                matches.append((category, word))
-                matched_words.add(word)
-                danger_score += 1
-
-    # Check military category
-    military_words = keyword_map.get('military', [])
-    mobilization_words = keyword_map.get('mobilization', [])
-    
-    military_found = False
-    for word in military_words:
-        if word in text_lower:
-            matches.append(('military', word))
-            matched_words.add(word)
-            danger_score += 1
-            military_found = True
-
-    # Check mobilization category
-    mobilization_found = False
-    for word in mobilization_words:
-        if word in text_lower:
-            matches.append(('mobilization', word))
-            matched_words.add(word)
-            danger_score += 1
-            mobilization_found = True
-
-    # HIGH RISK: Military + Violence/Threats combination
-    # If military terms are used with violence/threats, increase danger significantly
-    if military_found:
-        for cat in ['violence', 'threats']:
-            for word in keyword_map.get(cat, []):
-                if word in text_lower:
-                    matches.append(('contextual_threat', f'सेना + {word}'))
-                    matched_words.add(word)
-                    danger_score += 2  # Higher score for military + violence
-                    break
+def clean_comment_info(text):
+    """is_dangerous_comment() result of a comment without any keyword"""
+    return {
+        'is_dangerous': False,
+        'matches': [],
+        'danger_score': 0,
+        'highlighted_comment': mark_safe(escape(text).replace('\n', '<br>'))
+    }
 
-    # HIGH RISK: Military + Mobilization combination
-    # If military terms are used with mobilization/call to action
-    if military_found and mobilization_found:
-        matches.append(('contextual_threat', 'सेना + आह्वान'))
-        danger_score += 3  # Highest risk - military mobilization
-        # Add all military and mobilization words to matched words
-        for word in military_words:
-            if word in text_lower:
-                matched_words.add(word)
-        for word in mobilization_words:
-            if word in text_lower:
-                matched_words.add(word)
-
-    # Highlight matched words
-    safe_text = escape(text)
-    for word in sorted(matched_words, key=len, reverse=True):
-        escaped_word = re.escape(word)
-        safe_text = re.sub(
-            f'({escaped_word})',
-            r'<mark class="highlight-danger">\1</mark>',
-            safe_text,
-            flags=re.IGNORECASE
-        )
+
+def is_dangerous_comment(text, matcher=None, spans=None):
+    """Danger score, matches and highlighted HTML of a comment (spans: matcher.spans() of it, if already scanned)"""
+    if not text:
+        return clean_comment_info('')
+
+    # One pass over the comment for every keyword, active or not (see utils/keyword_matcher.py);
+    # the match offsets are kept for highlighting
+    matcher = matcher or keyword_matcher(active_only=False)
+    if spans is None:
+        spans = matcher.spans(normalize_text(text))
+    found = defaultdict(list)
+    for word, category in matcher.matches_in(spans):
+        found[category].append(word)
+    # Keyword points plus the military + violence / mobilization combinations (utils/danger.py)
+    matches, danger_score = score_matches(found)
+    matched_words = {word for category, word in matches if category != 'contextual_threat'}
+
+    # Highlight matched words in one pass from the scan offsets
+    matched_keys = {normalize_keyword(word) for word in matched_words}
+    safe_text = highlight_html(text, [span for span in spans if span[2] in matched_keys])
 
     highlighted = mark_safe(safe_text.replace('\n', '<br>'))
     
@@ -2129,10 +2060,54 @@ def is_dangerous_comment(text):
     }
 
 
+def score_comments(texts):
+    """
+    Sentiment + is_dangerous_comment() for a list of comments. Sentiment is
+    predicted for all comments at once (spread over the SENTIMENT_WORKERS
+    pool for big uploads), the keywords are scanned in chunks of
+    COMMENT_BATCH_SIZE; comments without a keyword skip the danger analysis
+    entirely. Results are aligned with texts.
+    """
+    sentiments = predict_sentiments(texts)
+    results = []
+    for start in range(0, len(texts), COMMENT_BATCH_SIZE):
+        chunk = texts[start:start + COMMENT_BATCH_SIZE]
+        # Keywords of other categories never change the danger info - leave them out of the scan
+        matcher = danger_matcher(active_only=False)
+        chunk_spans = comment_spans(chunk, matcher)
+        for text, sentiment, spans in zip(chunk, sentiments[start:start + COMMENT_BATCH_SIZE], chunk_spans):
+            danger_info = is_dangerous_comment(text, matcher, spans) if spans else clean_comment_info(text)
+            results.append({'sentiment': sentiment, **danger_info})
+    flush_sentiment_cache()
+    return results
+
+
+def comment_spans(texts, matcher):
+    """matcher.spans(normalize_text(text)) for every text, from one scan over all texts joined"""
+    # NUL never occurs in a keyword, so no match can span two comments (the rare text
+    # that contains one is scanned on its own)
+    joined = normalize_text('\x00'.join('' if '\x00' in text else text for text in texts))
+    starts = [0] + [match.end() for match in re.finditer('\x00', joined)]
+    # Inside the joined text a comment keeps the space normalize_text strips in front of it
+    starts = [start + 1 if joined.startswith(' ', start) else start for start in starts]
+    spans = [[] for _ in texts]
+    for start, end, word in matcher.spans(joined):
+        index = bisect_right(starts, start) - 1
+        spans[index].append((start - starts[index], end - starts[index], word))
+    for index, text in enumerate(texts):
+        if '\x00' in text:
+            spans[index] = matcher.spans(normalize_text(text))
+    return spans
+
+
 import json
 import re
 
 def parse_comments_from_text(text):
+    """Parse comments (read_comments) and score them together (score_comments)"""
+    return with_scores(read_comments(text))
+
+def read_comments(text):
     """
     Parse comments from either JSON format or the original text format.
     Supports both:
@@ -2145,56 +2120,25 @@ def parse_comments_from_text(text):
     try:
         data = json.loads(text)
         
-        # If it's a list of comments
-        if isinstance(data, list):
-            for item in data:
+        # If it's a list of comments (or a single comment object)
+        if isinstance(data, (list, dict)):
+            for item in (data if isinstance(data, list) else [data]):
                 # Get comment text from various possible field names
                 comment_text = item.get('text', '') or item.get('comment', '') or item.get('message', '')
                 
                 if comment_text:  # Only process if there's actual text
-                    danger_info = is_dangerous_comment(comment_text)
-                    sentiment = predict_sentiment(comment_text)
-                    
                     # Get profile URL from various possible field names
+                    # (kept in full when it has ?comment_id=, it still opens the profile)
                     profile_url = item.get('profile_url', '') or item.get('profileUrl', '') or item.get('url', '') or ''
                     
-                    # Clean profile URL if it contains extra parameters
-                    if profile_url and '?comment_id=' in profile_url:
-                        # Keep the full URL as it contains the comment ID
-                        # But we can still use it for profile access
-                        pass
-                    
                     comments.append({
                         'author': item.get('commenter', item.get('author', item.get('username', 'Unknown'))),
                         'comment': comment_text,
                         'timestamp': item.get('timestamp', item.get('time', item.get('date', ''))),
                         'profile_url': profile_url,
-                        'sentiment': sentiment,
-                        **danger_info
                     })
             return comments
             
-        # If it's a single comment object
-        elif isinstance(data, dict):
-            comment_text = data.get('text', '') or data.get('comment', '') or data.get('message', '')
-            
-            if comment_text:
-                danger_info = is_dangerous_comment(comment_text)
-                sentiment = predict_sentiment(comment_text)
-                
-                # Get profile URL from various possible field names
-                profile_url = data.get('profile_url', '') or data.get('profileUrl', '') or data.get('url', '') or ''
-                
-                comments.append({
-                    'author': data.get('commenter', data.get('author', data.get('username', 'Unknown'))),
-                    'comment': comment_text,
-                    'timestamp': data.get('timestamp', data.get('time', data.get('date', ''))),
-                    'profile_url': profile_url,
-                    'sentiment': sentiment,
-                    **danger_info
-                })
-            return comments
-            
     except (json.JSONDecodeError, TypeError):
         # If JSON parsing fails, fall back to original text format
         pass
@@ -2210,16 +2154,11 @@ def parse_comments_from_text(text):
                 author = buffer[0]
                 comment = '\n'.join(buffer[1:]).strip() if len(buffer) > 1 else ''
 
-                danger_info = is_dangerous_comment(comment)
-                sentiment = predict_sentiment(comment)
-
                 comments.append({
                     'author': author,
                     'comment': comment,
                     'timestamp': line,
                     'profile_url': '',  # No profile URL in text format
-                    'sentiment': sentiment,
-                    **danger_info
                 })
             buffer = []
         elif line not in {'Reply', 'Edited'}:
@@ -2230,20 +2169,20 @@ def parse_comments_from_text(text):
         author = buffer[0]
         comment = '\n'.join(buffer[1:]).strip() if len(buffer) > 1 else ''
 
-        danger_info = is_dangerous_comment(comment)
-        sentiment = predict_sentiment(comment)
-
         comments.append({
             'author': author,
             'comment': comment,
             'timestamp': '',  # No timestamp for last comment
             'profile_url': '',  # No profile URL in text format
-            'sentiment': sentiment,
-            **danger_info
         })
 
     return comments
 
+def with_scores(comments):
+    """Add sentiment and danger info to parsed comments, scored in batches"""
+    scores = score_comments([comment['comment'] for comment in comments])
+    return [{**comment, **score} for comment, score in zip(comments, scores)]
+
 def prepare_chart_data(comments):
     """Prepare simplified chart data that's guaranteed to work"""
     if not comments:
@@ -2470,8 +2409,10 @@ def commentAnalyze(request):
                 
                 # Parse comments using the universal function
                 comments = parse_comments_from_text(text)
-                print(111111111111111111111, comments)
                 uploaded = True
+                stats = sentiment_cache_stats()
+                print(f"🧠 Sentiment cache: {stats['hit_rate']:.0%} hit rate ({stats['hits']} hits, "
+                      f"{stats['misses']} misses, {stats['size']} cached)")
                 
                 # Prepare chart data
                 chart_data = prepare_chart_data(comments)
@@ -2507,195 +2448,37 @@ def commentAnalyze(request):
    
 def newsAutofeeding(request=None):
     """
-    Main function to fetch news from multiple sources and save to database
+    Queue the legacy news sources (Kantipur, Techpana, Kathmandu Post) for a background worker
     """
     if not check_access(request):
         return redirect('logout')  # Create this view
 
     try:
-        all_articles = []
-        
-        # Source 1: Kantipur News
-        try:
-            json_data = kantipur_to_json()
-            data = json.loads(json_data)
-            if data["metadata"]["status"] == "success":
-                for article in data["articles"]:
-                    article["source"] = "kantipur"  # Ensure source is set
-                    all_articles.append(article)
-                print(f"✅ Fetched {len(data['articles'])} articles from Kantipur")
-            else:
-                print(f"❌ Kantipur scraping failed: {data['metadata'].get('error', 'Unknown error')}")
-        except Exception as e:
-            print(f"❌ Error fetching Kantipur news: {e}")
-
-        # Source 2: Techpana News
-        try:
-            # Call the Techpana function directly - it returns JSON string
-            json_data = techpana_to_json()
-            data = json.loads(json_data)
-            
-            if data["metadata"]["status"] == "success":
-                for article in data["articles"]:
-                    article["source"] = "techpana"  # Ensure source is set
-                    all_articles.append(article)
-                print(f"✅ Fetched {len(data['articles'])} articles from Techpana")
-                
-                # Print some statistics if available - UPDATED FIELD NAMES
-                if "new_articles_added" in data["metadata"]:
-                    print(f"📊 Techpana Stats: {data['metadata']['new_articles_added']} new articles")
-                if "total_articles_found" in data["metadata"]:
-                    print(f"📊 Techpana Total Found: {data['metadata']['total_articles_found']} articles on homepage")
-                if "articles_skipped_no_keywords" in data["metadata"]:
-                    print(f"📊 Techpana Skipped (no keywords): {data['metadata']['articles_skipped_no_keywords']} articles")
-                if "articles_skipped_old" in data["metadata"]:
-                    print(f"📊 Techpana Skipped (old): {data['metadata']['articles_skipped_old']} articles")
-                
-                # Content statistics
-                if "content_statistics" in data["metadata"]:
-                    content_stats = data["metadata"]["content_statistics"]
-                    print(f"📝 Techpana Content Stats:")
-                    print(f"   - With full content: {content_stats.get('articles_with_full_content', 0)}")
-                    print(f"   - Preview only: {content_stats.get('articles_with_preview_only', 0)}")
-                    print(f"   - Avg summary length: {content_stats.get('average_summary_length', 0)} chars")
-                    print(f"   - Adequate content: {content_stats.get('articles_with_adequate_content', 0)}")
-                
-            else:
-                print(f"❌ Techpana scraping failed: {data['metadata'].get('error', 'Unknown error')}")
-        except Exception as e:
-            print(f"❌ Error fetching Techpana news: {e}")
-            import traceback
-            print(f"❌ Techpana error details: {traceback.format_exc()}")
-
-        # Source 3: Kathmandu Post News
-        try:
-            kathmandu_articles = kathmandu_post_extractor()
-            for article in kathmandu_articles:
-                # Convert Kathmandu Post format to match Kantipur format
-                converted_article = {
-                    "id": len(all_articles) + 1,
-                    "title": article["title"],
-                    "summary": article["summary"],
-                    "url": article["news_link"],
-                    "image_url": article["image_link"] or "",
-                    "date": article["raw_date"],
-                    "source": "kathmandu_post",
-                    "threat_analysis": article.get("threat_analysis", {
-                        "level": "low",
-                        "keywords_found": [],
-                        "categories": [],
-                        "total_keywords_matched": 0
-                    }),
-                    "content_length": len(article["title"] + " " + article["summary"]),
-                    "priority": article.get("threat_analysis", {}).get("priority", "normal")
-                }
-                all_articles.append(converted_article)
-            print(f"✅ Fetched {len(kathmandu_articles)} articles from Kathmandu Post")
-        except Exception as e:
-            print(f"❌ Error fetching Kathmandu Post news: {e}")
-        
-        if not all_articles:
-            error_msg = "❌ No articles fetched from any source"
-            print(error_msg)
-            return JsonResponse({
-                "status": "error",
-                "alert_type": "error",
-                "alert_message": "No articles could be fetched from any news source.",
-            })
-        
-        articles_saved = 0
-        articles_updated = 0
-        articles_skipped = 0
-        
-        # Process each article and save to database
-        for article_data in all_articles:
-            try:
-                # Prepare data for saving
-                threat_analysis = article_data.get("threat_analysis", {})
-                
-                # Convert lists to comma-separated strings
-                keywords_found = threat_analysis.get("keywords_found", [])
-                categories_list = threat_analysis.get("categories", [])
-                
-                keywords_str = ", ".join(keywords_found) if isinstance(keywords_found, list) else str(keywords_found)
-                categories_str = ", ".join(categories_list) if isinstance(categories_list, list) else str(categories_list)
-                
-                # Handle date field - ensure it's a string
-                article_date = article_data.get("date", "")
-                if not article_date or article_date == "Unknown":
-                    article_date = datetime.now().strftime("%Y-%m-%d")
-                
-                # Create or update article
-                obj, created = AutoNewsArticle.objects.update_or_create(
-                    url=article_data["url"],
-                    defaults={
-                        'title': article_data["title"][:500],  # Limit length for database
-                        'summary': article_data.get("summary", "")[:1000],  # Limit length
-                        'image_url': article_data.get("image_url", "")[:500],
-                        'source': article_data.get("source", "unknown"),
-                        'date': article_date,
-                        'content_length': article_data.get("content_length", 0),
-                        'priority': article_data.get("priority", "medium"),
-                        'threat_level': threat_analysis.get("level", "low"),
-                        'keywords': keywords_str[:500],  # Limit length
-                        'categories': categories_str[:500],  # Limit length
-                    }
-                )
-                
-                if created:
-                    articles_saved += 1
-                    print(f"✅ Saved {article_data.get('source', 'unknown')}: {article_data['title'][:50]}...")
-                else:
-                    articles_updated += 1
-                    print(f"🔄 Updated {article_data.get('source', 'unknown')}: {article_data['title'][:50]}...")
-                    
-            except Exception as e:
-                articles_skipped += 1
-                source = article_data.get('source', 'unknown')
-                print(f"❌ Error saving {source} article '{article_data.get('title', 'Unknown')[:30]}...': {e}")
-                continue
-        
-        # Create success message with all sources
-        sources_used = []
-        if any(article['source'] == 'kantipur' for article in all_articles):
-            sources_used.append("Kantipur")
-        if any(article['source'] == 'techpana' for article in all_articles):
-            sources_used.append("Techpana")
-        if any(article['source'] == 'kathmandu_post' for article in all_articles):
-            sources_used.append("Kathmandu Post")
-            
-        sources_str = ", ".join(sources_used) if sources_used else "No sources"
-        
-        success_message = f"News autofeeding completed! Sources: {sources_str}. Saved: {articles_saved}, Updated: {articles_updated}, Skipped: {articles_skipped}"
-        print(f"✅ {success_message}")
+        job, created = enqueue('news_autofeed', request.user if request.user.is_authenticated else None)
+        message = (f"News autofeeding queued as job #{job.pk}" if created
+                   else f"News autofeeding is already {job.state} (job #{job.pk})")
+        print(f"📥 {message}")
         
         # Return appropriate response
-        if request and hasattr(request, 'is_ajax') and request.is_ajax():
+        if request.headers.get('x-requested-with') == 'XMLHttpRequest':
             return JsonResponse({
-                "status": "success",
-                "alert_type": "success", 
-                "alert_message": success_message,
-                "stats": {
-                    "saved": articles_saved,
-                    "updated": articles_updated,
-                    "skipped": articles_skipped,
-                    "total_processed": len(all_articles),
-                    "sources": sources_used
-                }
+                "status": "queued",
+                "alert_type": "info",
+                "alert_message": message,
+                "job_id": job.pk,
+                "status_url": reverse('scrape_job_status', args=[job.pk]),
             })
         else:
             return HttpResponseRedirect(
                 reverse('autonews_view') + 
-                f'?alert=success&message={success_message}&saved={articles_saved}&updated={articles_updated}'
+                f'?alert=success&message={message}'
             )
     
     except Exception as e:
         error_msg = f"❌ Autofeeding failed: {str(e)}"
         print(error_msg)
-        import traceback
-        print(f"❌ Full error: {traceback.format_exc()}")
         
-        if request and hasattr(request, 'is_ajax') and request.is_ajax():
+        if request.headers.get('x-requested-with') == 'XMLHttpRequest':
             return JsonResponse({
                 "status": "error",
                 "alert_type": "error",
@@ -2725,10 +2508,6 @@ from django.urls import reverse
 from datetime import datetime
 from .models import AutoNewsArticle  # Your model
 
-# Import your scraper functions
-from collect.scrapers.keyboard_techpana import keyboard_techpana_to_json
-from collect.scrapers.keyboard_nagarik import keyboard_nagariknews_to_json
-
 def send_to_websocket(message):
     """Utility function to send messages to websocket"""
     # Implement your websocket sending logic here
@@ -2756,177 +2535,31 @@ def keyboard_AutoFeed(request):
             else:
                 source = request.POST.get('source')
         
-        send_to_websocket(f"Fetching started from { source}")
-        
-        # Define available scrapers
-        SCRAPER_FUNCTIONS = {
-            'nagariknews': keyboard_nagariknews_to_json,
-            'techpana': keyboard_techpana_to_json,
-            'kantipur': keyboard_kantipur_to_json,
-            'kathmandupost': keyboard_kathmandu_post_to_json,
-            'onlinekhabar': keyboard_onlinekhabar_to_json,
-            'paschimnepal': keyboard_paschimnepal_to_json,
-            'onlinetvnepal': keyboard_onlinetvnepal_to_json,
-            'osnepal': keyboard_osnepal_to_json, 
-            'eadarsha': keyboard_eadarsha_to_json,
-            'arthasarokar': keyboard_arthasarokar_to_json,
-            'newsofnepal': keyboard_newsofnepal_to_json,
-            'rajdhanidaily': keyboard_rajdhanidaily_to_json,
-            'dnews': keyboard_dnewsnepal_to_json,
-            'hetaudatoday': keyboard_hetaudatoday_to_json,
-            'chitwan': keyboard_chitwansamachar_to_json,
-            'nuwakot': keyboard_onlinenuwakot_to_json,
-            'merokarnali': keyboard_merokarnali_to_json,
-            'hamropahuch': keyboard_hamropahuch_to_json,
-            'raibar': keyboard_nepaliraibar_to_json,
-            'shilapaper': keyboard_shilapaper_to_json,
-
-            # Add more sources here as you create their scraper functions
-        }
-        
-        # Determine which sources to scrape
-        if source in SCRAPER_FUNCTIONS:
-            sources_to_scrape = [source]
-            print(333333333333333333333333, sources_to_scrape)
-        elif source == 'all' or source is None:
-            sources_to_scrape = list(SCRAPER_FUNCTIONS.keys())
-        else:
+        # Validate here so a bad source fails fast instead of as a job
+        if resolve_sources(source) is None:
             return JsonResponse({
                 "status": "error",
                 "message": f"Invalid source: {source}. Available: {', '.join(SCRAPER_FUNCTIONS.keys())}"
             })
         
-        total_saved = 0
-        source_stats = {}
-        
-        # Scrape each source
-        for source_name in sources_to_scrape:
-            try:
-                send_to_websocket(f"📰 Fetching from {source_name}...")
-                
-                # Get the scraper function
-                scraper_function = SCRAPER_FUNCTIONS[source_name]
-                
-                # Call the scraper
-                json_result = scraper_function(request)
-                
-                # Parse result
-                if isinstance(json_result, str):
-                    data = json.loads(json_result)
-                elif hasattr(json_result, 'content'):  # JsonResponse
-                    data = json.loads(json_result.content.decode('utf-8'))
-                else:
-                    data = json_result
-                
-                # Check if scraping was successful
-                if data.get("metadata", {}).get("status") != "success":
-                    send_to_websocket(f"❌ {source_name}: Scraping failed")
-                    source_stats[source_name] = {"error": "Scraping failed"}
-                    continue
-                
-                articles = data.get("articles", [])
-                saved_from_source = 0
-                
-                # Save each article
-                for article in articles:
-                    try:
-                        # Check for duplicate (by URL for this user)
-                        exists = AutoNewsArticle.objects.filter(
-                            url=article['url'],
-                            created_by=current_user
-                        ).exists()
-                        
-                        if exists:
-                            continue
-                        
-                        # Prepare keywords and categories
-                        keywords_list = article.get('keywords', [])
-                        if not keywords_list:
-                            # Try to get from threat_analysis for backward compatibility
-                            keywords_list = article.get('threat_analysis', {}).get('keywords_found', [])
-                        
-                        categories_list = article.get('categories', [])
-                        if not categories_list:
-                            # Try to get from threat_analysis for backward compatibility
-                            categories_list = article.get('threat_analysis', {}).get('categories', [])
-                        
-                        # Convert lists to comma-separated strings
-                        keywords_str = ','.join(keywords_list) if isinstance(keywords_list, list) else str(keywords_list)
-                        categories_str = ','.join(categories_list) if isinstance(categories_list, list) else str(categories_list)
-                        
-                        # Determine threat level and priority
-                        threat_level = article.get('threat_analysis', {}).get('level', 'low')
-                        priority = 'medium'
-                        if threat_level == 'high':
-                            priority = 'high'
-                        elif threat_level == 'low':
-                            priority = 'low'
-                        
-                        # Create article
-                        AutoNewsArticle.objects.create(
-                            title=article['title'][:200],
-                            summary=article.get('summary', article.get('content', '')[:300])[:500],
-                            url=article['url'],
-                            image_url=article.get('image_url', '')[:500],
-                            source=source_name,  # Use actual source name
-                            date=article.get('date', datetime.now().strftime('%Y-%m-%d')),
-                            keywords=keywords_str[:200],
-                            categories=categories_str[:200],
-                            threat_level=threat_level,
-                            priority=priority,
-                            content_length=len(article.get('content', '')),
-                            created_by=current_user
-                        )
-                        
-                        saved_from_source += 1
-                        total_saved += 1
-                        
-                        if saved_from_source % 5 == 0:
-                            send_to_websocket(f"✅ {source_name}: Saved {saved_from_source} articles")
-                            
-                    except Exception as e:
-                        # Skip article if error
-                        continue
-                
-                source_stats[source_name] = {
-                    "total_found": len(articles),
-                    "saved": saved_from_source,
-                    "status": "success"
-                }
-                
-                send_to_websocket(f"✅ {source_name}: Saved {saved_from_source}/{len(articles)} articles")
-                
-            except Exception as e:
-                send_to_websocket(f"❌ {source_name} error: {str(e)[:50]}")
-                source_stats[source_name] = {
-                    "error": str(e)[:100],
-                    "status": "failed"
-                }
-                continue
-        
-        # Final summary
-        send_to_websocket(f"💾 Total saved: {total_saved} articles")
-        
-        for source_name, stats in source_stats.items():
-            if stats.get('status') == 'success':
-                send_to_websocket(f"   📰 {source_name}: {stats.get('saved', 0)} saved")
-            else:
-                send_to_websocket(f"   ❌ {source_name}: Failed - {stats.get('error', 'Unknown error')}")
-        
-        send_to_websocket("=" * 40)
+        # The scrape runs in a `manage.py run_workers` process; progress streams over the websocket
+        job, created = enqueue('keyboard_autofeed', current_user, {"source": source})
+        message = (f"Auto-feed queued as job #{job.pk}." if created
+                   else f"Auto-feed for {source} is already {job.state} (job #{job.pk}).")
+        send_to_websocket(f"📥 {message}")
         
         # Return response
         if request.headers.get('x-requested-with') == 'XMLHttpRequest':
             return JsonResponse({
-                "status": "success",
-                "message": f"Auto-feed completed. Saved {total_saved} articles.",
-                "saved_count": total_saved,
-                "source_stats": source_stats,
+                "status": "queued",
+                "message": message,
+                "job_id": job.pk,
+                "status_url": reverse('scrape_job_status', args=[job.pk]),
                 "user": current_user.username
             })
         else:
             # For form submission
-            messages.success(request, f"Auto-feed completed. Saved {total_saved} articles.")
+            messages.success(request, message)
             return redirect('autonews_view')  # Redirect to your news view
         
     except Exception as e:
@@ -2942,6 +2575,66 @@ def keyboard_AutoFeed(request):
             return redirect('autonews_view')
 
 
+@login_required
+def scrape_job_status(request, job_id):
+    """Progress and result of one background scrape job (JSON)"""
+    if not check_access(request):
+        return redirect('logout')
+
+    jobs = ScrapeJob.objects.filter(pk=job_id)
+    if not request.user.is_superuser:
+        jobs = jobs.filter(created_by=request.user)
+    job = jobs.first()
+    if job is None:
+        return JsonResponse({"status": "error", "message": "Job not found"}, status=404)
+    return JsonResponse({"status": "success", "job": job_as_dict(job)})
+
+
+@login_required
+def scrape_jobs(request):
+    """The user's latest background scrape jobs (JSON)"""
+    if not check_access(request):
+        return redirect('logout')
+
+    jobs = ScrapeJob.objects.filter(created_by=request.user).order_by('-created_at')[:20]
+    return JsonResponse({"status": "success", "jobs": [job_as_dict(job, messages=0) for job in jobs]})
+
+
+# Scores stored on AutoNewsArticle at ingest (indexed) - the dashboards filter and sort on them
+ARTICLE_SENTIMENTS = {'negative': 0, 'positive': 1, 'neutral': 2}
+ARTICLE_SORTS = ['-created_at', '-danger_score']
+
+
+def article_score_filters(request):
+    """(sentiment, min_danger, sort) GET parameters of the article dashboards, validated"""
+    sentiment = request.GET.get('sentiment', '')
+    if sentiment not in ARTICLE_SENTIMENTS:
+        sentiment = ''
+    min_danger = request.GET.get('min_danger', '').strip()
+    if not min_danger.isdigit():
+        min_danger = ''
+    sort_by = request.GET.get('sort', '-created_at')
+    if sort_by not in ARTICLE_SORTS:
+        sort_by = '-created_at'
+    return sentiment, min_danger, sort_by
+
+
+def filter_article_scores(articles, sentiment, min_danger):
+    if sentiment:
+        articles = articles.filter(sentiment=ARTICLE_SENTIMENTS[sentiment])
+    if min_danger:
+        articles = articles.filter(danger_score__gte=int(min_danger))
+    return articles
+
+
+def article_score_query(sentiment, min_danger, sort_by):
+    """Query string that keeps the score filters across pagination links"""
+    params = {'sentiment': sentiment, 'min_danger': min_danger}
+    if sort_by != '-created_at':
+        params['sort'] = sort_by
+    return urlencode({key: value for key, value in params.items() if value})
+
+
 @login_required
 def autoNews(request):
     if not check_access(request):
@@ -2954,6 +2647,7 @@ def autoNews(request):
     priority_filter = request.GET.get('priority', '')
     date_filter = request.GET.get('date_filter', '')
     search_query = request.GET.get('search', '')
+    sentiment_filter, min_danger, sort_by = article_score_filters(request)
     
 
     # Start with articles created by current user only
@@ -2988,8 +2682,10 @@ def autoNews(request):
             Q(source__icontains=search_query)
         )
     
-    # Order by creation date (newest first)
-    articles = articles.order_by('-created_at')
+    articles = filter_article_scores(articles, sentiment_filter, min_danger)
+
+    # Newest first, or most dangerous first (unscored articles last)
+    articles = articles.order_by(sort_by, '-created_at')
     
     # Get all articles for statistics - ONLY FOR CURRENT USER
     all_articles_user = AutoNewsArticle.objects.filter(created_by__unit=current_user_unit)
@@ -3018,6 +2714,8 @@ def autoNews(request):
         elif date_filter == 'month':
             month_ago = timezone.now().date() - timedelta(days=30)
             stats_articles = stats_articles.filter(created_at__date__gte=month_ago)
+
+    stats_articles = filter_article_scores(stats_articles, sentiment_filter, min_danger)
     
     # Get articles by threat level for stats - ONLY FOR CURRENT USER WITH FILTERS
     critical_articles = stats_articles.filter(threat_level='critical')
@@ -3049,6 +2747,10 @@ def autoNews(request):
         'priority_filter': priority_filter,
         'date_filter': date_filter,
         'search_query': search_query,
+        'sentiment_filter': sentiment_filter,
+        'min_danger': min_danger,
+        'sort_by': sort_by,
+        'score_query': article_score_query(sentiment_filter, min_danger, sort_by),
         'page_obj': page_obj,
         'current_user': current_user,
         'showing_user_only': True,  # Flag to indicate showing only user's data
@@ -4901,7 +4603,7 @@ def keyword_edit(request, id):
         
         # Check for duplicate word-category combination (excluding current keyword)
         duplicate = DangerousKeyword.objects.filter(
-            Q(word__iexact=word) & Q(category__iexact=category)
+            Q(normalized_word=normalize_keyword(word)) & Q(category__iexact=category)
         ).exclude(id=id).exists()
         
         if duplicate:
@@ -7471,10 +7173,12 @@ def list_autonews(request):
     user_id = request.session.get('user_id', '')
     
     query = request.GET.get('q', '').strip()
+    sentiment_filter, min_danger, sort_by = article_score_filters(request)
     
     # Get all auto news articles
     articles = AutoNewsArticle.objects.all()
-    articles = articles.order_by('-created_at')
+    articles = filter_article_scores(articles, sentiment_filter, min_danger)
+    articles = articles.order_by(sort_by, '-created_at')
     
     # Search functionality
     if query:
@@ -7552,6 +7256,10 @@ def list_autonews(request):
         'user_unit': user_unit,
         'user_role': user_role,
         'search_query': query,
+        'sentiment_filter': sentiment_filter,
+        'min_danger': min_danger,
+        'sort_by': sort_by,
+        'score_query': article_score_query(sentiment_filter, min_danger, sort_by),
         'top_sources': top_sources,
         'is_superadmin': is_superadmin,
         'user_id': user_id,
@@ -8039,6 +7747,7 @@ from django.db import models
 from .models import Website
 import pytz
 from datetime import datetime
+from utils.http_session import session_for, connection_stats
 
 # Set up logging
 logger = logging.getLogger(__name__)
@@ -8134,7 +7843,8 @@ def check_website_with_retry(website, max_retries=MAX_RETRIES, timeout=TIMEOUT):
             
             start = time.time()
             
-            response = requests.get(
+            # Pooled keep-alive session; retries are handled by this loop
+            response = session_for(url, policy='monitor').get(
                 url, 
                 timeout=timeout,
                 headers={'User-Agent': 'Mozilla/5.0'},
@@ -8147,6 +7857,7 @@ def check_website_with_retry(website, max_retries=MAX_RETRIES, timeout=TIMEOUT):
             # If this was a recovery (previous attempts failed)
             if attempts > 1:
                 log_site_recovery(website, response_time, response.status_code, attempts)
+            health.record_monitor(url, response.status_code < 500, response_time, f"HTTP {response.status_code}")
             
             return {
                 'status': 'up',
@@ -8180,6 +7891,7 @@ def check_website_with_retry(website, max_retries=MAX_RETRIES, timeout=TIMEOUT):
     # All attempts failed - log the down site
     error_msg = f'{last_error} after {max_retries} attempts'
     log_down_site(website, error_msg, max_retries)
+    health.record_monitor(url, False, error=error_msg)
     
     return {
         'status': 'down',
@@ -8248,6 +7960,9 @@ def check_website_batch(websites):
     
     # Log batch summary
     logger.info(f"Batch check completed - Up: {up_count}, Down: {down_count}, Total: {len(websites)}")
+    health.flush()
+    stats = connection_stats()
+    logger.info(f"HTTP pool - requests: {stats['requests']}, connections opened: {stats['connections_opened']}, reused: {stats['reused']}")
     
     return results, up_count, down_count, fast_sites, slow_sites, very_slow_sites
 
@@ -8314,7 +8029,8 @@ def monitor_sites(request):
         'last_checked': get_kathmandu_time(),
         'load_time': round((time.time() - start_total) * 1000),
         'retry_count': MAX_RETRIES,
-        'retry_delay': RETRY_DELAY
+        'retry_delay': RETRY_DELAY,
+        'connection_stats': connection_stats()
     }
     
     cache.set(cache_key, context, CACHE_TIMEOUT)
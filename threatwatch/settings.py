@@ -84,6 +84,8 @@ DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        # Concurrent scrapers write from several threads - wait for the lock instead of failing
+        'OPTIONS': {'timeout': 20},
     }
 }
 
@@ -146,6 +148,48 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 # Custom user model
 AUTH_USER_MODEL = 'collect.User'
 
+# ========== SCRAPER PAGE CACHE ==========
+# Raw fetched pages, zlib-compressed and content-addressed (collect/scrapers/page_cache.py)
+PAGE_CACHE_ENABLED = True
+PAGE_CACHE_DIR = BASE_DIR / 'cache' / 'pages'
+PAGE_CACHE_TTL = 7 * 24 * 3600          # seconds - older pages are evicted first
+PAGE_CACHE_MAX_BYTES = 512 * 1024 * 1024  # compressed size before LRU eviction kicks in
+
+# ========== ARTICLE SEEN-SET ==========
+# Bloom filters over saved article URLs, one per user (collect/scrapers/seen_urls.py)
+SEEN_FILTER_DIR = BASE_DIR / 'cache' / 'seen'
+SEEN_FILTER_FP_RATE = 0.001               # target false-positive rate at capacity
+
+# ========== BACKGROUND SCRAPE JOBS ==========
+# Queued by the auto-feed views, run by `python manage.py run_workers --processes N`
+SCRAPE_JOB_LEASE = 300                    # seconds before a silent worker's job is picked up again
+SCRAPE_JOB_POLL_INTERVAL = 2              # seconds between queue / progress polls
+SCHEDULER_MAX_ACTIVE = 6                  # `run_scheduler`: scheduled jobs queued or running at once
+
+# ========== CACHES ==========
+# 'keywords' is shared by every process (runserver, run_workers, run_scheduler): it holds the
+# version of the DangerousKeyword table that compiled keyword matchers are checked against
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'keywords': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': BASE_DIR / 'cache' / 'keywords',
+    },
+}
+
+# ========== SENTIMENT MODEL ==========
+# utils/sentiment.py loads the model on first use. Servers can load it at startup instead
+# (SENTIMENT_PRELOAD=1 in the environment, e.g. with `gunicorn --preload` so forked workers share it)
+SENTIMENT_PRELOAD = os.environ.get('SENTIMENT_PRELOAD') == '1'
+SENTIMENT_MMAP = True                     # memory-map the model arrays (one page-cache copy for all workers)
+SENTIMENT_FAST_PATH = True                # linear models: NumPy dot product instead of model.predict()
+# Worker processes for large batches (big comment uploads, ingest); 0: score in the calling process
+SENTIMENT_WORKERS = int(os.environ.get('SENTIMENT_WORKERS', '0'))
+SENTIMENT_CACHE_SIZE = 100_000            # predictions kept per process (LRU, keyed by text + model hash)
+SENTIMENT_CACHE_FILE = BASE_DIR / 'cache' / 'sentiment.bin'  # None: don't persist the cache
+
 # CORS settings (development only)
 CORS_ALLOW_ALL_ORIGINS = True  # Remove in production
 
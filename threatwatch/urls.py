@@ -12,6 +12,8 @@ urlpatterns = [
     path('auto_news/', views.newsAutofeeding, name='news_AutoFeed'),
     path('fetch_keyboard/', views.keyboard_fetch, name='keyboard_fetch'),
     path('autofeed_keyboard/', views.keyboard_AutoFeed, name='keyboard_AutoFeed'),
+    path('scrape_jobs/', views.scrape_jobs, name='scrape_jobs'),
+    path('scrape_jobs/<int:job_id>/', views.scrape_job_status, name='scrape_job_status'),
     path('viewAutoNews/', views.autoNews, name='autonews_view'),
     path('search_news/', views.newsSearching, name='news_search'),
     path('visualize_news/', views.newsVisualization, name='news_visualization'),
@@ -0,0 +1,75 @@
+# utils/danger.py
+"""
+Keyword danger scoring shared by the comment analyzer (collect.views) and
+article ingestion (collect.scrapers.ingest).
+
+Every violence / threats / dehumanizing / military / mobilization keyword
+found scores one point; military words next to violence or threats add 2,
+military words next to mobilization add 3.
+"""
+from collections import defaultdict
+
+from utils.keyword_matcher import compile_keywords, keyword_entries
+from utils.sentiment import predict_sentiments
+from utils.text_normalize import normalize_text
+
+# Core categories scored one point per keyword; military / mobilization words are combined with them below
+CORE_DANGER_CATEGORIES = ['violence', 'threats', 'dehumanizing']
+SCORED_DANGER_CATEGORIES = CORE_DANGER_CATEGORIES + ['military', 'mobilization']
+
+
+def score_matches(found):
+    """(matches, danger_score) of found = {category: [matched words]}; matches are (category, word) pairs"""
+    matches = []
+    danger_score = 0
+    for category in SCORED_DANGER_CATEGORIES:
+        for word in found.get(category, ()):
+            matches.append((category, word))
+            danger_score += 1
+    military_found = bool(found.get('military'))
+
+    # HIGH RISK: Military + Violence/Threats combination
+    if military_found:
+        for category in ['violence', 'threats']:
+            if found.get(category):
+                matches.append(('contextual_threat', f'सेना + {found[category][0]}'))
+                danger_score += 2
+
+    # HIGH RISK: Military + Mobilization combination
+    if military_found and found.get('mobilization'):
+        matches.append(('contextual_threat', 'सेना + आह्वान'))
+        danger_score += 3
+    return matches, danger_score
+
+
+def danger_matcher(user=None, active_only=True):
+    """Matcher of user's active (or all) keywords (everyone's with None) in the scored categories only"""
+    return compile_keywords(
+        (word, category) for word, category in keyword_entries(user, active_only)
+        if category in SCORED_DANGER_CATEGORIES
+    )
+
+
+def danger_score(text, matcher):
+    found = defaultdict(list)
+    for word, category in matcher.matches(normalize_text(text)):
+        found[category].append(word)
+    return score_matches(found)[1]
+
+
+def article_text(title, summary):
+    return f"{title or ''} {summary or ''}".strip()
+
+
+def score_articles(articles, user=None, workers=None):
+    """
+    [(sentiment, danger_score)] of articles = [(title, summary)], scored as one
+    batch: one sentiment predict (across the worker pool when large) and one
+    keyword matcher for all of them
+    """
+    texts = [article_text(title, summary) for title, summary in articles]
+    matcher = danger_matcher(user)
+    return [
+        (sentiment, danger_score(text, matcher))
+        for text, sentiment in zip(texts, predict_sentiments(texts, workers))
+    ]
@@ -0,0 +1,134 @@
+# utils/http_session.py
+"""
+Process-wide registry of long-lived, pooled HTTP sessions.
+
+Scrapers and the site monitor draw their sessions from here instead of
+building a new requests.Session (or calling requests.get) every time, so
+keep-alive connections are reused across runs and TCP/TLS handshakes are
+only paid once per host and pool slot.
+"""
+import threading
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# urllib3 only decodes brotli when one of these is installed
+try:
+    import brotli  # noqa: F401
+    ACCEPT_ENCODING = "gzip, deflate, br"
+except ImportError:
+    try:
+        import brotlicffi  # noqa: F401
+        ACCEPT_ENCODING = "gzip, deflate, br"
+    except ImportError:
+        ACCEPT_ENCODING = "gzip, deflate"
+
+
+# ============ POOL SIZES ============
+POOL_CONNECTIONS = 20    # distinct hosts kept per session (article pages can live on other hosts)
+POOL_MAXSIZE = 16        # keep-alive connections kept per host - matches engine.MAX_REQUESTS
+
+# ============ RETRY POLICIES ============
+RETRY_POLICIES = {
+    # Scrapers: retry connection errors only - 429/5xx are retried by the
+    # engine through the per-host rate limiter so backoff stays polite
+    'scraper': Retry(
+        total=3,
+        backoff_factor=0.5,
+        status=0,
+        allowed_methods=["GET", "HEAD"],
+        raise_on_status=False,
+    ),
+    # Site monitor runs its own retry loop and logs every attempt
+    'monitor': Retry(total=0, redirect=5, raise_on_status=False),
+}
+
+DEFAULT_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+    "Accept-Encoding": ACCEPT_ENCODING,
+    "Connection": "keep-alive",
+}
+
+_sessions = {}
+_lock = threading.Lock()
+
+
+def _build_session(policy, headers):
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        max_retries=RETRY_POLICIES[policy],
+        pool_connections=POOL_CONNECTIONS,
+        pool_maxsize=POOL_MAXSIZE,
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers.update(DEFAULT_HEADERS)
+    if headers:
+        session.headers.update(headers)
+    return session
+
+
+def get_session(host, headers=None, policy='scraper'):
+    """
+    Shared session for a host and policy. headers are applied only when the
+    session is first created: every later caller (another scraper, or
+    engine.fetch() without a session) gets it with the first caller's headers.
+    Pass per-request headers for anything that varies or must always be sent.
+    """
+    key = (host, policy)
+    session = _sessions.get(key)
+    if session is None:
+        with _lock:
+            session = _sessions.get(key)
+            if session is None:
+                session = _build_session(policy, headers)
+                _sessions[key] = session
+    return session
+
+
+def session_for(url, headers=None, policy='scraper'):
+    """Shared session for the host of url (same header rule as get_session)"""
+    return get_session(urlsplit(url).netloc, headers=headers, policy=policy)
+
+
+def connection_stats():
+    """
+    Connection reuse counters across all registered sessions.
+    reused = requests that went over an already-open keep-alive connection.
+    """
+    stats = {"sessions": 0, "pools": 0, "connections_opened": 0, "requests": 0, "reused": 0, "hosts": {}}
+    with _lock:
+        sessions = list(_sessions.items())
+
+    for (host, policy), session in sessions:
+        stats["sessions"] += 1
+        seen = set()
+        for adapter in session.adapters.values():
+            if id(adapter) in seen:
+                continue
+            seen.add(id(adapter))
+            pools = adapter.poolmanager.pools
+            with pools.lock:
+                pool_list = list(pools._container.values())
+            for pool in pool_list:
+                stats["pools"] += 1
+                stats["connections_opened"] += pool.num_connections
+                stats["requests"] += pool.num_requests
+                host_stats = stats["hosts"].setdefault(pool.host, {"connections_opened": 0, "requests": 0})
+                host_stats["connections_opened"] += pool.num_connections
+                host_stats["requests"] += pool.num_requests
+
+    stats["reused"] = max(stats["requests"] - stats["connections_opened"], 0)
+    return stats
+
+
+def close_sessions():
+    """Close every pooled connection (tests/benchmarks and shutdown)"""
+    with _lock:
+        sessions = list(_sessions.values())
+        _sessions.clear()
+    for session in sessions:
+        session.close()
@@ -0,0 +1,298 @@
+# utils/keyword_matcher.py
+"""
+Multi-pattern keyword matching with an Aho–Corasick automaton.
+
+All keywords are compiled once into a trie with failure links, so a text is
+scanned a single time no matter how many keywords there are, instead of one
+`word in text` pass per keyword. Matching is on lower-cased text and finds
+keywords anywhere (also inside longer words), exactly like the substring
+checks it replaces. Keywords and text both go through
+utils.text_normalize.normalize_text first, so spelling variants (NFD,
+zero-width joiners, nukta, chandrabindu, long/short matras) match too.
+Every keyword entry carries a payload (its category); results come back in
+keyword order so callers that cap the number of matches keep their old output.
+
+For small keyword sets CPython's substring search, run once per keyword in
+C, is still faster than a Python-level scan of every character, so below
+AUTOMATON_MIN_WORDS distinct keywords the matcher does that instead (same
+results, see `manage.py bench_keywords` for the crossover).
+
+highlight_html() wraps the spans of a scan in <mark> tags in one linear pass
+over the original text.
+
+keyword_matcher(user) returns the compiled matcher of the active
+DangerousKeyword rows (a user's or everyone's; active_only=False includes the
+deactivated ones). It is rebuilt only when a keyword is saved or deleted anywhere - the change applies on the next call,
+in every process.
+"""
+import os
+import threading
+import time
+from collections import deque
+from functools import lru_cache
+from html import escape
+
+from django.conf import settings
+from django.core.cache import caches
+
+from utils.text_normalize import normalize_keyword, normalize_text, normalize_with_offsets
+
+
+AUTOMATON_MIN_WORDS = 300  # distinct keywords from which the automaton beats per-keyword `in`
+COMPILED_CACHE = 32        # distinct keyword sets kept compiled per process
+
+
+class KeywordMatcher:
+    """
+    Aho–Corasick automaton over (word, payload) entries. Entries keep the
+    word as given (lower-cased) for display; matching uses its normalized
+    form, so spelling variants of one keyword share a single trie path.
+    """
+
+    def __init__(self, entries, automaton=None):
+        self.entries = []
+        word_ids = {}
+        self._word_entries = []
+        for word, payload in entries:
+            key = normalize_keyword(word)
+            if not key:
+                continue
+            if key not in word_ids:
+                word_ids[key] = len(self._word_entries)
+                self._word_entries.append([])
+            self._word_entries[word_ids[key]].append(len(self.entries))
+            self.entries.append((word.lower().strip(), payload))
+        self.words = list(word_ids)
+        self._word_ids = word_ids
+        self.automaton = len(self.words) >= AUTOMATON_MIN_WORDS if automaton is None else automaton
+        if self.automaton:
+            self._build()
+
+    def _build(self):
+        goto = [{}]
+        out = [[]]
+        for word_id, word in enumerate(self.words):
+            node = 0
+            for ch in word:
+                nxt = goto[node].get(ch)
+                if nxt is None:
+                    nxt = len(goto)
+                    goto[node][ch] = nxt
+                    goto.append({})
+                    out.append([])
+                node = nxt
+            out[node].append(word_id)
+
+        # Breadth-first: a node's failure link is the longest proper suffix that is also in the trie
+        fail = [0] * len(goto)
+        queue = deque(goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, child in goto[node].items():
+                queue.append(child)
+                state = fail[node]
+                while state and ch not in goto[state]:
+                    state = fail[state]
+                fail[child] = goto[state].get(ch, 0)
+                out[child] = out[child] + out[fail[child]]
+
+        self._goto = goto
+        self._fail = fail
+        self._out = [tuple(words) for words in out]
+        self._alphabet = frozenset(ch for word in self.words for ch in word)
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __bool__(self):
+        return bool(self.entries)
+
+    def _scan(self, text):
+        """Yield (end index, word ids) for every position of normalized text where keywords end"""
+        goto, fail, out, alphabet = self._goto, self._fail, self._out, self._alphabet
+        node = 0
+        for index, ch in enumerate(text):
+            if ch not in alphabet:
+                node = 0
+                continue
+            while True:
+                nxt = goto[node].get(ch)
+                if nxt is not None:
+                    node = nxt
+                    break
+                if not node:
+                    break
+                node = fail[node]
+            if out[node]:
+                yield index, out[node]
+
+    def found_word_ids(self, text):
+        """Ids of the normalized keywords found in text (pass a NormalizedText to skip normalizing again)"""
+        if not self.words or not text:
+            return set()
+        text = normalize_text(text)
+        if not self.automaton:
+            return {word_id for word_id, word in enumerate(self.words) if word in text}
+        found = set()
+        for _, word_ids in self._scan(text):
+            found.update(word_ids)
+        return found
+
+    def matches(self, text):
+        """[(word, payload)] of every entry found in text, in keyword order"""
+        return self._entries_of(self.found_word_ids(text))
+
+    def matches_in(self, spans):
+        """matches() from the result of spans() - one scan for both"""
+        return self._entries_of({self._word_ids[word] for _, _, word in spans})
+
+    def _entries_of(self, found):
+        if not found:
+            return []
+        indexes = sorted(index for word_id in found for index in self._word_entries[word_id])
+        return [self.entries[index] for index in indexes]
+
+    def found_words(self, text):
+        """Distinct normalized keywords found in text, in keyword order"""
+        return [self.words[word_id] for word_id in sorted(self.found_word_ids(text))]
+
+    def spans(self, text):
+        """
+        (start, end, word) of every occurrence of a normalized keyword in
+        normalize_text(text) - overlapping ones included. Map them back onto
+        the original text with text_normalize.normalize_with_offsets.
+        """
+        if not self.words or not text:
+            return []
+        text = normalize_text(text)
+        spans = []
+        if not self.automaton:
+            for word in self.words:
+                start = text.find(word)
+                while start != -1:
+                    spans.append((start, start + len(word), word))
+                    start = text.find(word, start + 1)
+            return spans
+        for index, word_ids in self._scan(text):
+            for word_id in word_ids:
+                word = self.words[word_id]
+                spans.append((index + 1 - len(word), index + 1, word))
+        return spans
+
+
+def highlight_html(text, spans, open_tag='<mark class="highlight-danger">', close_tag='</mark>'):
+    """
+    HTML-escaped text with every span of KeywordMatcher.spans(text) wrapped
+    in open_tag/close_tag. Overlapping spans are merged into one mark, so tags
+    never nest or land inside each other; built in one pass over text.
+    """
+    if not text:
+        return ''
+    if not spans:
+        return escape(text)
+    _, starts, ends = normalize_with_offsets(text)
+    marks = []
+    for start, end in sorted((starts[start], ends[end - 1]) for start, end, _ in spans):
+        if marks and start <= marks[-1][1]:
+            marks[-1][1] = max(marks[-1][1], end)
+        else:
+            marks.append([start, end])
+
+    # Slice the raw text around marker characters and escape it once, instead of once per piece
+    opening, closing = ('\x00', '\x01') if '\x00' not in text and '\x01' not in text else (None, None)
+    pieces, position = [], 0
+    for start, end in marks:
+        if opening:
+            pieces += [text[position:start], opening, text[start:end], closing]
+        else:
+            pieces += [escape(text[position:start]), open_tag, escape(text[start:end]), close_tag]
+        position = end
+    if not opening:
+        return ''.join(pieces) + escape(text[position:])
+    pieces.append(text[position:])
+    return escape(''.join(pieces)).replace(opening, open_tag).replace(closing, close_tag)
+
+
+@lru_cache(maxsize=COMPILED_CACHE)
+def _compile(entries):
+    return KeywordMatcher(entries)
+
+
+def compile_keywords(entries):
+    """Shared compiled matcher for [(word, payload)] - identical keyword sets are compiled once per process"""
+    return _compile(tuple((word.lower().strip(), payload) for word, payload in entries if word))
+
+
+# ============ DANGEROUS KEYWORDS ============
+# Versioned registry: every change to the DangerousKeyword table (collect/signals.py)
+# stores a new version token in the shared 'keywords' cache; each process keeps its
+# entries and compiled matchers per user and rebuilds them only when the token moved.
+VERSION_KEY = 'dangerous-keywords:version'
+
+_cache = {}
+_cache_lock = threading.Lock()
+
+
+def _version_cache():
+    return caches['keywords' if 'keywords' in settings.CACHES else 'default']
+
+
+def bump_keyword_version():
+    """Mark every compiled keyword set stale, in this process and all others"""
+    # A unique token rather than incr(): two concurrent bumps can't collapse into one value
+    _version_cache().set(VERSION_KEY, f"{time.time_ns()}-{os.getpid()}", timeout=None)
+
+
+def keyword_version():
+    cache = _version_cache()
+    version = cache.get(VERSION_KEY)
+    if version is None:
+        # First use or a cleared cache: start a version everyone agrees on
+        cache.add(VERSION_KEY, f"{time.time_ns()}-{os.getpid()}", timeout=None)
+        version = cache.get(VERSION_KEY)
+    return version
+
+
+def _load_entries(user_id, active_only=True):
+    from collect.models import DangerousKeyword
+
+    keywords = DangerousKeyword.objects.all()
+    if active_only:
+        keywords = keywords.filter(is_active=True)
+    if user_id is not None:
+        keywords = keywords.filter(created_by_id=user_id)
+    return [(row['word'], row['category'].strip()) for row in keywords.order_by('pk').values('word', 'category')]
+
+
+def _registered(user, active_only=True):
+    """(entries, matcher) of user's keywords (everyone's with None) at the current version"""
+    if user is not None and not getattr(user, 'is_authenticated', True):
+        return [], compile_keywords([])
+    key = (getattr(user, 'pk', user), active_only)
+    version = keyword_version()
+    with _cache_lock:
+        cached = _cache.get(key)
+    if cached and cached[0] == version:
+        return cached[1], cached[2]
+
+    entries = _load_entries(*key)
+    matcher = compile_keywords(entries)
+    with _cache_lock:
+        _cache[key] = (version, entries, matcher)
+    return entries, matcher
+
+
+def keyword_entries(user=None, active_only=True):
+    """[(word, category)] of the active (or all) DangerousKeyword rows of user (everyone's with None), in pk order"""
+    return list(_registered(user, active_only)[0])
+
+
+def keyword_matcher(user=None, active_only=True):
+    """Compiled matcher of the active (or all) DangerousKeyword rows of user (everyone's with None), payload = category"""
+    return _registered(user, active_only)[1]
+
+
+def clear_cache():
+    with _cache_lock:
+        _cache.clear()
+    _compile.cache_clear()
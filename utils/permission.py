@@ -13,6 +13,7 @@ URL_ACCESS_MAP = {
     '/adding_new': ['User', 'SuperAdmin'],
     '/viewAutoNews': ['User', 'SuperAdmin'],
     '/fetch_keyboard': ['User', 'SuperAdmin'],
+    '/scrape_jobs': ['User', 'SuperAdmin'],
     '/search_news': ['User', 'SuperAdmin'],
     '/visualize_news': ['User', 'SuperAdmin'],
     '/trending_news': ['User', 'SuperAdmin'],
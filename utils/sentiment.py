@@ -1,19 +1,442 @@
-import joblib
+import hashlib
 import os
+import re
+import struct
+import threading
+from collections import OrderedDict
 
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 
 MODEL_PATH = os.path.join(BASE_DIR, 'ml_models/sentiment_model.joblib')
 VECTORIZER_PATH = os.path.join(BASE_DIR, 'ml_models/vectorizer.joblib')
 
-model = joblib.load(MODEL_PATH)
-vectorizer = joblib.load(VECTORIZER_PATH)
+CACHE_SIZE = 100_000      # predictions kept per process (LRU)
+CACHE_PERSIST_EVERY = 500  # new predictions before the cache file is rewritten
+CACHE_FILE_MAGIC = b'SNT2'
+CACHE_RECORD = struct.Struct('<16sq')  # key, label (any integer class label, negative ones included)
+
+POOL_MIN_TEXTS = 2000  # smaller batches are scored in-process: shipping them costs more than it saves
+POOL_MIN_CHUNK = 500
+
+# Loaded on first use (or by preload()), not at import: manage.py commands and
+# workers that never score a comment don't pay for joblib / scikit-learn
+_models = None
+_model_version = None
+_load_lock = threading.Lock()
+
+
+def _setting(name, default):
+    try:
+        from django.conf import settings
+        return getattr(settings, name, default)
+    except ImportError:
+        return default
+
+
+def _mmap_mode():
+    """'r' (numpy arrays memory-mapped read-only, shared between worker processes) unless SENTIMENT_MMAP is off"""
+    return 'r' if _setting('SENTIMENT_MMAP', True) else None
+
+
+def load_models():
+    """(model, vectorizer), loaded once per process"""
+    global _models
+    if _models is None:
+        with _load_lock:
+            if _models is None:
+                import joblib
+
+                mmap_mode = _mmap_mode()
+                _models = (joblib.load(MODEL_PATH, mmap_mode=mmap_mode), joblib.load(VECTORIZER_PATH, mmap_mode=mmap_mode))
+    return _models
+
+
+def model_version():
+    """Hash of the model files - cached predictions of another model are never used"""
+    global _model_version
+    if _model_version is None:
+        digest = hashlib.sha1()
+        for path in (MODEL_PATH, VECTORIZER_PATH):
+            with open(path, 'rb') as f:
+                digest.update(f.read())
+        _model_version = digest.hexdigest()[:16]
+    return _model_version
+
+
+def preload():
+    """Load the model now - for servers, so the first request doesn't wait (SENTIMENT_PRELOAD)"""
+    load_models()
+
+
+def __getattr__(name):
+    # utils.sentiment.model / .vectorizer keep working, loaded lazily
+    if name == 'model':
+        return load_models()[0]
+    if name == 'vectorizer':
+        return load_models()[1]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+# ============ FAST LINEAR PATH ============
+class LinearScorer:
+    """
+    A linear classifier (coef_/intercept_, or MultinomialNB's log probabilities)
+    behind a unigram Count/Tfidf vectorizer, exported to NumPy. Predicting is a
+    vocabulary lookup per token and one sparse dot product - what model.predict()
+    computes, without sklearn's per-call input validation.
+    """
+
+    def __init__(self, vectorizer, weights, bias, classes, binary_decision=False):
+        self.vocabulary = dict(vectorizer.vocabulary_)
+        self.token_pattern = re.compile(vectorizer.token_pattern)
+        self.lowercase = vectorizer.lowercase
+        self.binary = vectorizer.binary
+        self.weights = weights  # (features, classes), C-contiguous float64
+        self.bias = bias
+        self.classes = classes
+        self.binary_decision = binary_decision  # one coef_ row: class 1 when the score is > 0
+        self.idf = self.norm = None
+        self.sublinear_tf = False
+        if hasattr(vectorizer, 'idf_'):  # TfidfVectorizer
+            self.idf = vectorizer.idf_ if vectorizer.use_idf else None
+            self.norm = vectorizer.norm
+            self.sublinear_tf = vectorizer.sublinear_tf
+        self.counts_only = self.idf is None and not self.norm and not self.sublinear_tf
+
+    @classmethod
+    def export(cls, model, vectorizer):
+        """LinearScorer for (model, vectorizer), or None when they need the generic sklearn path"""
+        import numpy as np
+        from sklearn.feature_extraction.text import CountVectorizer
+        from sklearn.linear_model._base import LinearClassifierMixin
+        from sklearn.naive_bayes import MultinomialNB
+
+        if not (isinstance(vectorizer, CountVectorizer) and vectorizer.analyzer == 'word'
+                and tuple(vectorizer.ngram_range) == (1, 1) and vectorizer.input == 'content'
+                and vectorizer.tokenizer is None and vectorizer.preprocessor is None
+                and vectorizer.strip_accents is None and hasattr(vectorizer, 'vocabulary_')):
+            return None
+        if isinstance(model, MultinomialNB):
+            weights, bias = model.feature_log_prob_.T, model.class_log_prior_
+        elif isinstance(model, LinearClassifierMixin) and hasattr(model, 'coef_'):
+            weights, bias = model.coef_.T, np.broadcast_to(model.intercept_, (model.coef_.shape[0],))
+        else:
+            return None
+        if weights.shape[0] != len(vectorizer.vocabulary_):
+            return None
+        return cls(vectorizer, np.ascontiguousarray(weights, dtype=np.float64), np.array(bias, dtype=np.float64),
+                   np.asarray(model.classes_), binary_decision=weights.shape[1] == 1 and len(model.classes_) == 2)
+
+    def _ids(self, text):
+        get = self.vocabulary.get
+        return [index for index in map(get, self.token_pattern.findall(text.lower() if self.lowercase else text))
+                if index is not None]
+
+    def features(self, texts):
+        """CSR document-term matrix of texts, laid out the way vectorizer.transform() lays it out"""
+        import numpy as np
+        from scipy.sparse import csr_matrix
+
+        indices, indptr = [], [0]
+        for text in texts:
+            indices.extend(self._ids(text))
+            indptr.append(len(indices))
+        X = csr_matrix((np.ones(len(indices)), np.array(indices, dtype=np.int32), np.array(indptr, dtype=np.int32)),
+                       shape=(len(texts), len(self.vocabulary)))
+        X.sum_duplicates()  # counts per (text, feature), indices sorted
+        if self.binary:
+            X.data[:] = 1
+        if self.sublinear_tf:
+            np.log(X.data, out=X.data)
+            X.data += 1
+        if self.idf is not None:
+            X.data *= self.idf[X.indices]
+        if self.norm:
+            from sklearn.preprocessing import normalize
+            X = normalize(X, norm=self.norm, copy=False)
+        return X
+
+    def _label(self, scores):
+        if self.binary_decision:
+            return self.classes[int(scores[0] > 0)]
+        return self.classes[scores.argmax()]
+
+    def predict_one(self, text):
+        """predict([text])[0] without building a sparse matrix (count features)"""
+        import numpy as np
+
+        indices, counts = np.unique(np.array(self._ids(text), dtype=np.intp), return_counts=True)
+        if self.binary:
+            counts[:] = 1
+        return self._label((self.weights[indices] * counts[:, None]).sum(axis=0) + self.bias)
+
+    def predict(self, texts):
+        if len(texts) == 1 and self.counts_only:
+            return [self.predict_one(texts[0])]
+        scores = self.features(texts) @ self.weights + self.bias
+        if self.binary_decision:
+            return self.classes[(scores[:, 0] > 0).astype(int)]
+        return self.classes[scores.argmax(axis=1)]
+
+
+_scorer = None
+
+
+def fast_scorer():
+    """This process's LinearScorer, or None (non-linear model, or SENTIMENT_FAST_PATH off)"""
+    global _scorer
+    if _scorer is None:
+        scorer = False
+        if _setting('SENTIMENT_FAST_PATH', True):
+            scorer = LinearScorer.export(*load_models()) or False
+        _scorer = scorer
+    return _scorer or None
+
+
+def predict_uncached(texts):
+    """Labels of texts straight from the model (fast linear path when available)"""
+    scorer = fast_scorer()
+    if scorer is not None:
+        return [int(label) for label in scorer.predict(texts)]
+    model, vectorizer = load_models()
+    return [int(label) for label in model.predict(vectorizer.transform(texts))]
+
+
+# ============ PROCESS POOL ============
+# Scoring is Python tokenization under the GIL, so large batches are fanned out
+# to worker processes (SENTIMENT_WORKERS). Each worker loads the model once, in
+# its initializer; the pool lives as long as the process that started it.
+_pool = None
+_pool_workers = 0
+_pool_lock = threading.Lock()
+
+
+def _worker_init():
+    load_models()
+    fast_scorer()
+
+
+def pool_workers():
+    """Worker processes large batches use (SENTIMENT_WORKERS; 0 or 1: score in-process)"""
+    return _setting('SENTIMENT_WORKERS', 0) or 0
+
+
+def inference_pool(workers):
+    global _pool, _pool_workers
+    with _pool_lock:
+        if _pool is None or _pool_workers != workers:
+            import multiprocessing
+            from concurrent.futures import ProcessPoolExecutor
+
+            if _pool is not None:
+                _pool.shutdown(wait=False, cancel_futures=True)
+            # spawn: forking a threaded server (runserver, gunicorn threads) can deadlock the child
+            _pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn'),
+                                        initializer=_worker_init)
+            _pool_workers = workers
+        return _pool
+
+
+def shutdown_pool():
+    global _pool, _pool_workers
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(cancel_futures=True)
+        _pool, _pool_workers = None, 0
+
+
+def predict_parallel(texts, workers=None):
+    """
+    predict_uncached() with the texts split into chunks, queued to the worker
+    pool and collected in order. Batches under POOL_MIN_TEXTS, or a pool of
+    one worker, are scored in this process.
+    """
+    workers = pool_workers() if workers is None else workers
+    if workers <= 1 or len(texts) < POOL_MIN_TEXTS:
+        return predict_uncached(texts)
+    from concurrent.futures.process import BrokenProcessPool
+
+    # A few chunks per worker, so a slow chunk doesn't leave the other workers idle
+    size = max(POOL_MIN_CHUNK, -(-len(texts) // (workers * 4)))
+    chunks = [texts[start:start + size] for start in range(0, len(texts), size)]
+    try:
+        labels = []
+        for chunk_labels in inference_pool(workers).map(predict_uncached, chunks):
+            labels.extend(chunk_labels)
+        return labels
+    except BrokenProcessPool:
+        print("⚠️ Sentiment worker pool died - scoring in-process")
+        shutdown_pool()
+        return predict_uncached(texts)
+
+
+# ============ PREDICTION CACHE ============
+class SentimentCache:
+    """
+    Bounded LRU of predictions keyed by a hash of (model version, text as the
+    vectorizer sees it), optionally persisted to a file so repeated comments
+    stay cheap across uploads and restarts.
+    """
+
+    def __init__(self, size=CACHE_SIZE, path=None):
+        self.size = size
+        self.path = path
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.unsaved = 0
+        self.loaded = False
+        self.lock = threading.Lock()
+
+    def key(self, text):
+        # The (word-analyzer) CountVectorizer splits on non-word characters, so runs of
+        # whitespace can't change a prediction - and neither can case when it lower-cases.
+        # The Devanagari folding of utils.text_normalize would: the vocabulary tells spellings apart
+        if getattr(load_models()[1], 'lowercase', False):
+            text = text.lower()
+        normalized = ' '.join(text.split())
+        return hashlib.blake2b(f"{model_version()}\0{normalized}".encode('utf-8'), digest_size=16).digest()
+
+    def get_many(self, keys):
+        """
+        {key: label} of the cached keys. A miss is a distinct key that has to go
+        to the model; repeats of it in the same call count as hits.
+        """
+        self._load()
+        found, missed = {}, set()
+        with self.lock:
+            for key in keys:
+                if key in found or key in missed:
+                    self.hits += 1
+                    continue
+                label = self.entries.get(key)
+                if label is None:
+                    missed.add(key)
+                    self.misses += 1
+                else:
+                    self.entries.move_to_end(key)
+                    found[key] = label
+                    self.hits += 1
+        return found
+
+    def put_many(self, labels):
+        with self.lock:
+            for key, label in labels.items():
+                self.entries[key] = label
+                self.entries.move_to_end(key)
+            while len(self.entries) > self.size:
+                self.entries.popitem(last=False)
+            self.unsaved += len(labels)
+        if self.path and self.unsaved >= CACHE_PERSIST_EVERY:
+            self.save()
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self.entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            "file": self.path,
+        }
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.hits = self.misses = self.unsaved = 0
+        if self.path and os.path.exists(self.path):
+            os.remove(self.path)
+
+    # File: magic, model version (16 bytes), then CACHE_RECORD (key, label) records, oldest first
+    def _load(self):
+        if self.loaded:
+            return
+        with self.lock:
+            if self.loaded:
+                return
+            self.loaded = True
+            if not self.path:
+                return
+            try:
+                with open(self.path, 'rb') as f:
+                    data = f.read()
+            except OSError:
+                return
+            if data[:4] != CACHE_FILE_MAGIC or data[4:20] != model_version().encode('ascii'):
+                return
+            records = data[20:20 + (len(data) - 20) // CACHE_RECORD.size * CACHE_RECORD.size]
+            for key, label in CACHE_RECORD.iter_unpack(records):
+                self.entries[key] = label
+            while len(self.entries) > self.size:
+                self.entries.popitem(last=False)
+
+    def save(self):
+        if not self.path:
+            return
+        with self.lock:
+            records = b''.join(CACHE_RECORD.pack(key, label) for key, label in self.entries.items())
+            self.unsaved = 0
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            temp_path = f"{self.path}.{os.getpid()}.tmp"
+            with open(temp_path, 'wb') as f:
+                f.write(CACHE_FILE_MAGIC + model_version().encode('ascii') + records)
+            os.replace(temp_path, self.path)
+        except OSError as e:
+            print(f"⚠️ Sentiment cache not saved: {e}")
+
+
+_cache = None
+
+
+def prediction_cache():
+    global _cache
+    if _cache is None:
+        path = _setting('SENTIMENT_CACHE_FILE', None)
+        _cache = SentimentCache(_setting('SENTIMENT_CACHE_SIZE', CACHE_SIZE), str(path) if path else None)
+    return _cache
+
+
+def cache_stats():
+    """Hit-rate statistics of this process's prediction cache"""
+    return prediction_cache().stats()
+
+
+def flush_cache():
+    """Write new predictions to the cache file now (after an upload)"""
+    cache = prediction_cache()
+    if cache.unsaved:
+        cache.save()
+
 
 def predict_sentiment(text):
-    if not text.strip():
-        return 2  # Neutral for empty text
-    
-    X = vectorizer.transform([text])
-    prediction = model.predict(X)[0]
-    
-    return int(prediction)  # Ensure it's returned as integer
\ No newline at end of file
+    return predict_sentiments([text])[0]
+
+
+def predict_sentiments(texts, workers=None):
+    """
+    predict_sentiment() for a list of texts: cached predictions are reused and
+    the distinct misses are predicted in one batch (across the worker pool when
+    it is large - see predict_parallel)
+    """
+    sentiments = [2] * len(texts)  # Neutral for empty text
+    indexes = [i for i, text in enumerate(texts) if text.strip()]
+    if not indexes:
+        return sentiments
+
+    cache = prediction_cache()
+    keys = {i: cache.key(texts[i]) for i in indexes}
+    cached = cache.get_many(keys.values())
+    missing = {}
+    for i in indexes:
+        if keys[i] not in cached:
+            missing.setdefault(keys[i], texts[i])
+
+    if missing:
+        predicted = dict(zip(missing, predict_parallel(list(missing.values()), workers)))
+        cache.put_many(predicted)
+        cached.update(predicted)
+
+    for i in indexes:
+        sentiments[i] = cached[keys[i]]
+    return sentiments
@@ -0,0 +1,163 @@
+# utils/text_normalize.py
+"""
+One normalization pipeline for the Nepali/English text we match keywords in.
+
+The same word reaches us in several byte sequences: NFC or NFD composed,
+with invisible ZWJ/ZWNJ from phone keyboards, with or without nukta,
+chandrabindu instead of anusvara, a long vowel where the dictionary has a
+short one, curly quotes, dandas, Devanagari digits. normalize_text() folds
+all of them to one canonical form:
+
+    1. Unicode NFC
+    2. case folding
+    3. zero-width characters, soft hyphen and nukta removed
+    4. NASAL_MATRA_FOLDING: chandrabindu -> anusvara, long i/u (vowel and
+       matra) -> short, precomposed nukta letters -> base letter
+    5. PUNCTUATION_FOLDING: quotes, dashes, danda, Devanagari digits
+    6. runs of whitespace (NBSP included) -> one space, none at either end
+
+Every step is a C-level str operation, so a document is normalized once in
+about 0.1 ms per article and then scanned by any number of keyword matchers
+(see utils/keyword_matcher.py). Keywords are folded the same way when they
+are saved (DangerousKeyword.normalized_word) and when a matcher is compiled,
+so one stored keyword covers all its spellings.
+"""
+import re
+import unicodedata
+
+
+ZERO_WIDTH = {
+    '\u200b': None,  # zero width space
+    '\u200c': None,  # ZWNJ
+    '\u200d': None,  # ZWJ
+    '\u2060': None,  # word joiner
+    '\ufeff': None,  # BOM / zero width no-break space
+    '\u00ad': None,  # soft hyphen
+    '\u093c': None,  # nukta
+}
+
+NASAL_MATRA_FOLDING = {
+    '\u0901': '\u0902',   # chandrabindu -> anusvara
+    '\u0940': '\u093f',   # long i matra -> short
+    '\u0942': '\u0941',   # long u matra -> short
+    'ई': 'इ',
+    'ऊ': 'उ',
+    'ऩ': 'न',   # precomposed nukta letters (NFC keeps these composed)
+    'ऱ': 'र',
+    'ऴ': 'ळ',
+}
+
+PUNCTUATION_FOLDING = {
+    '‘': "'", '’': "'", '‚': "'", '‛': "'", '`': "'", '´': "'",
+    '“': '"', '”': '"', '„': '"', '‟': '"', '«': '"', '»': '"',
+    '‐': '-', '‑': '-', '‒': '-', '–': '-', '—': '-', '―': '-', '−': '-',
+    '।': '.', '॥': '.', '…': '...',
+    **{chr(0x0966 + digit): str(digit) for digit in range(10)},  # ० - ९
+}
+
+FOLDING = {**ZERO_WIDTH, **NASAL_MATRA_FOLDING, **PUNCTUATION_FOLDING}
+
+# str.translate() does a dict lookup per character of non-ASCII text; replacing
+# only the characters a document actually contains is ~10x faster
+FOLDED_CHARS = re.compile('[%s]' % re.escape(''.join(FOLDING)))
+# Characters that do not fold to exactly one character
+RESHAPED_CHARS = re.compile('[%s]' % re.escape(''.join(ch for ch, to in FOLDING.items() if to is None or len(to) != 1)))
+NON_SPACE = re.compile(r'\S+')
+SINGLE_WHITESPACE = re.compile(r'[^\S ]')
+SPACE_RUNS = re.compile(r'^ +| {2,}| +$')
+
+
+class NormalizedText(str):
+    """A str already passed through normalize_text() - matchers use it as is"""
+    __slots__ = ()
+
+
+def _fold(text):
+    text = unicodedata.normalize('NFC', text).casefold()
+    for ch in set(FOLDED_CHARS.findall(text)):
+        text = text.replace(ch, FOLDING[ch] or '')
+    return text
+
+
+def normalize_text(text):
+    """Canonical form of text for keyword matching (see the module docstring)"""
+    if isinstance(text, NormalizedText):
+        return text
+    return NormalizedText(' '.join(_fold(text or '').split()))
+
+
+def normalize_keyword(word):
+    """What keywords are stored and compiled as - the same as normalize_text()"""
+    return normalize_text(word)
+
+
+def normalize_with_offsets(text):
+    """
+    (normalized text, starts, ends): normalized[i] came from text[starts[i]:ends[i]]
+    - one character, a whitespace run, or the base character + combining marks
+    it was composed from - so a match (start, end) in the normalized text
+    covers text[starts[start]:ends[end - 1]].
+    """
+    text = text or ''
+    folded = _fold(text)
+    if len(folded) != len(text) or RESHAPED_CHARS.search(text) or not unicodedata.is_normalized('NFC', text):
+        return _token_offsets(text)
+
+    # Every character folded to exactly one character: offsets are the identity
+    # up to the whitespace collapsing, which only touches runs of 2+ spaces and the ends
+    folded = SINGLE_WHITESPACE.sub(' ', folded)
+    pieces, starts, ends = [], [], []
+    position = 0
+    for run in SPACE_RUNS.finditer(folded):
+        start, end = run.span()
+        pieces.append(folded[position:start])
+        starts.extend(range(position, start))
+        ends.extend(range(position + 1, start + 1))
+        if start and end < len(folded):
+            pieces.append(' ')
+            starts.append(start)
+            ends.append(end)
+        position = end
+    pieces.append(folded[position:])
+    starts.extend(range(position, len(folded)))
+    ends.extend(range(position + 1, len(folded) + 1))
+    return NormalizedText(''.join(pieces)), starts, ends
+
+
+def _token_offsets(text):
+    """normalize_with_offsets() for texts whose folding deletes, expands or composes characters"""
+    pieces, starts, ends = [], [], []
+    previous_end = None
+    for token in NON_SPACE.finditer(text):
+        word, base = token.group(), token.start()
+        folded = _fold(word)
+        if not folded:
+            continue
+        if previous_end is not None:
+            # The whitespace run between two words becomes one space
+            pieces.append(' ')
+            starts.append(previous_end)
+            ends.append(base)
+        if len(folded) == len(word) and not RESHAPED_CHARS.search(word) and unicodedata.is_normalized('NFC', word):
+            starts.extend(range(base, base + len(word)))
+            ends.extend(range(base + 1, base + len(word) + 1))
+        else:
+            folded = _cluster_offsets(word, base, starts, ends)
+        pieces.append(folded)
+        previous_end = token.end()
+    return NormalizedText(''.join(pieces)), starts, ends
+
+
+def _cluster_offsets(word, base, starts, ends):
+    """Fold word one base character + combining marks at a time, recording each cluster's slice"""
+    pieces, index, length = [], 0, len(word)
+    while index < length:
+        end = index + 1
+        while end < length and unicodedata.category(word[end]).startswith('M'):
+            end += 1
+        folded = _fold(word[index:end])
+        pieces.append(folded)
+        starts.extend([base + index] * len(folded))
+        ends.extend([base + end] * len(folded))
+        index = end
+    return ''.join(pieces)
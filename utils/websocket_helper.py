@@ -2,8 +2,21 @@
 from channels.layers import get_channel_layer
 from asgiref.sync import async_to_sync
 
+# Extra receivers of every message in this process (e.g. the progress log of a background job)
+_listeners = []
+
+def add_listener(listener):
+    """Call listener(message) for every message sent from this process"""
+    _listeners.append(listener)
+
+def remove_listener(listener):
+    if listener in _listeners:
+        _listeners.remove(listener)
+
 def send_to_websocket(message):
     """Send message to all connected WebSocket clients"""
+    for listener in list(_listeners):
+        listener(message)
     channel_layer = get_channel_layer()
     async_to_sync(channel_layer.group_send)(
         "print_messages",
@@ -11,4 +24,4 @@ def send_to_websocket(message):
             "type": "send_print",  # This calls send_print() method
             "text": message  # Changed from 'message' to 'text'
         }
-    )
\ No newline at end of file
+    )